@@ -0,0 +1,113 @@
+"""
+Microbenchmark de los decodificadores JSON disponibles
+
+Compara la decodificación de cargas realistas de la API: una lista de
+candidatos (endpoint /candidates) y una entidad con una geometría poligonal
+grande (endpoint /find sobre un municipio o una provincia).
+
+Uso:
+    python -m benchmarks.bench_decodificacion [--repeticiones N]
+"""
+
+import argparse
+import json
+import math
+import timeit
+
+from pyciudad.decodificacion import DECODIFICADORES
+
+
+def carga_candidatos(numero: int = 33) -> bytes:
+    """Genera una respuesta de /candidates con el número de candidatos indicado."""
+    candidatos = []
+    for i in range(numero):
+        candidatos.append({
+            "id": f"28079{i:07d}",
+            "province": "Madrid",
+            "provinceCode": "28",
+            "comunidadAutonoma": "Comunidad de Madrid",
+            "comunidadAutonomaCode": "13",
+            "muni": "Madrid",
+            "muniCode": "28079",
+            "type": "portal",
+            "address": f"CALLE MAYOR {i + 1}, Madrid",
+            "postalCode": "28013",
+            "poblacion": "Madrid",
+            "geom": None,
+            "tip_via": "CALLE",
+            "lat": 40.4153 + i * 1e-5,
+            "lng": -3.7074 - i * 1e-5,
+            "portalNumber": i + 1,
+            "noNumber": False,
+            "stateMsg": "",
+            "extension": None,
+            "state": 0,
+            "refCatastral": None,
+            "countryCode": "011",
+        })
+    return json.dumps(candidatos).encode("utf-8")
+
+
+def carga_geometria(vertices: int = 20000) -> bytes:
+    """Genera una respuesta de /find con un polígono WKT del número de vértices indicado."""
+    puntos = []
+    for i in range(vertices):
+        angulo = 2 * math.pi * i / vertices
+        puntos.append(
+            f"{-3.70 + 0.2 * math.cos(angulo):.13f} {40.42 + 0.15 * math.sin(angulo):.13f}"
+        )
+    puntos.append(puntos[0])
+    entidad = {
+        "id": "28079",
+        "province": "Madrid",
+        "provinceCode": "28",
+        "muni": "Madrid",
+        "muniCode": "28079",
+        "type": "Municipio",
+        "address": "Madrid",
+        "geom": f"POLYGON(({', '.join(puntos)}))",
+        "lat": 40.42,
+        "lng": -3.70,
+        "state": 0,
+        "countryCode": "011",
+    }
+    return json.dumps(entidad).encode("utf-8")
+
+
+def medir(carga: bytes, repeticiones: int) -> dict:
+    """
+    Mide el tiempo medio de decodificación de cada decodificador disponible.
+    
+    Args:
+        carga: Cuerpo de respuesta a decodificar
+        repeticiones: Número de decodificaciones por decodificador
+        
+    Returns:
+        Diccionario nombre -> microsegundos por decodificación
+    """
+    tiempos = {}
+    for nombre, decodificar in DECODIFICADORES.items():
+        total = min(timeit.repeat(lambda: decodificar(carga), number=repeticiones, repeat=3))
+        tiempos[nombre] = total / repeticiones * 1e6
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de decodificación JSON")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+    
+    cargas = {
+        "candidatos (33)": carga_candidatos(),
+        "geometría (20000 vértices)": carga_geometria(),
+    }
+    for nombre, carga in cargas.items():
+        tiempos = medir(carga, args.repeticiones)
+        base = tiempos["json"]
+        print(f"{nombre}: {len(carga) / 1024:.1f} KiB")
+        for decodificador, microsegundos in tiempos.items():
+            print(f"  {decodificador:8s} {microsegundos:10.1f} µs  x{base / microsegundos:.2f}")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Benchmark del parseo de geometrías WKT grandes
+
+Compara parsear_wkt con la extracción de pares de coordenadas por expresión
+regular (un float de Python por valor) sobre un polígono de varios megabytes.
+
+Uso:
+    python -m benchmarks.bench_geometria [--vertices N]
+"""
+
+import argparse
+import json
+import re
+import time
+import timeit
+
+from pyciudad.geometria import Geometria, parsear_wkt
+from benchmarks.bench_decodificacion import carga_geometria
+
+_PAR = re.compile(r"(-?\d+\.?\d*)\s+(-?\d+\.?\d*)")
+
+
+def por_regex(wkt: str) -> list:
+    """Extrae los vértices como lista de tuplas de floats, como haría un parseo manual."""
+    return [(float(x), float(y)) for x, y in _PAR.findall(wkt)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parseo WKT")
+    parser.add_argument("--vertices", type=int, default=200000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+    
+    wkt = json.loads(carga_geometria(args.vertices))["geom"]
+    print(f"POLYGON de {args.vertices} vértices ({len(wkt) / 1e6:.1f} MB)")
+    for nombre, funcion in (("regex + float", por_regex), ("parsear_wkt", parsear_wkt)):
+        segundos = min(timeit.repeat(lambda: funcion(wkt), number=1, repeat=args.repeticiones))
+        print(f"  {nombre:14s} {segundos * 1000:8.1f} ms")
+    
+    # Los valores derivados se memorizan: cada repetición usa una Geometria
+    # nueva sobre las mismas coordenadas para medir el cálculo y no la caché
+    g = parsear_wkt(wkt)
+    tiempos = []
+    for _ in range(args.repeticiones):
+        nueva = Geometria(g.tipo, g.coordenadas, g.anillos, g.partes, g.dimension)
+        inicio = time.perf_counter()
+        nueva.bbox(), nueva.centroide(), nueva.punto_representativo()
+        tiempos.append(time.perf_counter() - inicio)
+    print(f"  bbox + centroide + punto representativo: {min(tiempos) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
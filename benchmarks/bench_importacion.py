@@ -0,0 +1,119 @@
+"""
+Benchmark del tiempo de arranque en frío (python -X importtime)
+
+Lanza intérpretes nuevos con -X importtime y suma el tiempo acumulado de
+los módulos de primer nivel importados por cada escenario: el paquete, el
+cliente síncrono y la ayuda de la línea de comandos. Muestra la mediana y
+los módulos más costosos del escenario más lento.
+
+Con --limite-ms termina con código 1 si la mediana de "import pyciudad"
+supera el límite, para usarlo como guarda en integración continua.
+
+Uso:
+    python -m benchmarks.bench_importacion [--repeticiones N] [--limite-ms MS]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Escenario -> código ejecutado en el intérprete nuevo
+ESCENARIOS = {
+    "import pyciudad": "import pyciudad",
+    "from pyciudad import CartoCiudad": "from pyciudad import CartoCiudad",
+    "python -m pyciudad --help": (
+        "import sys; sys.argv = ['pyciudad', '--help']\n"
+        "import contextlib, io\n"
+        "from pyciudad.__main__ import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        main()\n"
+        "    except SystemExit:\n"
+        "        pass"
+    ),
+}
+
+
+def parsear_importtime(salida: str) -> List[Tuple[str, int, int]]:
+    """
+    Parsea la salida de -X importtime.
+    
+    Returns:
+        Lista de (módulo, microsegundos propios, microsegundos acumulados)
+        de los módulos importados por el código, excluido el arranque del intérprete
+    """
+    modulos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos.append((nombre.rstrip(), int(propio), int(acumulado)))
+    # Lo importado antes de "site" pertenece al arranque del intérprete
+    for i, (nombre, _, _) in enumerate(modulos):
+        if nombre.strip() == "site":
+            return modulos[i + 1:]
+    return modulos
+
+
+def medir_escenario(codigo: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Ejecuta un escenario en un intérprete nuevo.
+    
+    Returns:
+        Milisegundos de importación y detalle por módulo
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        capture_output=True, text=True, check=True
+    )
+    modulos = parsear_importtime(resultado.stderr)
+    # Los módulos de primer nivel (sin sangría) ya incluyen a sus dependencias
+    total = sum(acumulado for nombre, _, acumulado in modulos if not nombre.startswith("  "))
+    return total / 1000, modulos
+
+
+def medir(repeticiones: int) -> Dict[str, Tuple[float, List[Tuple[str, int, int]]]]:
+    """
+    Mide todos los escenarios.
+    
+    Returns:
+        Diccionario escenario -> (mediana en milisegundos, detalle de la última ejecución)
+    """
+    resultados = {}
+    for nombre, codigo in ESCENARIOS.items():
+        tiempos = []
+        for _ in range(repeticiones):
+            milisegundos, modulos = medir_escenario(codigo)
+            tiempos.append(milisegundos)
+        resultados[nombre] = (statistics.median(tiempos), modulos)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de importación")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, help="Máximo para 'import pyciudad', en milisegundos")
+    parser.add_argument("--detalle", type=int, default=10, help="Módulos más costosos a mostrar")
+    args = parser.parse_args()
+    
+    resultados = medir(args.repeticiones)
+    for nombre, (milisegundos, _) in resultados.items():
+        print(f"  {nombre:36s} {milisegundos:8.1f} ms")
+    
+    lento = max(resultados, key=lambda nombre: resultados[nombre][0])
+    print(f"\nMódulos más costosos en '{lento}' (acumulado):")
+    modulos = sorted(resultados[lento][1], key=lambda m: m[2], reverse=True)
+    for nombre, _, acumulado in modulos[:args.detalle]:
+        print(f"  {acumulado / 1000:8.1f} ms  {nombre.strip()}")
+    
+    if args.limite_ms is not None:
+        milisegundos = resultados["import pyciudad"][0]
+        if milisegundos > args.limite_ms:
+            print(f"\n'import pyciudad' tarda {milisegundos:.1f} ms (límite {args.limite_ms:.1f} ms)", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Memoria por resultado de los modelos Pydantic frente a los registros compactos
+
+Construye N resultados de geocodificación inversa con cada representación y
+mide la memoria asignada con tracemalloc. Las cadenas de cada resultado son
+distintas, como en un lote real.
+
+Uso:
+    python -m benchmarks.bench_memoria [--resultados N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from pyciudad.modelos import Direccion
+from pyciudad.registros import RegistroCompacto
+
+
+def respuesta(i: int) -> dict:
+    """Genera una respuesta de reverseGeocode distinta para cada índice."""
+    return {
+        "id": f"24625{i:08d}",
+        "province": "València/Valencia",
+        "provinceCode": "46",
+        "comunidadAutonoma": "Comunitat Valenciana",
+        "comunidadAutonomaCode": "10",
+        "muni": "València",
+        "muniCode": "46250",
+        "type": "portal",
+        "address": f"BLASCO IBÁÑEZ {i}",
+        "postalCode": "46022",
+        "poblacion": "València",
+        "geom": f"POINT({-0.3445 - i * 1e-7:.13f} {39.4724 + i * 1e-7:.13f})",
+        "tip_via": "AVENIDA",
+        "lat": 39.4724 + i * 1e-7,
+        "lng": -0.3445 - i * 1e-7,
+        "portalNumber": i % 300,
+        "noNumber": False,
+        "stateMsg": "",
+        "extension": None,
+        "state": 0,
+        "countryCode": "011",
+        "refCatastral": None,
+    }
+
+
+def medir(construir, resultados: int) -> float:
+    """
+    Mide los bytes por resultado que retiene una lista construida con la función.
+    
+    Args:
+        construir: Función índice -> resultado
+        resultados: Número de resultados a construir
+        
+    Returns:
+        Bytes asignados por resultado
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    lista = [construir(i) for i in range(resultados)]
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del lista
+    return total / resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria por resultado")
+    parser.add_argument("--resultados", type=int, default=100000)
+    args = parser.parse_args()
+    
+    modos = {
+        "Direccion (model_validate)": lambda i: Direccion.model_validate(respuesta(i)),
+        "RegistroCompacto": lambda i: RegistroCompacto.desde_dict(respuesta(i)),
+    }
+    base = None
+    for nombre, construir in modos.items():
+        bytes_por_resultado = medir(construir, args.resultados)
+        base = base or bytes_por_resultado
+        print(f"{nombre:30s} {bytes_por_resultado:8.0f} B/resultado  x{base / bytes_por_resultado:.2f}")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Benchmark del coste de las métricas por petición
+
+Mide geocodificar() con un transporte en memoria, sin red, con y sin
+registro de métricas, para acotar el coste de la instrumentación frente
+al resto del procesado (decodificación y construcción de modelos).
+
+Uso:
+    python -m benchmarks.bench_metricas [--repeticiones N]
+"""
+
+import argparse
+import json
+import logging
+import timeit
+
+from pyciudad import CartoCiudad, Metricas, TransporteMemoria
+from benchmarks.bench_decodificacion import carga_candidatos
+
+
+def medir(repeticiones: int) -> dict:
+    """
+    Mide el tiempo medio de una llamada a geocodificar() con y sin métricas.
+    
+    Args:
+        repeticiones: Número de llamadas por modo
+        
+    Returns:
+        Diccionario modo -> microsegundos por llamada
+    """
+    transporte = TransporteMemoria({"find": json.loads(carga_candidatos(numero=1))[0]})
+    clientes = {
+        "sin_metricas": CartoCiudad(transporte=transporte),
+        "con_metricas": CartoCiudad(transporte=transporte, metricas=Metricas()),
+    }
+    logging.getLogger("pycartociudad").disabled = True
+    tiempos = {}
+    for nombre, cliente in clientes.items():
+        total = min(timeit.repeat(lambda: cliente.geocodificar("Calle Mayor 1"), number=repeticiones, repeat=3))
+        tiempos[nombre] = total / repeticiones * 1e6
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del coste de las métricas")
+    parser.add_argument("--repeticiones", type=int, default=20000)
+    args = parser.parse_args()
+    
+    tiempos = medir(args.repeticiones)
+    base = tiempos["sin_metricas"]
+    for modo, microsegundos in tiempos.items():
+        print(f"  {modo:14s} {microsegundos:8.1f} µs  ({microsegundos - base:+.1f} µs)")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Benchmark del efecto de la normalización de consultas en la caché
+
+Genera consultas con variantes de escritura de las mismas direcciones
+("C/ Mayor 1, Madrid", "calle mayor, 1 madrid"...), las geocodifica con
+una caché en memoria y un transporte en memoria, sin red, y compara la
+tasa de aciertos de la caché con y sin NormalizadorConsultas. También
+mide el coste de normalizar una consulta.
+
+Uso:
+    python -m benchmarks.bench_normalizacion [--direcciones N] [--consultas N]
+"""
+
+import argparse
+import logging
+import random
+import timeit
+
+from pyciudad import CacheMemoria, CartoCiudad, NormalizadorConsultas, TransporteMemoria
+
+VIAS = ["Mayor", "Real", "Alcalá", "Gran Vía", "de la Constitución", "San Martín", "Nueva", "del Carmen"]
+TIPOS = [("Calle", "C/", "cl."), ("Avenida", "Avda.", "Av"), ("Plaza", "Pza.", "Pl.")]
+MUNICIPIOS = ["Madrid", "Málaga", "León", "Cádiz", "Zaragoza"]
+
+
+def variante(tipo, via, numero, municipio, rng):
+    """Escribe una dirección con una abreviatura, mayúsculas y puntuación al azar."""
+    texto = rng.choice([
+        "{t} {v} {n}, {m}",
+        "{t} {v}, {n} {m}",
+        "{t} {v} nº {n} {m}",
+        "{t} {v} {n} {m}",
+    ]).format(t=rng.choice(tipo), v=via, n=numero, m=municipio)
+    return rng.choice([str.upper, str.lower, lambda s: s])(texto)
+
+
+def generar_consultas(direcciones: int, consultas: int, semilla: int = 1) -> list:
+    """
+    Genera consultas que repiten un conjunto de direcciones con distintas variantes.
+    
+    Args:
+        direcciones: Número de direcciones distintas
+        consultas: Número total de consultas
+        semilla: Semilla del generador aleatorio
+    """
+    rng = random.Random(semilla)
+    base = [
+        (rng.choice(TIPOS), rng.choice(VIAS), rng.randint(1, 200), rng.choice(MUNICIPIOS))
+        for _ in range(direcciones)
+    ]
+    return [variante(*rng.choice(base), rng) for _ in range(consultas)]
+
+
+def medir(direcciones: int, consultas: int) -> dict:
+    """
+    Geocodifica las consultas con y sin normalizador.
+    
+    Returns:
+        Diccionario modo -> estadísticas de la caché y peticiones enviadas
+    """
+    logging.getLogger("pycartociudad").disabled = True
+    textos = generar_consultas(direcciones, consultas)
+    resultados = {}
+    for modo, normalizador in [("sin_normalizar", None), ("normalizado", NormalizadorConsultas())]:
+        transporte = TransporteMemoria({"find": {"id": "1", "type": "portal", "lat": 40.4, "lng": -3.7}})
+        cache = CacheMemoria(max_entradas=consultas)
+        cliente = CartoCiudad(transporte=transporte, cache=cache, normalizador=normalizador)
+        for texto in textos:
+            cliente.geocodificar(texto)
+        resultados[modo] = dict(cache.estadisticas(), peticiones=len(transporte.peticiones))
+    
+    normalizador = NormalizadorConsultas()
+    muestra = textos[:1000]
+    total = min(timeit.repeat(lambda: [normalizador(t) for t in muestra], number=10, repeat=3))
+    resultados["coste_us"] = total / (10 * len(muestra)) * 1e6
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la normalización de consultas")
+    parser.add_argument("--direcciones", type=int, default=500)
+    parser.add_argument("--consultas", type=int, default=10000)
+    args = parser.parse_args()
+    
+    resultados = medir(args.direcciones, args.consultas)
+    for modo in ("sin_normalizar", "normalizado"):
+        datos = resultados[modo]
+        print(
+            f"  {modo:15s} aciertos {datos['tasa_aciertos']:6.1%}  "
+            f"entradas {datos['entradas']:6d}  peticiones {datos['peticiones']:6d}"
+        )
+    print(f"  coste de normalizar: {resultados['coste_us']:.1f} µs por consulta")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
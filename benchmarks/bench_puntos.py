@@ -0,0 +1,76 @@
+"""
+Benchmark de la geocodificación inversa de trazas densas de puntos
+
+Genera una traza GPS sintética (un paseo aleatorio con pasos de unos
+metros y lecturas repetidas) y la geocodifica con un transporte en
+memoria, sin red. Compara geocodificacion_inversa_lote, que consulta cada
+punto, con geocodificacion_inversa_puntos, que valida con NumPy y consulta
+una vez por grupo de puntos casi iguales.
+
+Uso:
+    python -m benchmarks.bench_puntos [--puntos N] [--precision METROS]
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from pyciudad import CartoCiudad, TransporteMemoria
+
+RESPUESTA = {"id": "1", "type": "portal", "address": "CALLE MAYOR", "muni": "Madrid", "lat": 40.4, "lng": -3.7}
+
+
+def generar_traza(puntos: int, semilla: int = 1):
+    """
+    Genera una traza con pasos de unos 2 m y cada lectura repetida varias veces.
+    
+    Returns:
+        Tupla (longitudes, latitudes)
+    """
+    rng = np.random.default_rng(semilla)
+    pasos = rng.normal(0, 2e-5, size=(puntos, 2))
+    pasos[rng.random(puntos) < 0.5] = 0.0  # Vehículo parado: lecturas idénticas
+    traza = np.cumsum(pasos, axis=0) + [-3.7, 40.4]
+    return traza[:, 0], traza[:, 1]
+
+
+def medir(puntos: int, precision: float) -> dict:
+    """
+    Geocodifica la traza con los dos métodos.
+    
+    Returns:
+        Diccionario método -> (segundos, peticiones enviadas)
+    """
+    logging.getLogger("pycartociudad").disabled = True
+    longitudes, latitudes = generar_traza(puntos)
+    resultados = {}
+    
+    transporte = TransporteMemoria({"reverseGeocode": RESPUESTA})
+    cliente = CartoCiudad(transporte=transporte)
+    inicio = time.perf_counter()
+    cliente.geocodificacion_inversa_lote(zip(longitudes.tolist(), latitudes.tolist()), columnar=True)
+    resultados["por_punto"] = (time.perf_counter() - inicio, len(transporte.peticiones))
+    
+    transporte = TransporteMemoria({"reverseGeocode": RESPUESTA})
+    cliente = CartoCiudad(transporte=transporte)
+    inicio = time.perf_counter()
+    cliente.geocodificacion_inversa_puntos(longitudes, latitudes, precision_metros=precision)
+    resultados["agrupado"] = (time.perf_counter() - inicio, len(transporte.peticiones))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la geocodificación inversa de trazas")
+    parser.add_argument("--puntos", type=int, default=100000)
+    parser.add_argument("--precision", type=float, default=5.0)
+    args = parser.parse_args()
+    
+    resultados = medir(args.puntos, args.precision)
+    for metodo, (segundos, peticiones) in resultados.items():
+        print(f"  {metodo:10s} {segundos:8.2f} s  peticiones {peticiones:8d}")
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
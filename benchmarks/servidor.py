@@ -0,0 +1,208 @@
+"""
+Servidor HTTP local que imita la API de CartoCiudad
+
+Sirve respuestas grabadas de /candidates, /find y /reverseGeocode con una
+latencia artificial y una tasa de errores configurables, para medir el
+rendimiento del cliente sin depender de la red ni de la API real.
+
+Uso independiente:
+    python -m benchmarks.servidor --puerto 8765 --latencia 0.02 --tasa-error 0.01
+    
+y en el cliente:
+    CartoCiudad(url_base="http://127.0.0.1:8765/geocoder/api/geocoder")
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+
+# Ruta de la API en el servidor local (la misma que en CartoCiudad)
+RUTA_API = "/geocoder/api/geocoder"
+
+DIRECTORIO_RESPUESTAS = os.path.join(os.path.dirname(__file__), "respuestas")
+ENDPOINTS = ("candidates", "find", "reverseGeocode")
+
+
+def cargar_respuestas(directorio: str = DIRECTORIO_RESPUESTAS) -> Dict[str, bytes]:
+    """
+    Carga las respuestas grabadas de cada endpoint.
+    
+    Args:
+        directorio: Carpeta con un fichero <endpoint>.json por endpoint
+        
+    Returns:
+        Diccionario endpoint -> cuerpo de la respuesta en bytes
+    """
+    respuestas = {}
+    for endpoint in ENDPOINTS:
+        with open(os.path.join(directorio, f"{endpoint}.json"), encoding="utf-8") as f:
+            # Se vuelve a serializar compacto, como lo envía la API
+            respuestas[endpoint] = json.dumps(json.load(f), ensure_ascii=False).encode("utf-8")
+    return respuestas
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    """Atiende las peticiones GET con la respuesta grabada del endpoint."""
+    
+    # HTTP/1.1 para mantener las conexiones keep-alive, como la API real
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo en un único envío: con Nagle y el ACK diferido del
+    # cliente, enviarlos por separado añade ~40 ms a cada respuesta
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+    
+    def do_GET(self):
+        servidor = self.server
+        endpoint = self.path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        cuerpo = servidor.respuestas.get(endpoint)
+        
+        if servidor.latencia > 0:
+            variacion = servidor.latencia * servidor.variacion
+            time.sleep(max(0.0, random.uniform(servidor.latencia - variacion, servidor.latencia + variacion)))
+        
+        if cuerpo is None:
+            self._responder(404, b'{"error": "Endpoint no encontrado"}')
+        elif servidor.tasa_error > 0 and random.random() < servidor.tasa_error:
+            self._responder(503, b'{"error": "Servicio no disponible"}')
+        else:
+            self._responder(200, cuerpo)
+        
+        with servidor.bloqueo:
+            servidor.peticiones += 1
+    
+    def _responder(self, codigo: int, cuerpo: bytes) -> None:
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+    
+    def log_message(self, formato, *args):
+        # Sin traza por petición: distorsionaría las mediciones
+        pass
+
+
+class ServidorCartoCiudad(ThreadingHTTPServer):
+    """
+    Servidor local con la interfaz de la API de CartoCiudad.
+    
+    Cada petición se atiende en su propio hilo y espera una latencia
+    uniforme en [latencia * (1 - variacion), latencia * (1 + variacion)]
+    antes de responder con la respuesta grabada o, con probabilidad
+    tasa_error, con un error 503.
+    """
+    
+    daemon_threads = True
+    request_queue_size = 1024
+    
+    def __init__(
+        self,
+        puerto: int = 0,
+        latencia: float = 0.0,
+        variacion: float = 0.0,
+        tasa_error: float = 0.0,
+        respuestas: Optional[Dict[str, bytes]] = None
+    ):
+        """
+        Crea el servidor escuchando en 127.0.0.1.
+        
+        Args:
+            puerto: Puerto de escucha (0 para uno libre)
+            latencia: Latencia media añadida a cada respuesta, en segundos
+            variacion: Variación relativa de la latencia (0 a 1)
+            tasa_error: Proporción de peticiones que responden 503
+            respuestas: Cuerpos por endpoint; por defecto, los grabados
+        """
+        super().__init__(("127.0.0.1", puerto), _Manejador)
+        self.latencia = latencia
+        self.variacion = variacion
+        self.tasa_error = tasa_error
+        self.respuestas = respuestas if respuestas is not None else cargar_respuestas()
+        self.peticiones = 0
+        self.bloqueo = threading.Lock()
+    
+    @property
+    def url_base(self) -> str:
+        """URL base para pasar al cliente como url_base."""
+        return f"http://127.0.0.1:{self.server_address[1]}{RUTA_API}"
+
+
+@contextmanager
+def servidor_en_hilo(**configuracion) -> Iterator[ServidorCartoCiudad]:
+    """
+    Arranca el servidor en un hilo del proceso actual (útil en tests).
+    
+    Args:
+        **configuracion: Argumentos de ServidorCartoCiudad
+        
+    Yields:
+        El servidor en marcha
+    """
+    servidor = ServidorCartoCiudad(**configuracion)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    try:
+        yield servidor
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def _servir(cola, configuracion) -> None:
+    """Punto de entrada del proceso hijo: arranca el servidor y comunica su URL."""
+    servidor = ServidorCartoCiudad(**configuracion)
+    cola.put(servidor.url_base)
+    servidor.serve_forever()
+
+
+@contextmanager
+def servidor_en_proceso(**configuracion) -> Iterator[str]:
+    """
+    Arranca el servidor en un proceso aparte.
+    
+    Así el tiempo de CPU y la memoria del servidor no se mezclan con las del
+    cliente que se está midiendo.
+    
+    Args:
+        **configuracion: Argumentos de ServidorCartoCiudad
+        
+    Yields:
+        URL base del servidor
+    """
+    cola = multiprocessing.Queue()
+    proceso = multiprocessing.Process(target=_servir, args=(cola, configuracion), daemon=True)
+    proceso.start()
+    try:
+        yield cola.get(timeout=30)
+    finally:
+        proceso.terminate()
+        proceso.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API de CartoCiudad")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia media en segundos")
+    parser.add_argument("--variacion", type=float, default=0.0, help="Variación relativa de la latencia")
+    parser.add_argument("--tasa-error", type=float, default=0.0, help="Proporción de respuestas 503")
+    args = parser.parse_args()
+    
+    servidor = ServidorCartoCiudad(args.puerto, args.latencia, args.variacion, args.tasa_error)
+    print(f"Sirviendo en {servidor.url_base}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
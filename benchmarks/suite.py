@@ -0,0 +1,311 @@
+"""
+Suite de benchmarks del cliente contra un servidor local
+
+Arranca ServidorCartoCiudad en un proceso aparte y mide, para cada
+escenario, peticiones por segundo, latencias p50/p95/p99, tiempo de CPU del
+cliente por petición y pico de memoria asignada. Todo funciona sin red, de
+modo que los resultados son comparables entre versiones.
+
+Uso:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --peticiones 2000 --latencia 0.02 --tasa-error 0.01
+    python -m benchmarks.suite --escenarios lote cache --json resultados.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from pyciudad import CartoCiudad, CacheMemoria, CacheInversaEspacial, PoliticaReintentos
+from pyciudad.lote import iterar_lote
+from benchmarks.servidor import servidor_en_proceso
+
+
+@dataclass
+class Medicion:
+    """Resultado de un escenario."""
+    escenario: str
+    peticiones: int
+    errores: int
+    segundos: float
+    peticiones_por_segundo: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    cpu_us_por_peticion: float
+    memoria_pico_kib: Optional[float] = None
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0-100) por el método del rango más cercano."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class Fase:
+    """Mide el tiempo real y de CPU de la parte medida de un escenario (sin preparación)."""
+    
+    segundos = 0.0
+    cpu = 0.0
+    
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+    
+    def __exit__(self, *exc):
+        self.segundos = time.perf_counter() - self._inicio
+        self.cpu = time.process_time() - self._cpu
+
+
+def cronometrar(funcion: Callable, latencias: List[float]) -> Callable:
+    """Envuelve una función para anotar la duración de cada llamada en latencias."""
+    def cronometrada(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            latencias.append(time.perf_counter() - inicio)
+    return cronometrada
+
+
+# Escenarios: cada uno recibe la URL base, el número de peticiones y una Fase
+# con la que delimita la parte medida; devuelve (latencias en segundos,
+# número de errores)
+
+def escenario_individual(url_base: str, n: int, fase: Fase):
+    """Llamadas secuenciales a geocodificar() con un único cliente."""
+    latencias: List[float] = []
+    errores = 0
+    with CartoCiudad(url_base=url_base) as cliente:
+        geocodificar = cronometrar(cliente.geocodificar, latencias)
+        with fase:
+            for i in range(n):
+                try:
+                    geocodificar(f"Calle Mayor {i}, Madrid")
+                except Exception:
+                    errores += 1
+    return latencias, errores
+
+
+def escenario_candidatos(url_base: str, n: int, fase: Fase):
+    """Llamadas secuenciales a buscar_candidatos() (10 candidatos por respuesta)."""
+    latencias: List[float] = []
+    errores = 0
+    with CartoCiudad(url_base=url_base) as cliente:
+        buscar = cronometrar(cliente.buscar_candidatos, latencias)
+        with fase:
+            for i in range(n):
+                try:
+                    buscar(f"Calle Iglesia {i}")
+                except Exception:
+                    errores += 1
+    return latencias, errores
+
+
+def escenario_lote(url_base: str, n: int, fase: Fase, concurrencia: int = 16):
+    """Geocodificación por lotes en un pool de hilos, como geocodificar_lote()."""
+    latencias: List[float] = []
+    with CartoCiudad(url_base=url_base, max_conexiones_por_host=concurrencia) as cliente:
+        geocodificar = cronometrar(cliente.geocodificar, latencias)
+        with fase:
+            resultados = iterar_lote(geocodificar, (f"Calle Mayor {i}" for i in range(n)), concurrencia)
+            errores = sum(1 for r in resultados if not r.correcto)
+    return latencias, errores
+
+
+def escenario_lote_reintentos(url_base: str, n: int, fase: Fase, concurrencia: int = 16):
+    """Lote con reintentos: útil con --tasa-error para medir su coste."""
+    latencias: List[float] = []
+    politica = PoliticaReintentos(max_reintentos=3, espera_base=0.01, espera_maxima=0.1)
+    with CartoCiudad(url_base=url_base, max_conexiones_por_host=concurrencia, reintentos=politica) as cliente:
+        geocodificar = cronometrar(cliente.geocodificar, latencias)
+        with fase:
+            resultados = iterar_lote(geocodificar, (f"Calle Mayor {i}" for i in range(n)), concurrencia)
+            errores = sum(1 for r in resultados if not r.correcto)
+    return latencias, errores
+
+
+def escenario_async(url_base: str, n: int, fase: Fase, concurrencia: int = 16):
+    """
+    Cliente asíncrono con tantas corrutinas trabajadoras como concurrencia.
+    
+    Cada trabajadora hace sus peticiones de una en una, de modo que la
+    latencia medida no incluye el tiempo de espera en cola.
+    """
+    from pyciudad import CartoCiudadAsync
+    
+    latencias: List[float] = []
+    errores = 0
+    
+    async def trabajadora(cliente, consultas):
+        nonlocal errores
+        for consulta in consultas:
+            inicio = time.perf_counter()
+            try:
+                await cliente.geocodificar(consulta)
+            except Exception:
+                errores += 1
+            finally:
+                latencias.append(time.perf_counter() - inicio)
+    
+    async def todas():
+        async with CartoCiudadAsync(url_base=url_base, max_concurrencia=concurrencia) as cliente:
+            consultas = iter([f"Calle Mayor {i}" for i in range(n)])
+            with fase:
+                await asyncio.gather(*(trabajadora(cliente, consultas) for _ in range(concurrencia)))
+    
+    asyncio.run(todas())
+    return latencias, errores
+
+
+def escenario_cache(url_base: str, n: int, fase: Fase):
+    """Consultas repetidas servidas desde CacheMemoria (100 consultas distintas)."""
+    latencias: List[float] = []
+    errores = 0
+    with CartoCiudad(url_base=url_base, cache=CacheMemoria()) as cliente:
+        for i in range(100):
+            try:
+                cliente.geocodificar(f"Calle Mayor {i}")
+            except Exception:
+                pass
+        geocodificar = cronometrar(cliente.geocodificar, latencias)
+        with fase:
+            for i in range(n):
+                try:
+                    geocodificar(f"Calle Mayor {i % 100}")
+                except Exception:
+                    errores += 1
+    return latencias, errores
+
+
+def escenario_cache_inversa(url_base: str, n: int, fase: Fase):
+    """Geocodificación inversa de lecturas GPS próximas con CacheInversaEspacial."""
+    latencias: List[float] = []
+    errores = 0
+    aleatorio = random.Random(0)
+    # 50 puntos base con ruido de unos pocos metros
+    puntos = [
+        (-3.70 + (i % 50) * 0.001 + aleatorio.uniform(-2e-5, 2e-5),
+         40.41 + (i % 50) * 0.001 + aleatorio.uniform(-2e-5, 2e-5))
+        for i in range(n)
+    ]
+    cache = CacheInversaEspacial(celda_metros=10, radio_metros=10)
+    with CartoCiudad(url_base=url_base, cache_inversa=cache) as cliente:
+        inversa = cronometrar(cliente.geocodificacion_inversa, latencias)
+        with fase:
+            for lon, lat in puntos:
+                try:
+                    inversa(lon, lat)
+                except Exception:
+                    errores += 1
+    return latencias, errores
+
+
+ESCENARIOS: Dict[str, Callable] = {
+    "individual": escenario_individual,
+    "candidatos": escenario_candidatos,
+    "lote": escenario_lote,
+    "lote_reintentos": escenario_lote_reintentos,
+    "async": escenario_async,
+    "cache": escenario_cache,
+    "cache_inversa": escenario_cache_inversa,
+}
+
+
+def medir(nombre: str, url_base: str, n: int, memoria: bool = True) -> Medicion:
+    """
+    Ejecuta un escenario y resume sus métricas.
+    
+    La memoria se mide en una segunda ejecución con tracemalloc activo, para
+    que su sobrecoste no altere los tiempos.
+    
+    Args:
+        nombre: Nombre del escenario en ESCENARIOS
+        url_base: URL base del servidor local
+        n: Número de peticiones
+        memoria: Si se mide también el pico de memoria
+        
+    Returns:
+        Medicion del escenario
+    """
+    escenario = ESCENARIOS[nombre]
+    fase = Fase()
+    latencias, errores = escenario(url_base, n, fase)
+    segundos = fase.segundos
+    
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        escenario(url_base, n, Fase())
+        pico = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    
+    return Medicion(
+        escenario=nombre,
+        peticiones=n,
+        errores=errores,
+        segundos=segundos,
+        peticiones_por_segundo=n / segundos if segundos > 0 else 0.0,
+        p50_ms=percentil(latencias, 50) * 1000,
+        p95_ms=percentil(latencias, 95) * 1000,
+        p99_ms=percentil(latencias, 99) * 1000,
+        cpu_us_por_peticion=fase.cpu / n * 1e6,
+        memoria_pico_kib=pico,
+    )
+
+
+def imprimir(mediciones: List[Medicion]) -> None:
+    """Muestra las mediciones como tabla."""
+    print(f"{'escenario':16s} {'pet/s':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+          f"{'CPU µs/pet':>11s} {'mem KiB':>9s} {'errores':>8s}")
+    for m in mediciones:
+        memoria = f"{m.memoria_pico_kib:9.0f}" if m.memoria_pico_kib is not None else f"{'-':>9s}"
+        print(f"{m.escenario:16s} {m.peticiones_por_segundo:9.0f} {m.p50_ms:8.2f} {m.p95_ms:8.2f} "
+              f"{m.p99_ms:8.2f} {m.cpu_us_por_peticion:11.0f} {memoria} {m.errores:8d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del cliente contra un servidor local")
+    parser.add_argument("--escenarios", nargs="+", choices=sorted(ESCENARIOS), default=list(ESCENARIOS))
+    parser.add_argument("--peticiones", type=int, default=500, help="Peticiones por escenario")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia media del servidor en segundos")
+    parser.add_argument("--variacion", type=float, default=0.5, help="Variación relativa de la latencia")
+    parser.add_argument("--tasa-error", type=float, default=0.0, help="Proporción de respuestas 503")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir el pico de memoria")
+    parser.add_argument("--json", help="Fichero donde guardar los resultados")
+    args = parser.parse_args()
+    
+    # El registro por petición (incluidos los errores provocados con
+    # --tasa-error) distorsiona las mediciones
+    logging.getLogger("pycartociudad").disabled = True
+    
+    configuracion = dict(latencia=args.latencia, variacion=args.variacion, tasa_error=args.tasa_error)
+    mediciones = []
+    with servidor_en_proceso(**configuracion) as url_base:
+        for nombre in args.escenarios:
+            try:
+                mediciones.append(medir(nombre, url_base, args.peticiones, memoria=not args.sin_memoria))
+            except ImportError as e:
+                print(f"{nombre}: omitido ({e})")
+    
+    print(f"Servidor local: latencia {args.latencia * 1000:.0f} ms, tasa de error {args.tasa_error:.1%}")
+    imprimir(mediciones)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"configuracion": configuracion, "mediciones": [asdict(m) for m in mediciones]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
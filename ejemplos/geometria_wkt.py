@@ -112,6 +112,13 @@ def main():
         else:
             print("No se pudieron extraer coordenadas con el método de la librería")
         
+        # Geometría completa: todas las coordenadas y utilidades
+        geometria = ubicacion.obtener_geometria()
+        if geometria:
+            print(f"Tipo de geometría: {geometria.tipo} ({len(geometria)} vértices)")
+            print(f"Rectángulo envolvente: {geometria.bbox()}")
+            print(f"Centroide: {geometria.centroide()}")
+        
         # Extraer coordenadas manualmente
         coords_manual = extraer_coordenadas_manual(ubicacion.geom)
         if coords_manual:
@@ -1,31 +1,107 @@
 """
 PyCiudad - Librería Python para la API de CartoCiudad del IGN España
+
+Los nombres públicos se importan bajo demanda (PEP 562): "import pyciudad"
+no carga requests ni pydantic hasta que se usa el primer nombre que los
+necesita, de modo que la línea de comandos y los scripts cortos arrancan
+más rápido.
 """
 
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 
-from .cliente import CartoCiudad
-from .modelos import (
-    Candidato, 
-    Ubicacion, 
-    Direccion, 
-    TipoEntidad,
-    EntidadBase
-)
-from .excepciones import (
-    CartoCiudadError,
-    APIError,
-    PeticionInvalidaError
-)
-
-__all__ = [
-    "CartoCiudad",
-    "Candidato", 
-    "Ubicacion", 
-    "Direccion",
-    "TipoEntidad",
-    "EntidadBase",
-    "CartoCiudadError",
-    "APIError",
-    "PeticionInvalidaError"
-] 
\ No newline at end of file
+# Nombre público -> módulo que lo define
+_EXPORTACIONES = {
+    "CartoCiudad": "cliente",
+    "CartoCiudadAsync": "cliente_async",
+    "Candidato": "modelos",
+    "Ubicacion": "modelos",
+    "Direccion": "modelos",
+    "TipoEntidad": "modelos",
+    "EntidadBase": "modelos",
+    "ResultadoLote": "lote",
+    "RegistroCompacto": "registros",
+    "compactar": "registros",
+    "ResultadosColumnares": "columnar",
+    "CacheBase": "cache",
+    "CacheMemoria": "cache",
+    "CacheSQLite": "cache",
+    "CacheInversaEspacial": "cache",
+    "SesionAutocompletado": "autocompletado",
+    "SesionAutocompletadoAsync": "autocompletado",
+    "CachePrefijos": "autocompletado",
+    "Nomenclator": "nomenclator",
+    "excluir_salvo": "nomenclator",
+    "IndiceDirecciones": "indice",
+    "NormalizadorConsultas": "normalizacion",
+    "normalizar_consulta": "normalizacion",
+    "LimitadorTasa": "limitador",
+    "Metricas": "metricas",
+    "PoliticaReintentos": "reintentos",
+    "PresupuestoReintentos": "reintentos",
+    "TransporteBase": "transporte",
+    "TransporteHTTP": "transporte",
+    "TransporteHTTPAsync": "transporte",
+    "TransporteMemoria": "transporte",
+    "TransporteGrabacion": "transporte",
+    "TransporteReproduccion": "transporte",
+    "RespuestaTransporte": "transporte",
+    "CartoCiudadError": "excepciones",
+    "APIError": "excepciones",
+    "PeticionInvalidaError": "excepciones",
+    "ErrorTransporte": "excepciones",
+    "ErrorConexion": "excepciones",
+    "ErrorTimeout": "excepciones",
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+    """Importa el módulo que define un nombre público la primera vez que se usa."""
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    import importlib
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .cliente import CartoCiudad
+    from .cliente_async import CartoCiudadAsync
+    from .modelos import Candidato, Ubicacion, Direccion, TipoEntidad, EntidadBase
+    from .lote import ResultadoLote
+    from .registros import RegistroCompacto, compactar
+    from .columnar import ResultadosColumnares
+    from .cache import CacheBase, CacheMemoria, CacheSQLite, CacheInversaEspacial
+    from .autocompletado import SesionAutocompletado, SesionAutocompletadoAsync, CachePrefijos
+    from .nomenclator import Nomenclator, excluir_salvo
+    from .indice import IndiceDirecciones
+    from .normalizacion import NormalizadorConsultas, normalizar_consulta
+    from .limitador import LimitadorTasa
+    from .metricas import Metricas
+    from .reintentos import PoliticaReintentos, PresupuestoReintentos
+    from .transporte import (
+        TransporteBase,
+        TransporteHTTP,
+        TransporteHTTPAsync,
+        TransporteMemoria,
+        TransporteGrabacion,
+        TransporteReproduccion,
+        RespuestaTransporte
+    )
+    from .excepciones import (
+        CartoCiudadError,
+        APIError,
+        PeticionInvalidaError,
+        ErrorTransporte,
+        ErrorConexion,
+        ErrorTimeout
+    ) 
\ No newline at end of file
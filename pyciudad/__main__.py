@@ -6,12 +6,31 @@ Punto de entrada para ejecutar PyCartoCiudad como módulo
 """
 
 import sys
+import os
+import csv
+import json
 import argparse
-from pycartociudad import CartoCiudad, CartoCiudadError
+from itertools import islice
+from pyciudad.constantes import DEFAULT_CONCURRENCIA_LOTE
+
+# El cliente (y con él requests y pydantic) se importa dentro de cada
+# subcomando, para que --help y los errores de argumentos no lo carguen
+
+# Columnas añadidas a la salida del subcomando lote
+COLUMNAS_GEOCODIFICAR = [
+    "geo_latitud", "geo_longitud", "geo_direccion", "geo_municipio",
+    "geo_provincia", "geo_codigo_postal", "geo_tipo", "geo_error",
+]
+COLUMNAS_INVERSA = [
+    "geo_direccion", "geo_numero", "geo_municipio", "geo_provincia",
+    "geo_codigo_postal", "geo_tipo", "geo_error",
+]
 
 
 def geocodificar(args):
     """Geocodificar una dirección."""
+    from pyciudad import CartoCiudad, CartoCiudadError
+    
     cliente = CartoCiudad()
     try:
         ubicacion = cliente.geocodificar(args.direccion)
@@ -26,6 +45,8 @@ def geocodificar(args):
 
 def geocodificacion_inversa(args):
     """Geocodificación inversa."""
+    from pyciudad import CartoCiudad, CartoCiudadError
+    
     cliente = CartoCiudad()
     try:
         direccion = cliente.geocodificacion_inversa(args.longitud, args.latitud)
@@ -42,6 +63,8 @@ def geocodificacion_inversa(args):
 
 def buscar_candidatos(args):
     """Buscar candidatos para una dirección."""
+    from pyciudad import CartoCiudad, CartoCiudadError
+    
     cliente = CartoCiudad()
     try:
         candidatos = cliente.buscar_candidatos(args.consulta, limite=args.limite)
@@ -58,6 +81,148 @@ def buscar_candidatos(args):
         sys.exit(1)
 
 
+def _entero_positivo(valor):
+    """Tipo de argparse para enteros mayores o iguales que 1."""
+    numero = int(valor)
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero mayor o igual que 1: {valor}")
+    return numero
+
+
+def _leer_checkpoint(ruta):
+    """Lee el fichero de checkpoint o devuelve None si no existe."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _escribir_checkpoint(ruta, filas, bytes_salida):
+    """Guarda el checkpoint de forma atómica."""
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"filas": filas, "bytes_salida": bytes_salida}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _fila_geocodificar(resultado):
+    """Columnas de salida de una fila geocodificada."""
+    if not resultado.correcto:
+        return {"geo_error": str(resultado.error)}
+    ubicacion = resultado.resultado
+    return {
+        "geo_latitud": ubicacion.latitud,
+        "geo_longitud": ubicacion.longitud,
+        "geo_direccion": ubicacion.direccion,
+        "geo_municipio": ubicacion.municipio,
+        "geo_provincia": ubicacion.provincia,
+        "geo_codigo_postal": ubicacion.postalCode or "",
+        "geo_tipo": ubicacion.type or "",
+    }
+
+
+def _fila_inversa(resultado):
+    """Columnas de salida de una fila con geocodificación inversa."""
+    if not resultado.correcto:
+        return {"geo_error": str(resultado.error)}
+    direccion = resultado.resultado
+    return {
+        "geo_direccion": direccion.via,
+        "geo_numero": direccion.numero,
+        "geo_municipio": direccion.municipio,
+        "geo_provincia": direccion.provincia,
+        "geo_codigo_postal": direccion.codigo_postal,
+        "geo_tipo": direccion.type or "",
+    }
+
+
+def lote(args):
+    """Geocodificar un CSV completo en streaming, con checkpoint para reanudar."""
+    inversa = args.lon is not None or args.lat is not None
+    if inversa == (args.columna is not None) or (inversa and (args.lon is None or args.lat is None)):
+        print("Error: indique --columna, o bien --lon y --lat", file=sys.stderr)
+        sys.exit(2)
+    
+    ruta_checkpoint = args.checkpoint or f"{args.salida}.checkpoint"
+    checkpoint = _leer_checkpoint(ruta_checkpoint)
+    if checkpoint and (
+        not os.path.exists(args.salida) or os.path.getsize(args.salida) < checkpoint["bytes_salida"]
+    ):
+        print(
+            f"Aviso: {args.salida} no contiene las filas del checkpoint; se empieza desde el principio",
+            file=sys.stderr
+        )
+        checkpoint = None
+    filas_hechas = checkpoint["filas"] if checkpoint else 0
+    
+    from pyciudad import CartoCiudad, LimitadorTasa, PoliticaReintentos
+    from pyciudad.lote import iterar_lote
+    
+    cliente = CartoCiudad(
+        max_conexiones_por_host=max(args.concurrencia, 1),
+        reintentos=PoliticaReintentos(max_reintentos=args.reintentos) if args.reintentos else None,
+        limitador=LimitadorTasa(args.tasa) if args.tasa else None
+    )
+    
+    # El cliente se cierra también si el proceso falla o se interrumpe
+    with cliente, open(args.entrada, "r", encoding="utf-8", newline="") as f_entrada:
+        lector = csv.DictReader(f_entrada, delimiter=args.separador)
+        columnas_entrada = lector.fieldnames or []
+        for columna in ([args.lon, args.lat] if inversa else [args.columna]):
+            if columna not in columnas_entrada:
+                print(f"Error: la columna '{columna}' no existe en {args.entrada}", file=sys.stderr)
+                sys.exit(2)
+        
+        if inversa:
+            columnas_resultado = COLUMNAS_INVERSA
+            def consultar(fila):
+                return cliente.geocodificacion_inversa(float(fila[args.lon]), float(fila[args.lat]))
+            convertir = _fila_inversa
+        else:
+            columnas_resultado = COLUMNAS_GEOCODIFICAR
+            def consultar(fila):
+                return cliente.geocodificar(fila[args.columna])
+            convertir = _fila_geocodificar
+        
+        # Al reanudar se descarta lo escrito después del último checkpoint
+        if checkpoint:
+            os.truncate(args.salida, checkpoint["bytes_salida"])
+            f_salida = open(args.salida, "a", encoding="utf-8", newline="")
+            print(f"Reanudando desde la fila {filas_hechas}", file=sys.stderr)
+        else:
+            f_salida = open(args.salida, "w", encoding="utf-8", newline="")
+        
+        with f_salida:
+            escritor = csv.DictWriter(
+                f_salida,
+                fieldnames=columnas_entrada + [c for c in columnas_resultado if c not in columnas_entrada],
+                delimiter=args.separador,
+                extrasaction="ignore"
+            )
+            if not checkpoint:
+                escritor.writeheader()
+            
+            errores = 0
+            filas = islice(lector, filas_hechas, None)
+            for resultado in iterar_lote(consultar, filas, args.concurrencia):
+                escritor.writerow({**resultado.entrada, **convertir(resultado)})
+                errores += not resultado.correcto
+                filas_hechas += 1
+                if filas_hechas % args.cada == 0:
+                    f_salida.flush()
+                    os.fsync(f_salida.fileno())
+                    # En modo texto tell() no es un desplazamiento en bytes:
+                    # se guarda el tamaño del fichero, que sí lo es
+                    _escribir_checkpoint(ruta_checkpoint, filas_hechas, os.fstat(f_salida.fileno()).st_size)
+                    print(f"Procesadas {filas_hechas} filas ({errores} errores)", file=sys.stderr)
+    
+    if os.path.exists(ruta_checkpoint):
+        os.remove(ruta_checkpoint)
+    print(f"Completado: {filas_hechas} filas ({errores} errores en esta ejecución)", file=sys.stderr)
+
+
 def main():
     """Punto de entrada principal."""
     parser = argparse.ArgumentParser(
@@ -82,6 +247,22 @@ def main():
     parser_cand.add_argument("--limite", "-l", type=int, default=5, help="Límite de resultados")
     parser_cand.set_defaults(func=buscar_candidatos)
     
+    # Subcomando para geocodificar un CSV por lotes
+    parser_lote = subparsers.add_parser("lote", help="Geocodificar un fichero CSV por lotes")
+    parser_lote.add_argument("entrada", help="Fichero CSV de entrada")
+    parser_lote.add_argument("salida", help="Fichero CSV de salida")
+    parser_lote.add_argument("--columna", "-c", help="Columna con la dirección a geocodificar")
+    parser_lote.add_argument("--lon", help="Columna con la longitud (geocodificación inversa)")
+    parser_lote.add_argument("--lat", help="Columna con la latitud (geocodificación inversa)")
+    parser_lote.add_argument("--concurrencia", "-n", type=int, default=DEFAULT_CONCURRENCIA_LOTE,
+                             help="Peticiones simultáneas")
+    parser_lote.add_argument("--separador", default=",", help="Separador de campos del CSV")
+    parser_lote.add_argument("--checkpoint", help="Fichero de checkpoint (por defecto, SALIDA.checkpoint)")
+    parser_lote.add_argument("--cada", type=_entero_positivo, default=1000, help="Filas entre dos checkpoints")
+    parser_lote.add_argument("--reintentos", type=int, default=3, help="Reintentos ante errores transitorios")
+    parser_lote.add_argument("--tasa", type=float, help="Máximo de peticiones por segundo")
+    parser_lote.set_defaults(func=lote)
+    
     args = parser.parse_args()
     
     if args.comando is None:
@@ -0,0 +1,435 @@
+"""
+Autocompletado sobre buscar_candidatos: espera entre pulsaciones, descarte de
+consultas obsoletas y caché de prefijos
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .constantes import (
+    DEFAULT_LIMIT,
+    DEFAULT_ESPERA_AUTOCOMPLETADO,
+    DEFAULT_MIN_CARACTERES_AUTOCOMPLETADO,
+    DEFAULT_MAX_PREFIJOS_AUTOCOMPLETADO,
+    DEFAULT_TTL_AUTOCOMPLETADO
+)
+from .modelos import Candidato
+from .utils import normalizar_texto
+
+
+def _palabras_candidato(candidato: Candidato) -> List[str]:
+    """Palabras normalizadas con las que puede coincidir una consulta."""
+    campos = (
+        candidato.address, candidato.tip_via, candidato.portalNumber,
+        candidato.muni, candidato.province, candidato.postalCode, candidato.poblacion
+    )
+    return normalizar_texto(" ".join(str(campo) for campo in campos if campo)).split()
+
+
+def coincide(consulta: str, candidato: Candidato) -> bool:
+    """
+    Indica si un candidato sigue siendo válido para una consulta más larga.
+    
+    Cada palabra de la consulta debe ser el comienzo de alguna palabra de
+    la dirección, el tipo de vía, el número, el municipio, la provincia,
+    el código postal o la población del candidato.
+    
+    Args:
+        consulta: Consulta ya normalizada
+        candidato: Candidato devuelto para un prefijo de la consulta
+    """
+    palabras = _palabras_candidato(candidato)
+    return all(
+        any(palabra.startswith(parte) for palabra in palabras)
+        for parte in consulta.split()
+    )
+
+
+class _Nodo:
+    """Nodo del trie: hijos por carácter y, opcionalmente, un resultado guardado."""
+    
+    __slots__ = ("hijos", "entrada")
+    
+    def __init__(self):
+        self.hijos: Dict[str, "_Nodo"] = {}
+        self.entrada: Optional[Tuple[List[Candidato], bool, float]] = None
+
+
+class CachePrefijos:
+    """
+    Trie de consultas recientes de autocompletado y sus candidatos.
+    
+    Cada resultado se guarda con una marca "completo": si la API devolvió
+    menos candidatos que el límite, el resultado contiene todos los que
+    coinciden con ese prefijo, y cualquier consulta que lo prolongue puede
+    resolverse filtrándolo localmente en lugar de volver a la API.
+    
+    Las entradas caducan tras ttl segundos y, superado max_entradas, se
+    descartan las usadas hace más tiempo. Es segura entre hilos.
+    """
+    
+    def __init__(
+        self,
+        max_entradas: int = DEFAULT_MAX_PREFIJOS_AUTOCOMPLETADO,
+        ttl: Optional[float] = DEFAULT_TTL_AUTOCOMPLETADO
+    ):
+        """
+        Args:
+            max_entradas: Número máximo de prefijos guardados
+            ttl: Segundos de vida de cada resultado (None para no caducar)
+        """
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._raiz = _Nodo()
+        self._uso: "OrderedDict[str, None]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self._reloj = time.monotonic
+    
+    def __len__(self) -> int:
+        return len(self._uso)
+    
+    def _vigente(self, entrada, ahora: float) -> bool:
+        """Indica si una entrada no ha caducado."""
+        return self.ttl is None or ahora - entrada[2] < self.ttl
+    
+    def guardar(self, consulta: str, candidatos: List[Candidato], completo: bool) -> None:
+        """
+        Guarda el resultado de una consulta.
+        
+        Args:
+            consulta: Consulta normalizada
+            candidatos: Candidatos devueltos
+            completo: Si el resultado no se cortó en el límite
+        """
+        with self._cerrojo:
+            nodo = self._raiz
+            for caracter in consulta:
+                nodo = nodo.hijos.setdefault(caracter, _Nodo())
+            nodo.entrada = (list(candidatos), completo, self._reloj())
+            self._uso[consulta] = None
+            self._uso.move_to_end(consulta)
+            while len(self._uso) > self.max_entradas:
+                antigua, _ = self._uso.popitem(last=False)
+                self._eliminar(antigua)
+    
+    def _eliminar(self, consulta: str) -> None:
+        """Quita el resultado de una consulta y poda los nodos que quedan vacíos."""
+        camino = [self._raiz]
+        for caracter in consulta:
+            nodo = camino[-1].hijos.get(caracter)
+            if nodo is None:
+                return
+            camino.append(nodo)
+        camino[-1].entrada = None
+        for i in range(len(consulta), 0, -1):
+            nodo = camino[i]
+            if nodo.entrada is not None or nodo.hijos:
+                break
+            del camino[i - 1].hijos[consulta[i - 1]]
+    
+    def buscar(self, consulta: str) -> Optional[List[Candidato]]:
+        """
+        Busca los candidatos de una consulta sin ir a la API.
+        
+        Si la consulta está guardada se devuelve su resultado. Si no, se usa
+        el resultado completo del prefijo guardado más largo, filtrado con
+        coincide(), y se guarda como resultado de la consulta.
+        
+        Args:
+            consulta: Consulta normalizada
+            
+        Returns:
+            Lista de candidatos, o None si hay que consultar la API
+        """
+        with self._cerrojo:
+            ahora = self._reloj()
+            nodo = self._raiz
+            prefijo = None
+            for caracter in consulta:
+                if nodo.entrada is not None and nodo.entrada[1] and self._vigente(nodo.entrada, ahora):
+                    prefijo = nodo.entrada
+                nodo = nodo.hijos.get(caracter)
+                if nodo is None:
+                    break
+            else:
+                if nodo.entrada is not None and self._vigente(nodo.entrada, ahora):
+                    self._uso.move_to_end(consulta)
+                    return list(nodo.entrada[0])
+        
+        if prefijo is None:
+            return None
+        candidatos = [c for c in prefijo[0] if coincide(consulta, c)]
+        self.guardar(consulta, candidatos, completo=True)
+        return candidatos
+    
+    def limpiar(self) -> None:
+        """Elimina todos los resultados guardados."""
+        with self._cerrojo:
+            self._raiz = _Nodo()
+            self._uso.clear()
+
+
+class _SesionBase:
+    """Configuración y estadísticas comunes a las sesiones síncrona y asíncrona."""
+    
+    def __init__(
+        self,
+        cliente: Any,
+        limite: int = DEFAULT_LIMIT,
+        espera: float = DEFAULT_ESPERA_AUTOCOMPLETADO,
+        min_caracteres: int = DEFAULT_MIN_CARACTERES_AUTOCOMPLETADO,
+        cache: Optional[CachePrefijos] = None,
+        **filtros: Any
+    ):
+        self.cliente = cliente
+        self.limite = limite
+        self.espera = espera
+        self.min_caracteres = min_caracteres
+        self.cache = cache if cache is not None else CachePrefijos()
+        self.filtros = filtros
+        self._generacion = 0
+        # Consultas enviadas a la API, resueltas con la caché, descartadas
+        # antes de enviarse y respuestas que llegaron ya obsoletas
+        self.estadisticas = {"peticiones": 0, "locales": 0, "canceladas": 0, "obsoletas": 0}
+    
+    def _local(self, texto: str) -> Tuple[str, Optional[List[Candidato]]]:
+        """Normaliza el texto y devuelve los candidatos si no hace falta ir a la API."""
+        consulta = normalizar_texto(texto)
+        if len(consulta) < self.min_caracteres:
+            return consulta, []
+        candidatos = self.cache.buscar(consulta)
+        if candidatos is not None:
+            self.estadisticas["locales"] += 1
+        return consulta, candidatos
+    
+    def _guardar(self, consulta: str, candidatos: List[Candidato]) -> None:
+        """Guarda la respuesta de la API en la caché de prefijos."""
+        self.cache.guardar(consulta, candidatos, completo=len(candidatos) < self.limite)
+
+
+class SesionAutocompletado(_SesionBase):
+    """
+    Sesión de autocompletado para un campo de dirección con el cliente síncrono.
+    
+    escribir() se llama en cada pulsación. Si la caché de prefijos puede
+    responder, el resultado se entrega al momento; si no, la consulta se
+    envía cuando pasan `espera` segundos sin una pulsación nueva. Las
+    respuestas que llegan después de una pulsación posterior se guardan en
+    la caché, pero no se entregan. Los resultados se reciben en la función
+    al_resultado(texto, candidatos), que se llama desde el hilo que teclea
+    o desde un hilo del temporizador.
+    
+    Ejemplo:
+        sesion = SesionAutocompletado(cliente, mostrar_sugerencias, limite=10)
+        campo.al_cambiar(sesion.escribir)
+    """
+    
+    def __init__(
+        self,
+        cliente: Any,
+        al_resultado: Callable[[str, List[Candidato]], None],
+        limite: int = DEFAULT_LIMIT,
+        espera: float = DEFAULT_ESPERA_AUTOCOMPLETADO,
+        min_caracteres: int = DEFAULT_MIN_CARACTERES_AUTOCOMPLETADO,
+        cache: Optional[CachePrefijos] = None,
+        al_error: Optional[Callable[[str, Exception], None]] = None,
+        **filtros: Any
+    ):
+        """
+        Args:
+            cliente: Cliente CartoCiudad
+            al_resultado: Función que recibe el texto y sus candidatos
+            limite: Número máximo de candidatos por consulta
+            espera: Segundos sin teclear antes de consultar la API
+            min_caracteres: Longitud mínima de la consulta normalizada; con
+                menos caracteres el resultado es una lista vacía
+            cache: Caché de prefijos, que puede compartirse entre sesiones
+                con los mismos filtros (por defecto, una nueva)
+            al_error: Función que recibe el texto y el error de la API. Por
+                defecto los errores se ignoran, como en un campo de formulario
+            **filtros: Filtros de buscar_candidatos (municipio, provincia...)
+        """
+        super().__init__(cliente, limite, espera, min_caracteres, cache, **filtros)
+        self.al_resultado = al_resultado
+        self.al_error = al_error
+        self._cerrojo = threading.Lock()
+        self._temporizador: Optional[threading.Timer] = None
+    
+    def consultar(self, texto: str) -> List[Candidato]:
+        """
+        Devuelve los candidatos de un texto al momento, sin esperar ni descartar.
+        
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        consulta, candidatos = self._local(texto)
+        if candidatos is not None:
+            return candidatos
+        self.estadisticas["peticiones"] += 1
+        candidatos = self.cliente.buscar_candidatos(texto, limite=self.limite, **self.filtros)
+        self._guardar(consulta, candidatos)
+        return candidatos
+    
+    def escribir(self, texto: str) -> None:
+        """Registra el texto actual del campo tras una pulsación."""
+        with self._cerrojo:
+            self._generacion += 1
+            generacion = self._generacion
+            if self._temporizador is not None:
+                # La consulta pendiente aún no se había enviado
+                self._temporizador.cancel()
+                self._temporizador = None
+                self.estadisticas["canceladas"] += 1
+        
+        consulta, candidatos = self._local(texto)
+        if candidatos is not None:
+            self.al_resultado(texto, candidatos)
+            return
+        
+        temporizador = threading.Timer(self.espera, self._enviar, (texto, consulta, generacion))
+        temporizador.daemon = True
+        with self._cerrojo:
+            if generacion != self._generacion:
+                return
+            self._temporizador = temporizador
+        temporizador.start()
+    
+    def _enviar(self, texto: str, consulta: str, generacion: int) -> None:
+        """Consulta la API al vencer la espera y entrega el resultado si sigue vigente."""
+        with self._cerrojo:
+            if generacion != self._generacion:
+                return
+            self._temporizador = None
+            self.estadisticas["peticiones"] += 1
+        try:
+            candidatos = self.cliente.buscar_candidatos(texto, limite=self.limite, **self.filtros)
+        except Exception as e:
+            if self.al_error is not None and generacion == self._generacion:
+                self.al_error(texto, e)
+            return
+        self._guardar(consulta, candidatos)
+        with self._cerrojo:
+            obsoleta = generacion != self._generacion
+            if obsoleta:
+                self.estadisticas["obsoletas"] += 1
+        if not obsoleta:
+            self.al_resultado(texto, candidatos)
+    
+    def cerrar(self) -> None:
+        """Cancela la consulta pendiente, si la hay."""
+        with self._cerrojo:
+            self._generacion += 1
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+
+
+class SesionAutocompletadoAsync(_SesionBase):
+    """
+    Sesión de autocompletado con el cliente asíncrono.
+    
+    Cada llamada a escribir() cancela la anterior si sigue en curso, tanto
+    si está en la espera entre pulsaciones como si la petición ya se envió
+    (la petición HTTP se cancela). La llamada cancelada devuelve None; la
+    vigente devuelve sus candidatos.
+    
+    Ejemplo:
+        sesion = SesionAutocompletadoAsync(cliente, limite=10)
+        
+        async def al_cambiar(texto):
+            candidatos = await sesion.escribir(texto)
+            if candidatos is not None:
+                mostrar(candidatos)
+    """
+    
+    def __init__(
+        self,
+        cliente: Any,
+        limite: int = DEFAULT_LIMIT,
+        espera: float = DEFAULT_ESPERA_AUTOCOMPLETADO,
+        min_caracteres: int = DEFAULT_MIN_CARACTERES_AUTOCOMPLETADO,
+        cache: Optional[CachePrefijos] = None,
+        **filtros: Any
+    ):
+        """
+        Args:
+            cliente: Cliente CartoCiudadAsync
+            limite: Número máximo de candidatos por consulta
+            espera: Segundos sin teclear antes de consultar la API
+            min_caracteres: Longitud mínima de la consulta normalizada
+            cache: Caché de prefijos (por defecto, una nueva)
+            **filtros: Filtros de buscar_candidatos (municipio, provincia...)
+        """
+        super().__init__(cliente, limite, espera, min_caracteres, cache, **filtros)
+        self._tarea = None
+    
+    async def consultar(self, texto: str) -> List[Candidato]:
+        """
+        Devuelve los candidatos de un texto, sin esperar ni cancelar otras consultas.
+        
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        consulta, candidatos = self._local(texto)
+        if candidatos is not None:
+            return candidatos
+        self.estadisticas["peticiones"] += 1
+        candidatos = await self.cliente.buscar_candidatos(texto, limite=self.limite, **self.filtros)
+        self._guardar(consulta, candidatos)
+        return candidatos
+    
+    async def escribir(self, texto: str) -> Optional[List[Candidato]]:
+        """
+        Registra el texto actual del campo y espera sus candidatos.
+        
+        Returns:
+            Candidatos del texto, o None si una pulsación posterior la dejó obsoleta
+            
+        Raises:
+            APIError: Si hay un error en la petición vigente
+        """
+        import asyncio
+        
+        self._generacion += 1
+        generacion = self._generacion
+        if self._tarea is not None and not self._tarea.done():
+            self._tarea.cancel()
+        
+        consulta, candidatos = self._local(texto)
+        if candidatos is not None:
+            return candidatos
+        
+        tarea = asyncio.ensure_future(self._resolver(texto, consulta))
+        self._tarea = tarea
+        try:
+            return await tarea
+        except asyncio.CancelledError:
+            if generacion != self._generacion and tarea.cancelled():
+                return None
+            raise
+    
+    async def _resolver(self, texto: str, consulta: str) -> List[Candidato]:
+        """Espera entre pulsaciones y consulta la API."""
+        import asyncio
+        
+        try:
+            await asyncio.sleep(self.espera)
+        except asyncio.CancelledError:
+            self.estadisticas["canceladas"] += 1
+            raise
+        self.estadisticas["peticiones"] += 1
+        try:
+            candidatos = await self.cliente.buscar_candidatos(texto, limite=self.limite, **self.filtros)
+        except asyncio.CancelledError:
+            self.estadisticas["obsoletas"] += 1
+            raise
+        self._guardar(consulta, candidatos)
+        return candidatos
+    
+    async def cerrar(self) -> None:
+        """Cancela la consulta en curso, si la hay."""
+        self._generacion += 1
+        if self._tarea is not None and not self._tarea.done():
+            self._tarea.cancel() 
\ No newline at end of file
@@ -0,0 +1,527 @@
+"""
+Cachés de respuestas de la API de CartoCiudad
+"""
+
+import copy
+import json
+import threading
+import time
+import urllib.parse
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from .constantes import (
+    DEFAULT_MAX_ENTRADAS_CACHE,
+    DEFAULT_TTL_CACHE,
+    DEFAULT_CELDA_CACHE_INVERSA
+)
+from .espacial import RejillaEspacial
+from .utils import validar_coordenadas
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def clave_cache(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Construye la clave canónica de una petición.
+    
+    Los parámetros se ordenan y se convierten a texto, de modo que dos
+    peticiones equivalentes producen siempre la misma clave.
+    
+    Args:
+        url: URL del endpoint
+        params: Parámetros de la petición
+        
+    Returns:
+        Clave de caché en forma de URL con los parámetros ordenados
+    """
+    if not params:
+        return url
+    pares = sorted((str(k), str(v)) for k, v in params.items() if v is not None)
+    return f"{url}?{urllib.parse.urlencode(pares)}"
+
+
+def nombre_endpoint(url: str) -> str:
+    """Devuelve el nombre del endpoint (candidates, find, reverseGeocode) de una URL."""
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def es_respuesta_cacheable(datos: Any) -> bool:
+    """Indica si una respuesta de la API puede guardarse en caché."""
+    if datos is None:
+        return False
+    if isinstance(datos, dict) and datos.get("error"):
+        return False
+    return True
+
+
+class CacheBase(ABC):
+    """
+    Interfaz común de las cachés de respuestas.
+    
+    Las cachés guardan la respuesta JSON ya decodificada de cada petición,
+    indexada por endpoint y parámetros. El cliente construye modelos nuevos
+    a partir de ella en cada llamada.
+    """
+    
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_CACHE,
+        ttl_por_endpoint: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            ttl: Tiempo de vida por defecto de las entradas, en segundos
+            ttl_por_endpoint: Tiempo de vida específico por endpoint, por ejemplo
+                {"reverseGeocode": 600, "candidates": 86400}
+        """
+        self.ttl = ttl
+        self.ttl_por_endpoint = dict(ttl_por_endpoint or {})
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def ttl_para(self, url: str) -> float:
+        """Devuelve el tiempo de vida aplicable a un endpoint."""
+        return self.ttl_por_endpoint.get(nombre_endpoint(url), self.ttl)
+    
+    @abstractmethod
+    def obtener(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Busca la respuesta de una petición en la caché.
+        
+        Returns:
+            Respuesta guardada o None si no está o ha expirado
+        """
+    
+    @abstractmethod
+    def guardar(self, url: str, params: Optional[Dict[str, Any]], datos: Any) -> None:
+        """Guarda la respuesta de una petición."""
+    
+    def obtener_varios(
+        self, 
+        url: str, 
+        lista_params: Sequence[Optional[Dict[str, Any]]]
+    ) -> List[Optional[Any]]:
+        """
+        Busca en la caché las respuestas de varias peticiones al mismo endpoint.
+        
+        Args:
+            url: URL del endpoint
+            lista_params: Parámetros de cada petición
+            
+        Returns:
+            Lista alineada con lista_params con la respuesta guardada o None
+        """
+        return [self.obtener(url, params) for params in lista_params]
+    
+    @abstractmethod
+    def limpiar(self) -> None:
+        """Elimina todas las entradas de la caché."""
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas de uso de la caché.
+        
+        Returns:
+            Diccionario con aciertos, fallos y tasa de aciertos
+        """
+        total = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+        }
+
+
+class CacheMemoria(CacheBase):
+    """
+    Caché en memoria con expulsión LRU y caducidad por tiempo.
+    
+    Es segura para usarse desde varios hilos. Las respuestas se copian al
+    guardarlas y al devolverlas, de modo que los resultados de una llamada
+    no comparten objetos con los de otra.
+    """
+    
+    def __init__(
+        self,
+        max_entradas: int = DEFAULT_MAX_ENTRADAS_CACHE,
+        ttl: float = DEFAULT_TTL_CACHE,
+        ttl_por_endpoint: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            max_entradas: Número máximo de respuestas guardadas
+            ttl: Tiempo de vida por defecto de las entradas, en segundos
+            ttl_por_endpoint: Tiempo de vida específico por endpoint
+        """
+        super().__init__(ttl=ttl, ttl_por_endpoint=ttl_por_endpoint)
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+        self.max_entradas = max_entradas
+        self.expulsiones = 0
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self._reloj = time.monotonic
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def obtener(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        clave = clave_cache(url, params)
+        with self._cerrojo:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            caducidad, datos = entrada
+            if caducidad <= self._reloj():
+                del self._entradas[clave]
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+        return copy.deepcopy(datos)
+    
+    def guardar(self, url: str, params: Optional[Dict[str, Any]], datos: Any) -> None:
+        ttl = self.ttl_para(url)
+        if ttl <= 0:
+            return
+        clave = clave_cache(url, params)
+        entrada = (self._reloj() + ttl, copy.deepcopy(datos))
+        with self._cerrojo:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+    
+    def limpiar(self) -> None:
+        with self._cerrojo:
+            self._entradas.clear()
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        estadisticas = super().estadisticas()
+        estadisticas["entradas"] = len(self._entradas)
+        estadisticas["expulsiones"] = self.expulsiones
+        return estadisticas
+
+
+class CacheSQLite(CacheBase):
+    """
+    Caché persistente en disco basada en SQLite.
+    
+    Guarda el JSON original de cada respuesta, de modo que sobrevive entre
+    ejecuciones y puede compartirse entre varios procesos que apunten al
+    mismo fichero. La base de datos se abre en modo WAL para que los
+    lectores no se bloqueen mientras otro proceso escribe.
+    
+    Cada hilo usa su propia conexión. Al superar max_entradas se eliminan
+    primero las entradas caducadas y después las más antiguas, y se
+    devuelve el espacio libre al sistema de ficheros.
+    """
+    
+    # Número de escrituras entre dos podas de la base de datos
+    INTERVALO_PODA = 1000
+    # Máximo de parámetros por consulta IN (...) en SQLite
+    TAMANO_BLOQUE = 500
+    
+    def __init__(
+        self, 
+        ruta: str,
+        max_entradas: int = DEFAULT_MAX_ENTRADAS_CACHE,
+        ttl: float = DEFAULT_TTL_CACHE,
+        ttl_por_endpoint: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            ruta: Ruta del fichero SQLite
+            max_entradas: Número máximo de respuestas guardadas
+            ttl: Tiempo de vida por defecto de las entradas, en segundos
+            ttl_por_endpoint: Tiempo de vida específico por endpoint
+        """
+        super().__init__(ttl=ttl, ttl_por_endpoint=ttl_por_endpoint)
+        self.ruta = ruta
+        self.max_entradas = max_entradas
+        self._local = threading.local()
+        self._conexiones: List["sqlite3.Connection"] = []
+        self._cerrojo = threading.Lock()
+        self._escrituras = 0
+        self._reloj = time.time
+        self._inicializar()
+    
+    def _conexion(self) -> "sqlite3.Connection":
+        """Devuelve la conexión del hilo actual, creándola si es necesario."""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            import sqlite3
+            
+            conexion = sqlite3.connect(self.ruta, timeout=30, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+            with self._cerrojo:
+                self._conexiones.append(conexion)
+        return conexion
+    
+    def _inicializar(self) -> None:
+        """Crea el esquema de la base de datos si no existe."""
+        conexion = self._conexion()
+        with conexion:
+            conexion.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                " clave TEXT PRIMARY KEY,"
+                " endpoint TEXT NOT NULL,"
+                " datos TEXT NOT NULL,"
+                " creado REAL NOT NULL,"
+                " caduca REAL NOT NULL)"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_caduca ON respuestas (caduca)")
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_creado ON respuestas (creado)")
+    
+    def _contar(self, aciertos: int, fallos: int) -> None:
+        with self._cerrojo:
+            self.aciertos += aciertos
+            self.fallos += fallos
+    
+    def obtener(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        return self.obtener_varios(url, [params])[0]
+    
+    def obtener_varios(
+        self, 
+        url: str, 
+        lista_params: Sequence[Optional[Dict[str, Any]]]
+    ) -> List[Optional[Any]]:
+        claves = [clave_cache(url, params) for params in lista_params]
+        ahora = self._reloj()
+        encontrados: Dict[str, str] = {}
+        conexion = self._conexion()
+        unicas = list(dict.fromkeys(claves))
+        for inicio in range(0, len(unicas), self.TAMANO_BLOQUE):
+            bloque = unicas[inicio:inicio + self.TAMANO_BLOQUE]
+            marcadores = ",".join("?" * len(bloque))
+            filas = conexion.execute(
+                f"SELECT clave, datos FROM respuestas WHERE caduca > ? AND clave IN ({marcadores})",
+                [ahora, *bloque]
+            ).fetchall()
+            encontrados.update(filas)
+        
+        resultados = [
+            json.loads(encontrados[clave]) if clave in encontrados else None
+            for clave in claves
+        ]
+        aciertos = sum(1 for clave in claves if clave in encontrados)
+        self._contar(aciertos, len(claves) - aciertos)
+        return resultados
+    
+    def guardar(self, url: str, params: Optional[Dict[str, Any]], datos: Any) -> None:
+        ttl = self.ttl_para(url)
+        if ttl <= 0:
+            return
+        ahora = self._reloj()
+        conexion = self._conexion()
+        with conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, endpoint, datos, creado, caduca)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    clave_cache(url, params),
+                    nombre_endpoint(url),
+                    json.dumps(datos, ensure_ascii=False, separators=(",", ":")),
+                    ahora,
+                    ahora + ttl,
+                )
+            )
+        with self._cerrojo:
+            self._escrituras += 1
+            podar = self._escrituras % self.INTERVALO_PODA == 0
+        if podar:
+            self.podar()
+    
+    def podar(self) -> int:
+        """
+        Elimina las entradas caducadas y las más antiguas por encima de max_entradas.
+        
+        Returns:
+            Número de entradas eliminadas
+        """
+        conexion = self._conexion()
+        with conexion:
+            eliminadas = conexion.execute(
+                "DELETE FROM respuestas WHERE caduca <= ?", (self._reloj(),)
+            ).rowcount
+            sobrantes = len(self) - self.max_entradas
+            if sobrantes > 0:
+                eliminadas += conexion.execute(
+                    "DELETE FROM respuestas WHERE clave IN "
+                    "(SELECT clave FROM respuestas ORDER BY creado LIMIT ?)",
+                    (sobrantes,)
+                ).rowcount
+        if eliminadas:
+            conexion.execute("PRAGMA incremental_vacuum")
+        return eliminadas
+    
+    def __len__(self) -> int:
+        return self._conexion().execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+    
+    def limpiar(self) -> None:
+        conexion = self._conexion()
+        with conexion:
+            conexion.execute("DELETE FROM respuestas")
+        conexion.execute("PRAGMA incremental_vacuum")
+    
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones abiertas con la base de datos."""
+        with self._cerrojo:
+            conexiones, self._conexiones = self._conexiones, []
+        for conexion in conexiones:
+            conexion.close()
+        self._local = threading.local()
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        estadisticas = super().estadisticas()
+        estadisticas["entradas"] = len(self)
+        return estadisticas
+
+
+class CacheInversaEspacial:
+    """
+    Caché de geocodificación inversa indexada por posición.
+    
+    Las coordenadas se ajustan a una rejilla de celdas de celda_metros de
+    lado. Una consulta se responde con la respuesta guardada más cercana
+    dentro de radio_metros, buscando en su celda y en las vecinas, de modo
+    que lecturas GPS casi idénticas reutilizan la misma respuesta.
+    
+    Es segura para usarse desde varios hilos. Las entradas caducan tras ttl
+    segundos y, al superar max_entradas, se expulsan las menos usadas.
+    """
+    
+    def __init__(
+        self, 
+        celda_metros: float = DEFAULT_CELDA_CACHE_INVERSA,
+        radio_metros: Optional[float] = None,
+        max_entradas: int = DEFAULT_MAX_ENTRADAS_CACHE,
+        ttl: float = DEFAULT_TTL_CACHE
+    ):
+        """
+        Args:
+            celda_metros: Lado de las celdas de la rejilla, en metros (p. ej. 5 o 10)
+            radio_metros: Distancia máxima a una respuesta guardada para reutilizarla.
+                Por defecto es igual a celda_metros
+            max_entradas: Número máximo de respuestas guardadas
+            ttl: Tiempo de vida de las entradas, en segundos
+        """
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+        self.celda_metros = celda_metros
+        self.radio_metros = celda_metros if radio_metros is None else radio_metros
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        self._rejillas: Dict[Optional[str], RejillaEspacial] = {}
+        self._entradas: "OrderedDict[int, tuple]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self._reloj = time.monotonic
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def _eliminar(self, entrada: tuple) -> None:
+        """Elimina una entrada del índice LRU y de su rejilla."""
+        tipo, longitud, latitud, _, _ = entrada
+        del self._entradas[id(entrada)]
+        self._rejillas[tipo].eliminar(longitud, latitud, entrada)
+    
+    def obtener(
+        self, 
+        longitud: float, 
+        latitud: float, 
+        tipo: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        Busca la respuesta guardada más cercana a unas coordenadas.
+        
+        Args:
+            longitud: Coordenada de longitud en grados decimales
+            latitud: Coordenada de latitud en grados decimales
+            tipo: Tipo de entidad de la consulta (opcional)
+            
+        Returns:
+            Copia de la respuesta JSON guardada o None si no hay ninguna en el radio
+            
+        Raises:
+            PeticionInvalidaError: Si las coordenadas son inválidas
+        """
+        validar_coordenadas(longitud, latitud)
+        ahora = self._reloj()
+        with self._cerrojo:
+            rejilla = self._rejillas.get(tipo)
+            mejor = None
+            if rejilla is not None:
+                caducadas = []
+                for distancia, _, _, entrada in rejilla.vecinos(longitud, latitud, self.radio_metros):
+                    if entrada[4] <= ahora:
+                        caducadas.append(entrada)
+                    elif mejor is None or distancia < mejor[0]:
+                        mejor = (distancia, entrada)
+                for entrada in caducadas:
+                    self._eliminar(entrada)
+            if mejor is None:
+                self.fallos += 1
+                return None
+            entrada = mejor[1]
+            self._entradas.move_to_end(id(entrada))
+            self.aciertos += 1
+        return copy.deepcopy(entrada[3])
+    
+    def guardar(
+        self, 
+        longitud: float, 
+        latitud: float, 
+        tipo: Optional[str], 
+        datos: Any
+    ) -> None:
+        """
+        Guarda la respuesta de la API para unas coordenadas.
+        
+        Raises:
+            PeticionInvalidaError: Si las coordenadas son inválidas
+        """
+        validar_coordenadas(longitud, latitud)
+        if self.ttl <= 0 or not es_respuesta_cacheable(datos):
+            return
+        entrada = (tipo, longitud, latitud, copy.deepcopy(datos), self._reloj() + self.ttl)
+        with self._cerrojo:
+            rejilla = self._rejillas.get(tipo)
+            if rejilla is None:
+                rejilla = self._rejillas[tipo] = RejillaEspacial(self.celda_metros)
+            rejilla.insertar(longitud, latitud, entrada)
+            self._entradas[id(entrada)] = entrada
+            while len(self._entradas) > self.max_entradas:
+                _, antigua = next(iter(self._entradas.items()))
+                self._eliminar(antigua)
+    
+    def limpiar(self) -> None:
+        """Elimina todas las entradas de la caché."""
+        with self._cerrojo:
+            self._rejillas.clear()
+            self._entradas.clear()
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas de uso de la caché.
+        
+        Returns:
+            Diccionario con aciertos, fallos, tasa de aciertos y entradas
+        """
+        total = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+            "entradas": len(self._entradas),
+        } 
\ No newline at end of file
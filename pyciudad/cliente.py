@@ -2,121 +2,469 @@
 Cliente principal para interactuar con la API de CartoCiudad
 """
 
-import json
+import functools
 import logging
-from typing import Dict, List, Optional, Any, Union, Tuple
-import requests
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Union, Tuple, Iterable
 
 from .constantes import (
-    CANDIDATES_URL, 
-    FIND_URL, 
-    REVERSE_GEOCODE_URL, 
+    BASE_URL, 
     DEFAULT_COUNTRY_CODE, 
     DEFAULT_LIMIT,
     DEFAULT_HEADERS,
-    FILTROS_TIPO_ENTIDAD
+    DEFAULT_POOL_CONEXIONES,
+    DEFAULT_MAX_CONEXIONES_HOST,
+    DEFAULT_CONCURRENCIA_LOTE,
+    DEFAULT_PRECISION_PUNTOS,
+    ORIGEN_CACHE,
+    ORIGEN_NOMENCLATOR,
+    ORIGEN_INDICE,
+    FILTROS_TIPO_ENTIDAD,
+    TIPOS_ADMINISTRATIVOS
 )
-from .excepciones import CartoCiudadError, APIError, PeticionInvalidaError
+from .cache import CacheBase, CacheInversaEspacial, clave_cache, es_respuesta_cacheable, nombre_endpoint
+from .decodificacion import Decodificador, obtener_decodificador
+from .excepciones import (
+    CartoCiudadError,
+    APIError,
+    PeticionInvalidaError,
+    ErrorTransporte,
+    ErrorConexion,
+    ErrorTimeout
+)
+from .limitador import LimitadorTasa
+from .metricas import Metricas, FASE_DECODIFICACION, FASE_VALIDACION
+from .lote import ResultadoLote, ejecutar_lote, iterar_lote
+from .reintentos import PoliticaReintentos, parsear_retry_after
 from .modelos import Candidato, Ubicacion, Direccion, TipoEntidad
+from .transporte import TransporteBase, TransporteHTTP, RespuestaTransporte
 from .utils import validar_coordenadas, construir_parametros_filtro, url_encode
 
+if TYPE_CHECKING:
+    from .columnar import ResultadosColumnares
+    from .indice import IndiceDirecciones
+    from .nomenclator import Nomenclator
+
 # Configurar logging
 logger = logging.getLogger("pycartociudad")
 
+# Filtros geográficos de candidates y campo de la entidad con el que se comparan
+_FILTROS_NOMENCLATOR = {
+    "municipio_filter": "muni",
+    "provincia_filter": "province",
+    "comunidad_autonoma_filter": "comunidadAutonoma",
+    "poblacion_filter": "poblacion",
+}
+
+
+def _sin_geometria(datos: Any) -> Any:
+    """Devuelve una copia superficial de la respuesta sin el campo geom."""
+    if isinstance(datos, dict) and "geom" in datos:
+        return {clave: valor for clave, valor in datos.items() if clave != "geom"}
+    return datos
 
-class CartoCiudad:
+
+def _medir_validacion(endpoint: str) -> Callable:
     """
-    Cliente principal para interactuar con la API de CartoCiudad.
+    Decora un método _procesar_* para medir la construcción de los modelos.
     
-    Esta clase ofrece métodos para utilizar los diferentes servicios
-    de CartoCiudad de forma sencilla y orientada a objetos.
+    Si el cliente no tiene métricas se llama al método directamente.
+    """
+    def decorador(procesar: Callable) -> Callable:
+        @functools.wraps(procesar)
+        def envoltura(self, respuesta):
+            if self.metricas is None:
+                return procesar(self, respuesta)
+            inicio = time.perf_counter()
+            try:
+                return procesar(self, respuesta)
+            finally:
+                self.metricas.observar(FASE_VALIDACION, endpoint, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+class ClienteBase:
+    """
+    Lógica común a los clientes síncrono y asíncrono de CartoCiudad.
+    
+    Agrupa la construcción de parámetros y el procesado de las respuestas
+    de la API, de modo que ambos clientes comparten validaciones, modelos
+    y excepciones. Las peticiones se envían a través de un transporte
+    (ver pyciudad.transporte); las subclases sólo deciden cómo esperarlo.
     """
     
-    def __init__(self, timeout: int = 10, verificar_ssl: bool = True, debug: bool = False):
+    # Excepciones de transporte que se reintentan si la política no indica otras
+    _EXCEPCIONES_TRANSITORIAS: Tuple[type, ...] = (ErrorConexion, ErrorTimeout)
+    
+    def __init__(
+        self,
+        timeout: int = 10,
+        verificar_ssl: bool = True,
+        debug: bool = False,
+        cache: Optional[CacheBase] = None,
+        cache_inversa: Optional[CacheInversaEspacial] = None,
+        limitador: Optional[LimitadorTasa] = None,
+        reintentos: Optional[PoliticaReintentos] = None,
+        coalescer: bool = False,
+        decodificador: Optional[Union[str, Decodificador]] = None,
+        incluir_geometria: bool = True,
+        url_base: str = BASE_URL,
+        metricas: Optional[Metricas] = None,
+        nomenclator: Optional["Nomenclator"] = None,
+        normalizador: Optional[Callable[[str], str]] = None,
+        indice_direcciones: Optional["IndiceDirecciones"] = None
+    ):
         """
-        Inicializa el cliente de CartoCiudad.
+        Inicializa la configuración común del cliente.
         
         Args:
             timeout: Tiempo máximo en segundos para esperar respuesta de la API
             verificar_ssl: Si se debe verificar el certificado SSL en las peticiones
             debug: Activa el modo de depuración con mensajes detallados
+            cache: Caché de respuestas a consultar antes de ir a la API (opcional)
+            cache_inversa: Caché espacial para la geocodificación inversa (opcional)
+            limitador: Limitador de tasa aplicado a cada petición HTTP (opcional)
+            reintentos: Política de reintentos de peticiones fallidas (opcional)
+            coalescer: Si las peticiones idénticas simultáneas deben compartir una
+                única petición HTTP
+            decodificador: Decodificador JSON de las respuestas: nombre ("json",
+                "orjson") o función bytes -> objeto. Por defecto, el más rápido instalado
+            incluir_geometria: Si los modelos conservan el campo geom de la respuesta
+            url_base: URL base de la API (los endpoints se añaden a continuación)
+            metricas: Registro de métricas de las peticiones (opcional)
+            nomenclator: Nomenclátor local con el que se resuelven las entidades
+                administrativas sin ir a la API (opcional)
+            normalizador: Función que reescribe el texto de las consultas
+                en la clave de la caché, por ejemplo un NormalizadorConsultas
+                (opcional)
+            indice_direcciones: Índice de direcciones conocidas con el que se
+                responde la geocodificación inversa sin ir a la API (opcional)
         """
         self.timeout = timeout
         self.verificar_ssl = verificar_ssl
         self.headers = DEFAULT_HEADERS.copy()
+        self.cache = cache
+        self.cache_inversa = cache_inversa
+        self.limitador = limitador
+        self.reintentos = reintentos
+        self.coalescer = coalescer
+        self.decodificar = obtener_decodificador(decodificador)
+        self.incluir_geometria = incluir_geometria
+        self.url_base = url_base.rstrip("/")
+        self.url_candidatos = f"{self.url_base}/candidates"
+        self.url_find = f"{self.url_base}/find"
+        self.url_inversa = f"{self.url_base}/reverseGeocode"
+        self.metricas = metricas
+        self.nomenclator = nomenclator
+        self.normalizador = normalizador
+        self.indice_direcciones = indice_direcciones
         
-        # Configurar logging
+        # Configurar logging sólo en modo depuración: sin él, la configuración
+        # de logging es cosa de la aplicación
         self.debug = debug
         if debug:
             logging.basicConfig(level=logging.DEBUG)
             logger.setLevel(logging.DEBUG)
+    
+    def _parametros_cache(self, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Parámetros con los que se identifica una petición en la caché y al
+        agrupar peticiones en curso.
+        
+        Con normalizador, la consulta q se sustituye por su forma canónica;
+        la API sigue recibiendo el texto original.
+        """
+        if self.normalizador is None or not params or "q" not in params:
+            return params
+        return {**params, "q": self.normalizador(params["q"])}
+    
+    def _consultar_cache(self, url: str, params: Optional[Dict[str, Any]]) -> Optional[Any]:
+        """Devuelve la respuesta guardada en la caché o None si no hay caché o no está."""
+        if self.cache is None:
+            return None
+        datos = self.cache.obtener(url, self._parametros_cache(params))
+        if self.metricas is not None:
+            self.metricas.registrar_cache("respuestas", nombre_endpoint(url), datos is not None)
+        if datos is not None and self.debug:
+            logger.debug(f"Respuesta obtenida de la caché para {url}")
+        return datos
+    
+    def _guardar_cache(self, url: str, params: Optional[Dict[str, Any]], datos: Any) -> None:
+        """Guarda una respuesta correcta de la API en la caché, si la hay."""
+        if self.cache is not None and es_respuesta_cacheable(datos):
+            self.cache.guardar(url, self._parametros_cache(params), datos)
+    
+    def en_cache(self, consultas: Iterable[Union[str, Dict[str, Any]]], **kwargs) -> List[bool]:
+        """
+        Indica qué consultas de un lote de geocodificación ya están en la caché.
+        
+        Las claves se construyen igual que en geocodificar(), incluida la forma
+        canónica del normalizador, y se buscan todas de una vez con
+        CacheBase.obtener_varios (una única consulta en CacheSQLite). Sirve
+        para enviar a geocodificar_lote solo las consultas pendientes.
+        
+        Args:
+            consultas: Textos a geocodificar, o diccionarios con los argumentos
+                de geocodificar() para cada elemento
+            **kwargs: Argumentos comunes de geocodificar() para todo el lote
+            
+        Returns:
+            Lista alineada con las consultas: True si la respuesta está en la
+            caché; False si no lo está, si no hay caché o si la consulta no es
+            válida (geocodificar_lote informará del error)
+        """
+        lista_params: List[Optional[Dict[str, Any]]] = []
+        for consulta in consultas:
+            argumentos = {**kwargs, **consulta} if isinstance(consulta, dict) else {**kwargs, "consulta": consulta}
+            try:
+                lista_params.append(self._parametros_cache(self._parametros_geocodificar(**argumentos)))
+            except PeticionInvalidaError:
+                lista_params.append(None)
+        
+        if self.cache is None:
+            return [False] * len(lista_params)
+        validos = [params for params in lista_params if params is not None]
+        guardadas = iter(self.cache.obtener_varios(self.url_find, validos))
+        return [params is not None and next(guardadas) is not None for params in lista_params]
+    
+    def _espera_reintento(self, error: APIError, intento: int) -> Optional[float]:
+        """
+        Decide si una petición fallida debe reintentarse.
+        
+        Args:
+            error: Error producido en el último intento
+            intento: Número de reintentos ya realizados
+            
+        Returns:
+            Segundos a esperar antes de reintentar, o None si no hay que reintentar
+        """
+        politica = self.reintentos
+        if politica is None or intento >= politica.max_reintentos:
+            return None
+        
+        if error.codigo is not None:
+            reintentable = politica.es_codigo_reintentable(error.codigo)
         else:
-            logging.basicConfig(level=logging.INFO)
-            logger.setLevel(logging.INFO)
+            # Se recorre toda la cadena de causas para que las políticas que
+            # indican excepciones de requests o httpx sigan funcionando detrás
+            # de las excepciones de transporte
+            reintentable = False
+            causa = error.__cause__
+            while causa is not None and not reintentable:
+                reintentable = politica.es_excepcion_reintentable(
+                    causa, self._EXCEPCIONES_TRANSITORIAS
+                )
+                causa = causa.__cause__
+        if not reintentable:
+            return None
+        
+        if politica.presupuesto is not None and not politica.presupuesto.retirar():
+            logger.warning("Presupuesto de reintentos agotado: no se reintenta la petición")
+            return None
+        
+        espera = politica.calcular_espera(intento, error.retry_after)
+        logger.warning(f"Reintentando la petición en {espera:.2f}s (reintento {intento + 1}): {error}")
+        return espera
     
-    def _realizar_peticion(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _decodificar_respuesta(self, url: str, respuesta: RespuestaTransporte) -> Any:
         """
-        Realiza una petición HTTP a la API de CartoCiudad.
+        Comprueba el código HTTP de una respuesta del transporte y decodifica su JSON.
         
         Args:
-            url: URL del endpoint a consultar
-            params: Parámetros de la petición
+            url: URL del endpoint consultado
+            respuesta: Respuesta en bruto del transporte
             
         Returns:
-            Diccionario con la respuesta JSON
+            Respuesta JSON decodificada
             
         Raises:
-            APIError: Si hay un error en la petición
+            APIError: Si el código no es 2xx o el cuerpo no es JSON válido
         """
-        try:
-            # Loguear la petición en modo debug
-            if self.debug:
-                logger.debug(f"Realizando petición a {url}")
-                logger.debug(f"Parámetros: {params}")
-            
-            response = requests.get(
-                url,
-                params=params,
-                headers=self.headers,
-                timeout=self.timeout,
-                verify=self.verificar_ssl
+        if self.debug:
+            logger.debug(f"URL completa: {respuesta.url or url}")
+            logger.debug(f"Respuesta recibida: {respuesta.codigo}")
+            logger.debug(f"Contenido: {respuesta.texto[:500]}...")
+        
+        if not 200 <= respuesta.codigo < 300:
+            logger.error(f"Error HTTP: {respuesta.codigo} para {respuesta.url or url}")
+            raise APIError(
+                f"Error HTTP: {respuesta.codigo} para {respuesta.url or url}",
+                codigo=respuesta.codigo,
+                respuesta=respuesta.texto,
+                retry_after=parsear_retry_after(respuesta.cabeceras.get("Retry-After"))
             )
-            
-            # Loguear la URL completa en modo debug
-            if self.debug:
-                logger.debug(f"URL completa: {response.url}")
-            
-            # Verificar si la respuesta es exitosa
-            response.raise_for_status()
-            
-            # Loguear la respuesta en modo debug
-            if self.debug:
-                logger.debug(f"Respuesta recibida: {response.status_code}")
-                logger.debug(f"Contenido: {response.text[:500]}...")
-            
-            # Parsear la respuesta como JSON
-            datos = response.json()
-            
-            return datos
         
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"Error HTTP: {e}")
-            raise APIError(f"Error HTTP: {e}", codigo=response.status_code, respuesta=response.text)
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"Error de conexión: {e}")
-            raise APIError(f"Error de conexión con la API de CartoCiudad: {e}")
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout: {e}")
-            raise APIError(f"Tiempo de espera agotado (timeout: {self.timeout}s): {e}")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error en la petición: {e}")
-            raise APIError(f"Error en la petición: {e}")
-        except json.JSONDecodeError as e:
+        try:
+            if self.metricas is None:
+                return self.decodificar(respuesta.contenido)
+            inicio = time.perf_counter()
+            datos = self.decodificar(respuesta.contenido)
+            self.metricas.observar(FASE_DECODIFICACION, nombre_endpoint(url), time.perf_counter() - inicio)
+            return datos
+        except ValueError as e:
             logger.error(f"Error al decodificar JSON: {e}")
-            logger.error(f"Respuesta recibida: {response.text[:500]}...")
-            raise APIError(f"Error al decodificar la respuesta JSON: {e}", respuesta=response.text)
+            logger.error(f"Respuesta recibida: {respuesta.texto[:500]}...")
+            raise APIError(f"Error al decodificar la respuesta JSON: {e}", respuesta=respuesta.texto) from e
     
-    def buscar_candidatos(
+    def _error_transporte(self, error: ErrorTransporte) -> APIError:
+        """
+        Convierte un error del transporte en el APIError correspondiente.
+        
+        Args:
+            error: Error lanzado por el transporte
+            
+        Returns:
+            APIError a lanzar encadenado al error del transporte
+        """
+        if isinstance(error, ErrorTimeout):
+            logger.error(f"Timeout: {error}")
+            return APIError(f"Tiempo de espera agotado (timeout: {self.timeout}s): {error}")
+        if isinstance(error, ErrorConexion):
+            logger.error(f"Error de conexión: {error}")
+            return APIError(f"Error de conexión con la API de CartoCiudad: {error}")
+        logger.error(f"Error en la petición: {error}")
+        return APIError(f"Error en la petición: {error}")
+    
+    def _registrar_red(self, url: str, inicio: float, respuesta: Optional[RespuestaTransporte]) -> None:
+        """Anota en las métricas una petición enviada y su tiempo de red."""
+        self.metricas.registrar_peticion(
+            nombre_endpoint(url),
+            time.perf_counter() - inicio,
+            len(respuesta.contenido) if respuesta is not None else 0
+        )
+    
+    def _registrar_fallo(self, url: str, error: APIError, reintento: bool) -> None:
+        """Anota en las métricas un intento fallido y si se va a reintentar."""
+        if self.metricas is not None:
+            self.metricas.registrar_error(nombre_endpoint(url), error, reintento)
+    
+    def _registrar_peticion_original(self) -> None:
+        """Anota una petición nueva en el presupuesto de reintentos, si lo hay."""
+        if self.reintentos is not None and self.reintentos.presupuesto is not None:
+            self.reintentos.presupuesto.registrar_peticion()
+    
+    def _inversa_desde_cache(
+        self, 
+        longitud: float, 
+        latitud: float, 
+        tipo: Optional[str]
+    ) -> Optional[Direccion]:
+        """Devuelve la Direccion de la caché espacial más cercana o None."""
+        if self.cache_inversa is None:
+            return None
+        datos = self.cache_inversa.obtener(longitud, latitud, tipo)
+        if self.metricas is not None:
+            self.metricas.registrar_cache("espacial", "reverseGeocode", datos is not None)
+        if datos is None:
+            return None
+        direccion = self._procesar_direccion(datos)
+        direccion._origen = ORIGEN_CACHE
+        return direccion
+    
+    def _guardar_inversa(
+        self, 
+        longitud: float, 
+        latitud: float, 
+        tipo: Optional[str], 
+        respuesta: Any
+    ) -> None:
+        """Guarda una respuesta de reverseGeocode en la caché espacial y en el índice, si los hay."""
+        if self.cache_inversa is not None:
+            self.cache_inversa.guardar(longitud, latitud, tipo, respuesta)
+        self._indexar_direccion(respuesta)
+    
+    def _inversa_desde_indice(
+        self, 
+        longitud: float, 
+        latitud: float, 
+        tipo: Optional[str]
+    ) -> Optional[Direccion]:
+        """Devuelve la Direccion conocida más cercana del índice de direcciones o None."""
+        if self.indice_direcciones is None or not self.indice_direcciones.admite_tipo(tipo):
+            return None
+        encontrada = self.indice_direcciones.buscar(longitud, latitud)
+        if self.metricas is not None:
+            self.metricas.registrar_cache("indice", "reverseGeocode", encontrada is not None)
+        if encontrada is None:
+            return None
+        direccion = self._procesar_direccion(encontrada[1])
+        direccion._origen = ORIGEN_INDICE
+        return direccion
+    
+    def _indexar_direccion(self, respuesta: Any) -> None:
+        """Añade al índice de direcciones una respuesta de find o reverseGeocode, si procede."""
+        if (
+            self.indice_direcciones is not None
+            and self.indice_direcciones.aprender
+            and isinstance(respuesta, dict)
+            and not respuesta.get("error")
+        ):
+            self.indice_direcciones.agregar(respuesta)
+    
+    def _candidatos_locales(self, params: Dict[str, str]) -> Optional[List[Candidato]]:
+        """
+        Responde una búsqueda de candidatos con el nomenclátor, si es posible.
+        
+        Sólo se responde localmente cuando la búsqueda excluye todos los tipos
+        que no son administrativos (ver nomenclator.excluir_salvo) y no filtra
+        por código postal, que el nomenclátor no conoce. Si no hay ninguna
+        coincidencia se devuelve None y la búsqueda va a la API.
+        """
+        if self.nomenclator is None or "cod_postal_filter" in params:
+            return None
+        excluidos = set(params.get("no_process", "").split(","))
+        if any(
+            tipo not in excluidos for tipo in FILTROS_TIPO_ENTIDAD.values()
+            if tipo not in TIPOS_ADMINISTRATIVOS
+        ):
+            return None
+        tipos = [tipo for tipo in TIPOS_ADMINISTRATIVOS if tipo not in excluidos]
+        filtros = {
+            campo: params[filtro].split(",")
+            for filtro, campo in _FILTROS_NOMENCLATOR.items() if filtro in params
+        }
+        resultados = self.nomenclator.buscar(
+            params["q"], tipos=tipos, limite=int(params.get("limit", DEFAULT_LIMIT)), filtros=filtros
+        )
+        if self.metricas is not None:
+            self.metricas.registrar_cache("nomenclator", "candidates", bool(resultados))
+        if not resultados:
+            return None
+        candidatos = self._procesar_candidatos([entidad for entidad, _ in resultados])
+        for candidato in candidatos:
+            candidato._origen = ORIGEN_NOMENCLATOR
+        return candidatos
+    
+    def _ubicacion_local(self, params: Dict[str, Any]) -> Optional[Ubicacion]:
+        """
+        Responde una geocodificación con el nomenclátor, si es posible.
+        
+        Se resuelven localmente las consultas por tipo e id de una entidad
+        administrativa y, si el nomenclátor tiene geocodificar_nombres=True,
+        las consultas de texto que coinciden exactamente con el nombre de una
+        (sin portal ni formato GeoJSON). En otro caso se devuelve None y la
+        consulta va a la API.
+        """
+        if self.nomenclator is None or "portal" in params or "outputformat" in params:
+            return None
+        if "q" in params:
+            if not self.nomenclator.geocodificar_nombres:
+                return None
+            entidad = self.nomenclator.resolver(params["q"])
+        elif params["type"] in TIPOS_ADMINISTRATIVOS:
+            entidad = self.nomenclator.obtener(params["type"], params["id"])
+        else:
+            return None
+        if self.metricas is not None:
+            self.metricas.registrar_cache("nomenclator", "find", entidad is not None)
+        if entidad is None:
+            return None
+        ubicacion = self._procesar_ubicacion(entidad)
+        ubicacion._origen = ORIGEN_NOMENCLATOR
+        return ubicacion
+    
+    def _parametros_candidatos(
         self, 
         consulta: str, 
         limite: int = DEFAULT_LIMIT,
@@ -127,27 +475,12 @@ class CartoCiudad:
         comunidad_autonoma: Optional[Union[str, List[str]]] = None,
         poblacion: Optional[Union[str, List[str]]] = None,
         codigo_pais: str = DEFAULT_COUNTRY_CODE
-    ) -> List[Candidato]:
+    ) -> Dict[str, str]:
         """
-        Busca candidatos que coincidan con la consulta.
+        Valida y construye los parámetros del endpoint candidates.
         
-        Args:
-            consulta: Texto de búsqueda
-            limite: Número máximo de resultados a devolver
-            excluir_tipos: Lista de tipos de entidades a excluir
-            codigo_postal: Código(s) postal(es) para filtrar
-            municipio: Municipio(s) para filtrar
-            provincia: Provincia(s) para filtrar
-            comunidad_autonoma: Comunidad(es) autónoma(s) para filtrar
-            poblacion: Población(es) para filtrar
-            codigo_pais: Código del país
-            
-        Returns:
-            Lista de candidatos encontrados
-            
         Raises:
             PeticionInvalidaError: Si algún parámetro es inválido
-            APIError: Si hay un error en la petición
         """
         if not consulta:
             raise PeticionInvalidaError("La consulta no puede estar vacía", parametro="consulta")
@@ -166,28 +499,106 @@ class CartoCiudad:
             filtros_geograficos["poblacion_filter"] = poblacion
         
         # Construir parámetros
-        params = construir_parametros_filtro(
+        return construir_parametros_filtro(
             no_process=excluir_tipos,
             filtros_geograficos=filtros_geograficos,
             q=consulta,
             limit=limite,
             countrycodes=codigo_pais
         )
+    
+    def _parametros_geocodificar(
+        self, 
+        consulta: Optional[str] = None,
+        tipo: Optional[str] = None,
+        id_entidad: Optional[str] = None,
+        portal: Optional[str] = None,
+        formato_salida: str = "json"
+    ) -> Dict[str, Any]:
+        """
+        Valida y construye los parámetros del endpoint find.
         
-        # Realizar la petición
-        respuesta = self._realizar_peticion(CANDIDATES_URL, params)
+        Raises:
+            PeticionInvalidaError: Si algún parámetro es inválido
+        """
+        params = {}
         
-        # Procesar resultados
+        # Validar parámetros
+        if consulta:
+            params["q"] = consulta
+        elif tipo and id_entidad:
+            params["type"] = tipo
+            params["id"] = id_entidad
+        else:
+            raise PeticionInvalidaError(
+                "Debe proporcionar una consulta o un tipo y id de entidad",
+                parametro="consulta/tipo/id_entidad"
+            )
+        
+        # Añadir portal si se proporciona
+        if portal:
+            params["portal"] = portal
+        
+        # Añadir formato de salida
+        if formato_salida and formato_salida.lower() in ["json", "geojson"]:
+            if formato_salida.lower() == "geojson":
+                params["outputformat"] = "geojson"
+        
+        return params
+    
+    def _parametros_inversa(
+        self, 
+        longitud: float, 
+        latitud: float,
+        tipo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Valida y construye los parámetros del endpoint reverseGeocode.
+        
+        Raises:
+            PeticionInvalidaError: Si las coordenadas son inválidas
+        """
+        # Validar coordenadas
+        validar_coordenadas(longitud, latitud)
+        
+        # Construir parámetros
+        params = {
+            "lon": longitud,
+            "lat": latitud
+        }
+        
+        if tipo:
+            params["type"] = tipo
+        
+        return params
+    
+    def _comprobar_error_api(self, respuesta: Any) -> None:
+        """
+        Lanza APIError si la respuesta es un diccionario con la clave 'error'.
+        
+        Raises:
+            APIError: Si la API devolvió un error
+        """
+        if isinstance(respuesta, dict) and respuesta.get('error'):
+            error_msg = respuesta.get('error', 'Error desconocido en la API')
+            logger.error(f"Error en la API: {error_msg}")
+            raise APIError(error_msg)
+    
+    @_medir_validacion("candidates")
+    def _procesar_candidatos(self, respuesta: Any) -> List[Candidato]:
+        """
+        Convierte la respuesta del endpoint candidates en una lista de Candidato.
+        
+        Raises:
+            APIError: Si la respuesta es un error o no tiene el formato esperado
+        """
         candidatos = []
         if not respuesta:
             logger.warning("La API devolvió una respuesta vacía")
             return candidatos
         
         # Si la respuesta es un diccionario y tiene la clave 'error'
-        if isinstance(respuesta, dict) and respuesta.get('error'):
-            error_msg = respuesta.get('error', 'Error desconocido en la API')
-            logger.error(f"Error en la API: {error_msg}")
-            raise APIError(error_msg)
+        self._comprobar_error_api(respuesta)
         
         # Verificar que la respuesta sea una lista
         if not isinstance(respuesta, list):
@@ -195,6 +606,9 @@ class CartoCiudad:
             logger.error(f"Contenido: {respuesta}")
             raise APIError(f"Respuesta inesperada: se esperaba una lista pero se recibió {type(respuesta)}")
         
+        if not self.incluir_geometria:
+            respuesta = [_sin_geometria(item) for item in respuesta]
+        
         # Procesar los candidatos
         for item in respuesta:
             try:
@@ -209,6 +623,327 @@ class CartoCiudad:
         logger.info(f"Se encontraron {len(candidatos)} candidatos")
         return candidatos
     
+    @_medir_validacion("find")
+    def _procesar_ubicacion(self, respuesta: Any) -> Ubicacion:
+        """
+        Convierte la respuesta del endpoint find en una Ubicacion.
+        
+        Raises:
+            APIError: Si la respuesta es un error o no se puede parsear
+        """
+        # Si la respuesta es un diccionario y tiene la clave 'error'
+        self._comprobar_error_api(respuesta)
+        
+        if not self.incluir_geometria:
+            respuesta = _sin_geometria(respuesta)
+        
+        # Parsear la respuesta
+        try:
+            ubicacion = Ubicacion.model_validate(respuesta)
+            return ubicacion
+        except Exception as e:
+            logger.error(f"Error al parsear la respuesta: {e}")
+            logger.debug(f"Respuesta recibida: {respuesta}")
+            raise APIError(f"Error al parsear la respuesta: {e}", respuesta=respuesta)
+    
+    @_medir_validacion("reverseGeocode")
+    def _procesar_direccion(self, respuesta: Any) -> Direccion:
+        """
+        Convierte la respuesta del endpoint reverseGeocode en una Direccion.
+        
+        Raises:
+            APIError: Si la respuesta es un error o no se puede parsear
+        """
+        # Si la respuesta es un diccionario y tiene la clave 'error'
+        self._comprobar_error_api(respuesta)
+        
+        if not self.incluir_geometria:
+            respuesta = _sin_geometria(respuesta)
+        
+        # Parsear la respuesta
+        try:
+            direccion = Direccion.model_validate(respuesta)
+            return direccion
+        except Exception as e:
+            logger.error(f"Error al parsear la respuesta: {e}")
+            logger.debug(f"Respuesta recibida: {respuesta}")
+            raise APIError(f"Error al parsear la respuesta: {e}", respuesta=respuesta)
+
+
+class CartoCiudad(ClienteBase):
+    """
+    Cliente principal para interactuar con la API de CartoCiudad.
+    
+    Esta clase ofrece métodos para utilizar los diferentes servicios
+    de CartoCiudad de forma sencilla y orientada a objetos.
+    
+    Por defecto las peticiones se envían con TransporteHTTP, que mantiene
+    una sesión HTTP con un pool de conexiones keep-alive reutilizado entre
+    peticiones. Puede usarse como gestor de contexto para liberar las
+    conexiones al terminar:
+    
+        with CartoCiudad() as cliente:
+            cliente.geocodificar("Calle Mayor 1, Madrid")
+    """
+    
+    def __init__(
+        self, 
+        timeout: int = 10,
+        verificar_ssl: bool = True,
+        debug: bool = False,
+        conexiones_pool: int = DEFAULT_POOL_CONEXIONES,
+        max_conexiones_por_host: int = DEFAULT_MAX_CONEXIONES_HOST,
+        cache: Optional[CacheBase] = None,
+        cache_inversa: Optional[CacheInversaEspacial] = None,
+        limitador: Optional[LimitadorTasa] = None,
+        reintentos: Optional[PoliticaReintentos] = None,
+        coalescer: bool = False,
+        decodificador: Optional[Union[str, Decodificador]] = None,
+        incluir_geometria: bool = True,
+        url_base: str = BASE_URL,
+        transporte: Optional[TransporteBase] = None,
+        metricas: Optional[Metricas] = None,
+        nomenclator: Optional["Nomenclator"] = None,
+        normalizador: Optional[Callable[[str], str]] = None,
+        indice_direcciones: Optional["IndiceDirecciones"] = None
+    ):
+        """
+        Inicializa el cliente de CartoCiudad.
+        
+        Args:
+            timeout: Tiempo máximo en segundos para esperar respuesta de la API
+            verificar_ssl: Si se debe verificar el certificado SSL en las peticiones
+            debug: Activa el modo de depuración con mensajes detallados
+            conexiones_pool: Número de pools de conexiones (uno por host) a mantener
+            max_conexiones_por_host: Número máximo de conexiones keep-alive por host
+            cache: Caché de respuestas, por ejemplo CacheMemoria (opcional)
+            cache_inversa: Caché espacial para geocodificacion_inversa (opcional)
+            limitador: Limitador de tasa, que puede compartirse entre varios
+                clientes e hilos (opcional)
+            reintentos: Política de reintentos para errores transitorios (opcional)
+            coalescer: Si los hilos que piden lo mismo a la vez deben esperar a una
+                única petición HTTP y compartir su respuesta
+            decodificador: Decodificador JSON ("json", "orjson" o una función
+                bytes -> objeto). Por defecto se usa orjson si está instalado
+            incluir_geometria: Si es False, el campo geom se descarta al construir
+                los modelos, para no mantener en memoria geometrías que no se usan
+            url_base: URL base de la API. Permite apuntar a un servidor local de
+                pruebas o a un proxy con la misma interfaz
+            transporte: Transporte que envía las peticiones, por ejemplo
+                TransporteMemoria o TransporteReproduccion. Por defecto, un
+                TransporteHTTP con timeout, verificar_ssl y el pool indicados
+            metricas: Registro de métricas (peticiones, errores, reintentos,
+                cachés y latencias por fase). Por defecto no se mide nada
+            nomenclator: Nomenclátor local de municipios, provincias,
+                comunidades y poblaciones. Las búsquedas restringidas a estos
+                tipos se responden con él y sólo van a la API si no encuentra
+                la entidad
+            normalizador: Función que reescribe las consultas de texto en una
+                forma canónica, como NormalizadorConsultas, para que las
+                variantes de una dirección compartan la entrada de la caché.
+                Sólo se aplica a la clave: la API recibe el texto original
+            indice_direcciones: Índice de direcciones ya resueltas. Las
+                geocodificaciones inversas a menos de su distancia máxima de
+                una dirección conocida se responden con ella. Si el índice
+                tiene aprender=True, las direcciones obtenidas de la API se
+                añaden a él
+        """
+        super().__init__(
+            timeout=timeout,
+            verificar_ssl=verificar_ssl,
+            debug=debug,
+            cache=cache,
+            cache_inversa=cache_inversa,
+            limitador=limitador,
+            reintentos=reintentos,
+            coalescer=coalescer,
+            decodificador=decodificador,
+            incluir_geometria=incluir_geometria,
+            url_base=url_base,
+            metricas=metricas,
+            nomenclator=nomenclator,
+            normalizador=normalizador,
+            indice_direcciones=indice_direcciones
+        )
+        self._coalescedor = None
+        if coalescer:
+            from .coalescencia import CoalescedorPeticiones
+            self._coalescedor = CoalescedorPeticiones()
+        self.conexiones_pool = conexiones_pool
+        self.max_conexiones_por_host = max_conexiones_por_host
+        if transporte is None:
+            transporte = TransporteHTTP(
+                timeout=timeout,
+                verificar_ssl=verificar_ssl,
+                cabeceras=self.headers,
+                conexiones_pool=conexiones_pool,
+                max_conexiones_por_host=max_conexiones_por_host
+            )
+        self.transporte = transporte
+    
+    def cerrar(self) -> None:
+        """
+        Cierra el transporte y libera las conexiones del pool.
+        
+        Con el transporte HTTP el cliente puede seguir usándose después de
+        cerrarlo: la siguiente petición abrirá una sesión nueva.
+        """
+        self.transporte.cerrar()
+    
+    def __enter__(self) -> "CartoCiudad":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.cerrar()
+    
+    def _realizar_peticion(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Obtiene la respuesta de la API, consultando primero la caché si la hay
+        y agrupando las peticiones idénticas en curso si coalescer está activo.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        datos = self._consultar_cache(url, params)
+        if datos is not None:
+            return datos
+        
+        if self._coalescedor is not None:
+            return self._coalescedor.ejecutar(
+                clave_cache(url, self._parametros_cache(params)),
+                lambda: self._peticion_con_reintentos(url, params)
+            )
+        return self._peticion_con_reintentos(url, params)
+    
+    def _peticion_con_reintentos(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Realiza la petición HTTP aplicando el limitador de tasa y los reintentos.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si la petición falla y no quedan reintentos
+        """
+        self._registrar_peticion_original()
+        intento = 0
+        while True:
+            if self.limitador is not None:
+                self.limitador.adquirir()
+            try:
+                datos = self._peticion_http(url, params)
+                break
+            except APIError as e:
+                espera = self._espera_reintento(e, intento)
+                self._registrar_fallo(url, e, espera is not None)
+                if espera is None:
+                    e.reintentos = intento
+                    raise
+                time.sleep(espera)
+                intento += 1
+        
+        self._guardar_cache(url, params, datos)
+        return datos
+    
+    def _peticion_http(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Realiza una petición HTTP a la API de CartoCiudad.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        # Loguear la petición en modo debug
+        if self.debug:
+            logger.debug(f"Realizando petición a {url}")
+            logger.debug(f"Parámetros: {params}")
+        
+        inicio = time.perf_counter() if self.metricas is not None else 0.0
+        try:
+            respuesta = self.transporte.enviar(url, params)
+        except ErrorTransporte as e:
+            if self.metricas is not None:
+                self._registrar_red(url, inicio, None)
+            raise self._error_transporte(e) from e
+        if self.metricas is not None:
+            self._registrar_red(url, inicio, respuesta)
+        
+        return self._decodificar_respuesta(url, respuesta)
+    
+    def buscar_candidatos(
+        self, 
+        consulta: str, 
+        limite: int = DEFAULT_LIMIT,
+        excluir_tipos: Optional[List[str]] = None,
+        codigo_postal: Optional[Union[str, List[str]]] = None,
+        municipio: Optional[Union[str, List[str]]] = None,
+        provincia: Optional[Union[str, List[str]]] = None,
+        comunidad_autonoma: Optional[Union[str, List[str]]] = None,
+        poblacion: Optional[Union[str, List[str]]] = None,
+        codigo_pais: str = DEFAULT_COUNTRY_CODE
+    ) -> List[Candidato]:
+        """
+        Busca candidatos que coincidan con la consulta.
+        
+        Args:
+            consulta: Texto de búsqueda
+            limite: Número máximo de resultados a devolver
+            excluir_tipos: Lista de tipos de entidades a excluir
+            codigo_postal: Código(s) postal(es) para filtrar
+            municipio: Municipio(s) para filtrar
+            provincia: Provincia(s) para filtrar
+            comunidad_autonoma: Comunidad(es) autónoma(s) para filtrar
+            poblacion: Población(es) para filtrar
+            codigo_pais: Código del país
+            
+        Returns:
+            Lista de candidatos encontrados. Su atributo origen indica si
+            proceden de la API o del nomenclátor local
+            
+        Raises:
+            PeticionInvalidaError: Si algún parámetro es inválido
+            APIError: Si hay un error en la petición
+        """
+        params = self._parametros_candidatos(
+            consulta,
+            limite=limite,
+            excluir_tipos=excluir_tipos,
+            codigo_postal=codigo_postal,
+            municipio=municipio,
+            provincia=provincia,
+            comunidad_autonoma=comunidad_autonoma,
+            poblacion=poblacion,
+            codigo_pais=codigo_pais
+        )
+        
+        # Consultar el nomenclátor local
+        candidatos = self._candidatos_locales(params)
+        if candidatos is not None:
+            return candidatos
+        
+        # Realizar la petición
+        respuesta = self._realizar_peticion(self.url_candidatos, params)
+        
+        # Procesar resultados
+        return self._procesar_candidatos(respuesta)
+    
     def geocodificar(
         self, 
         consulta: Optional[str] = None,
@@ -234,46 +969,26 @@ class CartoCiudad:
             PeticionInvalidaError: Si algún parámetro es inválido
             APIError: Si hay un error en la petición
         """
-        params = {}
-        
-        # Validar parámetros
-        if consulta:
-            params["q"] = consulta
-        elif tipo and id_entidad:
-            params["type"] = tipo
-            params["id"] = id_entidad
-        else:
-            raise PeticionInvalidaError(
-                "Debe proporcionar una consulta o un tipo y id de entidad",
-                parametro="consulta/tipo/id_entidad"
-            )
-        
-        # Añadir portal si se proporciona
-        if portal:
-            params["portal"] = portal
+        params = self._parametros_geocodificar(
+            consulta,
+            tipo=tipo,
+            id_entidad=id_entidad,
+            portal=portal,
+            formato_salida=formato_salida
+        )
         
-        # Añadir formato de salida
-        if formato_salida and formato_salida.lower() in ["json", "geojson"]:
-            if formato_salida.lower() == "geojson":
-                params["outputformat"] = "geojson"
+        # Consultar el nomenclátor local
+        ubicacion = self._ubicacion_local(params)
+        if ubicacion is not None:
+            return ubicacion
         
         # Realizar la petición
-        respuesta = self._realizar_peticion(FIND_URL, params)
-        
-        # Si la respuesta es un diccionario y tiene la clave 'error'
-        if isinstance(respuesta, dict) and respuesta.get('error'):
-            error_msg = respuesta.get('error', 'Error desconocido en la API')
-            logger.error(f"Error en la API: {error_msg}")
-            raise APIError(error_msg)
+        respuesta = self._realizar_peticion(self.url_find, params)
         
         # Parsear la respuesta
-        try:
-            ubicacion = Ubicacion.model_validate(respuesta)
-            return ubicacion
-        except Exception as e:
-            logger.error(f"Error al parsear la respuesta: {e}")
-            logger.debug(f"Respuesta recibida: {respuesta}")
-            raise APIError(f"Error al parsear la respuesta: {e}", respuesta=respuesta)
+        ubicacion = self._procesar_ubicacion(respuesta)
+        self._indexar_direccion(respuesta)
+        return ubicacion
     
     def geocodificacion_inversa(
         self, 
@@ -290,38 +1005,167 @@ class CartoCiudad:
             tipo: Tipo de entidad a buscar (opcional)
             
         Returns:
-            Objeto Direccion con la información de la dirección encontrada
+            Objeto Direccion con la información de la dirección encontrada.
+            Su atributo origen indica si procede de la API, de cache_inversa
+            o de indice_direcciones
             
         Raises:
             PeticionInvalidaError: Si las coordenadas son inválidas
             APIError: Si hay un error en la petición
         """
-        # Validar coordenadas
-        validar_coordenadas(longitud, latitud)
+        params = self._parametros_inversa(longitud, latitud, tipo=tipo)
         
-        # Construir parámetros
-        params = {
-            "lon": longitud,
-            "lat": latitud
-        }
+        # Consultar la caché espacial
+        direccion = self._inversa_desde_cache(longitud, latitud, tipo)
+        if direccion is not None:
+            return direccion
         
-        if tipo:
-            params["type"] = tipo
+        # Consultar el índice de direcciones conocidas
+        direccion = self._inversa_desde_indice(longitud, latitud, tipo)
+        if direccion is not None:
+            return direccion
         
         # Realizar la petición
-        respuesta = self._realizar_peticion(REVERSE_GEOCODE_URL, params)
-        
-        # Si la respuesta es un diccionario y tiene la clave 'error'
-        if isinstance(respuesta, dict) and respuesta.get('error'):
-            error_msg = respuesta.get('error', 'Error desconocido en la API')
-            logger.error(f"Error en la API: {error_msg}")
-            raise APIError(error_msg)
+        respuesta = self._realizar_peticion(self.url_inversa, params)
         
         # Parsear la respuesta
-        try:
-            direccion = Direccion.model_validate(respuesta)
-            return direccion
-        except Exception as e:
-            logger.error(f"Error al parsear la respuesta: {e}")
-            logger.debug(f"Respuesta recibida: {respuesta}")
-            raise APIError(f"Error al parsear la respuesta: {e}", respuesta=respuesta) 
\ No newline at end of file
+        direccion = self._procesar_direccion(respuesta)
+        self._guardar_inversa(longitud, latitud, tipo, respuesta)
+        return direccion
+    
+    def geocodificar_lote(
+        self, 
+        consultas: Iterable[Union[str, Dict[str, Any]]],
+        concurrencia: int = DEFAULT_CONCURRENCIA_LOTE,
+        columnar: bool = False,
+        **kwargs
+    ) -> Union[List[ResultadoLote], "ResultadosColumnares"]:
+        """
+        Geocodifica un lote de consultas en paralelo.
+        
+        Cada consulta se resuelve con geocodificar() en un pool de hilos que
+        comparte la sesión HTTP del cliente. Conviene que max_conexiones_por_host
+        sea al menos igual a la concurrencia para aprovechar el pool.
+        
+        Args:
+            consultas: Textos a geocodificar, o diccionarios con los argumentos
+                de geocodificar() para cada elemento
+            concurrencia: Número máximo de peticiones simultáneas
+            columnar: Si es True, devuelve un ResultadosColumnares en lugar de
+                una lista; los modelos no se conservan en memoria
+            **kwargs: Argumentos comunes de geocodificar() para todo el lote
+            
+        Returns:
+            Lista de ResultadoLote en el mismo orden que las consultas, con la
+            Ubicacion o la excepción producida en cada caso, o ResultadosColumnares
+            si columnar es True
+        """
+        def geocodificar_elemento(consulta):
+            if isinstance(consulta, dict):
+                return self.geocodificar(**{**kwargs, **consulta})
+            return self.geocodificar(consulta, **kwargs)
+        
+        if columnar:
+            from .columnar import ResultadosColumnares
+            return ResultadosColumnares.desde_lote(
+                iterar_lote(geocodificar_elemento, consultas, concurrencia)
+            )
+        return ejecutar_lote(geocodificar_elemento, consultas, concurrencia)
+    
+    def geocodificacion_inversa_lote(
+        self, 
+        coordenadas: Iterable[Union[Tuple[float, float], Dict[str, Any]]],
+        concurrencia: int = DEFAULT_CONCURRENCIA_LOTE,
+        tipo: Optional[str] = None,
+        columnar: bool = False
+    ) -> Union[List[ResultadoLote], "ResultadosColumnares"]:
+        """
+        Realiza la geocodificación inversa de un lote de coordenadas en paralelo.
+        
+        Args:
+            coordenadas: Tuplas (longitud, latitud), o diccionarios con los
+                argumentos de geocodificacion_inversa() para cada elemento
+            concurrencia: Número máximo de peticiones simultáneas
+            tipo: Tipo de entidad a buscar para todo el lote (opcional)
+            columnar: Si es True, devuelve un ResultadosColumnares en lugar de
+                una lista; los modelos no se conservan en memoria
+                
+        Returns:
+            Lista de ResultadoLote en el mismo orden que las coordenadas, con la
+            Direccion o la excepción producida en cada caso, o ResultadosColumnares
+            si columnar es True
+        """
+        def inversa_elemento(punto):
+            if isinstance(punto, dict):
+                return self.geocodificacion_inversa(**{"tipo": tipo, **punto})
+            longitud, latitud = punto
+            return self.geocodificacion_inversa(longitud, latitud, tipo=tipo)
+        
+        if columnar:
+            from .columnar import ResultadosColumnares
+            return ResultadosColumnares.desde_lote(
+                iterar_lote(inversa_elemento, coordenadas, concurrencia)
+            )
+        return ejecutar_lote(inversa_elemento, coordenadas, concurrencia)
+    
+    def geocodificacion_inversa_puntos(
+        self,
+        longitudes: Any,
+        latitudes: Any,
+        tipo: Optional[str] = None,
+        precision_metros: float = DEFAULT_PRECISION_PUNTOS,
+        concurrencia: int = DEFAULT_CONCURRENCIA_LOTE
+    ) -> "ResultadosColumnares":
+        """
+        Realiza la geocodificación inversa de arrays de coordenadas, consultando
+        una sola vez cada grupo de puntos casi iguales.
+        
+        Pensado para trazas GPS densas de millones de puntos. Las coordenadas
+        se validan de forma vectorizada. Los puntos que caen en la misma celda
+        de precision_metros de lado forman un grupo, y sólo se consulta el
+        punto del grupo más cercano a su centroide. Su dirección se asigna a
+        todos los puntos del grupo, en el orden original.
+        
+        Args:
+            longitudes: Array de NumPy (o secuencia) de longitudes
+            latitudes: Array de NumPy (o secuencia) de latitudes
+            tipo: Tipo de entidad a buscar para todos los puntos (opcional)
+            precision_metros: Lado de las celdas que agrupan los puntos, en
+                metros. Con 0 sólo se agrupan los puntos idénticos
+            concurrencia: Número máximo de peticiones simultáneas
+            
+        Returns:
+            ResultadosColumnares con una fila por punto, en el orden de entrada.
+            Los puntos fuera de rango son filas con error
+            
+        Raises:
+            ValueError: Si longitudes y latitudes no tienen el mismo tamaño
+            ImportError: Si numpy no está instalado
+        """
+        from .columnar import ResultadosColumnares, _importar_numpy
+        from .puntos import a_arrays, agrupar_puntos, mascara_coordenadas
+        
+        longitudes, latitudes = a_arrays(longitudes, latitudes)
+        validos = mascara_coordenadas(longitudes, latitudes)
+        lon_validas, lat_validas = longitudes[validos], latitudes[validos]
+        representantes, etiquetas = agrupar_puntos(lon_validas, lat_validas, precision_metros)
+        if self.debug:
+            logger.debug(
+                f"Geocodificación inversa de {longitudes.size} puntos: "
+                f"{int(validos.sum())} válidos en {representantes.size} grupos"
+            )
+        
+        consultas = zip(lon_validas[representantes].tolist(), lat_validas[representantes].tolist())
+        grupos = ResultadosColumnares.desde_lote(iterar_lote(
+            lambda punto: self.geocodificacion_inversa(punto[0], punto[1], tipo=tipo),
+            consultas,
+            concurrencia
+        ))
+        # Fila común para los puntos fuera de rango, tras la de cada grupo
+        grupos.agregar_error(PeticionInvalidaError(
+            "Coordenadas fuera del rango válido para España", parametro="longitud/latitud"
+        ))
+        np = _importar_numpy()
+        filas = np.full(longitudes.size, len(grupos) - 1, dtype=np.intp)
+        filas[validos] = etiquetas
+        return grupos.tomar(filas) 
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+Cliente asíncrono para interactuar con la API de CartoCiudad
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Union
+
+from .cache import CacheBase, CacheInversaEspacial, clave_cache
+from .coalescencia import CoalescedorPeticionesAsync
+from .decodificacion import Decodificador
+from .cliente import ClienteBase
+from .limitador import LimitadorTasa
+from .metricas import Metricas
+from .reintentos import PoliticaReintentos
+from .constantes import (
+    BASE_URL,
+    DEFAULT_COUNTRY_CODE,
+    DEFAULT_LIMIT,
+    DEFAULT_MAX_CONCURRENCIA_ASYNC,
+    DEFAULT_MAX_CONEXIONES_HOST
+)
+from .excepciones import APIError, ErrorTransporte
+from .modelos import Candidato, Ubicacion, Direccion
+from .transporte import TransporteBase, TransporteHTTPAsync
+
+if TYPE_CHECKING:
+    from .indice import IndiceDirecciones
+    from .nomenclator import Nomenclator
+
+logger = logging.getLogger("pycartociudad")
+
+
+class CartoCiudadAsync(ClienteBase):
+    """
+    Cliente asíncrono para la API de CartoCiudad.
+    
+    Ofrece los mismos métodos que CartoCiudad como corrutinas, con los mismos
+    modelos, parámetros y excepciones. Un semáforo limita el número de
+    peticiones simultáneas, de modo que se pueden lanzar miles de consultas
+    con asyncio.gather sin saturar la API ni el pool de conexiones:
+    
+        async with CartoCiudadAsync(max_concurrencia=50) as cliente:
+            ubicaciones = await asyncio.gather(
+                *(cliente.geocodificar(d) for d in direcciones)
+            )
+    """
+    
+    def __init__(
+        self,
+        timeout: int = 10,
+        verificar_ssl: bool = True,
+        debug: bool = False,
+        max_concurrencia: int = DEFAULT_MAX_CONCURRENCIA_ASYNC,
+        max_conexiones_por_host: int = DEFAULT_MAX_CONEXIONES_HOST,
+        cache: Optional[CacheBase] = None,
+        cache_inversa: Optional[CacheInversaEspacial] = None,
+        limitador: Optional[LimitadorTasa] = None,
+        reintentos: Optional[PoliticaReintentos] = None,
+        coalescer: bool = False,
+        decodificador: Optional[Union[str, Decodificador]] = None,
+        incluir_geometria: bool = True,
+        url_base: str = BASE_URL,
+        transporte: Optional[TransporteBase] = None,
+        metricas: Optional[Metricas] = None,
+        nomenclator: Optional["Nomenclator"] = None,
+        normalizador: Optional[Callable[[str], str]] = None,
+        indice_direcciones: Optional["IndiceDirecciones"] = None
+    ):
+        """
+        Inicializa el cliente asíncrono de CartoCiudad.
+        
+        Args:
+            timeout: Tiempo máximo en segundos para esperar respuesta de la API
+            verificar_ssl: Si se debe verificar el certificado SSL en las peticiones
+            debug: Activa el modo de depuración con mensajes detallados
+            max_concurrencia: Número máximo de peticiones simultáneas en curso
+            max_conexiones_por_host: Número máximo de conexiones keep-alive por host
+            cache: Caché de respuestas, por ejemplo CacheMemoria (opcional)
+            cache_inversa: Caché espacial para geocodificacion_inversa (opcional)
+            limitador: Limitador de tasa, que puede compartirse con clientes síncronos (opcional)
+            reintentos: Política de reintentos para errores transitorios (opcional)
+            coalescer: Si las corrutinas que piden lo mismo a la vez deben esperar a
+                una única petición HTTP y compartir su respuesta
+            decodificador: Decodificador JSON ("json", "orjson" o una función
+                bytes -> objeto). Por defecto se usa orjson si está instalado
+            incluir_geometria: Si es False, el campo geom se descarta al construir
+                los modelos
+            url_base: URL base de la API (por defecto, la de CartoCiudad)
+            transporte: Transporte que envía las peticiones. Por defecto, un
+                TransporteHTTPAsync con timeout, verificar_ssl y el pool indicados
+            metricas: Registro de métricas, que puede compartirse con clientes
+                síncronos (opcional)
+            nomenclator: Nomenclátor local de entidades administrativas (opcional)
+            normalizador: Función que reescribe las consultas de texto en la
+                clave de la caché (opcional)
+            indice_direcciones: Índice de direcciones conocidas para la
+                geocodificación inversa (opcional)
+                
+        Raises:
+            ImportError: Si no se indica transporte y httpx no está instalado
+        """
+        super().__init__(
+            timeout=timeout,
+            verificar_ssl=verificar_ssl,
+            debug=debug,
+            cache=cache,
+            cache_inversa=cache_inversa,
+            limitador=limitador,
+            reintentos=reintentos,
+            coalescer=coalescer,
+            decodificador=decodificador,
+            incluir_geometria=incluir_geometria,
+            url_base=url_base,
+            metricas=metricas,
+            nomenclator=nomenclator,
+            normalizador=normalizador,
+            indice_direcciones=indice_direcciones
+        )
+        self._coalescedor = CoalescedorPeticionesAsync() if coalescer else None
+        self.max_concurrencia = max_concurrencia
+        self.max_conexiones_por_host = max_conexiones_por_host
+        self._semaforo = asyncio.Semaphore(max_concurrencia)
+        if transporte is None:
+            transporte = TransporteHTTPAsync(
+                timeout=timeout,
+                verificar_ssl=verificar_ssl,
+                cabeceras=self.headers,
+                max_conexiones=max(max_concurrencia, max_conexiones_por_host),
+                max_conexiones_keepalive=max_conexiones_por_host
+            )
+        self.transporte = transporte
+    
+    async def cerrar(self) -> None:
+        """Cierra el transporte y libera las conexiones del pool."""
+        await self.transporte.cerrar_async()
+    
+    async def __aenter__(self) -> "CartoCiudadAsync":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.cerrar()
+    
+    async def _realizar_peticion(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Obtiene la respuesta de la API, consultando primero la caché si la hay
+        y agrupando las peticiones idénticas en curso si coalescer está activo.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        datos = self._consultar_cache(url, params)
+        if datos is not None:
+            return datos
+        
+        if self._coalescedor is not None:
+            return await self._coalescedor.ejecutar(
+                clave_cache(url, self._parametros_cache(params)),
+                lambda: self._peticion_con_reintentos(url, params)
+            )
+        return await self._peticion_con_reintentos(url, params)
+    
+    async def _peticion_con_reintentos(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Realiza la petición HTTP aplicando el limitador de tasa y los reintentos.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si la petición falla y no quedan reintentos
+        """
+        self._registrar_peticion_original()
+        intento = 0
+        while True:
+            if self.limitador is not None:
+                await self.limitador.adquirir_async()
+            try:
+                datos = await self._peticion_http(url, params)
+                break
+            except APIError as e:
+                espera = self._espera_reintento(e, intento)
+                self._registrar_fallo(url, e, espera is not None)
+                if espera is None:
+                    e.reintentos = intento
+                    raise
+                await asyncio.sleep(espera)
+                intento += 1
+        
+        self._guardar_cache(url, params, datos)
+        return datos
+    
+    async def _peticion_http(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Realiza una petición HTTP asíncrona a la API de CartoCiudad.
+        
+        Args:
+            url: URL del endpoint a consultar
+            params: Parámetros de la petición
+            
+        Returns:
+            Diccionario con la respuesta JSON
+            
+        Raises:
+            APIError: Si hay un error en la petición
+        """
+        # Loguear la petición en modo debug
+        if self.debug:
+            logger.debug(f"Realizando petición a {url}")
+            logger.debug(f"Parámetros: {params}")
+        
+        async with self._semaforo:
+            inicio = time.perf_counter() if self.metricas is not None else 0.0
+            try:
+                respuesta = await self.transporte.enviar_async(url, params)
+            except ErrorTransporte as e:
+                if self.metricas is not None:
+                    self._registrar_red(url, inicio, None)
+                raise self._error_transporte(e) from e
+            if self.metricas is not None:
+                self._registrar_red(url, inicio, respuesta)
+        
+        return self._decodificar_respuesta(url, respuesta)
+    
+    async def buscar_candidatos(
+        self,
+        consulta: str,
+        limite: int = DEFAULT_LIMIT,
+        excluir_tipos: Optional[List[str]] = None,
+        codigo_postal: Optional[Union[str, List[str]]] = None,
+        municipio: Optional[Union[str, List[str]]] = None,
+        provincia: Optional[Union[str, List[str]]] = None,
+        comunidad_autonoma: Optional[Union[str, List[str]]] = None,
+        poblacion: Optional[Union[str, List[str]]] = None,
+        codigo_pais: str = DEFAULT_COUNTRY_CODE
+    ) -> List[Candidato]:
+        """
+        Busca candidatos que coincidan con la consulta.
+        
+        Acepta los mismos argumentos que CartoCiudad.buscar_candidatos.
+        
+        Returns:
+            Lista de candidatos encontrados
+            
+        Raises:
+            PeticionInvalidaError: Si algún parámetro es inválido
+            APIError: Si hay un error en la petición
+        """
+        params = self._parametros_candidatos(
+            consulta,
+            limite=limite,
+            excluir_tipos=excluir_tipos,
+            codigo_postal=codigo_postal,
+            municipio=municipio,
+            provincia=provincia,
+            comunidad_autonoma=comunidad_autonoma,
+            poblacion=poblacion,
+            codigo_pais=codigo_pais
+        )
+        candidatos = self._candidatos_locales(params)
+        if candidatos is not None:
+            return candidatos
+        respuesta = await self._realizar_peticion(self.url_candidatos, params)
+        return self._procesar_candidatos(respuesta)
+    
+    async def geocodificar(
+        self,
+        consulta: Optional[str] = None,
+        tipo: Optional[str] = None,
+        id_entidad: Optional[str] = None,
+        portal: Optional[str] = None,
+        formato_salida: str = "json"
+    ) -> Ubicacion:
+        """
+        Geocodifica una dirección o entidad y devuelve sus coordenadas.
+        
+        Acepta los mismos argumentos que CartoCiudad.geocodificar.
+        
+        Returns:
+            Objeto Ubicacion con la información de la entidad geocodificada
+            
+        Raises:
+            PeticionInvalidaError: Si algún parámetro es inválido
+            APIError: Si hay un error en la petición
+        """
+        params = self._parametros_geocodificar(
+            consulta,
+            tipo=tipo,
+            id_entidad=id_entidad,
+            portal=portal,
+            formato_salida=formato_salida
+        )
+        ubicacion = self._ubicacion_local(params)
+        if ubicacion is not None:
+            return ubicacion
+        respuesta = await self._realizar_peticion(self.url_find, params)
+        ubicacion = self._procesar_ubicacion(respuesta)
+        self._indexar_direccion(respuesta)
+        return ubicacion
+    
+    async def geocodificacion_inversa(
+        self,
+        longitud: float,
+        latitud: float,
+        tipo: Optional[str] = None
+    ) -> Direccion:
+        """
+        Realiza una geocodificación inversa: coordenadas a dirección.
+        
+        Acepta los mismos argumentos que CartoCiudad.geocodificacion_inversa.
+        
+        Returns:
+            Objeto Direccion con la información de la dirección encontrada
+            
+        Raises:
+            PeticionInvalidaError: Si las coordenadas son inválidas
+            APIError: Si hay un error en la petición
+        """
+        params = self._parametros_inversa(longitud, latitud, tipo=tipo)
+        direccion = self._inversa_desde_cache(longitud, latitud, tipo)
+        if direccion is None:
+            direccion = self._inversa_desde_indice(longitud, latitud, tipo)
+        if direccion is not None:
+            return direccion
+        respuesta = await self._realizar_peticion(self.url_inversa, params)
+        direccion = self._procesar_direccion(respuesta)
+        self._guardar_inversa(longitud, latitud, tipo, respuesta)
+        return direccion 
\ No newline at end of file
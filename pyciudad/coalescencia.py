@@ -0,0 +1,113 @@
+"""
+Coalescencia de peticiones idénticas en curso (single-flight)
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Vuelo:
+    """Petición en curso a la que pueden esperar otros hilos."""
+    
+    __slots__ = ("evento", "resultado", "error")
+    
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class CoalescedorPeticiones:
+    """
+    Agrupa las peticiones idénticas que se realizan a la vez desde varios hilos.
+    
+    Mientras una petición con una clave determinada está en curso, los demás
+    hilos que piden la misma clave esperan a que termine y reciben una copia
+    de su resultado (o la misma excepción) en lugar de repetir la petición.
+    """
+    
+    def __init__(self):
+        self._en_curso: Dict[str, _Vuelo] = {}
+        self._cerrojo = threading.Lock()
+        self.coalescidas = 0
+    
+    def ejecutar(self, clave: str, funcion: Callable[[], Any]) -> Any:
+        """
+        Ejecuta la función o espera al resultado de otra ejecución con la misma clave.
+        
+        Args:
+            clave: Clave que identifica la petición
+            funcion: Función que realiza la petición
+            
+        Returns:
+            Resultado de la función
+        """
+        with self._cerrojo:
+            vuelo = self._en_curso.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_curso[clave] = _Vuelo()
+            else:
+                self.coalescidas += 1
+        
+        if not lider:
+            vuelo.evento.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return copy.deepcopy(vuelo.resultado)
+        
+        try:
+            vuelo.resultado = funcion()
+            return vuelo.resultado
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._cerrojo:
+                del self._en_curso[clave]
+            vuelo.evento.set()
+
+
+class CoalescedorPeticionesAsync:
+    """
+    Agrupa las peticiones idénticas que se realizan a la vez desde varias corrutinas.
+    
+    Equivalente a CoalescedorPeticiones para un bucle de eventos de asyncio.
+    La petición se ejecuta en una tarea propia a la que todas las corrutinas
+    esperan a través de asyncio.shield: si se cancela una de ellas (también
+    la primera), las demás siguen esperando y la petición no se interrumpe.
+    """
+    
+    def __init__(self):
+        self._en_curso: Dict[str, asyncio.Task] = {}
+        self.coalescidas = 0
+    
+    async def ejecutar(self, clave: str, funcion: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta la corrutina o espera al resultado de otra ejecución con la misma clave.
+        
+        Args:
+            clave: Clave que identifica la petición
+            funcion: Función sin argumentos que devuelve la corrutina de la petición
+            
+        Returns:
+            Resultado de la corrutina
+        """
+        tarea = self._en_curso.get(clave)
+        if tarea is not None:
+            self.coalescidas += 1
+            return copy.deepcopy(await asyncio.shield(tarea))
+        
+        tarea = asyncio.ensure_future(funcion())
+        self._en_curso[clave] = tarea
+        tarea.add_done_callback(lambda t: self._terminar(clave, t))
+        return await asyncio.shield(tarea)
+    
+    def _terminar(self, clave: str, tarea: asyncio.Task) -> None:
+        """Retira la tarea terminada y recupera su excepción si nadie la esperaba."""
+        if self._en_curso.get(clave) is tarea:
+            del self._en_curso[clave]
+        if not tarea.cancelled():
+            tarea.exception() 
\ No newline at end of file
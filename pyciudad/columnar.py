@@ -0,0 +1,324 @@
+"""
+Contenedor columnar para los resultados de las consultas por lotes
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .lote import ResultadoLote
+
+# Valores de la columna de estado
+ESTADO_CORRECTO = 0
+ESTADO_ERROR = 1
+
+# Columnas de texto codificadas como diccionario (atributo del modelo)
+COLUMNAS_CATEGORICAS = ("muni", "province", "postalCode", "type")
+
+
+def _importar_numpy():
+    """Importa numpy, que sólo es necesario para exportar a arrays."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "La exportación a NumPy requiere el paquete 'numpy'. "
+            "Instálalo con: pip install pyciudad[numpy]"
+        ) from e
+    return numpy
+
+
+def _importar_pyarrow():
+    """Importa pyarrow, que sólo es necesario para exportar a Arrow."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "La exportación a Arrow requiere el paquete 'pyarrow'. "
+            "Instálalo con: pip install pyciudad[arrow]"
+        ) from e
+    return pyarrow
+
+
+def _importar_pandas():
+    """Importa pandas, que sólo es necesario para exportar a DataFrame."""
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError(
+            "La exportación a pandas requiere el paquete 'pandas'. "
+            "Instálalo con: pip install pyciudad[pandas]"
+        ) from e
+    return pandas
+
+
+class ColumnaCategorica:
+    """
+    Columna de texto codificada como diccionario.
+    
+    Cada valor distinto se guarda una sola vez en categorias y la columna
+    almacena su posición como entero de 32 bits; los valores nulos se
+    codifican como -1. Es la misma representación que pandas.Categorical y
+    pyarrow.DictionaryArray, por lo que la exportación no recorre los valores.
+    """
+    
+    def __init__(self):
+        self.codigos = array("i")
+        self.categorias: List[str] = []
+        self._posiciones: Dict[str, int] = {}
+    
+    def agregar(self, valor: Optional[str]) -> None:
+        """Añade un valor al final de la columna."""
+        if valor is None:
+            self.codigos.append(-1)
+            return
+        posicion = self._posiciones.get(valor)
+        if posicion is None:
+            posicion = self._posiciones[valor] = len(self.categorias)
+            self.categorias.append(valor)
+        self.codigos.append(posicion)
+    
+    def __len__(self) -> int:
+        return len(self.codigos)
+    
+    def __getitem__(self, indice: int) -> Optional[str]:
+        codigo = self.codigos[indice]
+        return None if codigo < 0 else self.categorias[codigo]
+
+
+class ResultadosColumnares:
+    """
+    Resultados de un lote almacenados por columnas.
+    
+    Las coordenadas se guardan en arrays contiguos de float64 (NaN si no hay
+    resultado), los textos repetitivos (municipio, provincia, código postal y
+    tipo) como columnas categóricas y el estado de cada fila en un array de
+    bytes, con el mensaje de error sólo para las filas fallidas. Las filas
+    siguen el orden de las entradas del lote.
+    
+    Ejemplo:
+        resultados = cliente.geocodificar_lote(direcciones, columnar=True)
+        columnas = resultados.a_numpy()
+        columnas["lat"].mean()
+    """
+    
+    def __init__(self):
+        self.lat = array("d")
+        self.lng = array("d")
+        self.estado = array("b")
+        self.errores: Dict[int, str] = {}
+        self.categoricas: Dict[str, ColumnaCategorica] = {
+            nombre: ColumnaCategorica() for nombre in COLUMNAS_CATEGORICAS
+        }
+    
+    @classmethod
+    def desde_lote(cls, resultados: Iterable[ResultadoLote]) -> "ResultadosColumnares":
+        """
+        Construye el contenedor a partir de los resultados de un lote.
+        
+        Args:
+            resultados: ResultadoLote en orden de entrada (lista o iterador)
+            
+        Returns:
+            ResultadosColumnares con una fila por resultado
+        """
+        columnas = cls()
+        for resultado in resultados:
+            if resultado.correcto:
+                columnas.agregar(resultado.resultado)
+            else:
+                columnas.agregar_error(resultado.error)
+        return columnas
+    
+    @classmethod
+    def desde_modelos(cls, entidades: Iterable[Any]) -> "ResultadosColumnares":
+        """
+        Construye el contenedor a partir de modelos (Candidato, Ubicacion, Direccion).
+        
+        Args:
+            entidades: Modelos o registros con los campos de la API
+            
+        Returns:
+            ResultadosColumnares con una fila por entidad
+        """
+        columnas = cls()
+        for entidad in entidades:
+            columnas.agregar(entidad)
+        return columnas
+    
+    def agregar(self, entidad: Any) -> None:
+        """Añade una fila correcta con los campos de la entidad."""
+        lat = getattr(entidad, "lat", None)
+        lng = getattr(entidad, "lng", None)
+        self.lat.append(math.nan if lat is None else lat)
+        self.lng.append(math.nan if lng is None else lng)
+        self.estado.append(ESTADO_CORRECTO)
+        for nombre, columna in self.categoricas.items():
+            columna.agregar(getattr(entidad, nombre, None))
+    
+    def agregar_error(self, error: Any) -> None:
+        """Añade una fila fallida con el mensaje del error."""
+        self.errores[len(self.estado)] = str(error)
+        self.lat.append(math.nan)
+        self.lng.append(math.nan)
+        self.estado.append(ESTADO_ERROR)
+        for columna in self.categoricas.values():
+            columna.agregar(None)
+    
+    def __len__(self) -> int:
+        return len(self.estado)
+    
+    @property
+    def correctos(self) -> int:
+        """Número de filas sin error."""
+        return len(self.estado) - len(self.errores)
+    
+    def fila(self, indice: int) -> Dict[str, Any]:
+        """
+        Devuelve una fila como diccionario.
+        
+        Args:
+            indice: Posición de la fila
+            
+        Returns:
+            Diccionario con lat, lng, estado, error y las columnas categóricas
+        """
+        if indice < 0:
+            indice += len(self)
+        fila = {
+            "lat": self.lat[indice],
+            "lng": self.lng[indice],
+            "estado": self.estado[indice],
+            "error": self.errores.get(indice),
+        }
+        for nombre, columna in self.categoricas.items():
+            fila[nombre] = columna[indice]
+        return fila
+    
+    def tomar(self, indices: Any) -> "ResultadosColumnares":
+        """
+        Construye un contenedor nuevo con las filas indicadas, que pueden repetirse.
+        
+        Es la operación take de NumPy: la fila i del resultado es la fila
+        indices[i] de este contenedor. Sirve para repartir los resultados de
+        consultas deduplicadas a las posiciones originales.
+        
+        Args:
+            indices: Array o secuencia de posiciones de fila
+            
+        Returns:
+            ResultadosColumnares con len(indices) filas
+            
+        Raises:
+            ImportError: Si numpy no está instalado
+        """
+        np = _importar_numpy()
+        indices = np.asarray(indices, dtype=np.intp)
+        tomados = ResultadosColumnares()
+        tomados.lat.frombytes(np.frombuffer(self.lat, dtype=np.float64)[indices].tobytes())
+        tomados.lng.frombytes(np.frombuffer(self.lng, dtype=np.float64)[indices].tobytes())
+        estado = np.frombuffer(self.estado, dtype=np.int8)[indices]
+        tomados.estado.frombytes(estado.tobytes())
+        for posicion in np.flatnonzero(estado == ESTADO_ERROR).tolist():
+            tomados.errores[posicion] = self.errores[int(indices[posicion])]
+        for nombre, columna in self.categoricas.items():
+            nueva = tomados.categoricas[nombre]
+            nueva.categorias = list(columna.categorias)
+            nueva._posiciones = dict(columna._posiciones)
+            nueva.codigos.frombytes(np.frombuffer(columna.codigos, dtype=np.int32)[indices].tobytes())
+        return tomados
+    
+    def columna_errores(self) -> List[Optional[str]]:
+        """Devuelve la columna de errores completa (None en las filas correctas)."""
+        errores = [None] * len(self)
+        for indice, mensaje in self.errores.items():
+            errores[indice] = mensaje
+        return errores
+    
+    def a_numpy(self) -> Dict[str, Any]:
+        """
+        Exporta las columnas a arrays de NumPy.
+        
+        Las columnas lat, lng y estado, y los códigos de las categóricas, son
+        vistas sobre la memoria del contenedor (sin copia), por lo que no deben
+        añadirse filas mientras se usen.
+        
+        Returns:
+            Diccionario con "lat", "lng" (float64), "estado" (int8), "error"
+            (object) y, por cada columna categórica, una tupla
+            (códigos int32, categorías)
+            
+        Raises:
+            ImportError: Si numpy no está instalado
+        """
+        np = _importar_numpy()
+        columnas: Dict[str, Any] = {
+            "lat": np.frombuffer(self.lat, dtype=np.float64),
+            "lng": np.frombuffer(self.lng, dtype=np.float64),
+            "estado": np.frombuffer(self.estado, dtype=np.int8),
+            "error": np.array(self.columna_errores(), dtype=object),
+        }
+        for nombre, columna in self.categoricas.items():
+            columnas[nombre] = self._codigos_numpy(np, columna)
+        return columnas
+    
+    @staticmethod
+    def _codigos_numpy(np, columna: ColumnaCategorica) -> Tuple[Any, List[str]]:
+        """Devuelve los códigos de una columna categórica como vista int32 y sus categorías."""
+        return np.frombuffer(columna.codigos, dtype=np.int32), list(columna.categorias)
+    
+    def a_arrow(self):
+        """
+        Exporta las columnas a una tabla de Apache Arrow.
+        
+        Las columnas numéricas comparten memoria con el contenedor y las
+        categóricas se exportan como DictionaryArray.
+        
+        Returns:
+            pyarrow.Table
+            
+        Raises:
+            ImportError: Si pyarrow o numpy no están instalados
+        """
+        pa = _importar_pyarrow()
+        np = _importar_numpy()
+        n = len(self)
+        columnas = {
+            "lat": pa.Array.from_buffers(pa.float64(), n, [None, pa.py_buffer(self.lat)]),
+            "lng": pa.Array.from_buffers(pa.float64(), n, [None, pa.py_buffer(self.lng)]),
+            "estado": pa.Array.from_buffers(pa.int8(), n, [None, pa.py_buffer(self.estado)]),
+            "error": pa.array(self.columna_errores(), type=pa.string()),
+        }
+        for nombre, columna in self.categoricas.items():
+            codigos, categorias = self._codigos_numpy(np, columna)
+            columnas[nombre] = pa.DictionaryArray.from_arrays(
+                pa.array(codigos, mask=codigos < 0),
+                pa.array(categorias, type=pa.string())
+            )
+        return pa.table(columnas)
+    
+    def a_pandas(self):
+        """
+        Exporta las columnas a un DataFrame de pandas.
+        
+        Las columnas categóricas se exportan como pandas.Categorical.
+        
+        Returns:
+            pandas.DataFrame
+            
+        Raises:
+            ImportError: Si pandas o numpy no están instalados
+        """
+        pd = _importar_pandas()
+        np = _importar_numpy()
+        columnas = self.a_numpy()
+        datos: Dict[str, Any] = {
+            "lat": columnas["lat"],
+            "lng": columnas["lng"],
+            "estado": columnas["estado"],
+            "error": columnas["error"],
+        }
+        for nombre in self.categoricas:
+            codigos, categorias = columnas[nombre]
+            datos[nombre] = pd.Categorical.from_codes(codigos, categories=np.array(categorias, dtype=object))
+        return pd.DataFrame(datos) 
\ No newline at end of file
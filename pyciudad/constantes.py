@@ -12,6 +12,87 @@ REVERSE_GEOCODE_URL = f"{BASE_URL}/reverseGeocode"
 DEFAULT_COUNTRY_CODE = "es"
 DEFAULT_LIMIT = 10  # Aunque la API permite hasta 33
 
+# Pool de conexiones HTTP
+DEFAULT_POOL_CONEXIONES = 10  # Número de pools (hosts) que se mantienen en caché
+DEFAULT_MAX_CONEXIONES_HOST = 10  # Conexiones keep-alive por host
+
+# Cliente asíncrono
+DEFAULT_MAX_CONCURRENCIA_ASYNC = 100  # Peticiones simultáneas en curso
+
+# Consultas por lotes
+DEFAULT_CONCURRENCIA_LOTE = 8  # Hilos trabajando en paralelo
+DEFAULT_PRECISION_PUNTOS = 5.0  # Metros de lado de las celdas que agrupan puntos casi iguales
+
+# Rango válido de coordenadas (aproximado para España, con margen)
+RANGO_LONGITUD = (-10.0, 5.0)
+RANGO_LATITUD = (35.0, 44.0)
+
+# Caché de respuestas
+DEFAULT_MAX_ENTRADAS_CACHE = 10000
+DEFAULT_TTL_CACHE = 3600  # Segundos
+DEFAULT_CELDA_CACHE_INVERSA = 10.0  # Metros de lado de la rejilla de la caché inversa
+
+# Reintentos
+DEFAULT_MAX_REINTENTOS = 3
+DEFAULT_ESPERA_BASE_REINTENTO = 0.5  # Segundos
+DEFAULT_ESPERA_MAXIMA_REINTENTO = 30.0  # Segundos
+CODIGOS_HTTP_REINTENTABLES = (429, 500, 502, 503, 504)
+
+# Autocompletado
+DEFAULT_ESPERA_AUTOCOMPLETADO = 0.15  # Segundos sin teclear antes de consultar la API
+DEFAULT_MIN_CARACTERES_AUTOCOMPLETADO = 3
+DEFAULT_MAX_PREFIJOS_AUTOCOMPLETADO = 1000  # Prefijos guardados en el trie
+DEFAULT_TTL_AUTOCOMPLETADO = 300  # Segundos
+
+# Métricas: límites superiores (en segundos) de los cubos de los histogramas de latencia
+CUBOS_LATENCIA = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Origen de los resultados
+ORIGEN_API = "api"
+ORIGEN_CACHE = "cache"
+ORIGEN_NOMENCLATOR = "nomenclator"
+ORIGEN_INDICE = "indice"
+
+# Índice de direcciones conocidas para la geocodificación inversa
+DEFAULT_DISTANCIA_INDICE = 5.0  # Metros hasta la dirección conocida más cercana
+TIPOS_INDICE_DIRECCIONES = ("portal",)
+
+# Nomenclátor local: tipos de entidad administrativa, en orden de preferencia
+# cuando un mismo nombre corresponde a varias (Madrid municipio, provincia...)
+TIPOS_ADMINISTRATIVOS = ("municipio", "provincia", "comunidad autonoma", "poblacion")
+DEFAULT_UMBRAL_SIMILITUD = 0.6  # Similitud mínima (coeficiente de Dice de trigramas)
+
+# Normalización de consultas: abreviaturas de tipo de vía al inicio de la
+# consulta (sin puntos finales) y el tipo de vía completo al que equivalen
+ABREVIATURAS_VIA = {
+    "c/": "calle",
+    "c.": "calle",
+    "cl": "calle",
+    "cl/": "calle",
+    "avda": "avenida",
+    "avd": "avenida",
+    "av": "avenida",
+    "pza": "plaza",
+    "plza": "plaza",
+    "pl": "plaza",
+    "pº": "paseo",
+    "p.º": "paseo",
+    "ps": "paseo",
+    "pso": "paseo",
+    "ctra": "carretera",
+    "rda": "ronda",
+    "trva": "travesia",
+    "trav": "travesia",
+    "gta": "glorieta",
+    "cmno": "camino",
+    "cno": "camino",
+    "urb": "urbanizacion",
+    "pje": "pasaje",
+}
+
 # Tipos de filtros
 FILTROS_TIPO_ENTIDAD = {
     "municipio": "municipio",
@@ -0,0 +1,61 @@
+"""
+Decodificación de las respuestas JSON de la API
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+# Función que convierte el cuerpo de una respuesta (bytes) en objetos Python
+Decodificador = Callable[[bytes], Any]
+
+
+def _decodificador_orjson() -> Optional[Decodificador]:
+    """Devuelve orjson.loads si orjson está instalado."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+DECODIFICADORES = {
+    "json": json.loads,
+}
+_orjson = _decodificador_orjson()
+if _orjson is not None:
+    DECODIFICADORES["orjson"] = _orjson
+
+# Decodificador por defecto: el más rápido disponible
+NOMBRE_DECODIFICADOR = "orjson" if "orjson" in DECODIFICADORES else "json"
+decodificar_json: Decodificador = DECODIFICADORES[NOMBRE_DECODIFICADOR]
+
+
+def obtener_decodificador(decodificador: Optional[Any] = None) -> Decodificador:
+    """
+    Resuelve el decodificador JSON a utilizar.
+    
+    Los decodificadores reciben directamente los bytes de la respuesta, sin
+    construir antes una cadena de texto, y deben lanzar ValueError (o una
+    subclase, como json.JSONDecodeError) si el contenido no es JSON válido.
+    
+    Args:
+        decodificador: None para el más rápido disponible, el nombre de uno
+            registrado ("json", "orjson") o una función bytes -> objeto
+            
+    Returns:
+        Función de decodificación
+        
+    Raises:
+        ValueError: Si el nombre no corresponde a ningún decodificador disponible
+    """
+    if decodificador is None:
+        return decodificar_json
+    if callable(decodificador):
+        return decodificador
+    try:
+        return DECODIFICADORES[decodificador]
+    except KeyError:
+        raise ValueError(
+            f"Decodificador JSON no disponible: {decodificador}. "
+            f"Disponibles: {', '.join(sorted(DECODIFICADORES))}"
+        ) from None 
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Utilidades espaciales: distancias y rejilla de búsqueda de vecinos
+"""
+
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Radio medio de la Tierra en metros
+RADIO_TIERRA = 6371008.8
+# Metros por grado de latitud (aproximación esférica)
+METROS_POR_GRADO = math.pi * RADIO_TIERRA / 180.0
+
+
+def distancia_metros(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """
+    Calcula la distancia de círculo máximo entre dos puntos.
+    
+    Args:
+        lon1: Longitud del primer punto en grados decimales
+        lat1: Latitud del primer punto en grados decimales
+        lon2: Longitud del segundo punto en grados decimales
+        lat2: Latitud del segundo punto en grados decimales
+        
+    Returns:
+        Distancia en metros (fórmula del haversine)
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RADIO_TIERRA * math.asin(min(1.0, math.sqrt(a)))
+
+
+class RejillaEspacial:
+    """
+    Índice espacial de puntos sobre una rejilla de celdas de tamaño fijo en metros.
+    
+    Cada fila de la rejilla usa la escala de longitud de su latitud central,
+    de modo que las celdas miden aproximadamente celda_metros de lado en
+    cualquier punto de España. Las búsquedas de vecinos recorren sólo las
+    celdas que pueden contener puntos dentro del radio pedido.
+    """
+    
+    def __init__(self, celda_metros: float = 10.0):
+        """
+        Args:
+            celda_metros: Lado de las celdas de la rejilla, en metros
+        """
+        if celda_metros <= 0:
+            raise ValueError("celda_metros debe ser mayor que 0")
+        self.celda_metros = celda_metros
+        self._celdas: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self._total = 0
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def _escala_fila(self, fila: int) -> float:
+        """Metros por grado de longitud en la latitud central de una fila."""
+        latitud = (fila + 0.5) * self.celda_metros / METROS_POR_GRADO
+        return METROS_POR_GRADO * max(math.cos(math.radians(latitud)), 1e-6)
+    
+    def celda(self, longitud: float, latitud: float) -> Tuple[int, int]:
+        """
+        Devuelve la celda (columna, fila) a la que pertenece un punto.
+        
+        Args:
+            longitud: Longitud en grados decimales
+            latitud: Latitud en grados decimales
+            
+        Returns:
+            Tupla con los índices enteros de la celda
+        """
+        fila = math.floor(latitud * METROS_POR_GRADO / self.celda_metros)
+        columna = math.floor(longitud * self._escala_fila(fila) / self.celda_metros)
+        return (columna, fila)
+    
+    def insertar(self, longitud: float, latitud: float, valor: Any) -> Tuple[int, int]:
+        """
+        Inserta un punto con un valor asociado.
+        
+        Returns:
+            Celda en la que se ha guardado el punto
+        """
+        clave = self.celda(longitud, latitud)
+        self._celdas.setdefault(clave, []).append((longitud, latitud, valor))
+        self._total += 1
+        return clave
+    
+    def eliminar(self, longitud: float, latitud: float, valor: Any) -> bool:
+        """
+        Elimina un punto previamente insertado (comparando el valor por identidad).
+        
+        Returns:
+            True si el punto se encontró y se eliminó
+        """
+        clave = self.celda(longitud, latitud)
+        puntos = self._celdas.get(clave)
+        if not puntos:
+            return False
+        for i, (_, _, guardado) in enumerate(puntos):
+            if guardado is valor:
+                del puntos[i]
+                self._total -= 1
+                if not puntos:
+                    del self._celdas[clave]
+                return True
+        return False
+    
+    def vecinos(
+        self,
+        longitud: float,
+        latitud: float,
+        radio_metros: float
+    ) -> Iterator[Tuple[float, float, float, Any]]:
+        """
+        Recorre los puntos situados a menos de radio_metros de un punto.
+        
+        Yields:
+            Tuplas (distancia, longitud, latitud, valor) sin un orden concreto
+        """
+        columna, fila = self.celda(longitud, latitud)
+        alcance = math.ceil(radio_metros / self.celda_metros)
+        for df in range(-alcance, alcance + 1):
+            fila_vecina = fila + df
+            # La escala varía de una fila a otra: se calcula la columna en cada fila
+            columna_fila = math.floor(longitud * self._escala_fila(fila_vecina) / self.celda_metros)
+            for dc in range(-alcance - 1, alcance + 2):
+                puntos = self._celdas.get((columna_fila + dc, fila_vecina))
+                if not puntos:
+                    continue
+                for lon, lat, valor in puntos:
+                    distancia = distancia_metros(longitud, latitud, lon, lat)
+                    if distancia <= radio_metros:
+                        yield (distancia, lon, lat, valor)
+    
+    def mas_cercano(
+        self,
+        longitud: float,
+        latitud: float,
+        radio_metros: float
+    ) -> Optional[Tuple[float, float, float, Any]]:
+        """
+        Busca el punto más cercano dentro de un radio.
+        
+        Returns:
+            Tupla (distancia, longitud, latitud, valor) o None si no hay ninguno
+        """
+        return min(self.vecinos(longitud, latitud, radio_metros), key=lambda v: v[0], default=None)
+    
+    def limpiar(self) -> None:
+        """Elimina todos los puntos de la rejilla."""
+        self._celdas.clear()
+        self._total = 0 
\ No newline at end of file
@@ -8,11 +8,19 @@ class CartoCiudadError(Exception):
 
 
 class APIError(CartoCiudadError):
-    """Excepción para errores de la API de CartoCiudad."""
+    """
+    Excepción para errores de la API de CartoCiudad.
     
-    def __init__(self, mensaje="Error en la API de CartoCiudad", codigo=None, respuesta=None):
+    El atributo reintentos indica cuántas veces se reintentó la petición
+    antes de darla por fallida, y retry_after los segundos de espera que
+    indicó el servidor en la cabecera Retry-After, si los hubo.
+    """
+    
+    def __init__(self, mensaje="Error en la API de CartoCiudad", codigo=None, respuesta=None, retry_after=None):
         self.codigo = codigo
         self.respuesta = respuesta
+        self.retry_after = retry_after
+        self.reintentos = 0
         super().__init__(f"{mensaje} (Código: {codigo})")
 
 
@@ -24,4 +32,25 @@ class PeticionInvalidaError(CartoCiudadError):
         mensaje_completo = mensaje
         if parametro:
             mensaje_completo += f" - Parámetro inválido: {parametro}"
-        super().__init__(mensaje_completo) 
\ No newline at end of file
+        super().__init__(mensaje_completo)
+
+
+class ErrorTransporte(CartoCiudadError):
+    """
+    Excepción de los transportes cuando la petición no obtiene respuesta.
+    
+    Los transportes traducen los errores de su librería HTTP a esta
+    excepción (o a sus subclases) encadenando el error original, y el
+    cliente la convierte en APIError.
+    """
+    pass
+
+
+class ErrorConexion(ErrorTransporte):
+    """No se pudo conectar con el servidor o la conexión se cortó."""
+    pass
+
+
+class ErrorTimeout(ErrorTransporte):
+    """El servidor no respondió dentro del tiempo máximo."""
+    pass 
\ No newline at end of file
@@ -0,0 +1,620 @@
+"""
+Motor de geometrías WKT y GeoJSON para las respuestas de CartoCiudad
+"""
+
+import math
+import re
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy es opcional
+    np = None
+
+# Tipos de geometría soportados (nombre WKT en mayúsculas)
+TIPOS_GEOMETRIA = (
+    "POINT",
+    "LINESTRING",
+    "POLYGON",
+    "MULTIPOINT",
+    "MULTILINESTRING",
+    "MULTIPOLYGON",
+)
+
+# Equivalencia entre los tipos GeoJSON y WKT
+TIPOS_GEOJSON = {
+    "Point": "POINT",
+    "LineString": "LINESTRING",
+    "Polygon": "POLYGON",
+    "MultiPoint": "MULTIPOINT",
+    "MultiLineString": "MULTILINESTRING",
+    "MultiPolygon": "MULTIPOLYGON",
+}
+
+# Profundidad de paréntesis a la que están los grupos de coordenadas de cada
+# tipo; MULTIPOINT admite además la forma sin paréntesis por punto (1)
+_PROFUNDIDAD_WKT = {
+    "POINT": 1,
+    "LINESTRING": 1,
+    "POLYGON": 2,
+    "MULTIPOINT": 2,
+    "MULTILINESTRING": 2,
+    "MULTIPOLYGON": 3,
+}
+
+# Texto permitido entre dos grupos de coordenadas, antes del primero y tras el último
+_ENTRE_GRUPOS = re.compile(r"[\s)]*,[\s(]*")
+_ANTES_DEL_PRIMERO = re.compile(r"[\s(]*")
+_TRAS_EL_ULTIMO = re.compile(r"[\s)]*")
+
+_CABECERA_WKT = re.compile(r"\s*(?:SRID=\d+\s*;\s*)?([A-Za-z]+?)\s*(ZM|Z|M)?\s*(?=\(|EMPTY\b)", re.IGNORECASE)
+
+# Valores por vértice que exige cada etiqueta de dimensión WKT (sin etiqueta
+# se deduce del primer vértice)
+_DIMENSIONES_WKT = {"Z": 3, "ZM": 4}
+
+
+class Geometria:
+    """
+    Geometría simple o múltiple con las coordenadas en un único bloque contiguo.
+    
+    Los vértices de todas las partes se guardan seguidos en coordenadas: un
+    array de NumPy de forma (vértices, dimensión) si NumPy está instalado o,
+    si no, un array('d') plano. Cada anillo (anillo de polígono, línea o punto)
+    es un rango de vértices [inicio, fin) y cada parte es la lista de sus
+    anillos; en los polígonos el primer anillo de cada parte es el exterior
+    y el resto son huecos.
+    
+    Los valores derivados (bbox, centroide y punto representativo) se calculan
+    en la primera llamada y se memorizan, por lo que las coordenadas no deben
+    modificarse después de crear la geometría.
+    
+    Attributes:
+        tipo: Tipo WKT en mayúsculas ("POINT", "POLYGON", "MULTIPOLYGON"...)
+        dimension: Número de valores por vértice (2, 3 o 4)
+        coordenadas: Vértices de la geometría
+        anillos: Rangos (inicio, fin) de vértices de cada anillo
+        partes: Índices en anillos de los anillos de cada parte
+    """
+    
+    __slots__ = ("tipo", "dimension", "coordenadas", "anillos", "partes", "_calculados")
+    
+    def __init__(
+        self,
+        tipo: str,
+        coordenadas: Any,
+        anillos: List[Tuple[int, int]],
+        partes: List[List[int]],
+        dimension: int = 2
+    ):
+        self.tipo = tipo
+        self.dimension = dimension
+        self.coordenadas = coordenadas
+        self.anillos = anillos
+        self.partes = partes
+        self._calculados: Dict[str, Any] = {}
+    
+    def __len__(self) -> int:
+        """Número de vértices de la geometría."""
+        return self.anillos[-1][1] if self.anillos else 0
+    
+    def __repr__(self) -> str:
+        return f"Geometria({self.tipo}, partes={len(self.partes)}, vertices={len(self)})"
+    
+    @property
+    def vacia(self) -> bool:
+        """Indica si la geometría no tiene vértices."""
+        return not self.anillos
+    
+    def xy(self, anillo: Optional[int] = None) -> Tuple[Sequence[float], Sequence[float]]:
+        """
+        Devuelve las longitudes (x) y latitudes (y) de un anillo o de toda la geometría.
+        
+        Con NumPy son vistas sobre coordenadas, sin copia.
+        
+        Args:
+            anillo: Índice del anillo, o None para todos los vértices
+            
+        Returns:
+            Tupla (xs, ys)
+        """
+        inicio, fin = (0, len(self)) if anillo is None else self.anillos[anillo]
+        if np is not None and isinstance(self.coordenadas, np.ndarray):
+            return self.coordenadas[inicio:fin, 0], self.coordenadas[inicio:fin, 1]
+        d = self.dimension
+        return (
+            self.coordenadas[inicio * d:fin * d:d],
+            self.coordenadas[inicio * d + 1:fin * d:d],
+        )
+    
+    def _memorizar(self, nombre: str, calcular) -> Any:
+        """Devuelve el valor derivado memorizado, calculándolo la primera vez."""
+        try:
+            return self._calculados[nombre]
+        except KeyError:
+            valor = self._calculados[nombre] = calcular()
+            return valor
+    
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Calcula el rectángulo envolvente.
+        
+        Returns:
+            Tupla (x_min, y_min, x_max, y_max) o None si la geometría está vacía
+        """
+        return self._memorizar("bbox", self._calcular_bbox)
+    
+    def _calcular_bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        if self.vacia:
+            return None
+        xs, ys = self.xy()
+        if np is not None and isinstance(xs, np.ndarray):
+            return (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+        return (min(xs), min(ys), max(xs), max(ys))
+    
+    def centroide(self) -> Optional[Tuple[float, float]]:
+        """
+        Calcula el centroide de la geometría.
+        
+        Para polígonos se pondera por área (restando los huecos), para líneas
+        por longitud y para puntos es la media. Si la geometría es degenerada
+        (área o longitud nula) se usa la media de los vértices.
+        
+        Returns:
+            Tupla (x, y) o None si la geometría está vacía
+        """
+        return self._memorizar("centroide", self._calcular_centroide)
+    
+    def _calcular_centroide(self) -> Optional[Tuple[float, float]]:
+        if self.vacia:
+            return None
+        
+        peso_total = sx = sy = 0.0
+        if self.tipo in ("POLYGON", "MULTIPOLYGON"):
+            for parte in self.partes:
+                for posicion, anillo in enumerate(parte):
+                    area, cx, cy = _area_centroide_anillo(*self.xy(anillo))
+                    area = abs(area) if posicion == 0 else -abs(area)
+                    peso_total += area
+                    sx += area * cx
+                    sy += area * cy
+        elif self.tipo in ("LINESTRING", "MULTILINESTRING"):
+            for anillo in range(len(self.anillos)):
+                longitud, cx, cy = _longitud_centroide_linea(*self.xy(anillo))
+                peso_total += longitud
+                sx += longitud * cx
+                sy += longitud * cy
+        
+        if peso_total > 0:
+            return (sx / peso_total, sy / peso_total)
+        xs, ys = self.xy()
+        if np is not None and isinstance(xs, np.ndarray):
+            return (float(xs.mean()), float(ys.mean()))
+        return (sum(xs) / len(xs), sum(ys) / len(ys))
+    
+    def punto_representativo(self) -> Optional[Tuple[float, float]]:
+        """
+        Devuelve un punto que está garantizado sobre la geometría.
+        
+        A diferencia del centroide, que puede caer fuera de un polígono cóncavo
+        o lejos de una línea curva, este punto está dentro del polígono más
+        grande (fuera de sus huecos), sobre la línea más larga (a mitad de su
+        longitud) o es el primer punto.
+        
+        Returns:
+            Tupla (x, y) o None si la geometría está vacía
+        """
+        return self._memorizar("punto_representativo", self._calcular_punto_representativo)
+    
+    def _calcular_punto_representativo(self) -> Optional[Tuple[float, float]]:
+        if self.vacia:
+            return None
+        
+        if self.tipo in ("POLYGON", "MULTIPOLYGON"):
+            parte = max(self.partes, key=lambda p: abs(_area_centroide_anillo(*self.xy(p[0]))[0]))
+            anillos = [self.xy(anillo) for anillo in parte]
+            area, cx, cy = _area_centroide_anillo(*anillos[0])
+            if area != 0 and _dentro_de_anillos(cx, cy, anillos):
+                return (cx, cy)
+            return _punto_interior_por_barrido(anillos)
+        
+        if self.tipo in ("LINESTRING", "MULTILINESTRING"):
+            anillo = max(range(len(self.anillos)), key=lambda a: _longitud_centroide_linea(*self.xy(a))[0])
+            return _punto_a_mitad(*self.xy(anillo))
+        
+        xs, ys = self.xy(0)
+        return (float(xs[0]), float(ys[0]))
+    
+    def a_geojson(self) -> Dict[str, Any]:
+        """
+        Convierte la geometría en un diccionario GeoJSON.
+        
+        Returns:
+            Diccionario con las claves "type" y "coordinates"
+        """
+        tipo = next(nombre for nombre, wkt in TIPOS_GEOJSON.items() if wkt == self.tipo)
+        d = self.dimension
+        
+        def posiciones(anillo):
+            inicio, fin = self.anillos[anillo]
+            if np is not None and isinstance(self.coordenadas, np.ndarray):
+                return self.coordenadas[inicio:fin].tolist()
+            plano = self.coordenadas[inicio * d:fin * d]
+            return [list(plano[i:i + d]) for i in range(0, len(plano), d)]
+        
+        partes = [[posiciones(anillo) for anillo in parte] for parte in self.partes]
+        if self.tipo == "POINT":
+            coordenadas = partes[0][0][0] if partes else []
+        elif self.tipo == "LINESTRING":
+            coordenadas = partes[0][0] if partes else []
+        elif self.tipo == "POLYGON":
+            coordenadas = partes[0] if partes else []
+        elif self.tipo == "MULTIPOINT":
+            coordenadas = [parte[0][0] for parte in partes]
+        elif self.tipo == "MULTILINESTRING":
+            coordenadas = [parte[0] for parte in partes]
+        else:
+            coordenadas = partes
+        return {"type": tipo, "coordinates": coordenadas}
+
+
+def parsear_wkt(texto: str) -> Geometria:
+    """
+    Convierte una geometría WKT en una Geometria.
+    
+    El texto se recorre una sola vez: se localizan los grupos de coordenadas
+    más internos (con str.find, sin expresiones regulares), se anotan sus
+    rangos de vértices y todos los números se convierten de una vez con
+    NumPy, sin crear un float de Python por vértice.
+    Sin NumPy se usa array('d') como alternativa.
+    
+    Todos los vértices deben tener el mismo número de valores: el que marca
+    la etiqueta Z (3) o ZM (4) o, sin etiqueta, el del primer vértice. Las
+    geometrías con medidas y sin Z ("POINT M (1 2 3)") se rechazan, porque
+    la medida se confundiría con la altura.
+    
+    Entre los grupos de coordenadas solo puede haber paréntesis y comas, y
+    cada grupo debe estar a la profundidad que exige el tipo (un POLYGON
+    sin paréntesis por anillo o un grupo fuera del paréntesis exterior se
+    rechazan).
+    
+    Args:
+        texto: Geometría en formato WKT (admite el prefijo EWKT "SRID=...;")
+        
+    Returns:
+        Geometria con las coordenadas
+        
+    Raises:
+        ValueError: Si el texto no es WKT válido o el tipo no está soportado
+    """
+    cabecera = _CABECERA_WKT.match(texto)
+    if not cabecera:
+        raise ValueError("Geometría WKT inválida")
+    tipo = cabecera.group(1).upper()
+    if tipo not in _PROFUNDIDAD_WKT:
+        raise ValueError(f"Tipo de geometría WKT no soportado: {tipo}")
+    etiqueta = (cabecera.group(2) or "").upper()
+    if etiqueta == "M":
+        raise ValueError("Geometrías WKT con medidas y sin Z no soportadas")
+    
+    resto = texto[cabecera.end():]
+    if resto.strip().upper() == "EMPTY":
+        return Geometria(tipo, _coordenadas_vacias(), [], [])
+    if not resto.startswith("("):
+        raise ValueError(f"Geometría WKT inválida: {texto[:50]}")
+    
+    profundidad_grupos = _PROFUNDIDAD_WKT[tipo]
+    multiple = tipo.startswith("MULTI")
+    textos: List[str] = []
+    anillos: List[Tuple[int, int]] = []
+    partes: List[List[int]] = []
+    vertices = 0
+    profundidad = 0
+    fin_anterior = 0
+    posicion = 0
+    
+    while True:
+        # Cada grupo más interno acaba en el siguiente ")" y empieza en el
+        # último "(" anterior; si no lo hay, el ")" cierra un grupo exterior
+        cierre = resto.find(")", posicion)
+        if cierre < 0:
+            break
+        apertura = resto.rfind("(", posicion, cierre)
+        posicion = cierre + 1
+        if apertura < 0:
+            continue
+        
+        # Entre el grupo anterior y este solo puede haber ")", una coma y "(",
+        # sin salir del paréntesis exterior
+        entre = resto[fin_anterior:apertura]
+        separador = _ENTRE_GRUPOS if anillos else _ANTES_DEL_PRIMERO
+        if not separador.fullmatch(entre):
+            raise ValueError(f"Geometría WKT inválida: {texto[:50]}")
+        profundidad -= entre.count(")")
+        if anillos and profundidad < 1:
+            raise ValueError(f"Geometría WKT inválida: {texto[:50]}")
+        nueva_parte = not partes or (multiple and profundidad == 1)
+        profundidad += entre.count("(") + 1
+        
+        contenido = resto[apertura + 1:cierre]
+        n = contenido.count(",") + 1
+        if tipo == "MULTIPOINT" and profundidad == 1:
+            # Forma sin paréntesis por punto: MULTIPOINT(1 2, 3 4)
+            for i in range(n):
+                partes.append([len(anillos)])
+                anillos.append((vertices + i, vertices + i + 1))
+        else:
+            if profundidad != profundidad_grupos or (tipo.endswith("POINT") and n > 1):
+                raise ValueError(f"Geometría WKT inválida: {texto[:50]}")
+            if nueva_parte:
+                partes.append([])
+            partes[-1].append(len(anillos))
+            anillos.append((vertices, vertices + n))
+        vertices += n
+        textos.append(contenido)
+        profundidad -= 1
+        fin_anterior = posicion
+    
+    cola = resto[fin_anterior:]
+    if not anillos or not _TRAS_EL_ULTIMO.fullmatch(cola) or cola.count(")") != profundidad:
+        raise ValueError(f"Geometría WKT inválida: {texto[:50]}")
+    
+    coordenadas, dimension = _parsear_numeros(",".join(textos), vertices, _DIMENSIONES_WKT.get(etiqueta))
+    return Geometria(tipo, coordenadas, anillos, partes, dimension)
+
+
+def parsear_geojson(geojson: Dict[str, Any]) -> Geometria:
+    """
+    Convierte una geometría GeoJSON en una Geometria.
+    
+    Args:
+        geojson: Diccionario con "type" y "coordinates"
+        
+    Returns:
+        Geometria con las coordenadas
+        
+    Raises:
+        ValueError: Si el tipo no está soportado o las coordenadas no son válidas
+    """
+    tipo = TIPOS_GEOJSON.get(geojson.get("type"))
+    if tipo is None:
+        raise ValueError(f"Tipo de geometría GeoJSON no soportado: {geojson.get('type')}")
+    coordenadas = geojson.get("coordinates") or []
+    
+    # Normalizar a lista de partes, cada una lista de anillos de posiciones
+    if tipo == "POINT":
+        partes = [[[coordenadas]]] if coordenadas else []
+    elif tipo == "LINESTRING":
+        partes = [[coordenadas]] if coordenadas else []
+    elif tipo == "POLYGON":
+        partes = [coordenadas] if coordenadas else []
+    elif tipo == "MULTIPOINT":
+        partes = [[[punto]] for punto in coordenadas]
+    elif tipo == "MULTILINESTRING":
+        partes = [[linea] for linea in coordenadas]
+    else:
+        partes = coordenadas
+    
+    posiciones: List[Sequence[float]] = []
+    anillos: List[Tuple[int, int]] = []
+    indices_partes: List[List[int]] = []
+    for parte in partes:
+        indices_partes.append([])
+        for anillo in parte:
+            indices_partes[-1].append(len(anillos))
+            anillos.append((len(posiciones), len(posiciones) + len(anillo)))
+            posiciones.extend(anillo)
+    
+    if not posiciones:
+        return Geometria(tipo, _coordenadas_vacias(), [], [])
+    dimension = len(posiciones[0])
+    if dimension < 2 or any(len(p) != dimension for p in posiciones):
+        raise ValueError("Coordenadas GeoJSON inválidas")
+    try:
+        if np is not None:
+            datos = np.asarray(posiciones, dtype=np.float64)
+        else:
+            datos = array("d", (valor for posicion in posiciones for valor in posicion))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Coordenadas GeoJSON inválidas: {e}") from e
+    return Geometria(tipo, datos, anillos, indices_partes, dimension)
+
+
+def parsear_geometria(geom: Any) -> Optional[Geometria]:
+    """
+    Convierte el campo geom de una respuesta (WKT o GeoJSON) en una Geometria.
+    
+    Args:
+        geom: Cadena WKT, diccionario GeoJSON o None
+        
+    Returns:
+        Geometria, o None si geom está vacío o no es una geometría válida
+    """
+    if not geom:
+        return None
+    try:
+        if isinstance(geom, str):
+            return parsear_wkt(geom)
+        if isinstance(geom, dict):
+            return parsear_geojson(geom)
+    except ValueError:
+        return None
+    return None
+
+
+def _coordenadas_vacias() -> Any:
+    """Devuelve un bloque de coordenadas sin vértices."""
+    return np.empty((0, 2)) if np is not None else array("d")
+
+
+def _parsear_numeros(numeros: str, vertices: int, dimension: Optional[int] = None) -> Tuple[Any, int]:
+    """
+    Convierte los vértices separados por comas en el bloque de coordenadas.
+    
+    Args:
+        numeros: Vértices separados por comas, con sus valores separados por espacios
+        vertices: Número de vértices esperado
+        dimension: Valores por vértice exigidos, o None para deducirlos del primero
+        
+    Raises:
+        ValueError: Si algún número no es válido o algún vértice no tiene la dimensión
+    """
+    datos = numeros.encode()
+    if np is not None:
+        # Un valor empieza donde un carácter que no es separador sigue a un
+        # espacio, a una coma o al inicio; se cuentan los que hay entre comas
+        caracteres = np.frombuffer(datos, dtype=np.uint8)
+        comas = caracteres == ord(",")
+        separadores = comas | (caracteres <= ord(" "))
+        inicios = np.flatnonzero(~separadores & np.concatenate(([True], separadores[:-1])))
+        cortes = np.searchsorted(inicios, np.flatnonzero(comas))
+        valores_por_vertice = np.diff(np.concatenate(([0], cortes, [inicios.size])))
+    else:
+        valores_por_vertice = [len(vertice.split()) for vertice in numeros.split(",")]
+    
+    if len(valores_por_vertice) != vertices:
+        raise ValueError("Coordenadas WKT inválidas")
+    if dimension is None:
+        dimension = int(valores_por_vertice[0])
+    if np is not None:
+        distintos = bool((valores_por_vertice != dimension).any())
+    else:
+        distintos = any(valores != dimension for valores in valores_por_vertice)
+    if dimension not in (2, 3, 4) or distintos:
+        raise ValueError("Coordenadas WKT inválidas: los vértices no tienen la misma dimensión")
+    
+    try:
+        if np is not None:
+            # Todo el bloque se convierte en una sola llamada, sin objetos por valor
+            coordenadas = np.fromstring(datos.replace(b",", b" "), dtype=np.float64, sep=" ")
+        else:
+            coordenadas = array("d", map(float, datos.replace(b",", b" ").split()))
+    except ValueError as e:
+        raise ValueError(f"Coordenadas WKT inválidas: {e}") from e
+    # Las versiones de NumPy que no lanzan ValueError se detienen en el primer valor inválido
+    if len(coordenadas) != vertices * dimension:
+        raise ValueError("Coordenadas WKT inválidas")
+    if np is not None:
+        coordenadas = coordenadas.reshape(vertices, dimension)
+    return coordenadas, dimension
+
+
+def _area_centroide_anillo(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float, float]:
+    """
+    Calcula el área con signo y el centroide de un anillo (fórmula del polígono).
+    
+    Las coordenadas se trasladan al primer vértice para no perder precisión
+    con coordenadas proyectadas grandes.
+    """
+    if len(xs) == 0:
+        return 0.0, math.nan, math.nan
+    x0, y0 = float(xs[0]), float(ys[0])
+    if np is not None and isinstance(xs, np.ndarray):
+        x = xs - x0
+        y = ys - y0
+        x1 = np.roll(x, -1)
+        y1 = np.roll(y, -1)
+        cruz = x * y1 - x1 * y
+        doble_area = float(cruz.sum())
+        if doble_area == 0:
+            return 0.0, x0, y0
+        cx = float(((x + x1) * cruz).sum()) / (3 * doble_area)
+        cy = float(((y + y1) * cruz).sum()) / (3 * doble_area)
+        return doble_area / 2, cx + x0, cy + y0
+    
+    doble_area = sx = sy = 0.0
+    n = len(xs)
+    for i in range(n):
+        xa, ya = xs[i] - x0, ys[i] - y0
+        xb, yb = xs[(i + 1) % n] - x0, ys[(i + 1) % n] - y0
+        cruz = xa * yb - xb * ya
+        doble_area += cruz
+        sx += (xa + xb) * cruz
+        sy += (ya + yb) * cruz
+    if doble_area == 0:
+        return 0.0, x0, y0
+    return doble_area / 2, sx / (3 * doble_area) + x0, sy / (3 * doble_area) + y0
+
+
+def _longitud_centroide_linea(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float, float]:
+    """Calcula la longitud (en unidades de las coordenadas) y el centroide de una línea."""
+    if np is not None and isinstance(xs, np.ndarray):
+        dx = np.diff(xs)
+        dy = np.diff(ys)
+        tramos = np.hypot(dx, dy)
+        longitud = float(tramos.sum())
+        if longitud == 0:
+            return 0.0, math.nan, math.nan
+        cx = float((tramos * (xs[:-1] + xs[1:])).sum()) / (2 * longitud)
+        cy = float((tramos * (ys[:-1] + ys[1:])).sum()) / (2 * longitud)
+        return longitud, cx, cy
+    
+    longitud = sx = sy = 0.0
+    for i in range(len(xs) - 1):
+        tramo = math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i])
+        longitud += tramo
+        sx += tramo * (xs[i] + xs[i + 1])
+        sy += tramo * (ys[i] + ys[i + 1])
+    if longitud == 0:
+        return 0.0, math.nan, math.nan
+    return longitud, sx / (2 * longitud), sy / (2 * longitud)
+
+
+def _punto_a_mitad(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """Devuelve el punto de la línea situado a mitad de su longitud."""
+    tramos = [math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i]) for i in range(len(xs) - 1)]
+    mitad = sum(tramos) / 2
+    recorrido = 0.0
+    for i, tramo in enumerate(tramos):
+        if tramo > 0 and recorrido + tramo >= mitad:
+            t = (mitad - recorrido) / tramo
+            return (
+                float(xs[i] + t * (xs[i + 1] - xs[i])),
+                float(ys[i] + t * (ys[i + 1] - ys[i])),
+            )
+        recorrido += tramo
+    return (float(xs[0]), float(ys[0]))
+
+
+def _cortes_horizontales(y: float, anillos: List[Tuple[Sequence[float], Sequence[float]]]) -> List[float]:
+    """Devuelve las x donde la recta horizontal de ordenada y corta las aristas de los anillos."""
+    cortes: List[float] = []
+    for xs, ys in anillos:
+        if np is not None and isinstance(xs, np.ndarray):
+            x1 = np.roll(xs, -1)
+            y1 = np.roll(ys, -1)
+            cruza = (ys > y) != (y1 > y)
+            xa, ya, xb, yb = xs[cruza], ys[cruza], x1[cruza], y1[cruza]
+            cortes.extend((xa + (y - ya) * (xb - xa) / (yb - ya)).tolist())
+            continue
+        n = len(xs)
+        for i in range(n):
+            xa, ya = xs[i], ys[i]
+            xb, yb = xs[(i + 1) % n], ys[(i + 1) % n]
+            if (ya > y) != (yb > y):
+                cortes.append(xa + (y - ya) * (xb - xa) / (yb - ya))
+    return cortes
+
+
+def _dentro_de_anillos(x: float, y: float, anillos: List[Tuple[Sequence[float], Sequence[float]]]) -> bool:
+    """Indica si el punto está dentro del polígono formado por los anillos (regla par-impar)."""
+    return sum(1 for corte in _cortes_horizontales(y, anillos) if corte > x) % 2 == 1
+
+
+def _punto_interior_por_barrido(anillos: List[Tuple[Sequence[float], Sequence[float]]]) -> Tuple[float, float]:
+    """
+    Busca un punto interior con una recta horizontal a media altura del polígono.
+    
+    Se toma el tramo interior más ancho de la recta y se devuelve su punto medio.
+    """
+    xs, ys = anillos[0]
+    y = (float(ys.min()) + float(ys.max())) / 2 if np is not None and isinstance(ys, np.ndarray) else (min(ys) + max(ys)) / 2
+    cortes = sorted(_cortes_horizontales(y, anillos))
+    mejor = None
+    for inicio, fin in zip(cortes[0::2], cortes[1::2]):
+        if mejor is None or fin - inicio > mejor[1] - mejor[0]:
+            mejor = (inicio, fin)
+    if mejor is None:
+        return (float(xs[0]), float(ys[0]))
+    return ((mejor[0] + mejor[1]) / 2, y) 
\ No newline at end of file
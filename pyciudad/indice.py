@@ -0,0 +1,236 @@
+"""
+Índice de direcciones ya resueltas para responder geocodificaciones inversas
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .constantes import DEFAULT_DISTANCIA_INDICE, TIPOS_INDICE_DIRECCIONES
+from .espacial import RejillaEspacial
+from .utils import cargar_entidades, guardar_entidades
+
+FORMATO_INDICE = "pyciudad-indice-direcciones"
+VERSION_INDICE = 1
+
+
+class IndiceDirecciones:
+    """
+    Índice espacial de direcciones conocidas (Ubicacion, Direccion o los
+    diccionarios de la API) para la geocodificación inversa local.
+    
+    Las direcciones se guardan en una RejillaEspacial según su lat y lng.
+    buscar() devuelve la dirección conocida más cercana a unas coordenadas
+    si está a menos de distancia_maxima metros. Un cliente con
+    indice_direcciones= la usa en geocodificacion_inversa antes de ir a la
+    API. Con aprender=True, además, añade al índice las direcciones que
+    obtiene de la API; max_entradas limita entonces su tamaño.
+    
+    Cada dirección se identifica por su tipo e id o, si no tiene id, por su
+    tipo y coordenadas: añadir otra con la misma identidad la sustituye.
+    
+    A diferencia de CacheInversaEspacial, que guarda respuestas de
+    reverseGeocode por el punto consultado y las caduca, el índice guarda
+    la posición de la propia dirección, no caduca y puede construirse con
+    los resultados de geocodificar y guardarse en disco.
+    
+    Es seguro para usarse desde varios hilos.
+    
+    Ejemplo:
+        indice = IndiceDirecciones.desde_modelos(ubicaciones, distancia_maxima=5)
+        indice.guardar("direcciones.json.gz")
+        cliente = CartoCiudad(indice_direcciones=IndiceDirecciones.cargar("direcciones.json.gz"))
+    """
+    
+    def __init__(
+        self,
+        distancia_maxima: float = DEFAULT_DISTANCIA_INDICE,
+        tipos: Optional[Iterable[str]] = TIPOS_INDICE_DIRECCIONES,
+        celda_metros: Optional[float] = None,
+        incluir_geometria: bool = False,
+        aprender: bool = False,
+        max_entradas: Optional[int] = None
+    ):
+        """
+        Args:
+            distancia_maxima: Distancia máxima, en metros, a la dirección
+                conocida para responder con ella
+            tipos: Tipos de entidad que se indexan. Por defecto sólo portales:
+                la posición de un municipio o de una calle no sirve como
+                respuesta a unas coordenadas. None indexa todos
+            celda_metros: Lado de las celdas de la rejilla. Por defecto,
+                distancia_maxima
+            incluir_geometria: Si se conserva el campo geom de las direcciones
+            aprender: Si los clientes añaden al índice las direcciones que
+                obtienen de la API con geocodificar y geocodificacion_inversa
+            max_entradas: Número máximo de direcciones. Al superarlo se
+                descartan las añadidas o sustituidas hace más tiempo. None
+                no impone límite
+        """
+        if distancia_maxima <= 0:
+            raise ValueError("distancia_maxima debe ser mayor que 0")
+        if max_entradas is not None and max_entradas <= 0:
+            raise ValueError("max_entradas debe ser mayor que 0")
+        self.distancia_maxima = distancia_maxima
+        self.tipos = None if tipos is None else tuple(tipos)
+        self.incluir_geometria = incluir_geometria
+        self.aprender = aprender
+        self.max_entradas = max_entradas
+        self._rejilla = RejillaEspacial(celda_metros or distancia_maxima)
+        # Direcciones por identidad, de la más antigua a la más reciente
+        self._entradas: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._rejilla)
+    
+    def __iter__(self):
+        with self._cerrojo:
+            entidades = list(self._entradas.values())
+        return iter(entidades)
+    
+    def admite_tipo(self, tipo: Optional[str]) -> bool:
+        """Indica si el índice contiene entidades de un tipo (None: cualquiera)."""
+        return self.tipos is None or tipo is None or tipo in self.tipos
+    
+    def agregar(self, entidad: Any) -> bool:
+        """
+        Añade una dirección o sustituye la que tenga el mismo tipo e id (o,
+        sin id, el mismo tipo y coordenadas).
+        
+        Args:
+            entidad: Ubicacion, Direccion o diccionario con lat y lng
+            
+        Returns:
+            True si se añadió, False si su tipo no se indexa o no tiene coordenadas
+        """
+        if hasattr(entidad, "model_dump"):
+            entidad = entidad.model_dump(exclude_none=True)
+        tipo = entidad.get("type")
+        if self.tipos is not None and tipo not in self.tipos:
+            return False
+        lat, lng = entidad.get("lat"), entidad.get("lng")
+        if lat is None or lng is None or not (math.isfinite(lat) and math.isfinite(lng)):
+            return False
+        entidad = {
+            clave: valor for clave, valor in entidad.items()
+            if valor is not None and (self.incluir_geometria or clave != "geom")
+        }
+        
+        clave = (tipo, entidad["id"]) if entidad.get("id") else (tipo, lng, lat)
+        with self._cerrojo:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._rejilla.eliminar(anterior["lng"], anterior["lat"], anterior)
+            self._entradas[clave] = entidad
+            self._rejilla.insertar(lng, lat, entidad)
+            if self.max_entradas is not None:
+                while len(self._entradas) > self.max_entradas:
+                    _, antigua = self._entradas.popitem(last=False)
+                    self._rejilla.eliminar(antigua["lng"], antigua["lat"], antigua)
+        return True
+    
+    def agregar_varios(self, entidades: Iterable[Any]) -> int:
+        """
+        Añade varias direcciones.
+        
+        Args:
+            entidades: Ubicacion, Direccion, diccionarios o ResultadoLote (se
+                añaden los correctos)
+                
+        Returns:
+            Número de direcciones añadidas
+        """
+        añadidas = 0
+        for entidad in entidades:
+            if hasattr(entidad, "correcto"):
+                if not entidad.correcto:
+                    continue
+                entidad = entidad.resultado
+            añadidas += self.agregar(entidad)
+        return añadidas
+    
+    @classmethod
+    def desde_modelos(cls, entidades: Iterable[Any], **kwargs: Any) -> "IndiceDirecciones":
+        """
+        Construye un índice con direcciones ya resueltas.
+        
+        Args:
+            entidades: Ubicacion, Direccion, diccionarios o ResultadoLote,
+                por ejemplo el resultado de geocodificar_lote
+            **kwargs: Argumentos del constructor de IndiceDirecciones
+        """
+        indice = cls(**kwargs)
+        indice.agregar_varios(entidades)
+        return indice
+    
+    def buscar(
+        self,
+        longitud: float,
+        latitud: float,
+        distancia_maxima: Optional[float] = None
+    ) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Busca la dirección conocida más cercana a unas coordenadas.
+        
+        Args:
+            longitud: Longitud en grados decimales
+            latitud: Latitud en grados decimales
+            distancia_maxima: Distancia máxima en metros (por defecto, la del índice)
+            
+        Returns:
+            Tupla (distancia en metros, entidad) o None si no hay ninguna a
+            menos de la distancia máxima
+        """
+        radio = self.distancia_maxima if distancia_maxima is None else distancia_maxima
+        with self._cerrojo:
+            cercano = self._rejilla.mas_cercano(longitud, latitud, radio)
+        if cercano is None:
+            return None
+        distancia, _, _, entidad = cercano
+        return distancia, entidad
+    
+    def limpiar(self) -> None:
+        """Elimina todas las direcciones."""
+        with self._cerrojo:
+            self._rejilla = RejillaEspacial(self._rejilla.celda_metros)
+            self._entradas.clear()
+    
+    def guardar(self, ruta: str) -> None:
+        """
+        Guarda el índice en disco, en JSON por columnas comprimido con gzip.
+        
+        Se guardan las direcciones y la configuración; la rejilla se
+        reconstruye al cargar.
+        
+        Args:
+            ruta: Fichero de destino (por convención, .json.gz)
+        """
+        guardar_entidades(
+            ruta,
+            FORMATO_INDICE,
+            VERSION_INDICE,
+            list(self),
+            distancia_maxima=self.distancia_maxima,
+            tipos=None if self.tipos is None else list(self.tipos),
+            celda_metros=self._rejilla.celda_metros
+        )
+    
+    @classmethod
+    def cargar(cls, ruta: str, **kwargs: Any) -> "IndiceDirecciones":
+        """
+        Carga un índice guardado con guardar().
+        
+        Args:
+            ruta: Fichero guardado
+            **kwargs: Argumentos del constructor que sustituyen a los guardados
+            
+        Raises:
+            ValueError: Si el fichero no tiene el formato esperado
+        """
+        entidades, cabecera = cargar_entidades(ruta, FORMATO_INDICE, VERSION_INDICE)
+        for clave in ("distancia_maxima", "tipos", "celda_metros"):
+            kwargs.setdefault(clave, cabecera.get(clave))
+        kwargs.setdefault("incluir_geometria", "geom" in cabecera["campos"])
+        return cls.desde_modelos(entidades, **kwargs) 
\ No newline at end of file
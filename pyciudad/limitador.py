@@ -0,0 +1,90 @@
+"""
+Limitador de tasa de peticiones basado en un cubo de fichas (token bucket)
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class LimitadorTasa:
+    """
+    Limitador de tasa compartido entre hilos y corrutinas.
+    
+    El cubo se rellena a razón de peticiones_por_segundo fichas por segundo
+    hasta un máximo de rafaga. Cada petición consume una ficha; si no hay
+    ninguna disponible, la petición reserva la siguiente y espera hasta
+    que llegue su turno. Las reservas se sirven en orden, de modo que el
+    caudal se mantiene en el límite configurado sin ráfagas de rechazos.
+    
+    La misma instancia puede compartirse entre varios clientes, hilos y
+    bucles de asyncio.
+    """
+    
+    def __init__(self, peticiones_por_segundo: float, rafaga: Optional[int] = None):
+        """
+        Args:
+            peticiones_por_segundo: Tasa sostenida de peticiones permitida
+            rafaga: Número máximo de peticiones que pueden hacerse seguidas
+                tras un periodo de inactividad. Por defecto, una por segundo de tasa
+        """
+        if peticiones_por_segundo <= 0:
+            raise ValueError("peticiones_por_segundo debe ser mayor que 0")
+        self.peticiones_por_segundo = peticiones_por_segundo
+        self.rafaga = rafaga if rafaga is not None else max(1, int(peticiones_por_segundo))
+        if self.rafaga < 1:
+            raise ValueError("rafaga debe ser al menos 1")
+        self._reloj = time.monotonic
+        self._fichas = float(self.rafaga)
+        self._actualizado = self._reloj()
+        self._cerrojo = threading.Lock()
+    
+    def _rellenar(self, ahora: float) -> None:
+        """Añade las fichas generadas desde la última actualización."""
+        transcurrido = ahora - self._actualizado
+        if transcurrido > 0:
+            self._fichas = min(self.rafaga, self._fichas + transcurrido * self.peticiones_por_segundo)
+            self._actualizado = ahora
+    
+    def reservar(self) -> float:
+        """
+        Reserva una ficha sin esperar.
+        
+        Returns:
+            Segundos que hay que esperar antes de realizar la petición (0 si
+            había una ficha disponible)
+        """
+        with self._cerrojo:
+            self._rellenar(self._reloj())
+            self._fichas -= 1
+            if self._fichas >= 0:
+                return 0.0
+            return -self._fichas / self.peticiones_por_segundo
+    
+    def intentar_adquirir(self) -> bool:
+        """
+        Consume una ficha sólo si hay una disponible.
+        
+        Returns:
+            True si se ha consumido una ficha, False si habría que esperar
+        """
+        with self._cerrojo:
+            self._rellenar(self._reloj())
+            if self._fichas >= 1:
+                self._fichas -= 1
+                return True
+            return False
+    
+    def adquirir(self) -> None:
+        """Bloquea el hilo actual hasta que la petición pueda realizarse."""
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+    
+    async def adquirir_async(self) -> None:
+        """Espera, sin bloquear el bucle de eventos, hasta que la petición pueda realizarse."""
+        import asyncio
+        
+        espera = self.reservar()
+        if espera > 0:
+            await asyncio.sleep(espera) 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Utilidades para ejecutar consultas por lotes con paralelismo acotado
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from .constantes import DEFAULT_CONCURRENCIA_LOTE
+
+
+@dataclass
+class ResultadoLote:
+    """
+    Resultado de una consulta individual dentro de un lote.
+    
+    Cada elemento del lote produce un ResultadoLote con el resultado o con
+    la excepción que se produjo, de forma que un elemento erróneo no
+    interrumpe el resto del lote.
+    """
+    indice: int
+    entrada: Any
+    resultado: Any = None
+    error: Optional[Exception] = None
+    
+    @property
+    def correcto(self) -> bool:
+        """Indica si la consulta se completó sin errores."""
+        return self.error is None
+
+
+def _ejecutar_elemento(funcion: Callable[[Any], Any], indice: int, entrada: Any) -> ResultadoLote:
+    """Ejecuta la función sobre un elemento capturando cualquier excepción."""
+    try:
+        return ResultadoLote(indice=indice, entrada=entrada, resultado=funcion(entrada))
+    except Exception as e:
+        return ResultadoLote(indice=indice, entrada=entrada, error=e)
+
+
+def iterar_lote(
+    funcion: Callable[[Any], Any],
+    entradas: Iterable[Any],
+    concurrencia: int = DEFAULT_CONCURRENCIA_LOTE
+) -> Iterator[ResultadoLote]:
+    """
+    Aplica una función a cada entrada en un pool de hilos, en orden.
+    
+    Las entradas se consumen de forma perezosa y nunca hay más de
+    2 * concurrencia tareas pendientes, por lo que la memoria usada no
+    depende del tamaño del lote.
+    
+    Args:
+        funcion: Función a aplicar a cada entrada
+        entradas: Iterable de entradas
+        concurrencia: Número máximo de hilos trabajando en paralelo
+        
+    Yields:
+        ResultadoLote por cada entrada, en el mismo orden que las entradas
+    """
+    if concurrencia < 1:
+        raise ValueError("La concurrencia debe ser al menos 1")
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=concurrencia) as ejecutor:
+        pendientes = deque()
+        for indice, entrada in enumerate(entradas):
+            pendientes.append(ejecutor.submit(_ejecutar_elemento, funcion, indice, entrada))
+            if len(pendientes) >= 2 * concurrencia:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def ejecutar_lote(
+    funcion: Callable[[Any], Any],
+    entradas: Iterable[Any],
+    concurrencia: int = DEFAULT_CONCURRENCIA_LOTE
+) -> List[ResultadoLote]:
+    """
+    Aplica una función a cada entrada en paralelo y devuelve todos los resultados.
+    
+    Args:
+        funcion: Función a aplicar a cada entrada
+        entradas: Iterable de entradas
+        concurrencia: Número máximo de hilos trabajando en paralelo
+        
+    Returns:
+        Lista de ResultadoLote en el mismo orden que las entradas
+    """
+    return list(iterar_lote(funcion, entradas, concurrencia)) 
\ No newline at end of file
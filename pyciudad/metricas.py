@@ -0,0 +1,285 @@
+"""
+Métricas de uso del cliente: contadores, histogramas de latencia y exportación Prometheus
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .constantes import CUBOS_LATENCIA
+
+# Fases en las que se divide la latencia de una petición
+FASE_RED = "red"
+FASE_DECODIFICACION = "decodificacion"
+FASE_VALIDACION = "validacion"
+FASES = (FASE_RED, FASE_DECODIFICACION, FASE_VALIDACION)
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latencias con cubos fijos, como los de Prometheus.
+    
+    Cada observación incrementa el cubo cuyo límite superior es el primero
+    mayor o igual que el valor; los valores por encima del último límite
+    van al cubo +Inf. Los percentiles se estiman interpolando dentro del
+    cubo, igual que histogram_quantile de Prometheus.
+    
+    No es seguro entre hilos por sí mismo: Metricas lo protege con su cerrojo.
+    """
+    
+    __slots__ = ("limites", "cubos", "suma", "total")
+    
+    def __init__(self, limites: Iterable[float] = CUBOS_LATENCIA):
+        self.limites: Tuple[float, ...] = tuple(limites)
+        self.cubos: List[int] = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+        self.total = 0
+    
+    def observar(self, valor: float) -> None:
+        """Añade una observación, en segundos."""
+        self.cubos[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+    
+    def acumulados(self) -> List[int]:
+        """Devuelve los recuentos acumulados de cada cubo, incluido +Inf."""
+        acumulados = []
+        cuenta = 0
+        for n in self.cubos:
+            cuenta += n
+            acumulados.append(cuenta)
+        return acumulados
+    
+    def percentil(self, p: float) -> Optional[float]:
+        """
+        Estima un percentil a partir de los cubos.
+        
+        Args:
+            p: Percentil entre 0 y 100
+            
+        Returns:
+            Latencia estimada en segundos, o None si no hay observaciones. Si el
+            percentil cae en el cubo +Inf se devuelve el último límite
+        """
+        if self.total == 0:
+            return None
+        objetivo = self.total * p / 100
+        anterior = 0
+        for i, acumulado in enumerate(self.acumulados()):
+            if acumulado >= objetivo and self.cubos[i]:
+                if i == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                fraccion = (objetivo - anterior) / self.cubos[i]
+                return inferior + (self.limites[i] - inferior) * fraccion
+            anterior = acumulado
+        return self.limites[-1]
+    
+    def resumen(self) -> Dict[str, Any]:
+        """Devuelve el total, la suma, la media y los percentiles 50, 95 y 99."""
+        return {
+            "total": self.total,
+            "suma": self.suma,
+            "media": self.suma / self.total if self.total else None,
+            "p50": self.percentil(50),
+            "p95": self.percentil(95),
+            "p99": self.percentil(99),
+        }
+
+
+def _escapar_etiqueta(valor: str) -> str:
+    """Escapa un valor de etiqueta para el formato de texto de Prometheus."""
+    return valor.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiquetas(**etiquetas: str) -> str:
+    """Formatea un conjunto de etiquetas como {a="x",b="y"}."""
+    pares = ",".join(f'{nombre}="{_escapar_etiqueta(str(valor))}"' for nombre, valor in etiquetas.items())
+    return "{" + pares + "}"
+
+
+def _formatear_numero(valor: float) -> str:
+    """Formatea un número como lo espera Prometheus (enteros sin decimales)."""
+    if valor == int(valor) and abs(valor) < 1e15:
+        return str(int(valor))
+    return repr(valor)
+
+
+class Metricas:
+    """
+    Registro de métricas de un cliente.
+    
+    Cuenta por endpoint las peticiones HTTP enviadas, los bytes recibidos,
+    los errores (por clase de excepción), los reintentos y los aciertos y
+    fallos de caché, y guarda histogramas de latencia separados para la
+    red, la decodificación JSON y la construcción de los modelos.
+    
+    La misma instancia puede compartirse entre varios clientes e hilos.
+    Cuando el cliente no tiene métricas (el valor por defecto) no se mide
+    nada y el único coste es comprobar si el atributo es None.
+    
+    Ejemplo:
+        metricas = Metricas()
+        cliente = CartoCiudad(metricas=metricas)
+        ...
+        metricas.instantanea()["peticiones"]   # {"find": 120, ...}
+        print(metricas.a_prometheus())
+    """
+    
+    def __init__(self, cubos: Iterable[float] = CUBOS_LATENCIA):
+        """
+        Args:
+            cubos: Límites superiores de los cubos de los histogramas, en segundos
+        """
+        self.cubos = tuple(sorted(cubos))
+        self._cerrojo = threading.Lock()
+        self.reiniciar()
+    
+    def reiniciar(self) -> None:
+        """Pone a cero todas las métricas."""
+        with self._cerrojo:
+            self._peticiones: Dict[str, int] = {}
+            self._bytes: Dict[str, int] = {}
+            self._errores: Dict[Tuple[str, str], int] = {}
+            self._reintentos: Dict[str, int] = {}
+            self._cache: Dict[Tuple[str, str, bool], int] = {}
+            self._latencias: Dict[Tuple[str, str], HistogramaLatencia] = {}
+    
+    def _observar(self, fase: str, endpoint: str, segundos: float) -> None:
+        """Añade una latencia a su histograma. Debe llamarse con el cerrojo adquirido."""
+        histograma = self._latencias.get((fase, endpoint))
+        if histograma is None:
+            histograma = self._latencias[(fase, endpoint)] = HistogramaLatencia(self.cubos)
+        histograma.observar(segundos)
+    
+    def registrar_peticion(self, endpoint: str, segundos: float, bytes_recibidos: int = 0) -> None:
+        """
+        Registra una petición HTTP enviada, haya tenido respuesta o no.
+        
+        Args:
+            endpoint: Nombre del endpoint (candidates, find, reverseGeocode)
+            segundos: Tiempo de red de la petición
+            bytes_recibidos: Tamaño del cuerpo de la respuesta
+        """
+        with self._cerrojo:
+            self._peticiones[endpoint] = self._peticiones.get(endpoint, 0) + 1
+            self._bytes[endpoint] = self._bytes.get(endpoint, 0) + bytes_recibidos
+            self._observar(FASE_RED, endpoint, segundos)
+    
+    def observar(self, fase: str, endpoint: str, segundos: float) -> None:
+        """
+        Registra la duración de una fase del procesado de una respuesta.
+        
+        Args:
+            fase: FASE_DECODIFICACION o FASE_VALIDACION
+            endpoint: Nombre del endpoint
+            segundos: Duración de la fase
+        """
+        with self._cerrojo:
+            self._observar(fase, endpoint, segundos)
+    
+    def registrar_error(self, endpoint: str, error: BaseException, reintento: bool = False) -> None:
+        """
+        Registra un intento fallido.
+        
+        El error se clasifica por la clase de su causa (por ejemplo
+        ErrorConexion o JSONDecodeError) si la tiene, o por su propia clase.
+        
+        Args:
+            endpoint: Nombre del endpoint
+            error: Excepción del intento
+            reintento: Si la petición se va a reintentar
+        """
+        causa = error.__cause__ if error.__cause__ is not None else error
+        clave = (endpoint, type(causa).__name__)
+        with self._cerrojo:
+            self._errores[clave] = self._errores.get(clave, 0) + 1
+            if reintento:
+                self._reintentos[endpoint] = self._reintentos.get(endpoint, 0) + 1
+    
+    def registrar_cache(self, cache: str, endpoint: str, acierto: bool) -> None:
+        """
+        Registra una consulta a una caché.
+        
+        Args:
+            cache: Nombre de la caché ("respuestas" o "espacial")
+            endpoint: Nombre del endpoint
+            acierto: Si la respuesta estaba en la caché
+        """
+        clave = (cache, endpoint, acierto)
+        with self._cerrojo:
+            self._cache[clave] = self._cache.get(clave, 0) + 1
+    
+    def instantanea(self) -> Dict[str, Any]:
+        """
+        Devuelve una copia de las métricas actuales.
+        
+        Returns:
+            Diccionario con las claves peticiones, bytes_recibidos, errores,
+            reintentos, cache y latencias. Las latencias se agrupan por fase y
+            endpoint y se resumen con total, suma, media, p50, p95 y p99
+        """
+        with self._cerrojo:
+            errores: Dict[str, Dict[str, int]] = {}
+            for (endpoint, clase), n in self._errores.items():
+                errores.setdefault(endpoint, {})[clase] = n
+            cache: Dict[str, Dict[str, Dict[str, int]]] = {}
+            for (nombre, endpoint, acierto), n in self._cache.items():
+                contadores = cache.setdefault(nombre, {}).setdefault(endpoint, {"aciertos": 0, "fallos": 0})
+                contadores["aciertos" if acierto else "fallos"] += n
+            latencias: Dict[str, Dict[str, Dict[str, Any]]] = {fase: {} for fase in FASES}
+            for (fase, endpoint), histograma in self._latencias.items():
+                latencias.setdefault(fase, {})[endpoint] = histograma.resumen()
+            return {
+                "peticiones": dict(self._peticiones),
+                "bytes_recibidos": dict(self._bytes),
+                "errores": errores,
+                "reintentos": dict(self._reintentos),
+                "cache": cache,
+                "latencias": latencias,
+            }
+    
+    def a_prometheus(self, prefijo: str = "pyciudad") -> str:
+        """
+        Exporta las métricas en el formato de texto de Prometheus.
+        
+        Args:
+            prefijo: Prefijo de los nombres de las métricas
+            
+        Returns:
+            Texto listo para servir en un endpoint /metrics
+        """
+        lineas: List[str] = []
+        
+        def contador(nombre: str, ayuda: str, valores: Dict[Tuple, int], etiquetas: Tuple[str, ...]) -> None:
+            lineas.append(f"# HELP {prefijo}_{nombre} {ayuda}")
+            lineas.append(f"# TYPE {prefijo}_{nombre} counter")
+            for clave, valor in sorted(valores.items()):
+                clave = clave if isinstance(clave, tuple) else (clave,)
+                lineas.append(f"{prefijo}_{nombre}{_etiquetas(**dict(zip(etiquetas, clave)))} {valor}")
+        
+        with self._cerrojo:
+            contador("peticiones_total", "Peticiones HTTP enviadas.", self._peticiones, ("endpoint",))
+            contador("bytes_recibidos_total", "Bytes recibidos en los cuerpos de las respuestas.",
+                     self._bytes, ("endpoint",))
+            contador("errores_total", "Intentos fallidos por clase de error.", self._errores, ("endpoint", "clase"))
+            contador("reintentos_total", "Reintentos realizados.", self._reintentos, ("endpoint",))
+            cache = {
+                (nombre, endpoint, "acierto" if acierto else "fallo"): n
+                for (nombre, endpoint, acierto), n in self._cache.items()
+            }
+            contador("cache_consultas_total", "Consultas a las cachés.", cache, ("cache", "endpoint", "resultado"))
+            
+            nombre = f"{prefijo}_latencia_segundos"
+            lineas.append(f"# HELP {nombre} Latencia por fase (red, decodificacion, validacion).")
+            lineas.append(f"# TYPE {nombre} histogram")
+            for (fase, endpoint), histograma in sorted(self._latencias.items()):
+                limites = [_formatear_numero(l) for l in histograma.limites] + ["+Inf"]
+                for limite, acumulado in zip(limites, histograma.acumulados()):
+                    etiquetas = _etiquetas(endpoint=endpoint, fase=fase, le=limite)
+                    lineas.append(f"{nombre}_bucket{etiquetas} {acumulado}")
+                etiquetas = _etiquetas(endpoint=endpoint, fase=fase)
+                lineas.append(f"{nombre}_sum{etiquetas} {_formatear_numero(histograma.suma)}")
+                lineas.append(f"{nombre}_count{etiquetas} {histograma.total}")
+        
+        return "\n".join(lineas) + "\n" 
\ No newline at end of file
@@ -2,10 +2,14 @@
 Modelos de datos para PyCartoCiudad
 """
 
-import re
 from enum import Enum
-from typing import List, Dict, Optional, Any, Union, Tuple
-from pydantic import BaseModel, Field, validator, field_validator, ConfigDict
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Union, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, validator, field_validator, ConfigDict
+
+from .constantes import ORIGEN_API
+
+if TYPE_CHECKING:
+    from .geometria import Geometria
 
 
 class TipoEntidad(str, Enum):
@@ -25,6 +29,37 @@ class TipoEntidad(str, Enum):
     REF_CATASTRAL = "refcatastral"
 
 
+# Marca de geometría todavía no parseada
+_SIN_PARSEAR = object()
+
+
+class _Metadatos:
+    """
+    Datos de una entidad que no forman parte de su valor: de dónde procede
+    el resultado y la geometría ya parseada, junto con el valor de geom del
+    que procede.
+    
+    Pydantic compara los atributos privados, así que unos metadatos son
+    iguales a cualquier otros y a None: el mismo resultado es igual venga de
+    la API o de una caché, y haya parseado o no su geometría. No se modifican
+    sino que se sustituyen, porque las copias superficiales del modelo
+    (model_copy) los comparten.
+    """
+    __slots__ = ("origen", "geom", "geometria")
+    
+    def __init__(self, origen: str = ORIGEN_API, geom: Any = _SIN_PARSEAR, geometria: Optional["Geometria"] = None):
+        self.origen = origen
+        self.geom = geom
+        self.geometria = geometria
+    
+    def __eq__(self, otro: Any) -> bool:
+        if otro is None or isinstance(otro, _Metadatos):
+            return True
+        return NotImplemented
+    
+    __hash__ = None
+
+
 class EntidadBase(BaseModel):
     """Modelo base para todas las entidades de CartoCiudad."""
     id: Optional[str] = None
@@ -45,6 +80,42 @@ class EntidadBase(BaseModel):
     stateMsg: Optional[str] = None
 
     model_config = ConfigDict(extra="allow")  # Permitir campos adicionales
+    
+    _metadatos: Optional[_Metadatos] = PrivateAttr(default=None)
+
+    @property
+    def origen(self) -> str:
+        """Indica si el resultado procede de la API ("api"), de una caché local ("cache"), del nomenclátor local ("nomenclator") o del índice de direcciones ("indice")."""
+        return self._origen
+    
+    @property
+    def _origen(self) -> str:
+        metadatos = self._metadatos
+        return metadatos.origen if metadatos is not None else ORIGEN_API
+    
+    @_origen.setter
+    def _origen(self, origen: str) -> None:
+        # El origen no interviene en la igualdad: se guarda en los metadatos
+        metadatos = self._metadatos or _Metadatos()
+        self._metadatos = _Metadatos(origen, metadatos.geom, metadatos.geometria)
+    
+    def _geometria_memorizada(self) -> Optional["Geometria"]:
+        """
+        Devuelve la geometría parseada, parseándola sólo en el primer acceso.
+        
+        El resultado se guarda junto con el valor de geom del que procede, de
+        modo que si se asigna otra geometría se vuelve a parsear.
+        """
+        geom = getattr(self, "geom", None)
+        metadatos = self._metadatos
+        if metadatos is not None and metadatos.geom is geom:
+            return metadatos.geometria
+        
+        # Importación diferida: la geometría sólo se necesita si se consulta
+        from .geometria import parsear_geometria
+        geometria = parsear_geometria(geom)
+        self._metadatos = _Metadatos(self._origen, geom, geometria)
+        return geometria
 
 
 class Candidato(EntidadBase):
@@ -139,27 +210,47 @@ class Ubicacion(EntidadBase):
         """Devuelve la geometría de la entidad."""
         return self.geom
     
+    def obtener_geometria(self) -> Optional["Geometria"]:
+        """
+        Convierte la geometría (WKT o GeoJSON) en una Geometria.
+        
+        El parseo se hace en el primer acceso y se reutiliza en los siguientes.
+        
+        Returns:
+            Geometria con las coordenadas y utilidades de bbox, centroide y
+            punto representativo, o None si no hay una geometría válida
+        """
+        return self._geometria_memorizada()
+    
+    @property
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        """Devuelve el rectángulo envolvente (x_min, y_min, x_max, y_max) de la geometría."""
+        geometria = self._geometria_memorizada()
+        return geometria.bbox() if geometria is not None else None
+    
+    @property
+    def centroide(self) -> Optional[Tuple[float, float]]:
+        """Devuelve el centroide (longitud, latitud) de la geometría."""
+        geometria = self._geometria_memorizada()
+        return geometria.centroide() if geometria is not None else None
+
     def extraer_coordenadas_wkt(self) -> Optional[Tuple[float, float]]:
         """
         Extrae las coordenadas de una geometría WKT.
         
+        Para un POINT devuelve sus coordenadas; para líneas y polígonos, un
+        punto representativo situado sobre la geometría.
+        
         Returns:
             Tupla (longitud, latitud) o None si no se puede extraer
         """
         if not self.geom or not isinstance(self.geom, str):
             return None
         
-        # Intentar extraer coordenadas de un POINT WKT
-        match = re.search(r'POINT\s*\(\s*(-?\d+\.?\d*)\s+(-?\d+\.?\d*)\s*\)', self.geom)
-        if match:
-            try:
-                lon = float(match.group(1))
-                lat = float(match.group(2))
-                return (lon, lat)
-            except (ValueError, IndexError):
-                return None
-        
-        return None
+        geometria = self.obtener_geometria()
+        if geometria is None or geometria.vacia:
+            return None
+        return geometria.punto_representativo()
 
 
 class Direccion(EntidadBase):
@@ -213,24 +304,44 @@ class Direccion(EntidadBase):
         """Devuelve la longitud."""
         return self.lng
     
+    def obtener_geometria(self) -> Optional["Geometria"]:
+        """
+        Convierte la geometría (WKT o GeoJSON) en una Geometria.
+        
+        El parseo se hace en el primer acceso y se reutiliza en los siguientes.
+        
+        Returns:
+            Geometria con las coordenadas y utilidades de bbox, centroide y
+            punto representativo, o None si no hay una geometría válida
+        """
+        return self._geometria_memorizada()
+    
+    @property
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        """Devuelve el rectángulo envolvente (x_min, y_min, x_max, y_max) de la geometría."""
+        geometria = self._geometria_memorizada()
+        return geometria.bbox() if geometria is not None else None
+    
+    @property
+    def centroide(self) -> Optional[Tuple[float, float]]:
+        """Devuelve el centroide (longitud, latitud) de la geometría."""
+        geometria = self._geometria_memorizada()
+        return geometria.centroide() if geometria is not None else None
+
     def extraer_coordenadas_wkt(self) -> Optional[Tuple[float, float]]:
         """
         Extrae las coordenadas de una geometría WKT.
         
+        Para un POINT devuelve sus coordenadas; para líneas y polígonos, un
+        punto representativo situado sobre la geometría.
+        
         Returns:
             Tupla (longitud, latitud) o None si no se puede extraer
         """
         if not self.geom or not isinstance(self.geom, str):
             return None
         
-        # Intentar extraer coordenadas de un POINT WKT
-        match = re.search(r'POINT\s*\(\s*(-?\d+\.?\d*)\s+(-?\d+\.?\d*)\s*\)', self.geom)
-        if match:
-            try:
-                lon = float(match.group(1))
-                lat = float(match.group(2))
-                return (lon, lat)
-            except (ValueError, IndexError):
-                return None
-        
-        return None 
\ No newline at end of file
+        geometria = self.obtener_geometria()
+        if geometria is None or geometria.vacia:
+            return None
+        return geometria.punto_representativo() 
\ No newline at end of file
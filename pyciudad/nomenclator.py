@@ -0,0 +1,377 @@
+"""
+Nomenclátor local de entidades administrativas (municipios, provincias,
+comunidades autónomas y poblaciones) con búsqueda exacta y aproximada
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .constantes import (
+    FILTROS_TIPO_ENTIDAD,
+    TIPOS_ADMINISTRATIVOS,
+    DEFAULT_UMBRAL_SIMILITUD
+)
+from .utils import cargar_entidades, guardar_entidades, normalizar_texto
+
+FORMATO_NOMENCLATOR = "pyciudad-nomenclator"
+VERSION_NOMENCLATOR = 1
+
+# Campo con el nombre propio de cada tipo de entidad, si address no lo trae
+_CAMPO_NOMBRE = {
+    "municipio": "muni",
+    "provincia": "province",
+    "comunidad autonoma": "comunidadAutonoma",
+    "poblacion": "poblacion",
+}
+
+# Campos de contexto con los que se desambigua "Nombre, Contexto"
+_CAMPOS_CONTEXTO = ("muni", "province", "comunidadAutonoma", "poblacion")
+
+
+def excluir_salvo(tipos: Iterable[str] = TIPOS_ADMINISTRATIVOS) -> List[str]:
+    """
+    Devuelve los tipos de entidad a excluir para quedarse sólo con los indicados.
+    
+    Sirve como valor de excluir_tipos en buscar_candidatos. Con los tipos
+    administrativos (el valor por defecto), el cliente puede responder la
+    búsqueda con su nomenclátor local.
+    
+    Ejemplo:
+        cliente.buscar_candidatos("Alcala", excluir_tipos=excluir_salvo())
+    """
+    conservar = set(tipos)
+    return [tipo for tipo in FILTROS_TIPO_ENTIDAD.values() if tipo not in conservar]
+
+
+def _trigramas(texto: str) -> set:
+    """Trigramas de un texto normalizado, con los extremos marcados."""
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class Nomenclator:
+    """
+    Índice en memoria de entidades administrativas para resolverlas sin red.
+    
+    Las entidades son los diccionarios que devuelve la API (candidates o
+    find) para los tipos municipio, provincia, comunidad autonoma y
+    poblacion. Se indexan por tipo e id, por nombre normalizado (sin
+    mayúsculas, tildes ni signos) y por trigramas del nombre para la
+    búsqueda aproximada.
+    
+    Se construye una vez a partir de resultados de la API (agregar,
+    desde_api) o de una exportación en JSON (desde_json), se guarda en
+    disco en un formato compacto (guardar) y se carga con cargar(). Un
+    cliente con nomenclator= responde con él las búsquedas de estos tipos y
+    vuelve a la API cuando no encuentra la entidad. Las geocodificaciones
+    de texto libre sólo se responden con él si geocodificar_nombres=True.
+    
+    Es seguro para usarse desde varios hilos: agregar() se serializa con un
+    cerrojo y sustituye las listas del índice por nombre en lugar de
+    modificarlas, así que las búsquedas no necesitan bloquearse.
+    
+    Ejemplo:
+        nomenclator = Nomenclator.cargar("nomenclator.json.gz")
+        cliente = CartoCiudad(nomenclator=nomenclator)
+        cliente.buscar_candidatos("Alcala de Henares", excluir_tipos=excluir_salvo())
+    """
+    
+    def __init__(
+        self,
+        entidades: Iterable[Any] = (),
+        umbral_similitud: float = DEFAULT_UMBRAL_SIMILITUD,
+        incluir_geometria: bool = False,
+        geocodificar_nombres: bool = False
+    ):
+        """
+        Args:
+            entidades: Entidades iniciales (diccionarios de la API o modelos)
+            umbral_similitud: Similitud mínima (0 a 1) de la búsqueda aproximada
+            incluir_geometria: Si se conserva el campo geom. Los polígonos de
+                municipios y provincias ocupan mucho y no son necesarios para
+                resolver nombres, así que por defecto se descartan
+            geocodificar_nombres: Si los clientes responden geocodificar(consulta)
+                con la entidad cuyo nombre coincide exactamente con la consulta.
+                Por defecto no: "Toledo" puede ser también una calle o un
+                punto de interés, y la consulta va a la API
+        """
+        self.umbral_similitud = umbral_similitud
+        self.incluir_geometria = incluir_geometria
+        self.geocodificar_nombres = geocodificar_nombres
+        self._entidades: List[Dict[str, Any]] = []
+        self._por_id: Dict[Tuple[str, str], int] = {}
+        self._por_nombre: Dict[str, List[int]] = {}
+        self._trigramas: Dict[str, List[str]] = {}
+        self._contexto: List[str] = []
+        self._cerrojo = threading.Lock()
+        for entidad in entidades:
+            self.agregar(entidad)
+    
+    def __len__(self) -> int:
+        return len(self._entidades)
+    
+    def __iter__(self):
+        return iter(self._entidades)
+    
+    @staticmethod
+    def nombre(entidad: Dict[str, Any]) -> str:
+        """Nombre de una entidad: address o, si falta, el campo propio de su tipo."""
+        return entidad.get("address") or entidad.get(_CAMPO_NOMBRE.get(entidad.get("type"), ""), "") or ""
+    
+    def agregar(self, entidad: Any) -> bool:
+        """
+        Añade o actualiza una entidad.
+        
+        Args:
+            entidad: Diccionario de la API o modelo (Candidato, Ubicacion...)
+            
+        Returns:
+            True si se añadió, False si no es de un tipo administrativo o no tiene id
+        """
+        if hasattr(entidad, "model_dump"):
+            entidad = entidad.model_dump(exclude_none=True)
+        tipo = entidad.get("type")
+        if tipo not in TIPOS_ADMINISTRATIVOS or not entidad.get("id"):
+            return False
+        entidad = {
+            clave: valor for clave, valor in entidad.items()
+            if valor is not None and (self.incluir_geometria or clave != "geom")
+        }
+        
+        clave_id = (tipo, str(entidad["id"]))
+        nombre = normalizar_texto(self.nombre(entidad))
+        with self._cerrojo:
+            indice = self._por_id.get(clave_id)
+            if indice is not None:
+                self._desindexar(indice, nombre)
+                self._entidades[indice] = entidad
+            else:
+                indice = len(self._entidades)
+                self._entidades.append(entidad)
+                self._contexto.append("")
+                self._por_id[clave_id] = indice
+            self._indexar(indice, nombre)
+        return True
+    
+    def _indexar(self, indice: int, nombre: str) -> None:
+        """Añade una entidad a los índices por nombre y por trigramas."""
+        entidad = self._entidades[indice]
+        self._contexto[indice] = " " + normalizar_texto(
+            " ".join(str(entidad.get(campo, "")) for campo in _CAMPOS_CONTEXTO)
+        ) + " "
+        if nombre not in self._por_nombre:
+            # Primera entidad con este nombre: el nombre entra en el índice de trigramas
+            for trigrama in _trigramas(nombre):
+                self._trigramas.setdefault(trigrama, []).append(nombre)
+        self._por_nombre[nombre] = sorted(
+            [*self._por_nombre.get(nombre, ()), indice],
+            key=lambda i: TIPOS_ADMINISTRATIVOS.index(self._entidades[i]["type"])
+        )
+    
+    def _desindexar(self, indice: int, nombre_nuevo: str) -> None:
+        """
+        Quita una entidad del índice por nombre antes de sustituirla.
+        
+        Si era la última entidad con su nombre y la nueva se llama de otra
+        forma, el nombre sale también del índice de trigramas.
+        """
+        nombre = normalizar_texto(self.nombre(self._entidades[indice]))
+        indices = [i for i in self._por_nombre.get(nombre, ()) if i != indice]
+        if indices or nombre == nombre_nuevo:
+            self._por_nombre[nombre] = indices
+            return
+        del self._por_nombre[nombre]
+        for trigrama in _trigramas(nombre):
+            nombres = [otro for otro in self._trigramas.get(trigrama, ()) if otro != nombre]
+            if nombres:
+                self._trigramas[trigrama] = nombres
+            else:
+                del self._trigramas[trigrama]
+    
+    def obtener(self, tipo: str, id_entidad: str) -> Optional[Dict[str, Any]]:
+        """Devuelve la entidad de un tipo e id, o None si no está."""
+        indice = self._por_id.get((tipo, str(id_entidad)))
+        return self._entidades[indice] if indice is not None else None
+    
+    def _en_contexto(self, indice: int, contexto: List[str]) -> bool:
+        """Indica si una entidad pertenece a todos los municipios, provincias... indicados."""
+        return all(f" {parte} " in self._contexto[indice] for parte in contexto)
+    
+    def _cumple_filtros(self, indice: int, filtros: Dict[str, set]) -> bool:
+        """Indica si el valor de cada campo filtrado está entre los admitidos."""
+        entidad = self._entidades[indice]
+        return all(
+            normalizar_texto(str(entidad.get(campo, ""))) in admitidos
+            for campo, admitidos in filtros.items()
+        )
+    
+    def buscar(
+        self,
+        consulta: str,
+        tipos: Optional[Iterable[str]] = None,
+        limite: int = 10,
+        aproximada: bool = True,
+        contexto: Optional[Iterable[str]] = None,
+        filtros: Optional[Dict[str, Union[str, Iterable[str]]]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Busca entidades por nombre.
+        
+        La consulta puede llevar contexto tras una coma ("Alcalá de Henares,
+        Madrid"): cada parte debe coincidir con el municipio, la provincia,
+        la comunidad o la población de la entidad. Primero se devuelven las
+        coincidencias exactas del nombre normalizado, en el orden de
+        TIPOS_ADMINISTRATIVOS, y después las aproximadas por similitud de
+        trigramas.
+        
+        Args:
+            consulta: Nombre a buscar
+            tipos: Tipos admitidos (por defecto, todos los administrativos)
+            limite: Número máximo de resultados
+            aproximada: Si se añaden coincidencias aproximadas
+            contexto: Nombres adicionales con los que debe coincidir la entidad
+            filtros: Valores admitidos por campo, como los filtros geográficos
+                de la API (por ejemplo {"province": ["Madrid", "Toledo"]})
+                
+        Returns:
+            Lista de (entidad, similitud), con similitud 1.0 para las exactas
+        """
+        partes = [normalizar_texto(parte) for parte in consulta.split(",")]
+        nombre = partes[0]
+        contexto = [parte for parte in partes[1:] if parte] + [
+            normalizar_texto(parte) for parte in (contexto or ()) if parte
+        ]
+        tipos = set(tipos) if tipos is not None else set(TIPOS_ADMINISTRATIVOS)
+        filtros = {
+            campo: {normalizar_texto(v) for v in ([valores] if isinstance(valores, str) else valores)}
+            for campo, valores in (filtros or {}).items()
+        }
+        if not nombre:
+            return []
+        
+        def admitida(indice: int) -> bool:
+            return (
+                self._entidades[indice]["type"] in tipos
+                and self._en_contexto(indice, contexto)
+                and self._cumple_filtros(indice, filtros)
+            )
+        
+        resultados = [
+            (self._entidades[i], 1.0) for i in self._por_nombre.get(nombre, ()) if admitida(i)
+        ][:limite]
+        if not aproximada or len(resultados) >= limite:
+            return resultados
+        
+        for similar, similitud in self._similares(nombre):
+            for indice in self._por_nombre.get(similar, ()):
+                if admitida(indice):
+                    resultados.append((self._entidades[indice], similitud))
+                    if len(resultados) >= limite:
+                        return resultados
+        return resultados
+    
+    def _similares(self, nombre: str) -> List[Tuple[str, float]]:
+        """Nombres indexados distintos de nombre con similitud suficiente, de mayor a menor."""
+        trigramas = _trigramas(nombre)
+        comunes: Dict[str, int] = {}
+        for trigrama in trigramas:
+            for otro in self._trigramas.get(trigrama, ()):
+                comunes[otro] = comunes.get(otro, 0) + 1
+        similares = []
+        for otro, n in comunes.items():
+            if otro == nombre:
+                continue
+            similitud = 2 * n / (len(trigramas) + len(_trigramas(otro)))
+            if similitud >= self.umbral_similitud:
+                similares.append((otro, similitud))
+        similares.sort(key=lambda par: (-par[1], par[0]))
+        return similares
+    
+    def resolver(self, consulta: str, tipos: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la entidad cuyo nombre coincide exactamente con la consulta.
+        
+        Si varias entidades se llaman igual, se devuelve la del primer tipo de
+        TIPOS_ADMINISTRATIVOS (el municipio antes que la provincia).
+        
+        Returns:
+            Entidad, o None si no hay coincidencia exacta
+        """
+        resultados = self.buscar(consulta, tipos=tipos, limite=1, aproximada=False)
+        return resultados[0][0] if resultados else None
+    
+    @classmethod
+    def desde_api(
+        cls,
+        cliente: Any,
+        nombres: Iterable[str],
+        tipos: Iterable[str] = TIPOS_ADMINISTRATIVOS,
+        **kwargs: Any
+    ) -> "Nomenclator":
+        """
+        Construye un nomenclátor consultando buscar_candidatos para cada nombre.
+        
+        Args:
+            cliente: Cliente CartoCiudad (síncrono)
+            nombres: Nombres a consultar, por ejemplo una lista de municipios
+            tipos: Tipos de entidad a conservar
+            **kwargs: Argumentos del constructor de Nomenclator
+            
+        Returns:
+            Nomenclátor con las entidades encontradas
+        """
+        tipos = tuple(tipos)
+        nomenclator = cls(**kwargs)
+        excluir = excluir_salvo(tipos)
+        for nombre in nombres:
+            for candidato in cliente.buscar_candidatos(nombre, limite=33, excluir_tipos=excluir):
+                if candidato.type in tipos:
+                    nomenclator.agregar(candidato)
+        return nomenclator
+    
+    @classmethod
+    def desde_json(cls, ruta: str, **kwargs: Any) -> "Nomenclator":
+        """
+        Construye un nomenclátor desde una exportación de respuestas de la API.
+        
+        Args:
+            ruta: Fichero JSON con una lista de entidades, o NDJSON con una por línea
+            **kwargs: Argumentos del constructor de Nomenclator
+        """
+        with open(ruta, encoding="utf-8") as f:
+            texto = f.read()
+        try:
+            entidades = json.loads(texto)
+        except ValueError:
+            entidades = [json.loads(linea) for linea in texto.splitlines() if linea.strip()]
+        return cls(entidades if isinstance(entidades, list) else [entidades], **kwargs)
+    
+    def guardar(self, ruta: str) -> None:
+        """
+        Guarda el nomenclátor en disco.
+        
+        El formato es JSON por columnas comprimido con gzip: la lista de
+        campos se escribe una vez y cada entidad es una fila de valores.
+        Los índices no se guardan; se reconstruyen al cargar.
+        
+        Args:
+            ruta: Fichero de destino (por convención, .json.gz)
+        """
+        guardar_entidades(ruta, FORMATO_NOMENCLATOR, VERSION_NOMENCLATOR, self._entidades)
+    
+    @classmethod
+    def cargar(cls, ruta: str, **kwargs: Any) -> "Nomenclator":
+        """
+        Carga un nomenclátor guardado con guardar().
+        
+        Args:
+            ruta: Fichero guardado
+            **kwargs: Argumentos del constructor de Nomenclator
+            
+        Raises:
+            ValueError: Si el fichero no tiene el formato esperado
+        """
+        entidades, cabecera = cargar_entidades(ruta, FORMATO_NOMENCLATOR, VERSION_NOMENCLATOR)
+        kwargs.setdefault("incluir_geometria", "geom" in cabecera["campos"])
+        return cls(entidades, **kwargs) 
\ No newline at end of file
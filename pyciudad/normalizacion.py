@@ -0,0 +1,191 @@
+"""
+Normalización de consultas de texto para la clave de la caché
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .constantes import ABREVIATURAS_VIA
+from .utils import quitar_tildes
+
+# Primera palabra de la consulta, con sus puntos y la barra de "C/"
+_PRIMERA_PALABRA = re.compile(r"\s*([^\W\d_][\w.º]*)\s*(/?)")
+# Palabras de la consulta: "s/n", carreteras ("n-340", "ap-7"), números y
+# rangos de portales ("1-3") y palabras sueltas. El resto es puntuación
+_PALABRA = re.compile(r"s\s*/\s*n\b|[^\W\d_]+-\d+\w*|\d+[^\W\d_]?(?:\s*-\s*\d+[^\W\d_]?)+\b|\w+")
+# "n.º 5" y "n. 5" se reescriben como "nº 5"; la "n" suelta no es una marca
+_N_PUNTO = re.compile(r"\bn\s*\.\s*(?:º\s*|(?=\d))")
+# Número de portal: hasta cuatro cifras y una letra opcional, un rango de
+# portales o "s/n" (los códigos postales, de cinco cifras, no lo son)
+_PORTAL = re.compile(r"\d{1,4}[^\W\d_]?(?:-\d{1,4}[^\W\d_]?)?|s/n")
+# Palabras que preceden al número de portal y se descartan ("nº 5", "num. 5")
+_MARCAS_NUMERO = {"nº", "num", "numero", "º"}
+# Palabras tras las que un número forma parte del nombre de la vía ("1 de mayo")
+_CONECTORES = {"de", "del"}
+
+
+@dataclass
+class ConsultaNormalizada:
+    """
+    Consulta descompuesta en vía, número de portal y resto (localidad, provincia...).
+    
+    Ejemplo:
+        ConsultaNormalizada("calle mayor", "1", ["madrid"]).texto == "calle mayor 1, madrid"
+    """
+    via: str
+    portal: Optional[str] = None
+    resto: List[str] = field(default_factory=list)
+    
+    @property
+    def texto(self) -> str:
+        """Forma canónica de la consulta."""
+        via = f"{self.via} {self.portal}" if self.portal else self.via
+        return ", ".join(parte for parte in [via, *self.resto] if parte)
+
+
+class NormalizadorConsultas:
+    """
+    Reescribe las consultas en una forma canónica para que las variantes de
+    una misma dirección compartan la entrada de la caché.
+    
+    "C/ Mayor 1, Madrid", "calle mayor, 1 madrid" y "CALLE MAYOR Nº 1 MADRID"
+    se convierten en "calle mayor 1, madrid":
+    
+    - pasa a minúsculas y quita tildes y signos de puntuación, salvo la ñ,
+      los guiones de los rangos ("1-3") y de las carreteras ("N-340") y la
+      barra de "s/n";
+    - expande la abreviatura del tipo de vía al inicio de la consulta (C/,
+      Avda., Pza., ver ABREVIATURAS_VIA);
+    - extrae el número de portal y lo coloca tras el nombre de la vía,
+      separado por una coma del resto de la consulta.
+      
+    Se pasa a los clientes con normalizador=, que lo aplican a la clave de
+    la caché y de las peticiones en curso; la API recibe el texto original.
+    El efecto se mide con las estadísticas de la caché
+    (estadisticas()["tasa_aciertos"]).
+    """
+    
+    def __init__(
+        self,
+        abreviaturas: Optional[Dict[str, str]] = None,
+        extraer_portal: bool = True
+    ):
+        """
+        Args:
+            abreviaturas: Abreviaturas de tipo de vía (en minúsculas, sin tildes
+                ni el punto final) y su expansión. Por defecto, ABREVIATURAS_VIA
+            extraer_portal: Si se reconoce el número de portal y se coloca
+                tras el nombre de la vía
+        """
+        self.abreviaturas = ABREVIATURAS_VIA if abreviaturas is None else abreviaturas
+        self.extraer_portal = extraer_portal
+    
+    def __call__(self, consulta: str) -> str:
+        return self.normalizar(consulta)
+    
+    def normalizar(self, consulta: str) -> str:
+        """
+        Devuelve la forma canónica de una consulta.
+        
+        Args:
+            consulta: Texto de la consulta
+            
+        Returns:
+            Consulta normalizada, o la original si queda vacía al normalizarla
+        """
+        return self.analizar(consulta).texto or consulta
+    
+    def analizar(self, consulta: str) -> ConsultaNormalizada:
+        """
+        Descompone una consulta en vía, número de portal y resto.
+        
+        Args:
+            consulta: Texto de la consulta
+            
+        Returns:
+            ConsultaNormalizada con las partes ya normalizadas
+        """
+        consulta = _N_PUNTO.sub("nº ", self._expandir_tipo_via(_plegar(consulta)))
+        partes = [self._sin_marcas_numero(self._palabras(parte)) for parte in consulta.split(",")]
+        partes = [palabras for palabras in partes if palabras]
+        if not partes:
+            return ConsultaNormalizada("")
+        
+        via, resto = partes[0], [" ".join(palabras) for palabras in partes[1:]]
+        portal = None
+        if self.extraer_portal:
+            indice = self._posicion_portal(via)
+            if indice is not None:
+                portal = via[indice]
+                if indice + 1 < len(via):
+                    resto.insert(0, " ".join(via[indice + 1:]))
+                via = via[:indice]
+            elif len(partes) > 1 and _PORTAL.fullmatch(partes[1][0]):
+                # "calle mayor, 1 madrid": el número abre la segunda parte
+                portal = partes[1][0]
+                resto[0] = " ".join(partes[1][1:])
+        return ConsultaNormalizada(" ".join(via), portal, [parte for parte in resto if parte])
+    
+    def _expandir_tipo_via(self, consulta: str) -> str:
+        """Sustituye la abreviatura del tipo de vía al inicio de la consulta."""
+        coincidencia = _PRIMERA_PALABRA.match(consulta)
+        if coincidencia is None or coincidencia.end() == len(consulta):
+            return consulta
+        palabra = coincidencia.group(1) + coincidencia.group(2)
+        tipo = self.abreviaturas.get(palabra) or self.abreviaturas.get(palabra.rstrip("."))
+        if tipo is None:
+            return consulta
+        return f"{tipo} {consulta[coincidencia.end():]}"
+    
+    @staticmethod
+    def _palabras(texto: str) -> List[str]:
+        """Divide un fragmento de la consulta en palabras, sin espacios internos."""
+        return ["".join(palabra.split()) for palabra in _PALABRA.findall(texto)]
+    
+    @staticmethod
+    def _sin_marcas_numero(palabras: List[str]) -> List[str]:
+        """Quita "nº", "num", "numero"... cuando preceden a un número."""
+        return [
+            palabra for i, palabra in enumerate(palabras)
+            if not (
+                palabra in _MARCAS_NUMERO
+                and i + 1 < len(palabras)
+                and (palabras[i + 1][0].isdigit() or palabras[i + 1] in _MARCAS_NUMERO)
+            )
+        ]
+    
+    def _posicion_portal(self, palabras: List[str]) -> Optional[int]:
+        """
+        Posición del número de portal en la primera parte de la consulta.
+        
+        Es el primer número que sigue a algo más que el tipo de vía y no va
+        seguido de "de" o "del": en "avenida 1 de mayo 3 madrid" es el 3.
+        """
+        tipos = set(self.abreviaturas.values())
+        for i, palabra in enumerate(palabras):
+            if not _PORTAL.fullmatch(palabra):
+                continue
+            antes = [p for p in palabras[:i] if p not in tipos]
+            siguiente = palabras[i + 1] if i + 1 < len(palabras) else None
+            if antes and siguiente not in _CONECTORES:
+                return i
+        return None
+
+
+def _plegar(texto: str) -> str:
+    """Pasa a minúsculas y quita las tildes y diéresis, conservando la ñ."""
+    return "ñ".join(quitar_tildes(trozo) for trozo in texto.lower().split("ñ"))
+
+
+_NORMALIZADOR = NormalizadorConsultas()
+
+
+def normalizar_consulta(consulta: str) -> str:
+    """
+    Devuelve la forma canónica de una consulta con las opciones por defecto.
+    
+    Ejemplo:
+        normalizar_consulta("C/ Mayor 1, Madrid")  # "calle mayor 1, madrid"
+    """
+    return _NORMALIZADOR.normalizar(consulta) 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Operaciones vectorizadas con NumPy sobre arrays de coordenadas
+"""
+
+from typing import Any, Tuple
+
+from .columnar import _importar_numpy
+from .constantes import RANGO_LONGITUD, RANGO_LATITUD
+from .espacial import METROS_POR_GRADO
+
+
+def a_arrays(longitudes: Any, latitudes: Any) -> Tuple[Any, Any]:
+    """
+    Convierte longitudes y latitudes en arrays de float64 de una dimensión.
+    
+    Args:
+        longitudes: Array, lista o cualquier secuencia de longitudes
+        latitudes: Array, lista o cualquier secuencia de latitudes
+        
+    Returns:
+        Tupla (longitudes, latitudes) como arrays de NumPy
+        
+    Raises:
+        ValueError: Si no tienen el mismo número de elementos
+        ImportError: Si numpy no está instalado
+    """
+    np = _importar_numpy()
+    longitudes = np.asarray(longitudes, dtype=np.float64).ravel()
+    latitudes = np.asarray(latitudes, dtype=np.float64).ravel()
+    if longitudes.shape != latitudes.shape:
+        raise ValueError(
+            f"longitudes y latitudes deben tener el mismo tamaño ({longitudes.size} != {latitudes.size})"
+        )
+    return longitudes, latitudes
+
+
+def mascara_coordenadas(longitudes: Any, latitudes: Any) -> Any:
+    """
+    Versión vectorizada de validar_coordenadas.
+    
+    Args:
+        longitudes: Array de longitudes en grados decimales
+        latitudes: Array de latitudes en grados decimales
+        
+    Returns:
+        Array de bool, True en los puntos dentro del rango válido (los NaN no lo están)
+    """
+    longitudes, latitudes = a_arrays(longitudes, latitudes)
+    return (
+        (longitudes >= RANGO_LONGITUD[0]) & (longitudes <= RANGO_LONGITUD[1])
+        & (latitudes >= RANGO_LATITUD[0]) & (latitudes <= RANGO_LATITUD[1])
+    )
+
+
+def celdas(longitudes: Any, latitudes: Any, celda_metros: float) -> Any:
+    """
+    Calcula la celda de la rejilla de cada punto como un único entero.
+    
+    Usa la misma rejilla que RejillaEspacial.celda: filas de celda_metros
+    de alto y, en cada fila, columnas de celda_metros de ancho a la
+    latitud central de la fila.
+    
+    Returns:
+        Array de int64 con la fila en los 32 bits altos y la columna en los bajos
+    """
+    np = _importar_numpy()
+    filas = np.floor(latitudes * METROS_POR_GRADO / celda_metros)
+    escala = METROS_POR_GRADO * np.maximum(
+        np.cos(np.radians((filas + 0.5) * celda_metros / METROS_POR_GRADO)), 1e-6
+    )
+    columnas = np.floor(longitudes * escala / celda_metros)
+    return (filas.astype(np.int64) << 32) + (columnas.astype(np.int64) + (1 << 31))
+
+
+def agrupar_puntos(longitudes: Any, latitudes: Any, precision_metros: float) -> Tuple[Any, Any]:
+    """
+    Agrupa los puntos iguales o casi iguales.
+    
+    Los puntos que caen en la misma celda de precision_metros de lado
+    forman un grupo. Con precision_metros 0 sólo se agrupan los puntos
+    idénticos. Cada grupo se representa con su punto más cercano al
+    centroide del grupo, que es uno de los puntos reales.
+    
+    Args:
+        longitudes: Array de longitudes
+        latitudes: Array de latitudes
+        precision_metros: Lado de las celdas, en metros
+        
+    Returns:
+        Tupla (representantes, etiquetas): posición del representante de cada
+        grupo y grupo al que pertenece cada punto
+    """
+    np = _importar_numpy()
+    longitudes, latitudes = a_arrays(longitudes, latitudes)
+    if longitudes.size == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if precision_metros > 0:
+        claves = celdas(longitudes, latitudes, precision_metros)
+    else:
+        claves = longitudes + 1j * latitudes
+    _, etiquetas = np.unique(claves, return_inverse=True)
+    etiquetas = etiquetas.ravel()
+    
+    # Representante: el punto más cercano al centroide de su grupo
+    cuenta = np.bincount(etiquetas)
+    centro_lon = np.bincount(etiquetas, weights=longitudes) / cuenta
+    centro_lat = np.bincount(etiquetas, weights=latitudes) / cuenta
+    distancia = (
+        ((longitudes - centro_lon[etiquetas]) * np.cos(np.radians(latitudes))) ** 2
+        + (latitudes - centro_lat[etiquetas]) ** 2
+    )
+    orden = np.lexsort((distancia, etiquetas))
+    primeros = np.flatnonzero(np.diff(etiquetas[orden], prepend=-1))
+    return orden[primeros], etiquetas 
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Registros compactos para mantener muchos resultados en memoria
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from .modelos import EntidadBase, Direccion
+
+
+class RegistroCompacto:
+    """
+    Representación compacta de un resultado de geocodificación.
+    
+    Guarda en __slots__ solo los campos útiles para cruzar resultados (sin
+    diccionario por instancia ni campos extra), por lo que ocupa una fracción
+    de la memoria de un modelo Pydantic. Ofrece los mismos accesores en
+    español que Candidato, Ubicacion y Direccion, y se convierte desde y
+    hacia esos modelos con coste mínimo.
+    
+    Los atributos conservan los nombres de la API (lat, lng, muni...).
+    """
+    __slots__ = (
+        "id",
+        "type",
+        "address",
+        "tip_via",
+        "portalNumber",
+        "muni",
+        "muniCode",
+        "province",
+        "provinceCode",
+        "postalCode",
+        "lat",
+        "lng",
+        "geom",
+    )
+    
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        type: Optional[str] = None,
+        address: Optional[str] = None,
+        tip_via: Optional[str] = None,
+        portalNumber: Optional[str] = None,
+        muni: Optional[str] = None,
+        muniCode: Optional[str] = None,
+        province: Optional[str] = None,
+        provinceCode: Optional[str] = None,
+        postalCode: Optional[str] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        geom: Optional[Any] = None
+    ):
+        self.id = id
+        self.type = type
+        self.address = address
+        self.tip_via = tip_via
+        self.portalNumber = portalNumber
+        self.muni = muni
+        self.muniCode = muniCode
+        self.province = province
+        self.provinceCode = provinceCode
+        self.postalCode = postalCode
+        self.lat = lat
+        self.lng = lng
+        self.geom = geom
+    
+    @classmethod
+    def desde_modelo(cls, entidad: EntidadBase) -> "RegistroCompacto":
+        """
+        Crea un registro a partir de un modelo de PyCiudad.
+        
+        Args:
+            entidad: Candidato, Ubicacion o Direccion
+            
+        Returns:
+            Registro con los campos de la entidad (None en los que no tenga)
+        """
+        valores = entidad.__dict__
+        return cls(*[valores.get(campo) for campo in cls.__slots__])
+    
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> "RegistroCompacto":
+        """
+        Crea un registro directamente desde un elemento de respuesta de la API.
+        
+        Args:
+            datos: Diccionario con los campos tal y como los devuelve la API
+            
+        Returns:
+            Registro con los campos reconocidos; el resto se descarta
+        """
+        registro = cls(*[datos.get(campo) for campo in cls.__slots__])
+        if registro.portalNumber is not None:
+            registro.portalNumber = str(registro.portalNumber)
+        return registro
+    
+    def a_modelo(self, clase: Type[EntidadBase] = Direccion) -> EntidadBase:
+        """
+        Convierte el registro en un modelo de PyCiudad.
+        
+        Los campos del registro ya tienen los tipos del modelo, así que la
+        validación de Pydantic es directa y es el camino más barato.
+        
+        Args:
+            clase: Clase de modelo a construir (Candidato, Ubicacion o Direccion)
+            
+        Returns:
+            Instancia de la clase con los campos no nulos del registro
+        """
+        return clase.model_validate(self.a_dict())
+    
+    def a_dict(self) -> Dict[str, Any]:
+        """Devuelve los campos no nulos del registro como diccionario."""
+        return {
+            campo: getattr(self, campo)
+            for campo in self.__slots__
+            if getattr(self, campo) is not None
+        }
+    
+    def a_tupla(self) -> Tuple[Any, ...]:
+        """Devuelve todos los campos del registro como tupla, en el orden de __slots__."""
+        return tuple(getattr(self, campo) for campo in self.__slots__)
+    
+    def __eq__(self, otro: Any) -> bool:
+        if not isinstance(otro, RegistroCompacto):
+            return NotImplemented
+        return self.a_tupla() == otro.a_tupla()
+    
+    def __repr__(self) -> str:
+        return f"RegistroCompacto(id={self.id!r}, address={self.address!r}, lat={self.lat!r}, lng={self.lng!r})"
+    
+    @property
+    def direccion(self) -> str:
+        """Devuelve la dirección formateada."""
+        return self.address or ""
+    
+    @property
+    def via(self) -> str:
+        """Devuelve el nombre de la vía."""
+        return self.address or ""
+    
+    @property
+    def numero(self) -> str:
+        """Devuelve el número del portal."""
+        return self.portalNumber or ""
+    
+    @property
+    def municipio(self) -> str:
+        """Devuelve el nombre del municipio."""
+        return self.muni or ""
+    
+    @property
+    def provincia(self) -> str:
+        """Devuelve el nombre de la provincia."""
+        return self.province or ""
+    
+    @property
+    def codigo_postal(self) -> str:
+        """Devuelve el código postal."""
+        return self.postalCode or ""
+    
+    @property
+    def latitud(self) -> Optional[float]:
+        """Devuelve la latitud."""
+        return self.lat
+    
+    @property
+    def longitud(self) -> Optional[float]:
+        """Devuelve la longitud."""
+        return self.lng
+
+
+def compactar(entidades: Iterable[Optional[EntidadBase]]) -> List[Optional[RegistroCompacto]]:
+    """
+    Convierte una secuencia de modelos en registros compactos.
+    
+    Args:
+        entidades: Modelos de PyCiudad; los None se conservan como None
+        
+    Returns:
+        Lista de RegistroCompacto en el mismo orden
+    """
+    desde_modelo = RegistroCompacto.desde_modelo
+    return [None if entidad is None else desde_modelo(entidad) for entidad in entidades] 
\ No newline at end of file
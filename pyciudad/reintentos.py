@@ -0,0 +1,184 @@
+"""
+Política de reintentos con espera exponencial, jitter y presupuesto global
+"""
+
+import email.utils
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple, Type
+
+from .constantes import (
+    DEFAULT_MAX_REINTENTOS,
+    DEFAULT_ESPERA_BASE_REINTENTO,
+    DEFAULT_ESPERA_MAXIMA_REINTENTO,
+    CODIGOS_HTTP_REINTENTABLES
+)
+
+
+def parsear_retry_after(valor: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el valor de la cabecera HTTP Retry-After.
+    
+    Args:
+        valor: Número de segundos o fecha HTTP
+        
+    Returns:
+        Segundos de espera indicados por el servidor, o None si no se puede interpretar
+    """
+    if not valor:
+        return None
+    valor = valor.strip()
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        fecha = email.utils.parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
+
+
+class PresupuestoReintentos:
+    """
+    Presupuesto global de reintentos compartido entre hilos.
+    
+    Cada petición original deposita una fracción de ficha y cada reintento
+    consume una ficha entera, de modo que los reintentos nunca superan esa
+    fracción del tráfico (por defecto, un 10 %). Además, el presupuesto se
+    rellena a una tasa mínima para permitir reintentos con poco tráfico.
+    Durante una caída prolongada el presupuesto se agota y los fallos se
+    devuelven sin multiplicar la carga sobre la API.
+    """
+    
+    def __init__(
+        self,
+        proporcion: float = 0.1,
+        minimo_por_segundo: float = 1.0,
+        maximo: float = 10.0
+    ):
+        """
+        Args:
+            proporcion: Fichas depositadas por cada petición original
+            minimo_por_segundo: Fichas añadidas por segundo independientemente del tráfico
+            maximo: Máximo de fichas acumuladas
+        """
+        self.proporcion = proporcion
+        self.minimo_por_segundo = minimo_por_segundo
+        self.maximo = maximo
+        self._reloj = time.monotonic
+        self._fichas = maximo
+        self._actualizado = self._reloj()
+        self._cerrojo = threading.Lock()
+    
+    def _rellenar(self) -> None:
+        ahora = self._reloj()
+        self._fichas = min(
+            self.maximo,
+            self._fichas + (ahora - self._actualizado) * self.minimo_por_segundo
+        )
+        self._actualizado = ahora
+    
+    def registrar_peticion(self) -> None:
+        """Registra una petición original, que aumenta el presupuesto."""
+        with self._cerrojo:
+            self._rellenar()
+            self._fichas = min(self.maximo, self._fichas + self.proporcion)
+    
+    def retirar(self) -> bool:
+        """
+        Intenta consumir el presupuesto de un reintento.
+        
+        Returns:
+            True si el reintento está permitido
+        """
+        with self._cerrojo:
+            self._rellenar()
+            if self._fichas >= 1:
+                self._fichas -= 1
+                return True
+            return False
+
+
+class PoliticaReintentos:
+    """
+    Configuración de los reintentos de peticiones fallidas.
+    
+    Un fallo se reintenta si su código HTTP está en codigos_reintentables o si
+    la excepción de transporte es de uno de los tipos reintentables. La espera
+    entre intentos sigue un crecimiento exponencial con jitter completo
+    (un valor aleatorio entre 0 y espera_base * 2 ** intento, acotado por
+    espera_maxima), salvo que el servidor indique otra con Retry-After.
+    """
+    
+    def __init__(
+        self,
+        max_reintentos: int = DEFAULT_MAX_REINTENTOS,
+        espera_base: float = DEFAULT_ESPERA_BASE_REINTENTO,
+        espera_maxima: float = DEFAULT_ESPERA_MAXIMA_REINTENTO,
+        codigos_reintentables: Iterable[int] = CODIGOS_HTTP_REINTENTABLES,
+        excepciones_reintentables: Optional[Tuple[Type[BaseException], ...]] = None,
+        respetar_retry_after: bool = True,
+        presupuesto: Optional[PresupuestoReintentos] = None
+    ):
+        """
+        Args:
+            max_reintentos: Número máximo de reintentos por petición
+            espera_base: Espera base en segundos para el primer reintento
+            espera_maxima: Espera máxima en segundos entre dos intentos
+            codigos_reintentables: Códigos HTTP que se consideran transitorios
+            excepciones_reintentables: Excepciones de transporte que se reintentan.
+                Por defecto, los errores de conexión y de timeout del cliente
+            respetar_retry_after: Si se debe esperar lo indicado en la cabecera Retry-After
+            presupuesto: Presupuesto global de reintentos (opcional)
+        """
+        if max_reintentos < 0:
+            raise ValueError("max_reintentos no puede ser negativo")
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.codigos_reintentables = frozenset(codigos_reintentables)
+        self.excepciones_reintentables = excepciones_reintentables
+        self.respetar_retry_after = respetar_retry_after
+        self.presupuesto = presupuesto
+    
+    def es_codigo_reintentable(self, codigo: int) -> bool:
+        """Indica si un código de estado HTTP se debe reintentar."""
+        return codigo in self.codigos_reintentables
+    
+    def es_excepcion_reintentable(
+        self,
+        excepcion: BaseException,
+        por_defecto: Tuple[Type[BaseException], ...] = ()
+    ) -> bool:
+        """
+        Indica si una excepción de transporte se debe reintentar.
+        
+        Args:
+            excepcion: Excepción producida al realizar la petición
+            por_defecto: Tipos reintentables si la política no define los suyos
+        """
+        tipos = self.excepciones_reintentables
+        if tipos is None:
+            tipos = por_defecto
+        return isinstance(excepcion, tipos)
+    
+    def calcular_espera(self, intento: int, retry_after: Optional[float] = None) -> float:
+        """
+        Calcula la espera antes de un reintento.
+        
+        Args:
+            intento: Número de reintentos ya realizados (0 para el primero)
+            retry_after: Espera indicada por el servidor, en segundos (opcional)
+            
+        Returns:
+            Segundos de espera
+        """
+        if retry_after is not None and self.respetar_retry_after:
+            return min(retry_after, self.espera_maxima)
+        techo = min(self.espera_maxima, self.espera_base * (2 ** intento))
+        return random.uniform(0, techo) 
\ No newline at end of file
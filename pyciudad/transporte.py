@@ -0,0 +1,497 @@
+"""
+Transportes: la capa que envía las peticiones y devuelve las respuestas en bruto
+"""
+
+import base64
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .cache import clave_cache, nombre_endpoint
+from .constantes import DEFAULT_HEADERS, DEFAULT_POOL_CONEXIONES, DEFAULT_MAX_CONEXIONES_HOST
+from .excepciones import ErrorTransporte, ErrorConexion, ErrorTimeout
+
+
+def _importar_httpx():
+    """Importa httpx, que sólo es necesario para el cliente asíncrono."""
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "CartoCiudadAsync requiere el paquete 'httpx'. "
+            "Instálalo con: pip install pyciudad[async]"
+        ) from e
+    return httpx
+
+
+@dataclass
+class RespuestaTransporte:
+    """
+    Respuesta en bruto de un transporte.
+    
+    Las cabeceras se consultan con el nombre canónico (por ejemplo
+    "Retry-After"); los transportes HTTP devuelven además un diccionario
+    insensible a mayúsculas.
+    """
+    codigo: int
+    contenido: bytes
+    cabeceras: Mapping[str, str] = field(default_factory=dict)
+    url: str = ""
+    
+    @property
+    def texto(self) -> str:
+        """Contenido decodificado como UTF-8."""
+        return self.contenido.decode("utf-8", errors="replace")
+
+
+def clave_peticion(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Clave de una petición independiente de la URL base: endpoint y parámetros ordenados.
+    
+    Por ejemplo, "find?q=Calle+Mayor+1".
+    """
+    return clave_cache(nombre_endpoint(url), params)
+
+
+class TransporteBase(ABC):
+    """
+    Interfaz de los transportes.
+    
+    Un transporte recibe la URL y los parámetros de una petición GET y
+    devuelve una RespuestaTransporte con el código, el cuerpo y las
+    cabeceras, sin interpretarlos: la comprobación del código, la
+    decodificación JSON, los reintentos y la caché siguen en el cliente.
+    Si la petición no obtiene respuesta debe lanzar ErrorTransporte.
+    
+    La versión asíncrona, por defecto, delega en la síncrona, lo que sirve
+    para los transportes que no hacen E/S de red.
+    """
+    
+    @abstractmethod
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        """
+        Envía una petición GET.
+        
+        Args:
+            url: URL del endpoint
+            params: Parámetros de la petición
+            
+        Returns:
+            Respuesta en bruto
+            
+        Raises:
+            ErrorTransporte: Si no se obtiene respuesta
+        """
+    
+    async def enviar_async(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        """Versión asíncrona de enviar()."""
+        return self.enviar(url, params)
+    
+    def cerrar(self) -> None:
+        """Libera los recursos del transporte."""
+        pass
+    
+    async def cerrar_async(self) -> None:
+        """Versión asíncrona de cerrar()."""
+        self.cerrar()
+
+
+class TransporteHTTP(TransporteBase):
+    """
+    Transporte HTTP síncrono basado en una sesión de requests.
+    
+    La sesión mantiene un pool de conexiones keep-alive que se reutiliza
+    entre peticiones; después de cerrar() se vuelve a crear bajo demanda.
+    Las cabeceras se leen en cada petición, así que los cambios en el
+    diccionario recibido (por ejemplo cliente.headers) se aplican a las
+    siguientes.
+    """
+    
+    def __init__(
+        self,
+        timeout: float = 10,
+        verificar_ssl: bool = True,
+        cabeceras: Optional[Dict[str, str]] = None,
+        conexiones_pool: int = DEFAULT_POOL_CONEXIONES,
+        max_conexiones_por_host: int = DEFAULT_MAX_CONEXIONES_HOST,
+        proxies_del_entorno: bool = True
+    ):
+        """
+        Args:
+            timeout: Tiempo máximo de espera por petición, en segundos
+            verificar_ssl: Si se verifica el certificado SSL
+            cabeceras: Cabeceras HTTP de todas las peticiones. El diccionario
+                se comparte, no se copia
+            conexiones_pool: Número de pools de conexiones (uno por host) en caché
+            max_conexiones_por_host: Conexiones keep-alive por host
+            proxies_del_entorno: Si se leen los proxies y certificados de las
+                variables de entorno. requests lo hace en cada petición, y con
+                entornos grandes es una parte apreciable de su coste de CPU
+        """
+        self.timeout = timeout
+        self.verificar_ssl = verificar_ssl
+        self.cabeceras = dict(DEFAULT_HEADERS) if cabeceras is None else cabeceras
+        self.conexiones_pool = conexiones_pool
+        self.max_conexiones_por_host = max_conexiones_por_host
+        self.proxies_del_entorno = proxies_del_entorno
+        self._sesion = self._crear_sesion()
+    
+    def _crear_sesion(self) -> requests.Session:
+        """
+        Crea la sesión HTTP con el pool de conexiones configurado.
+        
+        Returns:
+            Sesión de requests con adaptadores para HTTP y HTTPS
+        """
+        sesion = requests.Session()
+        sesion.trust_env = self.proxies_del_entorno
+        adaptador = HTTPAdapter(
+            pool_connections=self.conexiones_pool,
+            pool_maxsize=self.max_conexiones_por_host
+        )
+        sesion.mount("https://", adaptador)
+        sesion.mount("http://", adaptador)
+        return sesion
+    
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        if self._sesion is None:
+            self._sesion = self._crear_sesion()
+        try:
+            response = self._sesion.get(
+                url,
+                params=params,
+                headers=self.cabeceras,
+                timeout=self.timeout,
+                verify=self.verificar_ssl
+            )
+        except requests.exceptions.Timeout as e:
+            raise ErrorTimeout(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            raise ErrorConexion(str(e)) from e
+        except requests.exceptions.RequestException as e:
+            raise ErrorTransporte(str(e)) from e
+        return RespuestaTransporte(response.status_code, response.content, response.headers, response.url)
+    
+    def cerrar(self) -> None:
+        if self._sesion is not None:
+            self._sesion.close()
+            self._sesion = None
+
+
+class TransporteHTTPAsync(TransporteBase):
+    """
+    Transporte HTTP asíncrono basado en httpx.AsyncClient.
+    
+    Requiere httpx (pip install pyciudad[async]). El cliente httpx se crea
+    en la primera petición y sólo puede usarse con enviar_async(). Como en
+    TransporteHTTP, las cabeceras se leen en cada petición.
+    """
+    
+    def __init__(
+        self,
+        timeout: float = 10,
+        verificar_ssl: bool = True,
+        cabeceras: Optional[Dict[str, str]] = None,
+        max_conexiones: int = 100,
+        max_conexiones_keepalive: int = DEFAULT_MAX_CONEXIONES_HOST
+    ):
+        """
+        Args:
+            timeout: Tiempo máximo de espera por petición, en segundos
+            verificar_ssl: Si se verifica el certificado SSL
+            cabeceras: Cabeceras HTTP de todas las peticiones. El diccionario
+                se comparte, no se copia
+            max_conexiones: Conexiones simultáneas como máximo
+            max_conexiones_keepalive: Conexiones keep-alive que se conservan
+            
+        Raises:
+            ImportError: Si httpx no está instalado
+        """
+        self._httpx = _importar_httpx()
+        self.timeout = timeout
+        self.verificar_ssl = verificar_ssl
+        self.cabeceras = dict(DEFAULT_HEADERS) if cabeceras is None else cabeceras
+        self.max_conexiones = max_conexiones
+        self.max_conexiones_keepalive = max_conexiones_keepalive
+        self._cliente_http = None
+    
+    def _crear_cliente_http(self):
+        """
+        Crea el cliente httpx con el pool de conexiones configurado.
+        
+        Returns:
+            Instancia de httpx.AsyncClient
+        """
+        httpx = self._httpx
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            verify=self.verificar_ssl,
+            limits=httpx.Limits(
+                max_connections=self.max_conexiones,
+                max_keepalive_connections=self.max_conexiones_keepalive
+            )
+        )
+    
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        raise TypeError("TransporteHTTPAsync sólo admite peticiones asíncronas (enviar_async)")
+    
+    async def enviar_async(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        httpx = self._httpx
+        if self._cliente_http is None:
+            self._cliente_http = self._crear_cliente_http()
+        try:
+            response = await self._cliente_http.get(url, params=params, headers=self.cabeceras)
+        except httpx.TimeoutException as e:
+            raise ErrorTimeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise ErrorConexion(str(e)) from e
+        except httpx.HTTPError as e:
+            raise ErrorTransporte(str(e)) from e
+        return RespuestaTransporte(response.status_code, response.content, response.headers, str(response.url))
+    
+    def cerrar(self) -> None:
+        # El cliente httpx sólo puede cerrarse desde un bucle de eventos
+        pass
+    
+    async def cerrar_async(self) -> None:
+        if self._cliente_http is not None:
+            await self._cliente_http.aclose()
+            self._cliente_http = None
+
+
+def _a_respuesta(valor: Any, url: str = "") -> RespuestaTransporte:
+    """Convierte una respuesta predefinida (objeto JSON, bytes o RespuestaTransporte) en RespuestaTransporte."""
+    if isinstance(valor, RespuestaTransporte):
+        return valor
+    if isinstance(valor, bytes):
+        return RespuestaTransporte(200, valor, {}, url)
+    return RespuestaTransporte(200, json.dumps(valor, ensure_ascii=False).encode("utf-8"), {}, url)
+
+
+def _respuesta_no_encontrada(url: str, clave: str) -> RespuestaTransporte:
+    """Respuesta 404 para las peticiones sin respuesta predefinida ni grabada."""
+    cuerpo = json.dumps({"error": f"Sin respuesta para {clave}"}, ensure_ascii=False).encode("utf-8")
+    return RespuestaTransporte(404, cuerpo, {}, url)
+
+
+class TransporteMemoria(TransporteBase):
+    """
+    Transporte que responde con respuestas predefinidas, sin red.
+    
+    Las respuestas se buscan primero por la petición exacta (endpoint y
+    parámetros, como "find?q=Calle+Mayor+1") y después sólo por el nombre
+    del endpoint ("find"). Las peticiones sin respuesta reciben un 404.
+    Sirve para perfilar el decodificado y la construcción de modelos sin
+    ruido de red, y para tests.
+    
+    Ejemplo:
+        transporte = TransporteMemoria({"find": {"id": "1", "lat": 40.4, "lng": -3.7}})
+        cliente = CartoCiudad(transporte=transporte)
+    """
+    
+    def __init__(self, respuestas: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            respuestas: Diccionario clave -> respuesta. La clave es el nombre
+                del endpoint o una clave de clave_peticion(); la respuesta, un
+                objeto JSON, bytes o una RespuestaTransporte
+        """
+        self._respuestas: Dict[str, RespuestaTransporte] = {}
+        self.peticiones: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        for clave, respuesta in (respuestas or {}).items():
+            self.agregar(clave, respuesta)
+    
+    def agregar(self, clave: str, respuesta: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Añade o sustituye una respuesta predefinida.
+        
+        Args:
+            clave: Nombre del endpoint o URL del endpoint
+            respuesta: Objeto JSON, bytes o RespuestaTransporte
+            params: Si se indican, la respuesta sólo se usa para esos parámetros
+        """
+        if params is not None or "/" in clave:
+            clave = clave_peticion(clave, params)
+        self._respuestas[clave] = _a_respuesta(respuesta)
+    
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        self.peticiones.append((url, params))
+        clave = clave_peticion(url, params)
+        respuesta = self._respuestas.get(clave) or self._respuestas.get(nombre_endpoint(url))
+        if respuesta is None:
+            return _respuesta_no_encontrada(url, clave)
+        return respuesta
+
+
+class TransporteGrabacion(TransporteBase):
+    """
+    Transporte que delega en otro y graba cada petición y su respuesta.
+    
+    Cada intercambio se añade como una línea JSON (NDJSON) al diario, con
+    la URL, los parámetros, el código, las cabeceras, el cuerpo, la
+    duración y el momento de la petición. Las peticiones que fallan sin
+    respuesta se graban con el campo "error". El diario puede reproducirse
+    después con TransporteReproduccion.
+    """
+    
+    def __init__(self, interior: TransporteBase, ruta: str):
+        """
+        Args:
+            interior: Transporte que realiza las peticiones
+            ruta: Fichero del diario; las líneas se añaden al final
+        """
+        self.interior = interior
+        self.ruta = ruta
+        self._fichero = open(ruta, "a", encoding="utf-8")
+        self._bloqueo = threading.Lock()
+    
+    def _grabar(self, url, params, inicio, respuesta=None, error=None) -> None:
+        """Añade un intercambio al diario."""
+        entrada: Dict[str, Any] = {
+            "momento": inicio,
+            "duracion": time.time() - inicio,
+            "url": url,
+            "params": params,
+        }
+        if respuesta is not None:
+            entrada["codigo"] = respuesta.codigo
+            entrada["cabeceras"] = dict(respuesta.cabeceras)
+            try:
+                entrada["contenido"] = respuesta.contenido.decode("utf-8")
+            except UnicodeDecodeError:
+                entrada["contenido_b64"] = base64.b64encode(respuesta.contenido).decode("ascii")
+        else:
+            entrada["error"] = type(error).__name__
+            entrada["mensaje"] = str(error)
+        linea = json.dumps(entrada, ensure_ascii=False)
+        with self._bloqueo:
+            self._fichero.write(linea + "\n")
+            self._fichero.flush()
+    
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        inicio = time.time()
+        try:
+            respuesta = self.interior.enviar(url, params)
+        except ErrorTransporte as e:
+            self._grabar(url, params, inicio, error=e)
+            raise
+        self._grabar(url, params, inicio, respuesta=respuesta)
+        return respuesta
+    
+    async def enviar_async(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        inicio = time.time()
+        try:
+            respuesta = await self.interior.enviar_async(url, params)
+        except ErrorTransporte as e:
+            self._grabar(url, params, inicio, error=e)
+            raise
+        self._grabar(url, params, inicio, respuesta=respuesta)
+        return respuesta
+    
+    def cerrar(self) -> None:
+        self.interior.cerrar()
+        with self._bloqueo:
+            self._fichero.close()
+    
+    async def cerrar_async(self) -> None:
+        await self.interior.cerrar_async()
+        with self._bloqueo:
+            self._fichero.close()
+
+
+# Errores grabados que se reproducen con su tipo original
+_ERRORES_GRABADOS = {
+    "ErrorConexion": ErrorConexion,
+    "ErrorTimeout": ErrorTimeout,
+}
+
+
+class TransporteReproduccion(TransporteBase):
+    """
+    Transporte que responde con los intercambios de un diario grabado.
+    
+    Cada petición se resuelve por su endpoint y sus parámetros (sin la URL
+    base). Si la misma petición se grabó varias veces, las respuestas se
+    devuelven en el orden grabado y la última se repite. Las peticiones
+    que no están en el diario reciben un 404. Las cabeceras se devuelven
+    en un diccionario insensible a mayúsculas, como las de los transportes
+    HTTP (httpx las graba en minúsculas).
+    
+    Con consultas() se obtienen las peticiones en el orden original, para
+    volver a lanzar la misma carga contra el cliente.
+    """
+    
+    def __init__(self, ruta: str, respetar_tiempos: bool = False):
+        """
+        Args:
+            ruta: Fichero NDJSON grabado con TransporteGrabacion
+            respetar_tiempos: Si cada respuesta espera la duración grabada
+        """
+        self.ruta = ruta
+        self.respetar_tiempos = respetar_tiempos
+        self._entradas: List[Dict[str, Any]] = []
+        self._por_clave: Dict[str, deque] = {}
+        self._bloqueo = threading.Lock()
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    entrada = json.loads(linea)
+                    self._entradas.append(entrada)
+                    clave = clave_peticion(entrada["url"], entrada.get("params"))
+                    self._por_clave.setdefault(clave, deque()).append(entrada)
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def consultas(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Devuelve las peticiones (endpoint, parámetros) del diario en el orden grabado."""
+        for entrada in self._entradas:
+            yield nombre_endpoint(entrada["url"]), entrada.get("params")
+    
+    def _siguiente(self, clave: str) -> Optional[Dict[str, Any]]:
+        """Devuelve la siguiente entrada grabada para una clave."""
+        with self._bloqueo:
+            cola = self._por_clave.get(clave)
+            if not cola:
+                return None
+            return cola.popleft() if len(cola) > 1 else cola[0]
+    
+    @staticmethod
+    def _respuesta(entrada: Dict[str, Any], url: str) -> RespuestaTransporte:
+        """Reconstruye la respuesta (o el error) de una entrada grabada."""
+        if "error" in entrada:
+            raise _ERRORES_GRABADOS.get(entrada["error"], ErrorTransporte)(entrada.get("mensaje", ""))
+        if "contenido_b64" in entrada:
+            contenido = base64.b64decode(entrada["contenido_b64"])
+        else:
+            contenido = entrada.get("contenido", "").encode("utf-8")
+        cabeceras = CaseInsensitiveDict(entrada.get("cabeceras") or {})
+        return RespuestaTransporte(entrada["codigo"], contenido, cabeceras, url)
+    
+    def enviar(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        clave = clave_peticion(url, params)
+        entrada = self._siguiente(clave)
+        if entrada is None:
+            return _respuesta_no_encontrada(url, clave)
+        if self.respetar_tiempos:
+            time.sleep(entrada.get("duracion", 0))
+        return self._respuesta(entrada, url)
+    
+    async def enviar_async(self, url: str, params: Optional[Dict[str, Any]] = None) -> RespuestaTransporte:
+        import asyncio
+        
+        clave = clave_peticion(url, params)
+        entrada = self._siguiente(clave)
+        if entrada is None:
+            return _respuesta_no_encontrada(url, clave)
+        if self.respetar_tiempos:
+            await asyncio.sleep(entrada.get("duracion", 0))
+        return self._respuesta(entrada, url) 
\ No newline at end of file
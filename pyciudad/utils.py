@@ -2,8 +2,11 @@
 Utilidades para PyCartoCiudad
 """
 
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+import json
+import unicodedata
 import urllib.parse
+from .constantes import RANGO_LONGITUD, RANGO_LATITUD
 from .excepciones import PeticionInvalidaError
 
 
@@ -19,13 +22,13 @@ def validar_coordenadas(longitud: float, latitud: float) -> None:
         PeticionInvalidaError: Si las coordenadas están fuera de rangos válidos
     """
     # Rango aproximado para España (con margen)
-    if not (-10.0 <= longitud <= 5.0):
+    if not (RANGO_LONGITUD[0] <= longitud <= RANGO_LONGITUD[1]):
         raise PeticionInvalidaError(
             "Longitud fuera del rango válido para España (-10.0 a 5.0)",
             parametro="longitud"
         )
     
-    if not (35.0 <= latitud <= 44.0):
+    if not (RANGO_LATITUD[0] <= latitud <= RANGO_LATITUD[1]):
         raise PeticionInvalidaError(
             "Latitud fuera del rango válido para España (35.0 a 44.0)",
             parametro="latitud"
@@ -81,4 +84,98 @@ def url_encode(texto: str) -> str:
     Returns:
         Texto codificado para URL
     """
-    return urllib.parse.quote(texto) 
\ No newline at end of file
+    return urllib.parse.quote(texto)
+
+
+def quitar_tildes(texto: str) -> str:
+    """
+    Quita las tildes y diéresis de un texto (la ñ queda como n).
+    
+    Args:
+        texto: Texto original
+        
+    Returns:
+        Texto sin marcas diacríticas, por ejemplo "Alcala" para "Alcalá"
+    """
+    return "".join(c for c in unicodedata.normalize("NFD", texto) if not unicodedata.combining(c))
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza un texto para comparaciones insensibles a mayúsculas y tildes.
+    
+    Pasa a minúsculas, quita las tildes y diéresis (la ñ queda como n),
+    sustituye los signos de puntuación por espacios y colapsa los espacios.
+    
+    Args:
+        texto: Texto a normalizar
+        
+    Returns:
+        Texto normalizado, por ejemplo "alcala de henares" para "Alcalá de Henares"
+    """
+    return " ".join("".join(c if c.isalnum() else " " for c in quitar_tildes(texto).lower()).split())
+
+
+def guardar_entidades(
+    ruta: str,
+    formato: str,
+    version: int,
+    entidades: Iterable[Dict[str, Any]],
+    **metadatos: Any
+) -> None:
+    """
+    Guarda entidades en JSON por columnas comprimido con gzip.
+    
+    La lista de campos se escribe una vez y cada entidad es una fila de
+    valores, de modo que los nombres de campo no se repiten.
+    
+    Args:
+        ruta: Fichero de destino (por convención, .json.gz)
+        formato: Identificador del formato, que se comprueba al cargar
+        version: Versión del formato
+        entidades: Diccionarios con los campos de cada entidad
+        **metadatos: Valores adicionales que se guardan en la cabecera
+    """
+    import gzip
+    
+    entidades = list(entidades)
+    campos = sorted({campo for entidad in entidades for campo in entidad})
+    datos = {
+        "formato": formato,
+        "version": version,
+        **metadatos,
+        "campos": campos,
+        "filas": [[entidad.get(campo) for campo in campos] for entidad in entidades],
+    }
+    with gzip.open(ruta, "wt", compresslevel=6, encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def cargar_entidades(ruta: str, formato: str, version: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Carga entidades guardadas con guardar_entidades().
+    
+    Args:
+        ruta: Fichero guardado
+        formato: Identificador del formato esperado
+        version: Versión del formato esperada
+        
+    Returns:
+        Tupla (entidades, cabecera), con los campos nulos omitidos en las
+        entidades y los metadatos y la lista de campos en la cabecera
+        
+    Raises:
+        ValueError: Si el fichero no tiene el formato o la versión esperados
+    """
+    import gzip
+    
+    with gzip.open(ruta, "rt", encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("formato") != formato or datos.get("version") != version:
+        raise ValueError(f"{ruta} no es un fichero {formato} de PyCiudad (versión {version})")
+    campos = datos["campos"]
+    entidades = [
+        {campo: valor for campo, valor in zip(campos, fila) if valor is not None}
+        for fila in datos.pop("filas")
+    ]
+    return entidades, datos
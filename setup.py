@@ -33,5 +33,12 @@ setup(
         "pydantic>=2.0.0",
         "typing-extensions>=4.0.0",
     ],
+    extras_require={
+        "async": ["httpx>=0.24.0"],
+        "rapido": ["orjson>=3.8.0"],
+        "numpy": ["numpy>=1.22"],
+        "arrow": ["pyarrow>=10.0", "numpy>=1.22"],
+        "pandas": ["pandas>=1.5", "numpy>=1.22"],
+    },
     keywords="cartociudad, geocoding, spain, ign, api, rest, geospatial",
 ) 
\ No newline at end of file
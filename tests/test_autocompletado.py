@@ -0,0 +1,197 @@
+"""
+Tests para el autocompletado de PyCiudad
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from pyciudad.autocompletado import (
+    CachePrefijos,
+    SesionAutocompletado,
+    SesionAutocompletadoAsync,
+    coincide
+)
+from pyciudad.modelos import Candidato
+
+
+def candidato(direccion, municipio="Madrid"):
+    """Crea un candidato de prueba."""
+    return Candidato.model_validate({"address": direccion, "muni": municipio, "province": municipio})
+
+
+CALLES = [
+    candidato("CALLE IGLESIA"),
+    candidato("CALLE IGUALDAD"),
+    candidato("CALLE ÍNDICO", "Málaga"),
+    candidato("AVENIDA ILUSTRACIÓN"),
+]
+
+
+class ClienteFalso:
+    """Cliente que responde a buscar_candidatos filtrando CALLES y anota las consultas."""
+    
+    def __init__(self, retardo=0.0):
+        self.consultas = []
+        self.retardo = retardo
+    
+    def buscar_candidatos(self, consulta, limite=10, **filtros):
+        self.consultas.append(consulta)
+        time.sleep(self.retardo)
+        return [c for c in CALLES if coincide(consulta.lower(), c)][:limite]
+
+
+class ClienteFalsoAsync(ClienteFalso):
+    """Versión asíncrona de ClienteFalso."""
+    
+    async def buscar_candidatos(self, consulta, limite=10, **filtros):
+        self.consultas.append(consulta)
+        await asyncio.sleep(self.retardo)
+        return [c for c in CALLES if coincide(consulta.lower(), c)][:limite]
+
+
+class TestCachePrefijos:
+    """Tests para el trie de prefijos."""
+    
+    def test_coincide(self):
+        """Test de la coincidencia por comienzo de palabra, sin tildes ni mayúsculas."""
+        assert coincide("calle ind", CALLES[2])
+        assert coincide("ind malag", CALLES[2])
+        assert not coincide("calle ig malaga", CALLES[0])
+    
+    def test_prefijo_completo_filtra_localmente(self):
+        """Test de que un resultado completo responde a las consultas que lo prolongan."""
+        cache = CachePrefijos()
+        cache.guardar("calle i", CALLES[:3], completo=True)
+        
+        assert cache.buscar("calle i") == CALLES[:3]
+        assert cache.buscar("calle ig") == CALLES[:2]
+        assert cache.buscar("calle igu") == [CALLES[1]]
+        # El resultado filtrado se guarda como una consulta más
+        assert len(cache) == 3
+        assert cache.buscar("calle") is None
+    
+    def test_prefijo_truncado(self):
+        """Test de que un resultado cortado en el límite no se filtra."""
+        cache = CachePrefijos()
+        cache.guardar("calle i", CALLES[:2], completo=False)
+        
+        assert cache.buscar("calle i") == CALLES[:2]
+        assert cache.buscar("calle ig") is None
+    
+    def test_ttl_y_limite(self):
+        """Test de la caducidad y del descarte de los prefijos menos usados."""
+        cache = CachePrefijos(max_entradas=2, ttl=10)
+        reloj = [0.0]
+        cache._reloj = lambda: reloj[0]
+        cache.guardar("abc", [], completo=True)
+        cache.guardar("abd", [], completo=True)
+        cache.buscar("abc")
+        cache.guardar("xyz", [], completo=True)
+        
+        assert len(cache) == 2
+        assert cache.buscar("abd") is None
+        assert "d" not in cache._raiz.hijos["a"].hijos["b"].hijos
+        
+        reloj[0] = 11
+        assert cache.buscar("abc") is None
+
+
+class TestSesionAutocompletado:
+    """Tests para la sesión de autocompletado síncrona."""
+    
+    def test_consultar_reutiliza_prefijos(self):
+        """Test de que prolongar un prefijo completo no vuelve a la API."""
+        cliente = ClienteFalso()
+        sesion = SesionAutocompletado(cliente, al_resultado=None, limite=10)
+        
+        assert sesion.consultar("Calle I") == CALLES[:3]
+        assert sesion.consultar("Calle Ig") == CALLES[:2]
+        assert sesion.consultar("calle igle") == [CALLES[0]]
+        assert sesion.consultar("ca") == []
+        assert cliente.consultas == ["Calle I"]
+        assert sesion.estadisticas["locales"] == 2
+    
+    def test_escribir_espera_entre_pulsaciones(self):
+        """Test de que sólo se consulta el último texto de una ráfaga de pulsaciones."""
+        cliente = ClienteFalso()
+        resultados = []
+        recibido = threading.Event()
+        
+        def al_resultado(texto, candidatos):
+            resultados.append((texto, candidatos))
+            recibido.set()
+        
+        sesion = SesionAutocompletado(cliente, al_resultado, espera=0.05)
+        for texto in ("cal", "call", "calle", "calle i"):
+            sesion.escribir(texto)
+        assert recibido.wait(2)
+        
+        assert cliente.consultas == ["calle i"]
+        assert resultados == [("calle i", CALLES[:3])]
+        assert sesion.estadisticas["canceladas"] == 3
+        
+        # Prolongar el prefijo se responde al momento, sin esperar
+        sesion.escribir("calle ind")
+        assert resultados[-1] == ("calle ind", [CALLES[2]])
+        sesion.cerrar()
+    
+    def test_respuesta_obsoleta_no_se_entrega(self):
+        """Test de que una respuesta que llega tras otra pulsación se descarta, pero se guarda."""
+        cliente = ClienteFalso(retardo=0.2)
+        resultados = []
+        recibido = threading.Event()
+        
+        def al_resultado(texto, candidatos):
+            resultados.append(texto)
+            recibido.set()
+        
+        sesion = SesionAutocompletado(cliente, al_resultado, espera=0.01, limite=2)
+        sesion.escribir("calle i")
+        time.sleep(0.1)  # La petición de "calle i" ya está en curso
+        sesion.escribir("avenida")
+        assert recibido.wait(2)
+        time.sleep(0.2)
+        
+        assert cliente.consultas == ["calle i", "avenida"]
+        assert resultados == ["avenida"]
+        assert sesion.estadisticas["obsoletas"] == 1
+        assert sesion.cache.buscar("calle i") == CALLES[:2]
+
+
+class TestSesionAutocompletadoAsync:
+    """Tests para la sesión de autocompletado asíncrona."""
+    
+    def test_cancela_consultas_obsoletas(self):
+        """Test de que cada pulsación cancela la consulta anterior, esté esperando o en curso."""
+        cliente = ClienteFalsoAsync(retardo=0.1)
+        sesion = SesionAutocompletadoAsync(cliente, espera=0.02)
+        
+        async def teclear():
+            primera = asyncio.ensure_future(sesion.escribir("calle"))
+            await asyncio.sleep(0)
+            segunda = asyncio.ensure_future(sesion.escribir("calle i"))
+            await asyncio.sleep(0.05)  # La petición de "calle i" ya está en curso
+            tercera = asyncio.ensure_future(sesion.escribir("avenida"))
+            return await asyncio.gather(primera, segunda, tercera)
+        
+        primera, segunda, tercera = asyncio.run(teclear())
+        
+        assert primera is None
+        assert segunda is None
+        assert tercera == [CALLES[3]]
+        assert cliente.consultas == ["calle i", "avenida"]
+        assert sesion.estadisticas == {"peticiones": 2, "locales": 0, "canceladas": 1, "obsoletas": 1}
+    
+    def test_respuesta_local(self):
+        """Test de que la caché de prefijos responde sin esperar."""
+        cliente = ClienteFalsoAsync()
+        sesion = SesionAutocompletadoAsync(cliente, espera=0.01)
+        
+        async def teclear():
+            await sesion.escribir("calle i")
+            return await sesion.escribir("calle igl")
+        
+        assert asyncio.run(teclear()) == [CALLES[0]]
+        assert cliente.consultas == ["calle i"] 
\ No newline at end of file
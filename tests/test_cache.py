@@ -0,0 +1,270 @@
+"""
+Tests para las cachés de respuestas de PyCiudad
+"""
+
+import threading
+import pytest
+import responses
+
+from pyciudad.cache import CacheBase, CacheMemoria, CacheSQLite, CacheInversaEspacial, clave_cache
+from pyciudad.cliente import CartoCiudad
+from pyciudad.constantes import CANDIDATES_URL, FIND_URL, REVERSE_GEOCODE_URL
+from pyciudad.espacial import RejillaEspacial, distancia_metros
+from pyciudad.excepciones import PeticionInvalidaError
+from pyciudad.normalizacion import NormalizadorConsultas
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_FIND, RESPUESTA_REVERSE
+
+
+class RelojFalso:
+    """Reloj controlable para probar la caducidad sin esperas."""
+    
+    def __init__(self):
+        self.ahora = 0.0
+    
+    def __call__(self):
+        return self.ahora
+
+
+class TestCacheMemoria:
+    """Tests para CacheMemoria."""
+    
+    def test_clave_canonica(self):
+        """Test de que el orden de los parámetros no altera la clave."""
+        a = clave_cache(FIND_URL, {"q": "Mayor 1", "portal": 1})
+        b = clave_cache(FIND_URL, {"portal": "1", "q": "Mayor 1"})
+        assert a == b
+        assert a != clave_cache(CANDIDATES_URL, {"q": "Mayor 1", "portal": 1})
+    
+    def test_interfaz_abstracta(self):
+        """Test de que una caché debe implementar obtener, guardar y limpiar."""
+        class CacheIncompleta(CacheBase):
+            def obtener(self, url, params=None):
+                return None
+        
+        with pytest.raises(TypeError):
+            CacheBase()
+        with pytest.raises(TypeError):
+            CacheIncompleta()
+    
+    def test_lru(self):
+        """Test de la expulsión de la entrada menos usada."""
+        cache = CacheMemoria(max_entradas=2)
+        cache.guardar(FIND_URL, {"q": "a"}, {"id": "a"})
+        cache.guardar(FIND_URL, {"q": "b"}, {"id": "b"})
+        assert cache.obtener(FIND_URL, {"q": "a"}) == {"id": "a"}
+        cache.guardar(FIND_URL, {"q": "c"}, {"id": "c"})
+        
+        assert cache.obtener(FIND_URL, {"q": "b"}) is None
+        assert cache.obtener(FIND_URL, {"q": "a"}) == {"id": "a"}
+        assert cache.estadisticas()["expulsiones"] == 1
+    
+    def test_ttl_por_endpoint(self):
+        """Test de la caducidad específica por endpoint."""
+        cache = CacheMemoria(ttl=100, ttl_por_endpoint={"reverseGeocode": 10})
+        reloj = RelojFalso()
+        cache._reloj = reloj
+        cache.guardar(FIND_URL, {"q": "a"}, {"id": "a"})
+        cache.guardar(REVERSE_GEOCODE_URL, {"lon": 1, "lat": 2}, {"id": "r"})
+        
+        reloj.ahora = 50
+        assert cache.obtener(FIND_URL, {"q": "a"}) == {"id": "a"}
+        assert cache.obtener(REVERSE_GEOCODE_URL, {"lon": 1, "lat": 2}) is None
+    
+    def test_copias_independientes(self):
+        """Test de que modificar un resultado no altera la caché."""
+        cache = CacheMemoria()
+        datos = {"geom": {"coordinates": [1, 2]}}
+        cache.guardar(FIND_URL, {"q": "a"}, datos)
+        datos["geom"]["coordinates"].append(3)
+        
+        copia = cache.obtener(FIND_URL, {"q": "a"})
+        copia["geom"]["coordinates"].append(4)
+        assert cache.obtener(FIND_URL, {"q": "a"}) == {"geom": {"coordinates": [1, 2]}}
+    
+    def test_acceso_concurrente(self):
+        """Test de acceso desde varios hilos."""
+        cache = CacheMemoria(max_entradas=50)
+        
+        def trabajar(n):
+            for i in range(200):
+                cache.guardar(FIND_URL, {"q": f"{n}-{i}"}, {"i": i})
+                cache.obtener(FIND_URL, {"q": f"{n}-{i // 2}"})
+        
+        hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert len(cache) == 50
+        assert cache.aciertos + cache.fallos == 8 * 200
+    
+    @responses.activate
+    def test_cliente_con_cache(self):
+        """Test de que el cliente evita peticiones repetidas."""
+        responses.add(responses.GET, CANDIDATES_URL, json=RESPUESTA_CANDIDATOS, status=200)
+        responses.add(responses.GET, FIND_URL, json={"error": "no encontrado"}, status=200)
+        cliente = CartoCiudad(cache=CacheMemoria())
+        
+        primeros = cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        segundos = cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        primeros[0].muni = "Otro"
+        
+        assert len(responses.calls) == 1
+        assert segundos[0] is not primeros[0]
+        assert segundos[0].muni == "Madrid"
+        assert cliente.buscar_candidatos("Calle Iglesia 5, Madrid")[0].muni == "Madrid"
+        
+        # Las respuestas de error no se guardan
+        for _ in range(2):
+            with pytest.raises(Exception):
+                cliente.geocodificar("inexistente")
+        assert len(responses.calls) == 3
+
+
+class TestCacheSQLite:
+    """Tests para CacheSQLite."""
+    
+    def test_persistencia_entre_instancias(self, tmp_path):
+        """Test de que dos instancias (procesos) comparten el mismo fichero."""
+        ruta = str(tmp_path / "cache.sqlite")
+        escritora = CacheSQLite(ruta)
+        escritora.guardar(FIND_URL, {"q": "Mayor 1"}, RESPUESTA_FIND)
+        escritora.cerrar()
+        
+        lectora = CacheSQLite(ruta)
+        assert lectora.obtener(FIND_URL, {"q": "Mayor 1"}) == RESPUESTA_FIND
+        assert lectora.obtener(FIND_URL, {"q": "Mayor 2"}) is None
+        modo = lectora._conexion().execute("PRAGMA journal_mode").fetchone()[0]
+        assert modo == "wal"
+        lectora.cerrar()
+    
+    def test_obtener_varios_y_caducidad(self, tmp_path):
+        """Test de la consulta masiva y la caducidad por endpoint."""
+        cache = CacheSQLite(str(tmp_path / "cache.sqlite"), ttl=100, ttl_por_endpoint={"find": 10})
+        reloj = RelojFalso()
+        cache._reloj = reloj
+        for i in range(0, 1200, 2):
+            cache.guardar(CANDIDATES_URL, {"q": str(i)}, [{"id": str(i)}])
+        cache.guardar(FIND_URL, {"q": "a"}, {"id": "a"})
+        
+        reloj.ahora = 50
+        resultados = cache.obtener_varios(CANDIDATES_URL, [{"q": str(i)} for i in range(1200)])
+        assert resultados[0] == [{"id": "0"}]
+        assert resultados[1] is None
+        assert sum(r is not None for r in resultados) == 600
+        assert cache.obtener(FIND_URL, {"q": "a"}) is None
+        
+        # La poda elimina la entrada caducada
+        assert cache.podar() == 1
+        cache.cerrar()
+    
+    def test_limite_de_entradas(self, tmp_path):
+        """Test de la eliminación de las entradas más antiguas."""
+        cache = CacheSQLite(str(tmp_path / "cache.sqlite"), max_entradas=5)
+        reloj = RelojFalso()
+        cache._reloj = reloj
+        for i in range(8):
+            reloj.ahora = i
+            cache.guardar(FIND_URL, {"q": str(i)}, {"id": str(i)})
+        
+        assert cache.podar() == 3
+        assert len(cache) == 5
+        assert cache.obtener(FIND_URL, {"q": "2"}) is None
+        assert cache.obtener(FIND_URL, {"q": "3"}) == {"id": "3"}
+        cache.cerrar()
+    
+    @responses.activate
+    def test_cliente_con_cache_sqlite(self, tmp_path):
+        """Test del uso transparente desde el cliente y desde varios hilos."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        cache = CacheSQLite(str(tmp_path / "cache.sqlite"))
+        cliente = CartoCiudad(cache=cache)
+        
+        resultados = cliente.geocodificar_lote(["Clínico, Málaga"] * 3 + ["Larios, Málaga"], concurrencia=1)
+        assert all(r.correcto for r in resultados)
+        assert len(responses.calls) == 2
+        
+        resultados = cliente.geocodificar_lote(["Clínico, Málaga", "Larios, Málaga"] * 10, concurrencia=4)
+        assert all(r.resultado.id == "2906755300" for r in resultados)
+        assert len(responses.calls) == 2
+        cache.cerrar()
+    
+    @responses.activate
+    def test_en_cache(self, tmp_path):
+        """Test de la consulta en bloque desde el cliente con las mismas claves que geocodificar()."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        cache = CacheSQLite(str(tmp_path / "cache.sqlite"))
+        cliente = CartoCiudad(cache=cache, normalizador=NormalizadorConsultas())
+        cliente.geocodificar("C/ Larios 1, Málaga")
+        cliente.geocodificar(tipo="portal", id_entidad="1", portal="2")
+        
+        consultas = ["calle larios, 1 malaga", "Clínico, Málaga", "", {"tipo": "portal", "id_entidad": "1"}]
+        assert cliente.en_cache(consultas) == [True, False, False, False]
+        assert cliente.en_cache([{"tipo": "portal", "id_entidad": "1"}], portal="2") == [True]
+        assert CartoCiudad().en_cache(["calle larios, 1 malaga"]) == [False]
+        cache.cerrar()
+
+
+class TestCacheInversaEspacial:
+    """Tests para CacheInversaEspacial y la rejilla espacial."""
+    
+    def test_rejilla_vecinos(self):
+        """Test de la búsqueda del vecino más cercano en la rejilla."""
+        rejilla = RejillaEspacial(celda_metros=5)
+        rejilla.insertar(-3.703790, 40.416775, "sol")
+        rejilla.insertar(-3.703790, 40.416875, "norte")  # ~11 m al norte
+        
+        distancia, _, _, valor = rejilla.mas_cercano(-3.703800, 40.416780, radio_metros=5)
+        assert valor == "sol"
+        assert distancia < 2
+        assert rejilla.mas_cercano(-3.703790, 40.417100, radio_metros=5) is None
+        assert len(list(rejilla.vecinos(-3.703790, 40.416825, radio_metros=10))) == 2
+        assert 11 < distancia_metros(-3.703790, 40.416775, -3.703790, 40.416875) < 11.2
+    
+    def test_aciertos_por_proximidad(self):
+        """Test de que puntos cercanos reutilizan la misma respuesta."""
+        cache = CacheInversaEspacial(celda_metros=10)
+        cache.guardar(-0.344579, 39.472413, None, RESPUESTA_REVERSE)
+        
+        # ~3 m de distancia: acierto
+        assert cache.obtener(-0.344600, 39.472430) == RESPUESTA_REVERSE
+        # ~30 m de distancia: fallo
+        assert cache.obtener(-0.344579, 39.472683) is None
+        # Mismo punto pero otro tipo de entidad: fallo
+        assert cache.obtener(-0.344579, 39.472413, tipo="portal") is None
+        assert cache.estadisticas()["aciertos"] == 1
+        
+        with pytest.raises(PeticionInvalidaError):
+            cache.obtener(100.0, 50.0)
+    
+    def test_limite_y_caducidad(self):
+        """Test de la expulsión LRU y la caducidad de las entradas."""
+        cache = CacheInversaEspacial(max_entradas=2, ttl=10)
+        reloj = RelojFalso()
+        cache._reloj = reloj
+        cache.guardar(-3.70, 40.41, None, {"id": "a"})
+        cache.guardar(-3.60, 40.41, None, {"id": "b"})
+        assert cache.obtener(-3.70, 40.41) == {"id": "a"}
+        cache.guardar(-3.50, 40.41, None, {"id": "c"})
+        
+        assert len(cache) == 2
+        assert cache.obtener(-3.60, 40.41) is None
+        reloj.ahora = 11
+        assert cache.obtener(-3.70, 40.41) is None
+        assert len(cache) == 1
+    
+    @responses.activate
+    def test_cliente_con_cache_inversa(self):
+        """Test del origen de los resultados en el cliente."""
+        responses.add(responses.GET, REVERSE_GEOCODE_URL, json=RESPUESTA_REVERSE, status=200)
+        cliente = CartoCiudad(cache_inversa=CacheInversaEspacial(celda_metros=5))
+        
+        primera = cliente.geocodificacion_inversa(-0.344579, 39.472413)
+        segunda = cliente.geocodificacion_inversa(-0.344585, 39.472418)
+        
+        assert primera.origen == "api"
+        assert segunda.origen == "cache"
+        assert segunda.numero == "146"
+        assert segunda == primera
+        assert len(responses.calls) == 1 
\ No newline at end of file
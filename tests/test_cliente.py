@@ -230,7 +230,7 @@ class TestCartoCiudad:
         
         assert "Longitud fuera del rango válido" in str(excinfo.value)
     
-    @patch('pyciudad.cliente.requests.get')
+    @patch('pyciudad.transporte.requests.Session.get')
     def test_timeout(self, mock_get):
         """Test para timeout en la petición."""
         # Configurar mock para simular timeout
@@ -243,7 +243,7 @@ class TestCartoCiudad:
         
         assert "Tiempo de espera agotado" in str(excinfo.value)
     
-    @patch('pyciudad.cliente.requests.get')
+    @patch('pyciudad.transporte.requests.Session.get')
     def test_error_conexion(self, mock_get):
         """Test para error de conexión."""
         # Configurar mock para simular error de conexión
@@ -254,4 +254,81 @@ class TestCartoCiudad:
         with pytest.raises(APIError) as excinfo:
             self.cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
         
-        assert "Error de conexión" in str(excinfo.value) 
\ No newline at end of file
+        assert "Error de conexión" in str(excinfo.value)
+    
+    @responses.activate
+    def test_sesion_reutilizada(self):
+        """Test para la reutilización de la sesión HTTP entre métodos."""
+        responses.add(responses.GET, CANDIDATES_URL, json=RESPUESTA_CANDIDATOS, status=200)
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        
+        sesion = self.cliente.transporte._sesion
+        self.cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        self.cliente.geocodificar("Estación de metro Clínico, Málaga")
+        
+        assert self.cliente.transporte._sesion is sesion
+        adaptador = sesion.get_adapter(CANDIDATES_URL)
+        assert adaptador._pool_maxsize == self.cliente.max_conexiones_por_host
+    
+    @responses.activate
+    def test_cerrar_y_gestor_contexto(self):
+        """Test para el cierre explícito de la sesión."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        
+        with CartoCiudad(conexiones_pool=2, max_conexiones_por_host=4) as cliente:
+            assert cliente.transporte._sesion.get_adapter(FIND_URL)._pool_maxsize == 4
+        assert cliente.transporte._sesion is None
+        
+        # Tras cerrar, el cliente abre una sesión nueva bajo demanda
+        ubicacion = cliente.geocodificar("Estación de metro Clínico, Málaga")
+        assert ubicacion.id == "2906755300"
+        assert cliente.transporte._sesion is not None
+        cliente.cerrar()
+    
+    @responses.activate
+    def test_geocodificar_lote(self):
+        """Test para la geocodificación por lotes con errores aislados."""
+        def respuesta_find(request):
+            if "error" in request.url:
+                return (500, {}, "error interno")
+            return (200, {}, json.dumps(RESPUESTA_FIND))
+        
+        responses.add_callback(responses.GET, FIND_URL, callback=respuesta_find)
+        
+        consultas = [f"Calle {i}" for i in range(20)]
+        consultas[7] = "error"
+        consultas[12] = {"tipo": "portal", "id_entidad": "2906755300"}
+        resultados = self.cliente.geocodificar_lote(consultas, concurrencia=4)
+        
+        assert [r.indice for r in resultados] == list(range(20))
+        assert [r.entrada for r in resultados] == consultas
+        assert not resultados[7].correcto
+        assert isinstance(resultados[7].error, APIError)
+        assert all(r.correcto for i, r in enumerate(resultados) if i != 7)
+        assert resultados[12].resultado.id == "2906755300"
+    
+    @responses.activate
+    def test_geocodificacion_inversa_lote(self):
+        """Test para la geocodificación inversa por lotes."""
+        responses.add(responses.GET, REVERSE_GEOCODE_URL, json=RESPUESTA_REVERSE, status=200)
+        
+        coordenadas = [(-0.344579, 39.472413), (100.0, 50.0), (-3.70, 40.41)]
+        resultados = self.cliente.geocodificacion_inversa_lote(coordenadas, concurrencia=2)
+        
+        assert resultados[0].resultado.numero == "146"
+        assert isinstance(resultados[1].error, PeticionInvalidaError)
+        assert resultados[2].correcto
+        assert len(responses.calls) == 2
+    
+    @responses.activate
+    def test_sin_geometria(self):
+        """Test de la opción para descartar la geometría de las respuestas."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        
+        cliente = CartoCiudad(incluir_geometria=False)
+        ubicacion = cliente.geocodificar("Clínico")
+        assert ubicacion.geom is None
+        assert ubicacion.obtener_geometria() is None
+        assert ubicacion.latitud == 36.716583
+        
+        assert self.cliente.geocodificar("Clínico").geom == RESPUESTA_FIND["geom"]
@@ -0,0 +1,116 @@
+"""
+Tests para el cliente asíncrono de PyCiudad
+"""
+
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from pyciudad.cliente_async import CartoCiudadAsync
+from pyciudad.excepciones import APIError, PeticionInvalidaError
+from pyciudad.reintentos import PoliticaReintentos
+from pyciudad.constantes import CANDIDATES_URL, FIND_URL, REVERSE_GEOCODE_URL
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_FIND, RESPUESTA_REVERSE
+
+
+def crear_cliente(manejador, **kwargs):
+    """Crea un cliente asíncrono cuyo transporte HTTP es un mock de httpx."""
+    cliente = CartoCiudadAsync(**kwargs)
+    cliente.transporte._cliente_http = httpx.AsyncClient(transport=httpx.MockTransport(manejador))
+    return cliente
+
+
+class TestCartoCiudadAsync:
+    """Tests para el cliente CartoCiudadAsync."""
+    
+    def test_metodos_basicos(self):
+        """Test de los tres métodos principales con respuestas mock."""
+        def manejador(request):
+            url = str(request.url).split("?")[0]
+            if url == CANDIDATES_URL:
+                assert request.url.params["q"] == "Calle Iglesia 5, Madrid"
+                return httpx.Response(200, json=RESPUESTA_CANDIDATOS)
+            if url == FIND_URL:
+                return httpx.Response(200, json=RESPUESTA_FIND)
+            if url == REVERSE_GEOCODE_URL:
+                return httpx.Response(200, json=RESPUESTA_REVERSE)
+            return httpx.Response(404)
+        
+        async def ejecutar():
+            async with crear_cliente(manejador) as cliente:
+                candidatos = await cliente.buscar_candidatos("Calle Iglesia 5, Madrid", limite=2)
+                ubicacion = await cliente.geocodificar("Estación de metro Clínico, Málaga")
+                direccion = await cliente.geocodificacion_inversa(-0.344579, 39.472413)
+            return candidatos, ubicacion, direccion
+        
+        candidatos, ubicacion, direccion = asyncio.run(ejecutar())
+        
+        assert len(candidatos) == 2
+        assert candidatos[0].portalNumber == "5"
+        assert ubicacion.extraer_coordenadas_wkt() == (-4.478817, 36.716583)
+        assert direccion.numero == "146"
+    
+    def test_concurrencia_limitada(self):
+        """Test de que el semáforo limita las peticiones simultáneas."""
+        estado = {"en_curso": 0, "maximo": 0}
+        
+        async def manejador(request):
+            estado["en_curso"] += 1
+            estado["maximo"] = max(estado["maximo"], estado["en_curso"])
+            await asyncio.sleep(0.001)
+            estado["en_curso"] -= 1
+            return httpx.Response(200, json=RESPUESTA_FIND)
+        
+        async def ejecutar():
+            async with crear_cliente(manejador, max_concurrencia=5) as cliente:
+                return await asyncio.gather(
+                    *(cliente.geocodificar(f"Calle {i}") for i in range(50))
+                )
+        
+        ubicaciones = asyncio.run(ejecutar())
+        
+        assert len(ubicaciones) == 50
+        assert estado["maximo"] <= 5
+    
+    def test_errores(self):
+        """Test de la conversión de errores a las excepciones de la librería."""
+        def manejador(request):
+            if request.url.params.get("q") == "timeout":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(500, text="error interno")
+        
+        async def ejecutar(consulta):
+            async with crear_cliente(manejador) as cliente:
+                return await cliente.geocodificar(consulta)
+        
+        with pytest.raises(APIError) as excinfo:
+            asyncio.run(ejecutar("error"))
+        assert excinfo.value.codigo == 500
+        
+        with pytest.raises(APIError) as excinfo:
+            asyncio.run(ejecutar("timeout"))
+        assert "Tiempo de espera agotado" in str(excinfo.value)
+        
+        with pytest.raises(PeticionInvalidaError):
+            asyncio.run(ejecutar(None))
+    
+    def test_reintentos(self):
+        """Test de los reintentos ante errores transitorios."""
+        respuestas = [httpx.Response(503), httpx.Response(200, json=RESPUESTA_FIND)]
+        
+        def manejador(request):
+            if request.url.params.get("q") == "caida":
+                raise httpx.ConnectError("Connection refused", request=request)
+            return respuestas.pop(0)
+        
+        async def ejecutar(consulta):
+            politica = PoliticaReintentos(max_reintentos=2, espera_base=0)
+            async with crear_cliente(manejador, reintentos=politica) as cliente:
+                return await cliente.geocodificar(consulta)
+        
+        assert asyncio.run(ejecutar("Clínico")).id == "2906755300"
+        
+        with pytest.raises(APIError) as excinfo:
+            asyncio.run(ejecutar("caida"))
+        assert excinfo.value.reintentos == 2 
\ No newline at end of file
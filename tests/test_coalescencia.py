@@ -0,0 +1,140 @@
+"""
+Tests para la coalescencia de peticiones de PyCiudad
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+import responses
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.coalescencia import CoalescedorPeticiones, CoalescedorPeticionesAsync
+from pyciudad.constantes import FIND_URL
+from tests.test_cliente import RESPUESTA_FIND
+
+
+class TestCoalescedorPeticiones:
+    """Tests para los coalescedores síncrono y asíncrono."""
+    
+    def test_hilos_comparten_peticion(self):
+        """Test de que los hilos concurrentes comparten una única ejecución."""
+        coalescedor = CoalescedorPeticiones()
+        llamadas = []
+        barrera = threading.Barrier(5)
+        
+        def peticion():
+            llamadas.append(1)
+            time.sleep(0.05)
+            return {"datos": [1, 2]}
+        
+        resultados = []
+        
+        def trabajar():
+            barrera.wait()
+            resultados.append(coalescedor.ejecutar("clave", peticion))
+        
+        hilos = [threading.Thread(target=trabajar) for _ in range(5)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert len(llamadas) == 1
+        assert coalescedor.coalescidas == 4
+        assert all(r == {"datos": [1, 2]} for r in resultados)
+        # Cada hilo recibe su propia copia
+        assert len({id(r) for r in resultados}) == 5
+        
+        # Terminada la petición, la siguiente vuelve a ejecutarse
+        coalescedor.ejecutar("clave", peticion)
+        assert len(llamadas) == 2
+    
+    def test_hilos_comparten_error(self):
+        """Test de que el error de la petición llega a todos los que esperan."""
+        coalescedor = CoalescedorPeticiones()
+        evento = threading.Event()
+        
+        def peticion():
+            evento.wait()
+            raise ValueError("fallo")
+        
+        errores = []
+        
+        def trabajar():
+            try:
+                coalescedor.ejecutar("clave", peticion)
+            except ValueError as e:
+                errores.append(e)
+        
+        hilos = [threading.Thread(target=trabajar) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        while coalescedor.coalescidas < 2:
+            time.sleep(0.001)
+        evento.set()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert len(errores) == 3
+    
+    def test_corrutinas_comparten_peticion(self):
+        """Test de la coalescencia en asyncio."""
+        coalescedor = CoalescedorPeticionesAsync()
+        llamadas = []
+        
+        async def peticion():
+            llamadas.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": "a"}
+        
+        async def ejecutar():
+            return await asyncio.gather(
+                *(coalescedor.ejecutar("clave", peticion) for _ in range(10)),
+                coalescedor.ejecutar("otra", peticion)
+            )
+        
+        resultados = asyncio.run(ejecutar())
+        
+        assert len(llamadas) == 2
+        assert resultados == [{"id": "a"}] * 11
+    
+    def test_cancelar_lider(self):
+        """Test de que cancelar la primera corrutina no cancela la petición de las demás."""
+        coalescedor = CoalescedorPeticionesAsync()
+        llamadas = []
+        
+        async def peticion():
+            llamadas.append(1)
+            await asyncio.sleep(0.02)
+            return {"id": "a"}
+        
+        async def ejecutar():
+            lider = asyncio.ensure_future(coalescedor.ejecutar("clave", peticion))
+            await asyncio.sleep(0)
+            seguidora = asyncio.ensure_future(coalescedor.ejecutar("clave", peticion))
+            await asyncio.sleep(0.005)
+            lider.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await lider
+            return await seguidora
+        
+        assert asyncio.run(ejecutar()) == {"id": "a"}
+        assert len(llamadas) == 1
+        assert coalescedor._en_curso == {}
+    
+    @responses.activate
+    def test_cliente_con_coalescencia(self):
+        """Test de que un lote con consultas repetidas no duplica peticiones en curso."""
+        def respuesta_lenta(request):
+            time.sleep(0.05)
+            return (200, {}, json.dumps(RESPUESTA_FIND))
+        
+        responses.add_callback(responses.GET, FIND_URL, callback=respuesta_lenta)
+        cliente = CartoCiudad(coalescer=True)
+        
+        resultados = cliente.geocodificar_lote(["Estación de metro Clínico, Málaga"] * 8, concurrencia=8)
+        
+        assert all(r.resultado.id == "2906755300" for r in resultados)
+        assert len(responses.calls) < 8 
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Tests para el contenedor columnar de resultados
+"""
+
+import math
+import pytest
+import responses
+
+from pyciudad.cliente import CartoCiudad, APIError
+from pyciudad.columnar import ResultadosColumnares, ESTADO_CORRECTO, ESTADO_ERROR
+from pyciudad.constantes import FIND_URL
+from pyciudad.lote import ResultadoLote
+from pyciudad.modelos import Candidato, Ubicacion
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_FIND
+
+
+def crear_columnas():
+    """Crea un contenedor con dos filas correctas y una fallida entre ellas."""
+    return ResultadosColumnares.desde_lote([
+        ResultadoLote(0, "a", resultado=Ubicacion.model_validate(RESPUESTA_FIND)),
+        ResultadoLote(1, "b", error=RuntimeError("Error HTTP 500")),
+        ResultadoLote(2, "c", resultado=Ubicacion.model_validate(RESPUESTA_FIND)),
+    ])
+
+
+class TestResultadosColumnares:
+    """Tests para ResultadosColumnares."""
+    
+    def test_columnas(self):
+        """Test del contenido de las columnas y de la codificación como diccionario."""
+        columnas = crear_columnas()
+        
+        assert len(columnas) == 3
+        assert columnas.correctos == 2
+        assert list(columnas.estado) == [ESTADO_CORRECTO, ESTADO_ERROR, ESTADO_CORRECTO]
+        assert columnas.lat[0] == 36.716583
+        assert math.isnan(columnas.lat[1])
+        assert columnas.columna_errores() == [None, "Error HTTP 500", None]
+        
+        muni = columnas.categoricas["muni"]
+        assert list(muni.codigos) == [0, -1, 0]
+        assert muni.categorias == ["Málaga"]
+        
+        fila = columnas.fila(-1)
+        assert fila["muni"] == "Málaga"
+        assert fila["type"] == "toponimo"
+        assert fila["error"] is None
+    
+    def test_desde_modelos(self):
+        """Test de la construcción a partir de una lista de candidatos."""
+        candidatos = [Candidato.model_validate(c) for c in RESPUESTA_CANDIDATOS]
+        columnas = ResultadosColumnares.desde_modelos(candidatos)
+        
+        assert list(columnas.lng) == [c.longitud for c in candidatos]
+        assert columnas.categoricas["province"].categorias == ["Madrid", "Zamora"]
+    
+    def test_tomar(self):
+        """Test de la selección y repetición de filas en un orden nuevo."""
+        pytest.importorskip("numpy")
+        columnas = crear_columnas()
+        
+        tomados = columnas.tomar([2, 1, 1, 0])
+        assert len(tomados) == 4
+        assert list(tomados.estado) == [ESTADO_CORRECTO, ESTADO_ERROR, ESTADO_ERROR, ESTADO_CORRECTO]
+        assert tomados.columna_errores() == [None, "Error HTTP 500", "Error HTTP 500", None]
+        assert tomados.fila(0) == columnas.fila(2)
+        assert list(tomados.categoricas["muni"].codigos) == [0, -1, -1, 0]
+        assert len(columnas.tomar([])) == 0
+    
+    def test_a_numpy_sin_copia(self):
+        """Test de la exportación a NumPy compartiendo memoria."""
+        np = pytest.importorskip("numpy")
+        columnas = crear_columnas()
+        arrays = columnas.a_numpy()
+        
+        assert arrays["lat"].dtype == np.float64
+        assert np.shares_memory(arrays["lat"], np.frombuffer(columnas.lat))
+        columnas.lat[0] = 1.5
+        assert arrays["lat"][0] == 1.5
+        
+        codigos, categorias = arrays["postalCode"]
+        assert codigos.tolist() == [0, -1, 0]
+        assert categorias == ["29010"]
+        assert arrays["error"][1] == "Error HTTP 500"
+    
+    def test_a_arrow_y_pandas(self):
+        """Test de la exportación a Arrow y pandas, si están instalados."""
+        pytest.importorskip("numpy")
+        columnas = crear_columnas()
+        
+        try:
+            tabla = columnas.a_arrow()
+        except ImportError:
+            pass
+        else:
+            assert tabla.num_rows == 3
+            assert tabla.column("muni").to_pylist() == ["Málaga", None, "Málaga"]
+        
+        try:
+            df = columnas.a_pandas()
+        except ImportError:
+            pass
+        else:
+            assert list(df["muni"].cat.categories) == ["Málaga"]
+            assert df["muni"].isna().tolist() == [False, True, False]
+    
+    @responses.activate
+    def test_lote_columnar(self):
+        """Test de geocodificar_lote con salida columnar."""
+        def respuesta_find(request):
+            if "error" in request.url:
+                return (500, {}, "error interno")
+            return (200, {}, '{"muni": "Málaga", "lat": 36.7, "lng": -4.4}')
+        
+        responses.add_callback(responses.GET, FIND_URL, callback=respuesta_find)
+        
+        consultas = ["Calle 1", "error", "Calle 2"]
+        columnas = CartoCiudad().geocodificar_lote(consultas, concurrencia=2, columnar=True)
+        
+        assert isinstance(columnas, ResultadosColumnares)
+        assert list(columnas.estado) == [ESTADO_CORRECTO, ESTADO_ERROR, ESTADO_CORRECTO]
+        assert columnas.lng[2] == -4.4
+        assert "500" in columnas.errores[1] 
\ No newline at end of file
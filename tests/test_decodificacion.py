@@ -0,0 +1,53 @@
+"""
+Tests para la decodificación JSON de las respuestas
+"""
+
+import json
+import pytest
+import responses
+
+from pyciudad.cliente import CartoCiudad, APIError
+from pyciudad.constantes import FIND_URL
+from pyciudad.decodificacion import DECODIFICADORES, decodificar_json, obtener_decodificador
+from tests.test_cliente import RESPUESTA_FIND
+
+
+class TestDecodificacion:
+    """Tests para la selección del decodificador JSON."""
+    
+    def test_obtener_decodificador(self):
+        """Test de la resolución por defecto, por nombre y por función."""
+        assert obtener_decodificador() is decodificar_json
+        assert obtener_decodificador("json") is json.loads
+        
+        propio = lambda contenido: {"propio": True}
+        assert obtener_decodificador(propio) is propio
+        
+        with pytest.raises(ValueError) as excinfo:
+            obtener_decodificador("inexistente")
+        assert "Disponibles" in str(excinfo.value)
+    
+    @pytest.mark.parametrize("nombre", sorted(DECODIFICADORES))
+    def test_decodificadores_equivalentes(self, nombre):
+        """Test de que todos los decodificadores producen el mismo resultado desde bytes."""
+        contenido = json.dumps(RESPUESTA_FIND, ensure_ascii=False).encode("utf-8")
+        assert DECODIFICADORES[nombre](contenido) == RESPUESTA_FIND
+    
+    @responses.activate
+    def test_cliente_con_decodificador(self):
+        """Test del cliente con un decodificador personalizado y con JSON inválido."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        recibidos = []
+        
+        def decodificador(contenido):
+            recibidos.append(contenido)
+            return json.loads(contenido)
+        
+        ubicacion = CartoCiudad(decodificador=decodificador).geocodificar("Clínico")
+        assert ubicacion.id == "2906755300"
+        assert isinstance(recibidos[0], bytes)
+        
+        responses.replace(responses.GET, FIND_URL, body="<html>no es json</html>", status=200)
+        with pytest.raises(APIError) as excinfo:
+            CartoCiudad().geocodificar("Clínico")
+        assert "Error al decodificar la respuesta JSON" in str(excinfo.value) 
\ No newline at end of file
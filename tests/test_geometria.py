@@ -0,0 +1,138 @@
+"""
+Tests para el motor de geometrías WKT y GeoJSON
+"""
+
+import pytest
+
+import pyciudad.geometria as geometria
+from pyciudad.geometria import parsear_wkt, parsear_geojson, parsear_geometria
+from pyciudad.modelos import Ubicacion
+
+
+POLIGONO_CON_HUECO = (
+    "MULTIPOLYGON(((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 4 2, 4 4, 2 4, 2 2)),"
+    "((20 20, 21 20, 21 21, 20 20)))"
+)
+POLIGONO_EN_U = "POLYGON((0 0, 10 0, 10 10, 8 10, 8 2, 2 2, 2 10, 0 10, 0 0))"
+
+
+@pytest.fixture(params=["numpy", "array"])
+def motor(request, monkeypatch):
+    """Ejecuta cada test con NumPy y con la alternativa array('d')."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geometria, "np", None)
+    return request.param
+
+
+class TestGeometria:
+    """Tests para el parseo y las utilidades de Geometria."""
+    
+    def test_estructura_multipoligono(self, motor):
+        """Test de los rangos de anillos y partes de un multipolígono con hueco."""
+        g = parsear_wkt(POLIGONO_CON_HUECO)
+        
+        assert g.tipo == "MULTIPOLYGON"
+        assert len(g) == 14
+        assert g.anillos == [(0, 5), (5, 10), (10, 14)]
+        assert g.partes == [[0, 1], [2]]
+        assert g.bbox() == (0.0, 0.0, 21.0, 21.0)
+        
+        xs, ys = g.xy(1)
+        assert list(xs) == [2.0, 4.0, 4.0, 2.0, 2.0]
+    
+    def test_centroide_y_punto_representativo(self, motor):
+        """Test del centroide y de un punto interior en un polígono cóncavo."""
+        u = parsear_wkt(POLIGONO_EN_U)
+        x, y = u.centroide()
+        assert x == pytest.approx(5.0)
+        assert y == pytest.approx(4.0769230769)
+        # El centroide cae en el hueco de la U; el punto representativo no
+        assert u.punto_representativo() == (1.0, 5.0)
+        
+        linea = parsear_wkt("MULTILINESTRING((0 0, 10 0), (0 1, 0 2))")
+        assert linea.partes == [[0], [1]]
+        assert linea.punto_representativo() == (5.0, 0.0)
+        
+        assert parsear_wkt("POINT(-4.478817 36.716583)").centroide() == (-4.478817, 36.716583)
+    
+    def test_variantes_wkt(self, motor):
+        """Test de multipuntos, dimensiones extra, EWKT y geometrías vacías."""
+        assert parsear_wkt("MULTIPOINT(1 2, 3 4)").partes == [[0], [1]]
+        assert parsear_wkt("MULTIPOINT((1 2), (3 4))").partes == [[0], [1]]
+        assert parsear_wkt("POINT Z (1 2 3)").dimension == 3
+        assert parsear_wkt("LINESTRING ZM (1 2 3 4, 5 6 7 8)").dimension == 4
+        assert parsear_wkt(" POINT ( 1   2 ) ").bbox() == (1.0, 2.0, 1.0, 2.0)
+        assert parsear_wkt("SRID=4326;POINT(1 2)").bbox() == (1.0, 2.0, 1.0, 2.0)
+        
+        vacia = parsear_wkt("POLYGON EMPTY")
+        assert vacia.vacia
+        assert vacia.centroide() is None
+    
+    def test_geojson_ida_y_vuelta(self, motor):
+        """Test de la conversión entre WKT y GeoJSON."""
+        g = parsear_wkt(POLIGONO_CON_HUECO)
+        geojson = g.a_geojson()
+        
+        assert geojson["type"] == "MultiPolygon"
+        assert geojson["coordinates"][1] == [[[20.0, 20.0], [21.0, 20.0], [21.0, 21.0], [20.0, 20.0]]]
+        assert parsear_geojson(geojson).a_geojson() == geojson
+        assert parsear_geojson({"type": "Point", "coordinates": [1, 2]}).centroide() == (1.0, 2.0)
+    
+    def test_geometrias_invalidas(self, motor):
+        """Test de que las geometrías inválidas se rechazan."""
+        for geom in ["INVALID_GEOM", "POINT(1 a)", "POINT(1 2 3 4 5)", "GEOMETRYCOLLECTION(POINT(1 2))"]:
+            assert parsear_geometria(geom) is None
+        for geom in [
+            "LINESTRING(1 2, 3 4 5 6)",
+            "LINESTRING(1 2,, 3 4)",
+            "POINT Z (1 2)",
+            "POINT M (1 2 3)",
+            "POINT(1 2) basura",
+            "POINT(1 2)(3 4)",
+            "POLYGON((0 0, 1 0, 1 1, 0 0)))",
+            "POLYGON(0 0, 1 1, 1 0, 0 0)",
+            "POLYGON((0 0, 1 0, 1 1, 0 0), 5 5)",
+            "MULTIPOLYGON((0 0, 1 0, 1 1, 0 0))",
+            "MULTIPOLYGON(((0 0, 1 0, 1 1, 0 0)), (5 5, 6 5, 6 6, 5 5))",
+            "MULTIPOINT((1 2), (3 4)), (5 6)",
+            "MULTIPOINT((1 2, 3 4))",
+            "LINESTRING((1 2, 3 4))",
+        ]:
+            with pytest.raises(ValueError):
+                parsear_wkt(geom)
+        with pytest.raises(ValueError):
+            parsear_wkt("POINT(1)")
+        with pytest.raises(ValueError):
+            parsear_geojson({"type": "Feature"})
+    
+    def test_modelo(self, motor):
+        """Test de la geometría desde los modelos."""
+        ubicacion = Ubicacion.model_validate({"geom": POLIGONO_EN_U})
+        assert ubicacion.obtener_geometria().tipo == "POLYGON"
+        assert ubicacion.extraer_coordenadas_wkt() == (1.0, 5.0)
+        
+        ubicacion = Ubicacion.model_validate({"geom": {"type": "Point", "coordinates": [1, 2]}})
+        assert ubicacion.obtener_geometria().bbox() == (1.0, 2.0, 1.0, 2.0)
+    
+    def test_memorizacion(self, motor):
+        """Test de que la geometría se parsea una sola vez y sus derivados se memorizan."""
+        ubicacion = Ubicacion.model_validate({"geom": POLIGONO_EN_U})
+        copia = Ubicacion.model_validate({"geom": POLIGONO_EN_U})
+        
+        g = ubicacion.obtener_geometria()
+        assert ubicacion.obtener_geometria() is g
+        assert ubicacion.centroide is g.centroide()
+        assert ubicacion.bbox == (0.0, 0.0, 10.0, 10.0)
+        # La caché no afecta a la igualdad entre modelos
+        assert ubicacion == copia and copia == ubicacion
+        copia.obtener_geometria()
+        assert ubicacion == copia
+        
+        # Al asignar otra geometría se vuelve a parsear
+        ubicacion.geom = "POINT(1 2)"
+        assert ubicacion.obtener_geometria().tipo == "POINT"
+        assert ubicacion.centroide == (1.0, 2.0)
+        
+        assert Ubicacion.model_validate({}).bbox is None 
\ No newline at end of file
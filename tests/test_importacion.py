@@ -0,0 +1,63 @@
+"""
+Tests para la importación bajo demanda de PyCiudad
+"""
+
+import json
+import subprocess
+import sys
+import pytest
+
+import pyciudad
+
+
+def modulos_cargados(codigo: str, modulos) -> list:
+    """Ejecuta código en un intérprete nuevo y devuelve cuáles de los módulos quedaron cargados."""
+    script = f"{codigo}\nimport sys, json\nprint(json.dumps([m for m in {list(modulos)!r} if m in sys.modules]))"
+    salida = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+PESADOS = ["requests", "pydantic", "asyncio", "httpx", "numpy", "sqlite3", "concurrent.futures"]
+
+
+class TestImportacion:
+    """Tests para el arranque en frío del paquete y la línea de comandos."""
+    
+    def test_import_paquete_ligero(self):
+        """Test de que importar el paquete no carga dependencias pesadas."""
+        assert modulos_cargados("import pyciudad", PESADOS + ["pyciudad.cliente"]) == []
+    
+    def test_ayuda_cli_ligera(self):
+        """Test de que la ayuda de la línea de comandos no carga el cliente."""
+        codigo = (
+            "import sys\n"
+            "sys.argv = ['pyciudad', '--help']\n"
+            "from pyciudad.__main__ import main\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        assert modulos_cargados(codigo, PESADOS + ["pyciudad.cliente"]) == []
+    
+    def test_cliente_sin_extras(self):
+        """Test de que el cliente síncrono no carga asyncio, httpx, numpy ni sqlite3."""
+        codigo = "from pyciudad import CartoCiudad\nCartoCiudad()"
+        assert modulos_cargados(codigo, ["asyncio", "httpx", "numpy", "sqlite3"]) == []
+    
+    def test_nombres_publicos(self):
+        """Test de que todos los nombres de __all__ se resuelven bajo demanda."""
+        for nombre in pyciudad.__all__:
+            assert getattr(pyciudad, nombre).__name__ == nombre
+        assert set(pyciudad.__all__) <= set(dir(pyciudad))
+        
+        with pytest.raises(AttributeError):
+            pyciudad.NoExiste
+    
+    def test_sin_configurar_logging(self):
+        """Test de que crear un cliente sin debug no configura el logging raíz."""
+        codigo = "import logging\nfrom pyciudad import CartoCiudad\nCartoCiudad()\nprint(len(logging.getLogger().handlers))"
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True).stdout
+        assert salida.strip() == "0" 
\ No newline at end of file
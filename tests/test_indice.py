@@ -0,0 +1,162 @@
+"""
+Tests para el índice de direcciones de PyCiudad
+"""
+
+import asyncio
+import pytest
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.cliente_async import CartoCiudadAsync
+from pyciudad.indice import IndiceDirecciones
+from pyciudad.lote import ResultadoLote
+from pyciudad.metricas import Metricas
+from pyciudad.modelos import Ubicacion
+from pyciudad.transporte import TransporteMemoria
+
+
+def portal(id_entidad, lng, lat, **extra):
+    """Crea un portal con el formato de la API."""
+    return {
+        "id": id_entidad,
+        "type": "portal",
+        "address": f"CALLE MAYOR {id_entidad}",
+        "muni": "Madrid",
+        "portalNumber": id_entidad,
+        "lng": lng,
+        "lat": lat,
+        "geom": f"POINT({lng} {lat})",
+        **extra
+    }
+
+
+# Dos portales a unos 17 m, un municipio y una entidad sin coordenadas
+PORTALES = [portal("1", -3.7000, 40.4000), portal("3", -3.7002, 40.4000)]
+MUNICIPIO = {"id": "28079", "type": "municipio", "address": "Madrid", "lng": -3.70001, "lat": 40.40001}
+RESPUESTA_API = portal("99", -3.6, 40.3)
+
+
+class TestIndiceDirecciones:
+    """Tests del índice de direcciones."""
+    
+    def test_construccion(self):
+        """Test de la construcción con modelos, diccionarios y resultados de lote."""
+        indice = IndiceDirecciones.desde_modelos([
+            Ubicacion.model_validate(PORTALES[0]),
+            ResultadoLote(1, "b", resultado=PORTALES[1]),
+            ResultadoLote(2, "c", error=RuntimeError("fallo")),
+            MUNICIPIO,
+            portal("5", None, None),
+        ])
+        
+        assert len(indice) == 2
+        assert all("geom" not in entidad for entidad in indice)
+        assert len(IndiceDirecciones.desde_modelos([MUNICIPIO], tipos=None)) == 1
+        with pytest.raises(ValueError):
+            IndiceDirecciones(distancia_maxima=0)
+    
+    def test_buscar(self):
+        """Test de la búsqueda de la dirección más cercana dentro de la distancia máxima."""
+        indice = IndiceDirecciones.desde_modelos(PORTALES, distancia_maxima=5.0)
+        
+        distancia, entidad = indice.buscar(-3.70002, 40.40001)
+        assert entidad["id"] == "1"
+        assert distancia < 3
+        assert indice.buscar(-3.7001, 40.4000) is None
+        assert indice.buscar(-3.7001, 40.4000, distancia_maxima=10.0)[1]["id"] in ("1", "3")
+    
+    def test_sustituir_y_limpiar(self):
+        """Test de que una dirección con el mismo tipo e id sustituye a la anterior."""
+        indice = IndiceDirecciones.desde_modelos(PORTALES)
+        indice.agregar(portal("1", -3.6, 40.3))
+        
+        assert len(indice) == 2
+        assert indice.buscar(-3.7, 40.4) is None
+        assert indice.buscar(-3.6, 40.3)[1]["id"] == "1"
+        
+        indice.agregar({"type": "portal", "lng": -3.5, "lat": 40.2})
+        indice.agregar({"type": "portal", "lng": -3.5, "lat": 40.2, "address": "CALLE NUEVA 2"})
+        assert len(indice) == 3
+        assert indice.buscar(-3.5, 40.2)[1]["address"] == "CALLE NUEVA 2"
+        
+        indice.limpiar()
+        assert len(indice) == 0
+    
+    def test_max_entradas(self):
+        """Test de que al superar max_entradas se descartan las direcciones más antiguas."""
+        indice = IndiceDirecciones.desde_modelos(PORTALES, max_entradas=2)
+        indice.agregar(portal("1", -3.7000, 40.4000, address="CALLE MAYOR 1 BIS"))
+        indice.agregar(portal("7", -3.6, 40.3))
+        
+        assert [entidad["id"] for entidad in indice] == ["1", "7"]
+        assert indice.buscar(-3.7002, 40.4000) is None
+        with pytest.raises(ValueError):
+            IndiceDirecciones(max_entradas=0)
+    
+    def test_guardar_y_cargar(self, tmp_path):
+        """Test de la persistencia de las direcciones y de la configuración."""
+        indice = IndiceDirecciones.desde_modelos(PORTALES, distancia_maxima=8.0, celda_metros=4.0)
+        ruta = str(tmp_path / "direcciones.json.gz")
+        indice.guardar(ruta)
+        
+        cargado = IndiceDirecciones.cargar(ruta)
+        assert len(cargado) == 2
+        assert cargado.distancia_maxima == 8.0
+        assert cargado.tipos == ("portal",)
+        assert cargado.buscar(-3.7002, 40.40003)[1] == indice.buscar(-3.7002, 40.40003)[1]
+        assert IndiceDirecciones.cargar(ruta, distancia_maxima=1.0).distancia_maxima == 1.0
+
+
+class TestClienteConIndice:
+    """Tests de la integración del índice en los clientes."""
+    
+    def test_inversa_desde_indice(self):
+        """Test de que las inversas cerca de una dirección conocida no van a la API."""
+        transporte = TransporteMemoria({"reverseGeocode": RESPUESTA_API})
+        metricas = Metricas()
+        cliente = CartoCiudad(
+            transporte=transporte,
+            indice_direcciones=IndiceDirecciones.desde_modelos(PORTALES),
+            metricas=metricas
+        )
+        
+        direccion = cliente.geocodificacion_inversa(-3.70001, 40.40001)
+        assert direccion.id == "1"
+        assert direccion.numero == "1"
+        assert direccion.origen == "indice"
+        assert transporte.peticiones == []
+        
+        assert cliente.geocodificacion_inversa(-3.65, 40.35).id == "99"
+        assert len(transporte.peticiones) == 1
+        assert metricas.instantanea()["cache"]["indice"]["reverseGeocode"] == {"aciertos": 1, "fallos": 1}
+    
+    def test_aprende_de_la_api(self):
+        """Test de que con aprender=True las direcciones de find y reverseGeocode se añaden al índice."""
+        transporte = TransporteMemoria({"find": PORTALES[0], "reverseGeocode": RESPUESTA_API})
+        indice = IndiceDirecciones(aprender=True)
+        cliente = CartoCiudad(transporte=transporte, indice_direcciones=indice)
+        
+        cliente.geocodificar("Calle Mayor 1, Madrid")
+        cliente.geocodificacion_inversa(-3.65, 40.35)
+        assert {entidad["id"] for entidad in indice} == {"1", "99"}
+        
+        assert cliente.geocodificacion_inversa(-3.70001, 40.4).origen == "indice"
+        assert len(transporte.peticiones) == 2
+    
+    def test_sin_aprender_y_tipo(self):
+        """Test de que por defecto el índice no cambia y de las inversas de tipos no indexados."""
+        transporte = TransporteMemoria({"reverseGeocode": RESPUESTA_API})
+        indice = IndiceDirecciones.desde_modelos(PORTALES)
+        cliente = CartoCiudad(transporte=transporte, indice_direcciones=indice)
+        
+        cliente.geocodificacion_inversa(-3.65, 40.35)
+        assert len(indice) == 2
+        assert cliente.geocodificacion_inversa(-3.7, 40.4, tipo="callejero").id == "99"
+    
+    def test_cliente_async(self):
+        """Test del índice en el cliente asíncrono."""
+        transporte = TransporteMemoria({"reverseGeocode": RESPUESTA_API})
+        cliente = CartoCiudadAsync(transporte=transporte, indice_direcciones=IndiceDirecciones.desde_modelos(PORTALES))
+        
+        direccion = asyncio.run(cliente.geocodificacion_inversa(-3.70001, 40.40001))
+        assert direccion.id == "1"
+        assert transporte.peticiones == [] 
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Tests para el limitador de tasa de PyCiudad
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import responses
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.constantes import FIND_URL
+from pyciudad.limitador import LimitadorTasa
+from tests.test_cliente import RESPUESTA_FIND
+
+
+class RelojFalso:
+    """Reloj controlable para probar el relleno del cubo sin esperas."""
+    
+    def __init__(self):
+        self.ahora = 0.0
+    
+    def __call__(self):
+        return self.ahora
+
+
+def crear_limitador(peticiones_por_segundo, rafaga=None):
+    """Crea un limitador con un reloj controlable."""
+    reloj = RelojFalso()
+    limitador = LimitadorTasa(peticiones_por_segundo, rafaga)
+    limitador._reloj = reloj
+    limitador._actualizado = 0.0
+    return limitador, reloj
+
+
+class TestLimitadorTasa:
+    """Tests para LimitadorTasa."""
+    
+    def test_rafaga_y_reservas(self):
+        """Test de la ráfaga inicial y del escalonado de las reservas."""
+        limitador, reloj = crear_limitador(10, rafaga=3)
+        
+        assert [limitador.reservar() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limitador.reservar() == pytest.approx(0.1)
+        assert limitador.reservar() == pytest.approx(0.2)
+        
+        reloj.ahora = 1.0
+        assert limitador.intentar_adquirir()
+    
+    def test_intentar_adquirir(self):
+        """Test de la adquisición no bloqueante."""
+        limitador, reloj = crear_limitador(2, rafaga=1)
+        
+        assert limitador.intentar_adquirir()
+        assert not limitador.intentar_adquirir()
+        reloj.ahora = 0.5
+        assert limitador.intentar_adquirir()
+    
+    def test_validacion(self):
+        """Test de la validación de parámetros."""
+        with pytest.raises(ValueError):
+            LimitadorTasa(0)
+        with pytest.raises(ValueError):
+            LimitadorTasa(5, rafaga=0)
+    
+    def test_hilos_respetan_la_tasa(self):
+        """Test de que varios hilos comparten el mismo límite."""
+        limitador = LimitadorTasa(200, rafaga=1)
+        inicio = time.monotonic()
+        
+        def trabajar():
+            for _ in range(10):
+                limitador.adquirir()
+        
+        hilos = [threading.Thread(target=trabajar) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        # 40 peticiones a 200/s con ráfaga 1 necesitan al menos 39 / 200 s
+        assert time.monotonic() - inicio >= 0.19
+    
+    def test_asincrono(self):
+        """Test de la adquisición desde corrutinas."""
+        limitador = LimitadorTasa(100, rafaga=2)
+        
+        async def ejecutar():
+            inicio = time.monotonic()
+            await asyncio.gather(*(limitador.adquirir_async() for _ in range(7)))
+            return time.monotonic() - inicio
+        
+        assert asyncio.run(ejecutar()) >= 0.04
+    
+    @responses.activate
+    def test_cliente_con_limitador(self):
+        """Test de que el cliente consume una ficha por petición HTTP."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        limitador, _ = crear_limitador(1, rafaga=5)
+        cliente = CartoCiudad(limitador=limitador)
+        
+        for _ in range(3):
+            cliente.geocodificar("Estación de metro Clínico, Málaga")
+        
+        assert limitador._fichas == pytest.approx(2) 
\ No newline at end of file
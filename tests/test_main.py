@@ -0,0 +1,142 @@
+"""
+Tests para la línea de comandos de PyCiudad
+"""
+
+import csv
+import json
+import sys
+import pytest
+import responses
+from unittest.mock import patch
+
+from pyciudad import CartoCiudad, __main__ as cli
+from pyciudad.__main__ import main
+from pyciudad.constantes import FIND_URL, REVERSE_GEOCODE_URL
+from tests.test_cliente import RESPUESTA_FIND, RESPUESTA_REVERSE
+
+
+def ejecutar(*argumentos):
+    """Ejecuta la línea de comandos con los argumentos indicados."""
+    with patch.object(sys, "argv", ["pyciudad", *argumentos]):
+        main()
+
+
+def leer_csv(ruta, separador=","):
+    """Lee un CSV como lista de diccionarios."""
+    with open(ruta, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f, delimiter=separador))
+
+
+class TestLote:
+    """Tests para el subcomando lote."""
+    
+    @responses.activate
+    def test_lote_geocodificar(self, tmp_path):
+        """Test de la geocodificación de un CSV con una fila errónea."""
+        def respuesta_find(request):
+            if "error" in request.url:
+                return (500, {}, "error interno")
+            return (200, {}, json.dumps(RESPUESTA_FIND))
+        
+        responses.add_callback(responses.GET, FIND_URL, callback=respuesta_find)
+        entrada = tmp_path / "entrada.csv"
+        salida = tmp_path / "salida.csv"
+        entrada.write_text("id,direccion\n1,Clínico Málaga\n2,error\n3,Clínico Málaga\n", encoding="utf-8")
+        
+        ejecutar("lote", str(entrada), str(salida), "--columna", "direccion", "--reintentos", "0", "--cada", "2")
+        
+        filas = leer_csv(salida)
+        assert [f["id"] for f in filas] == ["1", "2", "3"]
+        assert filas[0]["geo_latitud"] == "36.716583"
+        assert filas[1]["geo_error"]
+        assert not (tmp_path / "salida.csv.checkpoint").exists()
+    
+    @responses.activate
+    def test_lote_reanudar(self, tmp_path):
+        """Test de la reanudación desde un checkpoint."""
+        responses.add(responses.GET, REVERSE_GEOCODE_URL, json=RESPUESTA_REVERSE, status=200)
+        entrada = tmp_path / "entrada.csv"
+        salida = tmp_path / "salida.csv"
+        filas = "".join(f"{i};-0.3445;39.4724\n" for i in range(6))
+        entrada.write_text("id;x;y\n" + filas, encoding="utf-8")
+        
+        # Simula una ejecución interrumpida: 2 filas confirmadas y una a medio escribir
+        cabecera = "id;x;y;geo_direccion;geo_numero;geo_municipio;geo_provincia;geo_codigo_postal;geo_tipo;geo_error\r\n"
+        confirmado = cabecera + "0;-0.3445;39.4724;previa;;;;;;\r\n1;-0.3445;39.4724;previa;;;;;;\r\n"
+        salida.write_text(confirmado + "2;-0.34", encoding="utf-8")
+        (tmp_path / "ckpt.json").write_text(
+            json.dumps({"filas": 2, "bytes_salida": len(confirmado.encode("utf-8"))}), encoding="utf-8"
+        )
+        
+        ejecutar("lote", str(entrada), str(salida), "--lon", "x", "--lat", "y",
+                 "--separador", ";", "--checkpoint", str(tmp_path / "ckpt.json"))
+        
+        resultado = leer_csv(salida, separador=";")
+        assert [f["id"] for f in resultado] == [str(i) for i in range(6)]
+        assert [f["geo_direccion"] for f in resultado[:2]] == ["previa", "previa"]
+        assert resultado[5]["geo_numero"] == "146"
+        assert len(responses.calls) == 4
+    
+    @responses.activate
+    def test_lote_interrumpido_y_reanudado(self, tmp_path):
+        """Test de una ejecución que se interrumpe tras el checkpoint y se reanuda."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        entrada = tmp_path / "entrada.csv"
+        salida = tmp_path / "salida.csv"
+        entrada.write_text("id,direccion\n" + "".join(f"{i},Clínico Málaga\n" for i in range(6)), encoding="utf-8")
+        argumentos = ("lote", str(entrada), str(salida), "--columna", "direccion", "--concurrencia", "1", "--cada", "2")
+        
+        # La sexta fila falla después de escribir la quinta, que no llega al checkpoint
+        original = cli._fila_geocodificar
+        llamadas = []
+        def fila_con_fallo(resultado):
+            llamadas.append(resultado)
+            if len(llamadas) == 6:
+                raise KeyboardInterrupt
+            return original(resultado)
+        
+        with (
+            patch.object(cli, "_fila_geocodificar", fila_con_fallo),
+            patch.object(CartoCiudad, "cerrar") as cerrar,
+            pytest.raises(KeyboardInterrupt),
+        ):
+            ejecutar(*argumentos)
+        cerrar.assert_called_once()
+        assert [f["id"] for f in leer_csv(salida)] == ["0", "1", "2", "3", "4"]
+        assert json.loads((tmp_path / "salida.csv.checkpoint").read_text())["filas"] == 4
+        
+        ejecutar(*argumentos)
+        
+        filas = leer_csv(salida)
+        assert [f["id"] for f in filas] == [str(i) for i in range(6)]
+        assert all(f["geo_municipio"] == "Málaga" for f in filas)
+        assert len(responses.calls) == 8
+        assert not (tmp_path / "salida.csv.checkpoint").exists()
+    
+    @responses.activate
+    def test_lote_checkpoint_sin_salida(self, tmp_path):
+        """Test de que un checkpoint sin fichero de salida se ignora."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        entrada = tmp_path / "entrada.csv"
+        salida = tmp_path / "salida.csv"
+        entrada.write_text("id,direccion\n1,Clínico Málaga\n2,Clínico Málaga\n", encoding="utf-8")
+        (tmp_path / "salida.csv.checkpoint").write_text(json.dumps({"filas": 1, "bytes_salida": 120}), encoding="utf-8")
+        
+        ejecutar("lote", str(entrada), str(salida), "--columna", "direccion")
+        
+        assert [f["id"] for f in leer_csv(salida)] == ["1", "2"]
+        assert len(responses.calls) == 2
+    
+    def test_lote_argumentos_invalidos(self, tmp_path):
+        """Test de la validación de las columnas y de --cada."""
+        entrada = tmp_path / "entrada.csv"
+        entrada.write_text("id,direccion\n", encoding="utf-8")
+        
+        with pytest.raises(SystemExit):
+            ejecutar("lote", str(entrada), str(tmp_path / "salida.csv"))
+        with pytest.raises(SystemExit):
+            ejecutar("lote", str(entrada), str(tmp_path / "salida.csv"), "--columna", "otra")
+        for cada in ("0", "-5"):
+            with pytest.raises(SystemExit) as error:
+                ejecutar("lote", str(entrada), str(tmp_path / "salida.csv"), "--columna", "direccion", "--cada", cada)
+            assert error.value.code == 2 
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Tests para las métricas del cliente de PyCiudad
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from pyciudad import CartoCiudad, CartoCiudadAsync
+from pyciudad.cache import CacheMemoria, CacheInversaEspacial
+from pyciudad.excepciones import APIError, ErrorConexion
+from pyciudad.metricas import HistogramaLatencia, Metricas
+from pyciudad.reintentos import PoliticaReintentos
+from pyciudad.transporte import RespuestaTransporte, TransporteBase, TransporteMemoria
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_FIND, RESPUESTA_REVERSE
+
+
+class TestHistogramaLatencia:
+    """Tests para el histograma de cubos fijos."""
+    
+    def test_cubos_y_percentiles(self):
+        """Test de la asignación a cubos y la estimación de percentiles."""
+        histograma = HistogramaLatencia((0.1, 0.2, 0.4))
+        for valor in (0.05, 0.1, 0.15, 0.3, 1.0):
+            histograma.observar(valor)
+        
+        assert histograma.cubos == [2, 1, 1, 1]
+        assert histograma.acumulados() == [2, 3, 4, 5]
+        assert histograma.total == 5
+        assert histograma.suma == pytest.approx(1.6)
+        assert histograma.percentil(40) == pytest.approx(0.1)
+        assert histograma.percentil(50) == pytest.approx(0.15)
+        # El percentil que cae en +Inf se acota al último límite
+        assert histograma.percentil(99) == 0.4
+    
+    def test_vacio(self):
+        """Test de un histograma sin observaciones."""
+        assert HistogramaLatencia().percentil(50) is None
+        assert HistogramaLatencia().resumen()["media"] is None
+
+
+class TestMetricasCliente:
+    """Tests para las métricas recogidas por el cliente."""
+    
+    def crear_cliente(self, **kwargs):
+        """Crea un cliente con métricas y respuestas en memoria."""
+        transporte = TransporteMemoria({
+            "candidates": RESPUESTA_CANDIDATOS,
+            "find": RESPUESTA_FIND,
+            "reverseGeocode": RESPUESTA_REVERSE
+        })
+        return CartoCiudad(transporte=transporte, metricas=Metricas(), **kwargs)
+    
+    def test_peticiones_bytes_y_fases(self):
+        """Test de los contadores por endpoint y las tres fases de latencia."""
+        cliente = self.crear_cliente()
+        cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        cliente.geocodificar("Estación de metro Clínico, Málaga")
+        cliente.geocodificar("Estación de metro Clínico, Málaga")
+        
+        instantanea = cliente.metricas.instantanea()
+        assert instantanea["peticiones"] == {"candidates": 1, "find": 2}
+        assert instantanea["bytes_recibidos"]["find"] == 2 * len(json.dumps(RESPUESTA_FIND, ensure_ascii=False).encode("utf-8"))
+        for fase in ("red", "decodificacion", "validacion"):
+            assert instantanea["latencias"][fase]["find"]["total"] == 2
+            assert instantanea["latencias"][fase]["candidates"]["total"] == 1
+        assert instantanea["errores"] == {}
+    
+    def test_cache(self):
+        """Test de los aciertos y fallos de las dos cachés."""
+        cliente = self.crear_cliente(cache=CacheMemoria(), cache_inversa=CacheInversaEspacial())
+        for _ in range(3):
+            cliente.geocodificar("Estación de metro Clínico, Málaga")
+        for _ in range(2):
+            cliente.geocodificacion_inversa(-0.344585, 39.472411)
+        
+        cache = cliente.metricas.instantanea()["cache"]
+        assert cache["respuestas"]["find"] == {"aciertos": 2, "fallos": 1}
+        assert cache["espacial"]["reverseGeocode"] == {"aciertos": 1, "fallos": 1}
+        assert cliente.metricas.instantanea()["peticiones"] == {"find": 1, "reverseGeocode": 1}
+    
+    def test_errores_y_reintentos(self):
+        """Test de los errores por clase y los reintentos."""
+        transporte = MagicMock(spec=TransporteBase)
+        transporte.enviar.side_effect = [
+            ErrorConexion("Connection refused"),
+            RespuestaTransporte(503, b"{}"),
+            RespuestaTransporte(200, b"no es json"),
+        ]
+        politica = PoliticaReintentos(max_reintentos=3, espera_base=0)
+        cliente = CartoCiudad(transporte=transporte, reintentos=politica, metricas=Metricas())
+        
+        with pytest.raises(APIError):
+            cliente.geocodificar("Calle Mayor 1, Madrid")
+        
+        instantanea = cliente.metricas.instantanea()
+        assert instantanea["errores"]["find"] == {"ErrorConexion": 1, "APIError": 1, "JSONDecodeError": 1}
+        assert instantanea["reintentos"] == {"find": 2}
+        assert instantanea["peticiones"] == {"find": 3}
+    
+    def test_cliente_async_comparte_metricas(self):
+        """Test de un registro compartido por un cliente síncrono y otro asíncrono."""
+        metricas = Metricas()
+        transporte = TransporteMemoria({"find": RESPUESTA_FIND})
+        CartoCiudad(transporte=transporte, metricas=metricas).geocodificar("Calle Mayor 1")
+        cliente_async = CartoCiudadAsync(transporte=transporte, metricas=metricas)
+        asyncio.run(cliente_async.geocodificar("Calle Mayor 1"))
+        
+        assert metricas.instantanea()["peticiones"] == {"find": 2}
+    
+    def test_hilos(self):
+        """Test de que los contadores no pierden incrementos entre hilos."""
+        cliente = self.crear_cliente()
+        hilos = [
+            threading.Thread(target=lambda: [cliente.geocodificar("Calle Mayor 1") for _ in range(50)])
+            for _ in range(4)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert cliente.metricas.instantanea()["latencias"]["validacion"]["find"]["total"] == 200
+    
+    def test_sin_metricas(self):
+        """Test de que por defecto el cliente no tiene métricas."""
+        cliente = CartoCiudad(transporte=TransporteMemoria({"find": RESPUESTA_FIND}))
+        assert cliente.metricas is None
+        assert cliente.geocodificar("Calle Mayor 1").id == "2906755300"
+
+
+class TestPrometheus:
+    """Tests para la exportación en formato de texto de Prometheus."""
+    
+    def test_formato(self):
+        """Test de contadores, histogramas acumulados y escapado de etiquetas."""
+        metricas = Metricas(cubos=(0.1, 1.0))
+        metricas.registrar_peticion("find", 0.05, 100)
+        metricas.registrar_peticion("find", 0.5, 50)
+        metricas.registrar_error("find", ValueError('mal "valor"'))
+        metricas.registrar_cache("respuestas", "find", True)
+        
+        texto = metricas.a_prometheus()
+        lineas = texto.splitlines()
+        
+        assert "# TYPE pyciudad_peticiones_total counter" in lineas
+        assert 'pyciudad_peticiones_total{endpoint="find"} 2' in lineas
+        assert 'pyciudad_bytes_recibidos_total{endpoint="find"} 150' in lineas
+        assert 'pyciudad_errores_total{endpoint="find",clase="ValueError"} 1' in lineas
+        assert 'pyciudad_cache_consultas_total{cache="respuestas",endpoint="find",resultado="acierto"} 1' in lineas
+        assert "# TYPE pyciudad_latencia_segundos histogram" in lineas
+        assert 'pyciudad_latencia_segundos_bucket{endpoint="find",fase="red",le="0.1"} 1' in lineas
+        assert 'pyciudad_latencia_segundos_bucket{endpoint="find",fase="red",le="1"} 2' in lineas
+        assert 'pyciudad_latencia_segundos_bucket{endpoint="find",fase="red",le="+Inf"} 2' in lineas
+        assert 'pyciudad_latencia_segundos_count{endpoint="find",fase="red"} 2' in lineas
+        assert texto.endswith("\n")
+    
+    def test_reiniciar(self):
+        """Test de la puesta a cero."""
+        metricas = Metricas()
+        metricas.registrar_peticion("find", 0.01)
+        metricas.reiniciar()
+        assert metricas.instantanea()["peticiones"] == {}
+        assert "pyciudad_peticiones_total{" not in metricas.a_prometheus() 
\ No newline at end of file
@@ -174,4 +174,22 @@ class TestModelos:
         # Caso con portalNumber None
         datos = {"portalNumber": None}
         candidato = Candidato.model_validate(datos)
-        assert candidato.portalNumber is None 
\ No newline at end of file
+        assert candidato.portalNumber is None
+    
+    def test_igualdad_sin_origen(self):
+        """Test de que el origen no interviene en la igualdad y se conserva al copiar."""
+        datos = {"id": "1", "type": "portal", "geom": "POINT(1 2)", "campoNuevo": "extra"}
+        api = Ubicacion.model_validate(datos)
+        cache = Ubicacion.model_validate(datos)
+        cache._origen = "cache"
+        
+        assert cache.origen == "cache" and api.origen == "api"
+        assert api == cache and cache == api
+        assert cache.centroide == (1.0, 2.0)
+        assert cache.origen == "cache"
+        assert api != Ubicacion.model_validate({**datos, "id": "2"})
+        
+        copia = cache.model_copy()
+        copia._origen = "indice"
+        assert (cache.origen, copia.origen) == ("cache", "indice")
+        assert cache.model_dump() == api.model_dump() 
\ No newline at end of file
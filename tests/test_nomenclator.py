@@ -0,0 +1,233 @@
+"""
+Tests para el nomenclátor local de PyCiudad
+"""
+
+import asyncio
+import gzip
+import json
+import pytest
+import threading
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.cliente_async import CartoCiudadAsync
+from pyciudad.metricas import Metricas
+from pyciudad.nomenclator import Nomenclator, excluir_salvo
+from pyciudad.transporte import TransporteMemoria
+
+
+def entidad(tipo, id_entidad, nombre, muni=None, provincia="Madrid", **extra):
+    """Crea una entidad administrativa con el formato de la API."""
+    datos = {
+        "id": id_entidad,
+        "type": tipo,
+        "address": nombre,
+        "province": provincia,
+        "comunidadAutonoma": "Comunidad de Madrid",
+        "lat": 40.4,
+        "lng": -3.7,
+        "geom": "MULTIPOLYGON(((-3.8 40.3,-3.6 40.3,-3.6 40.5,-3.8 40.3)))",
+    }
+    if muni:
+        datos["muni"] = muni
+    datos.update(extra)
+    return datos
+
+
+ENTIDADES = [
+    entidad("provincia", "28", "Madrid"),
+    entidad("municipio", "28079", "Madrid", muni="Madrid"),
+    entidad("municipio", "28005", "Alcalá de Henares", muni="Alcalá de Henares"),
+    entidad("municipio", "19006", "Alcolea del Pinar", muni="Alcolea del Pinar", provincia="Guadalajara"),
+    entidad("municipio", "45168", "Toledo", muni="Toledo", provincia="Toledo"),
+    entidad("poblacion", "280790001", "Aravaca", muni="Madrid"),
+    entidad("portal", "1", "CALLE MAYOR 1", muni="Madrid"),
+]
+
+RESPUESTA_API = [{"id": "api", "type": "callejero", "address": "CALLE ALCALA", "muni": "Madrid"}]
+
+
+class TestNomenclator:
+    """Tests del índice del nomenclátor."""
+    
+    def test_indexado(self):
+        """Test de que sólo se indexan entidades administrativas y sin geometría."""
+        nomenclator = Nomenclator(ENTIDADES)
+        
+        assert len(nomenclator) == 6
+        assert nomenclator.obtener("municipio", "28079")["address"] == "Madrid"
+        assert "geom" not in nomenclator.obtener("municipio", "28079")
+        assert nomenclator.obtener("portal", "1") is None
+        assert "geom" in Nomenclator(ENTIDADES, incluir_geometria=True).obtener("provincia", "28")
+    
+    def test_busqueda_exacta(self):
+        """Test de la búsqueda exacta sin tildes ni mayúsculas y de la prioridad por tipo."""
+        nomenclator = Nomenclator(ENTIDADES)
+        
+        resultados = nomenclator.buscar("MADRID", aproximada=False)
+        assert [e["type"] for e, _ in resultados] == ["municipio", "provincia"]
+        assert nomenclator.buscar("alcala de henares")[0][0]["id"] == "28005"
+        assert nomenclator.resolver("madrid", tipos=["provincia"])["id"] == "28"
+        assert nomenclator.resolver("Getafe") is None
+    
+    def test_busqueda_aproximada(self):
+        """Test de la búsqueda aproximada con errores tipográficos."""
+        nomenclator = Nomenclator(ENTIDADES)
+        
+        resultados = nomenclator.buscar("Alcala de Henars")
+        assert resultados[0][0]["id"] == "28005"
+        assert 0.6 <= resultados[0][1] < 1.0
+        assert nomenclator.buscar("Alcala de Henars", aproximada=False) == []
+        assert nomenclator.buscar("Zaragoza") == []
+    
+    def test_contexto_y_filtros(self):
+        """Test del contexto tras la coma y de los filtros por campo."""
+        nomenclator = Nomenclator(ENTIDADES)
+        
+        assert [e["id"] for e, _ in nomenclator.buscar("Aravaca, Madrid")] == ["280790001"]
+        assert nomenclator.buscar("Aravaca, Toledo") == []
+        assert nomenclator.buscar("Toledo", filtros={"province": ["Madrid"]}) == []
+        assert nomenclator.buscar("Toledo", filtros={"province": "toledo"})[0][0]["id"] == "45168"
+    
+    def test_actualizar_entidad(self):
+        """Test de que una entidad con el mismo tipo e id sustituye a la anterior."""
+        nomenclator = Nomenclator(ENTIDADES)
+        nomenclator.agregar(entidad("municipio", "28005", "Alcalá de Henares", muni="Alcalá de Henares", lat=1.0))
+        
+        assert len(nomenclator) == 6
+        resultados = nomenclator.buscar("Alcalá de Henares")
+        assert len(resultados) == 1
+        assert resultados[0][0]["lat"] == 1.0
+        
+        # Al cambiar de nombre, el anterior deja de estar en el índice de trigramas
+        nomenclator.agregar(entidad("municipio", "28005", "Alcalá de Guadaíra", muni="Alcalá de Guadaíra"))
+        assert nomenclator.resolver("Alcala de Guadaira")["id"] == "28005"
+        assert nomenclator.resolver("Alcala de Henares") is None
+        assert all("alcala de henares" not in nombres for nombres in nomenclator._trigramas.values())
+    
+    def test_acceso_concurrente(self):
+        """Test de altas y sustituciones desde varios hilos mientras se busca."""
+        nomenclator = Nomenclator()
+        
+        def trabajar(n):
+            for i in range(200):
+                nomenclator.agregar(entidad("poblacion", str(i % 50), f"Pueblo {n} {i}"))
+                nomenclator.buscar(f"Pueblo {n} {i // 2}")
+        
+        hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        assert len(nomenclator) == 50
+        assert sum(len(indices) for indices in nomenclator._por_nombre.values()) == 50
+        nombres = {nombre for nombres in nomenclator._trigramas.values() for nombre in nombres}
+        assert nombres == {nombre for nombre, indices in nomenclator._por_nombre.items() if indices}
+    
+    def test_guardar_cargar_y_json(self, tmp_path):
+        """Test de la persistencia en formato compacto y de la carga desde JSON y NDJSON."""
+        nomenclator = Nomenclator(ENTIDADES)
+        ruta = tmp_path / "nomenclator.json.gz"
+        nomenclator.guardar(str(ruta))
+        
+        cargado = Nomenclator.cargar(str(ruta))
+        assert list(cargado) == list(nomenclator)
+        assert cargado.resolver("Alcala de Henares")["id"] == "28005"
+        
+        ruta_json = tmp_path / "entidades.json"
+        ruta_json.write_text(json.dumps(ENTIDADES), encoding="utf-8")
+        ruta_ndjson = tmp_path / "entidades.ndjson"
+        ruta_ndjson.write_text("\n".join(json.dumps(e) for e in ENTIDADES), encoding="utf-8")
+        assert len(Nomenclator.desde_json(str(ruta_json))) == 6
+        assert len(Nomenclator.desde_json(str(ruta_ndjson))) == 6
+        
+        otro = tmp_path / "otro.json.gz"
+        with gzip.open(otro, "wt", encoding="utf-8") as f:
+            json.dump({"formato": "otro"}, f)
+        with pytest.raises(ValueError):
+            Nomenclator.cargar(str(otro))
+    
+    def test_desde_api(self):
+        """Test de la construcción a partir de búsquedas en la API."""
+        transporte = TransporteMemoria({"candidates": ENTIDADES})
+        nomenclator = Nomenclator.desde_api(CartoCiudad(transporte=transporte), ["Madrid"])
+        
+        assert len(nomenclator) == 6
+        assert transporte.peticiones[0][1]["no_process"] == ",".join(excluir_salvo())
+
+
+class TestClienteConNomenclator:
+    """Tests de la integración del nomenclátor en los clientes."""
+    
+    def crear_cliente(self, **kwargs):
+        transporte = TransporteMemoria({"candidates": RESPUESTA_API, "find": RESPUESTA_API[0]})
+        cliente = CartoCiudad(transporte=transporte, nomenclator=Nomenclator(ENTIDADES), **kwargs)
+        return cliente, transporte
+    
+    def test_candidatos_locales(self):
+        """Test de que las búsquedas de tipos administrativos no van a la API."""
+        metricas = Metricas()
+        cliente, transporte = self.crear_cliente(metricas=metricas)
+        
+        candidatos = cliente.buscar_candidatos("Alcala de Henares", excluir_tipos=excluir_salvo())
+        assert [c.id for c in candidatos] == ["28005"]
+        assert candidatos[0].origen == "nomenclator"
+        
+        candidatos = cliente.buscar_candidatos("Madrid", excluir_tipos=excluir_salvo(["provincia"]))
+        assert [c.type for c in candidatos] == ["provincia"]
+        
+        candidatos = cliente.buscar_candidatos("Aravaca", excluir_tipos=excluir_salvo(), municipio="Madrid")
+        assert [c.id for c in candidatos] == ["280790001"]
+        
+        assert transporte.peticiones == []
+        assert metricas.instantanea()["cache"]["nomenclator"]["candidates"]["aciertos"] == 3
+    
+    def test_candidatos_a_la_api(self):
+        """Test de que van a la API las búsquedas de otros tipos, con código postal o sin coincidencia."""
+        cliente, transporte = self.crear_cliente()
+        
+        assert cliente.buscar_candidatos("Alcala")[0].id == "api"
+        assert cliente.buscar_candidatos("Alcala de Henares", excluir_tipos=excluir_salvo(), codigo_postal="28801")[0].id == "api"
+        assert cliente.buscar_candidatos("Getafe", excluir_tipos=excluir_salvo())[0].origen == "api"
+        assert len(transporte.peticiones) == 3
+    
+    def test_geocodificar(self):
+        """Test de la geocodificación local por tipo e id, y de que el texto libre va a la API."""
+        cliente, transporte = self.crear_cliente()
+        
+        ubicacion = cliente.geocodificar(tipo="provincia", id_entidad="28")
+        assert ubicacion.address == "Madrid"
+        assert ubicacion.origen == "nomenclator"
+        assert transporte.peticiones == []
+        
+        assert cliente.geocodificar("Toledo").id == "api"
+        assert cliente.geocodificar(tipo="portal", id_entidad="1").id == "api"
+        assert len(transporte.peticiones) == 2
+    
+    def test_geocodificar_nombres(self):
+        """Test de la geocodificación local por nombre exacto con geocodificar_nombres=True."""
+        transporte = TransporteMemoria({"find": RESPUESTA_API[0]})
+        cliente = CartoCiudad(transporte=transporte, nomenclator=Nomenclator(ENTIDADES, geocodificar_nombres=True))
+        
+        assert cliente.geocodificar("Toledo").id == "45168"
+        assert transporte.peticiones == []
+        
+        assert cliente.geocodificar("Calle Mayor 1, Madrid").id == "api"
+        assert cliente.geocodificar("Toledo", portal="1").id == "api"
+        assert len(transporte.peticiones) == 2
+    
+    def test_cliente_async(self):
+        """Test del nomenclátor en el cliente asíncrono."""
+        transporte = TransporteMemoria({"candidates": RESPUESTA_API})
+        cliente = CartoCiudadAsync(transporte=transporte, nomenclator=Nomenclator(ENTIDADES, geocodificar_nombres=True))
+        
+        async def consultar():
+            return (
+                await cliente.buscar_candidatos("Toledo", excluir_tipos=excluir_salvo()),
+                await cliente.geocodificar("Alcolea del Pinar")
+            )
+        
+        candidatos, ubicacion = asyncio.run(consultar())
+        assert candidatos[0].id == "45168"
+        assert ubicacion.id == "19006"
+        assert transporte.peticiones == [] 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Tests para la normalización de consultas de PyCiudad
+"""
+
+import asyncio
+import pytest
+
+from pyciudad.cache import CacheMemoria
+from pyciudad.cliente import CartoCiudad
+from pyciudad.cliente_async import CartoCiudadAsync
+from pyciudad.normalizacion import ConsultaNormalizada, NormalizadorConsultas, normalizar_consulta
+from pyciudad.transporte import TransporteMemoria
+
+
+RESPUESTA_FIND = {"id": "280790529087", "type": "portal", "address": "CALLE MAYOR", "lat": 40.4, "lng": -3.7}
+
+
+class TestNormalizadorConsultas:
+    """Tests de la forma canónica de las consultas."""
+    
+    @pytest.mark.parametrize("consulta", [
+        "C/ Mayor 1, Madrid",
+        "calle mayor, 1 madrid",
+        "CALLE MAYOR 1 MADRID",
+        "Calle Mayor nº 1, Madrid",
+        "cl. Mayor, n.º 1 - Madrid",
+    ])
+    def test_variantes_misma_direccion(self, consulta):
+        """Test de que las variantes de una dirección tienen la misma forma canónica."""
+        assert normalizar_consulta(consulta) == "calle mayor 1, madrid"
+    
+    @pytest.mark.parametrize("consulta, esperado", [
+        ("Avda. de la Constitución, 12, Sevilla", "avenida de la constitucion 12, sevilla"),
+        ("Pza. España 3", "plaza españa 3"),
+        ("P.º de la Castellana 100", "paseo de la castellana 100"),
+        ("Av Andalucía 10B, Málaga", "avenida andalucia 10b, malaga"),
+        ("Plaza Mayor, 28012 Madrid", "plaza mayor, 28012 madrid"),
+        ("Calle 2 de Mayo", "calle 2 de mayo"),
+        ("Avenida 1 de Mayo 3 Madrid", "avenida 1 de mayo 3, madrid"),
+        ("Clara del Rey 5", "clara del rey 5"),
+        ("Madrid", "madrid"),
+    ])
+    def test_forma_canonica(self, consulta, esperado):
+        """Test de abreviaturas, tildes, códigos postales y números que forman parte del nombre."""
+        assert normalizar_consulta(consulta) == esperado
+    
+    @pytest.mark.parametrize("consulta, esperado", [
+        ("Carretera N-340 km 12", "carretera n-340 km 12"),
+        ("Autovía A-6, Madrid", "autovia a-6, madrid"),
+        ("AP-7 salida 5", "ap-7 salida 5"),
+        ("Calle N 5", "calle n 5"),
+        ("Av Europa 1-3", "avenida europa 1-3"),
+        ("Calle Real s/n, Toledo", "calle real s/n, toledo"),
+        ("Calle Mayor n. 5", "calle mayor 5"),
+    ])
+    def test_conserva_el_significado(self, consulta, esperado):
+        """Test de que se conservan carreteras, rangos de portales, "s/n" y la "n" suelta."""
+        assert normalizar_consulta(consulta) == esperado
+    
+    def test_analizar(self):
+        """Test de la descomposición en vía, portal y resto."""
+        normalizador = NormalizadorConsultas()
+        
+        assert normalizador.analizar("C/ Mayor 1, Madrid") == ConsultaNormalizada("calle mayor", "1", ["madrid"])
+        assert normalizador.analizar("Calle Mayor, Madrid").portal is None
+        assert normalizador.analizar("Calle Real s/n").portal == "s/n"
+        assert normalizador.analizar(" , ").texto == ""
+        assert normalizador.normalizar(" , ") == " , "
+    
+    def test_opciones(self):
+        """Test de las abreviaturas propias y de la extracción de portal desactivada."""
+        normalizador = NormalizadorConsultas(abreviaturas={"rua": "calle"}, extraer_portal=False)
+        
+        assert normalizador("Rúa Nova 3 Lugo") == "calle nova 3 lugo"
+        assert normalizador("C/ Nova 3") == "c nova 3"
+
+
+class TestClienteConNormalizador:
+    """Tests de la normalización en los clientes."""
+    
+    def test_aciertos_de_cache(self):
+        """Test de que las variantes comparten una única entrada de la caché y la API recibe el texto original."""
+        transporte = TransporteMemoria({"find": RESPUESTA_FIND, "candidates": [RESPUESTA_FIND]})
+        cache = CacheMemoria()
+        cliente = CartoCiudad(transporte=transporte, cache=cache, normalizador=NormalizadorConsultas())
+        
+        for consulta in ["C/ Mayor 1, Madrid", "calle mayor, 1 madrid", "CALLE MAYOR 1 MADRID"]:
+            cliente.geocodificar(consulta)
+            cliente.buscar_candidatos(consulta)
+        
+        assert [params["q"] for _, params in transporte.peticiones] == ["C/ Mayor 1, Madrid"] * 2
+        assert cache.estadisticas()["aciertos"] == 4
+    
+    def test_sin_normalizador(self):
+        """Test de que sin normalizador la consulta se envía tal cual."""
+        transporte = TransporteMemoria({"find": RESPUESTA_FIND})
+        cliente = CartoCiudad(transporte=transporte, normalizador=None)
+        
+        cliente.geocodificar("C/ Mayor 1, Madrid")
+        assert transporte.peticiones[0][1]["q"] == "C/ Mayor 1, Madrid"
+    
+    def test_cliente_async(self):
+        """Test del normalizador en el cliente asíncrono."""
+        transporte = TransporteMemoria({"find": RESPUESTA_FIND})
+        cache = CacheMemoria()
+        cliente = CartoCiudadAsync(transporte=transporte, cache=cache, normalizador=normalizar_consulta)
+        
+        async def consultar():
+            await cliente.geocodificar("C/ Mayor 1, Madrid")
+            await cliente.geocodificar("calle mayor, 1 madrid")
+        
+        asyncio.run(consultar())
+        assert [params["q"] for _, params in transporte.peticiones] == ["C/ Mayor 1, Madrid"]
+        assert cache.estadisticas()["aciertos"] == 1 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Tests para la geocodificación inversa vectorizada de PyCiudad
+"""
+
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.columnar import ESTADO_CORRECTO, ESTADO_ERROR
+from pyciudad.espacial import RejillaEspacial, distancia_metros
+from pyciudad.puntos import agrupar_puntos, celdas, mascara_coordenadas
+from pyciudad.transporte import RespuestaTransporte, TransporteBase
+
+
+class TransporteInverso(TransporteBase):
+    """Transporte que responde a reverseGeocode con una dirección distinta por punto consultado."""
+    
+    def __init__(self):
+        self.consultas = []
+    
+    def enviar(self, url, params=None):
+        self.consultas.append((params["lon"], params["lat"]))
+        datos = {
+            "id": str(len(self.consultas)),
+            "type": "portal",
+            "address": f"CALLE {len(self.consultas)}",
+            "muni": "Madrid",
+            "lng": params["lon"],
+            "lat": params["lat"],
+        }
+        return RespuestaTransporte(200, json.dumps(datos).encode(), url=url)
+
+
+class TestPuntos:
+    """Tests de la validación y agrupación vectorizadas."""
+    
+    def test_mascara(self):
+        """Test de la máscara de coordenadas válidas, equivalente a validar_coordenadas."""
+        longitudes = [-3.7, 6.0, -3.7, np.nan, -10.0]
+        latitudes = [40.4, 40.4, 34.9, 40.4, 44.0]
+        
+        assert mascara_coordenadas(longitudes, latitudes).tolist() == [True, False, False, False, True]
+        with pytest.raises(ValueError):
+            mascara_coordenadas([1.0, 2.0], [1.0])
+    
+    def test_celdas_de_rejilla(self):
+        """Test de que las celdas coinciden con las de RejillaEspacial."""
+        rejilla = RejillaEspacial(celda_metros=5.0)
+        longitudes = np.array([-3.7, -0.3445, 2.17, -8.5])
+        latitudes = np.array([40.4, 39.47, 41.38, 42.88])
+        
+        claves = celdas(longitudes, latitudes, 5.0)
+        for clave, lon, lat in zip(claves.tolist(), longitudes, latitudes):
+            columna, fila = rejilla.celda(lon, lat)
+            assert clave == (fila << 32) + columna + (1 << 31)
+    
+    def test_agrupar(self):
+        """Test de la agrupación de puntos idénticos y casi idénticos."""
+        longitudes = np.array([-3.7, -3.700001, -3.8, -3.7, -3.70002])
+        latitudes = np.array([40.4, 40.400001, 40.5, 40.4, 40.4])
+        
+        representantes, etiquetas = agrupar_puntos(longitudes, latitudes, 0)
+        assert representantes.size == 4
+        assert etiquetas[0] == etiquetas[3]
+        
+        representantes, etiquetas = agrupar_puntos(longitudes, latitudes, 5.0)
+        assert etiquetas[0] == etiquetas[1] == etiquetas[3] != etiquetas[2]
+        # El representante es uno de los puntos del grupo, el más próximo al centroide
+        assert etiquetas[representantes[etiquetas[0]]] == etiquetas[0]
+        assert representantes[etiquetas[0]] in (0, 3)
+        
+        vacio = agrupar_puntos(np.array([]), np.array([]), 5.0)
+        assert vacio[0].size == vacio[1].size == 0
+
+
+class TestInversaPuntos:
+    """Tests de CartoCiudad.geocodificacion_inversa_puntos."""
+    
+    def test_una_consulta_por_grupo(self):
+        """Test de que cada grupo se consulta una vez y el resultado vuelve a todas sus posiciones."""
+        transporte = TransporteInverso()
+        cliente = CartoCiudad(transporte=transporte)
+        rng = np.random.default_rng(1)
+        centros = np.array([[-3.7, 40.4], [-3.69, 40.41], [-0.34, 39.47]])
+        elegidos = rng.integers(0, 3, size=300)
+        # Ruido de menos de un metro alrededor de tres puntos separados
+        longitudes = centros[elegidos, 0] + rng.uniform(-5e-6, 5e-6, 300)
+        latitudes = centros[elegidos, 1] + rng.uniform(-5e-6, 5e-6, 300)
+        
+        resultados = cliente.geocodificacion_inversa_puntos(longitudes, latitudes, precision_metros=50.0)
+        
+        assert len(resultados) == 300
+        assert len(transporte.consultas) == 3
+        assert resultados.correctos == 300
+        lng = resultados.a_numpy()["lng"]
+        for i in range(300):
+            assert distancia_metros(lng[i], resultados.lat[i], longitudes[i], latitudes[i]) < 5
+    
+    def test_puntos_invalidos(self):
+        """Test de que los puntos fuera de rango no se consultan y quedan como error en su posición."""
+        transporte = TransporteInverso()
+        cliente = CartoCiudad(transporte=transporte)
+        
+        resultados = cliente.geocodificacion_inversa_puntos(
+            [-3.7, 20.0, -3.7, np.nan],
+            [40.4, 40.4, 40.4, 40.4],
+            precision_metros=0
+        )
+        
+        assert list(resultados.estado) == [ESTADO_CORRECTO, ESTADO_ERROR, ESTADO_CORRECTO, ESTADO_ERROR]
+        assert "fuera del rango" in resultados.errores[1]
+        assert transporte.consultas == [(-3.7, 40.4)]
+        assert resultados.fila(0)["muni"] == "Madrid"
+    
+    def test_errores_de_la_api(self):
+        """Test de que el error de la consulta de un grupo se asigna a todos sus puntos."""
+        class TransporteFallido(TransporteBase):
+            def enviar(self, url, params=None):
+                return RespuestaTransporte(500, b"{}", url=url)
+        
+        cliente = CartoCiudad(transporte=TransporteFallido())
+        resultados = cliente.geocodificacion_inversa_puntos([-3.7, -3.7], [40.4, 40.4])
+        
+        assert resultados.correctos == 0
+        assert resultados.errores[0] == resultados.errores[1]
+        assert "500" in resultados.errores[0] 
\ No newline at end of file
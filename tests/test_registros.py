@@ -0,0 +1,50 @@
+"""
+Tests para los registros compactos de PyCiudad
+"""
+
+import pickle
+import sys
+
+from pyciudad.modelos import Candidato, Direccion
+from pyciudad.registros import RegistroCompacto, compactar
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_REVERSE
+
+
+class TestRegistroCompacto:
+    """Tests para RegistroCompacto."""
+    
+    def test_desde_modelo_y_accesores(self):
+        """Test de la conversión desde un modelo y de los accesores en español."""
+        direccion = Direccion.model_validate(RESPUESTA_REVERSE)
+        registro = RegistroCompacto.desde_modelo(direccion)
+        
+        assert not hasattr(registro, "__dict__")
+        assert registro.via == direccion.via
+        assert registro.numero == "146"
+        assert registro.municipio == direccion.municipio
+        assert registro.provincia == direccion.provincia
+        assert registro.codigo_postal == direccion.codigo_postal
+        assert registro.latitud == direccion.latitud
+        assert registro.longitud == direccion.longitud
+        assert sys.getsizeof(registro) < sys.getsizeof(direccion.__dict__)
+    
+    def test_ida_y_vuelta(self):
+        """Test de la conversión registro -> modelo -> registro."""
+        registro = RegistroCompacto.desde_dict(RESPUESTA_REVERSE)
+        assert registro == RegistroCompacto.desde_modelo(Direccion.model_validate(RESPUESTA_REVERSE))
+        
+        direccion = registro.a_modelo(Direccion)
+        assert isinstance(direccion, Direccion)
+        assert direccion.numero == "146"
+        assert RegistroCompacto.desde_modelo(direccion) == registro
+        
+        assert pickle.loads(pickle.dumps(registro)) == registro
+    
+    def test_compactar(self):
+        """Test de la conversión de una lista con huecos."""
+        candidatos = [Candidato.model_validate(c) for c in RESPUESTA_CANDIDATOS]
+        registros = compactar([candidatos[0], None, candidatos[1]])
+        
+        assert registros[1] is None
+        assert [r.municipio for r in (registros[0], registros[2])] == ["Madrid", "Madridanos"]
+        assert registros[0].a_modelo(Candidato).direccion == candidatos[0].direccion 
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Tests para la política de reintentos de PyCiudad
+"""
+
+import pytest
+import responses
+from unittest.mock import patch
+from requests.exceptions import ConnectionError
+
+from pyciudad.cliente import CartoCiudad
+from pyciudad.constantes import FIND_URL
+from pyciudad.excepciones import APIError
+from pyciudad.reintentos import PoliticaReintentos, PresupuestoReintentos, parsear_retry_after
+from tests.test_cliente import RESPUESTA_FIND
+
+
+class TestPoliticaReintentos:
+    """Tests para PoliticaReintentos y PresupuestoReintentos."""
+    
+    def test_calcular_espera(self):
+        """Test de la espera exponencial con jitter completo."""
+        politica = PoliticaReintentos(espera_base=1, espera_maxima=5)
+        for intento in range(6):
+            espera = politica.calcular_espera(intento)
+            assert 0 <= espera <= min(5, 2 ** intento)
+        
+        assert politica.calcular_espera(0, retry_after=3) == 3
+        assert politica.calcular_espera(0, retry_after=60) == 5
+        assert PoliticaReintentos(respetar_retry_after=False, espera_base=0).calcular_espera(0, 60) == 0
+    
+    def test_parsear_retry_after(self):
+        """Test de la interpretación de la cabecera Retry-After."""
+        assert parsear_retry_after("120") == 120
+        assert parsear_retry_after(None) is None
+        assert parsear_retry_after("no es una fecha") is None
+        assert parsear_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    
+    def test_presupuesto(self):
+        """Test de que el presupuesto limita la proporción de reintentos."""
+        presupuesto = PresupuestoReintentos(proporcion=0.5, minimo_por_segundo=0, maximo=2)
+        assert presupuesto.retirar()
+        assert presupuesto.retirar()
+        assert not presupuesto.retirar()
+        
+        presupuesto.registrar_peticion()
+        presupuesto.registrar_peticion()
+        assert presupuesto.retirar()
+        assert not presupuesto.retirar()
+
+
+class TestClienteConReintentos:
+    """Tests de los reintentos en el cliente."""
+    
+    def setup_method(self):
+        """Configuración para cada test."""
+        self.cliente = CartoCiudad(reintentos=PoliticaReintentos(max_reintentos=3, espera_base=0))
+    
+    @responses.activate
+    def test_reintenta_errores_transitorios(self):
+        """Test de que un 503 seguido de un 200 se resuelve sin error."""
+        responses.add(responses.GET, FIND_URL, status=503)
+        responses.add(responses.GET, FIND_URL, status=429, headers={"Retry-After": "0"})
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        
+        ubicacion = self.cliente.geocodificar("Estación de metro Clínico, Málaga")
+        
+        assert ubicacion.id == "2906755300"
+        assert len(responses.calls) == 3
+    
+    @responses.activate
+    def test_agota_los_reintentos(self):
+        """Test del número de reintentos expuesto en APIError."""
+        responses.add(responses.GET, FIND_URL, status=502)
+        
+        with pytest.raises(APIError) as excinfo:
+            self.cliente.geocodificar("Calle Mayor 1")
+        
+        assert excinfo.value.codigo == 502
+        assert excinfo.value.reintentos == 3
+        assert len(responses.calls) == 4
+    
+    @responses.activate
+    def test_no_reintenta_errores_del_cliente(self):
+        """Test de que un 400 no se reintenta."""
+        responses.add(responses.GET, FIND_URL, status=400)
+        
+        with pytest.raises(APIError) as excinfo:
+            self.cliente.geocodificar("Calle Mayor 1")
+        
+        assert excinfo.value.reintentos == 0
+        assert len(responses.calls) == 1
+    
+    @patch('pyciudad.transporte.requests.Session.get')
+    def test_reintenta_errores_de_conexion(self, mock_get):
+        """Test de los reintentos ante errores de conexión."""
+        mock_get.side_effect = ConnectionError("Connection refused")
+        
+        with pytest.raises(APIError) as excinfo:
+            self.cliente.geocodificar("Calle Mayor 1")
+        
+        assert "Error de conexión" in str(excinfo.value)
+        assert excinfo.value.reintentos == 3
+        assert mock_get.call_count == 4
+    
+    @responses.activate
+    def test_presupuesto_agotado(self):
+        """Test de que sin presupuesto no se reintenta."""
+        responses.add(responses.GET, FIND_URL, status=503)
+        presupuesto = PresupuestoReintentos(proporcion=0, minimo_por_segundo=0, maximo=1)
+        cliente = CartoCiudad(
+            reintentos=PoliticaReintentos(max_reintentos=5, espera_base=0, presupuesto=presupuesto)
+        )
+        
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 1")
+        assert excinfo.value.reintentos == 1
+        
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 2")
+        assert excinfo.value.reintentos == 0
+        assert len(responses.calls) == 3 
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Tests para el servidor local de benchmarks y la opción url_base del cliente
+"""
+
+import pytest
+
+from pyciudad.cliente import CartoCiudad, APIError
+from benchmarks.servidor import servidor_en_hilo
+from benchmarks.suite import percentil
+
+
+class TestServidorLocal:
+    """Tests del cliente contra el servidor local."""
+    
+    def test_respuestas_grabadas(self):
+        """Test de los tres endpoints servidos por el servidor local."""
+        with servidor_en_hilo() as servidor:
+            with CartoCiudad(url_base=servidor.url_base) as cliente:
+                assert len(cliente.buscar_candidatos("Calle Iglesia 5")) == 10
+                assert cliente.geocodificar("Clínico").id == "2906755300"
+                assert cliente.geocodificacion_inversa(-0.344579, 39.472413).numero == "146"
+            assert servidor.peticiones == 3
+    
+    def test_tasa_error(self):
+        """Test de los errores 503 provocados por el servidor."""
+        with servidor_en_hilo(tasa_error=1.0) as servidor:
+            with pytest.raises(APIError) as excinfo:
+                CartoCiudad(url_base=servidor.url_base).geocodificar("Clínico")
+        assert excinfo.value.codigo == 503
+    
+    def test_percentil(self):
+        """Test del cálculo de percentiles de la suite."""
+        valores = list(range(1, 101))
+        assert percentil(valores, 50) == 50
+        assert percentil(valores, 99) == 99
+        assert percentil([], 95) == 0.0 
\ No newline at end of file
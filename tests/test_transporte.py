@@ -0,0 +1,227 @@
+"""
+Tests para los transportes de PyCiudad
+"""
+
+import asyncio
+import json
+import pytest
+import responses
+from unittest.mock import MagicMock
+
+from pyciudad import CartoCiudad, CartoCiudadAsync
+from pyciudad.constantes import FIND_URL, CANDIDATES_URL
+from pyciudad.excepciones import APIError, ErrorConexion
+from pyciudad.reintentos import PoliticaReintentos
+from pyciudad.transporte import (
+    RespuestaTransporte,
+    TransporteBase,
+    TransporteMemoria,
+    TransporteGrabacion,
+    TransporteReproduccion,
+    clave_peticion
+)
+from tests.test_cliente import RESPUESTA_CANDIDATOS, RESPUESTA_FIND
+
+
+class TestTransporteMemoria:
+    """Tests para el transporte con respuestas predefinidas."""
+    
+    def test_cliente_sin_red(self):
+        """Test de los métodos del cliente con respuestas por endpoint."""
+        transporte = TransporteMemoria({"candidates": RESPUESTA_CANDIDATOS, "find": RESPUESTA_FIND})
+        cliente = CartoCiudad(transporte=transporte)
+        
+        candidatos = cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        ubicacion = cliente.geocodificar("Estación de metro Clínico, Málaga")
+        
+        assert candidatos[0].id == RESPUESTA_CANDIDATOS[0]["id"]
+        assert ubicacion.id == "2906755300"
+        assert [url for url, _ in transporte.peticiones] == [CANDIDATES_URL, FIND_URL]
+    
+    def test_respuesta_por_parametros(self):
+        """Test de que la respuesta exacta tiene prioridad sobre la del endpoint."""
+        otra = dict(RESPUESTA_FIND, id="otro")
+        transporte = TransporteMemoria({"find": RESPUESTA_FIND})
+        transporte.agregar("find", otra, params={"q": "Otra consulta"})
+        
+        assert json.loads(transporte.enviar(FIND_URL, {"q": "Otra consulta"}).contenido)["id"] == "otro"
+        assert json.loads(transporte.enviar(FIND_URL, {"q": "Cualquiera"}).contenido)["id"] == "2906755300"
+    
+    def test_sin_respuesta_y_errores_http(self):
+        """Test de los 404 sin respuesta y de los códigos de error predefinidos."""
+        transporte = TransporteMemoria({
+            "find": RespuestaTransporte(503, b"{}", {"Retry-After": "2"})
+        })
+        cliente = CartoCiudad(transporte=transporte)
+        
+        with pytest.raises(APIError) as excinfo:
+            cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        assert excinfo.value.codigo == 404
+        
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 1, Madrid")
+        assert excinfo.value.codigo == 503
+        assert excinfo.value.retry_after == 2.0
+    
+    def test_cliente_async(self):
+        """Test del cliente asíncrono con un transporte síncrono en memoria."""
+        cliente = CartoCiudadAsync(transporte=TransporteMemoria({"find": RESPUESTA_FIND}))
+        
+        ubicacion = asyncio.run(cliente.geocodificar("Estación de metro Clínico, Málaga"))
+        assert ubicacion.id == "2906755300"
+    
+    def test_interfaz_abstracta(self):
+        """Test de que TransporteBase no se instancia sin implementar enviar()."""
+        with pytest.raises(TypeError):
+            TransporteBase()
+
+
+class TestTransporteHTTP:
+    """Tests para el transporte HTTP síncrono."""
+    
+    @responses.activate
+    def test_cabeceras_compartidas_con_el_cliente(self):
+        """Test de que los cambios en cliente.headers se aplican a las peticiones siguientes."""
+        responses.add(responses.GET, FIND_URL, json=RESPUESTA_FIND, status=200)
+        cliente = CartoCiudad()
+        cliente.geocodificar("Calle Mayor 1")
+        cliente.headers["User-Agent"] = "MiAplicacion/1.0"
+        cliente.geocodificar("Calle Mayor 2")
+        
+        assert responses.calls[0].request.headers["User-Agent"] == "PyCartoCiudad/0.1.0"
+        assert responses.calls[1].request.headers["User-Agent"] == "MiAplicacion/1.0"
+        assert responses.calls[1].request.headers["Accept"] == "application/json"
+
+
+class TestErroresTransporte:
+    """Tests para la traducción de los errores de transporte."""
+    
+    def test_error_conexion_reintentado(self):
+        """Test de que ErrorConexion se reintenta y acaba en APIError."""
+        transporte = MagicMock(spec=TransporteBase)
+        transporte.enviar.side_effect = ErrorConexion("Connection refused")
+        politica = PoliticaReintentos(max_reintentos=2, espera_base=0)
+        cliente = CartoCiudad(transporte=transporte, reintentos=politica)
+        
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 1, Madrid")
+        
+        assert "Error de conexión" in str(excinfo.value)
+        assert excinfo.value.reintentos == 2
+        assert transporte.enviar.call_count == 3
+    
+    def test_politica_con_excepciones_de_requests(self):
+        """Test de que una política con tipos de requests sigue reconociendo su causa."""
+        import requests
+        
+        transporte = MagicMock(spec=TransporteBase)
+        transporte.enviar.side_effect = [_error_encadenado(requests.exceptions.ConnectionError()), RESPUESTA_OK]
+        politica = PoliticaReintentos(
+            max_reintentos=1,
+            espera_base=0,
+            excepciones_reintentables=(requests.exceptions.ConnectionError,)
+        )
+        cliente = CartoCiudad(transporte=transporte, reintentos=politica)
+        
+        assert cliente.geocodificar("Estación de metro Clínico, Málaga").id == "2906755300"
+
+
+RESPUESTA_OK = RespuestaTransporte(200, json.dumps(RESPUESTA_FIND).encode("utf-8"))
+
+
+def _error_encadenado(causa):
+    """Devuelve un ErrorConexion encadenado a la excepción indicada."""
+    try:
+        raise ErrorConexion(str(causa)) from causa
+    except ErrorConexion as e:
+        return e
+
+
+class TestGrabacionReproduccion:
+    """Tests para la grabación de tráfico en NDJSON y su reproducción."""
+    
+    def test_grabar_y_reproducir(self, tmp_path):
+        """Test de que el diario grabado reproduce las mismas respuestas."""
+        ruta = str(tmp_path / "trafico.ndjson")
+        grabacion = TransporteGrabacion(
+            TransporteMemoria({"candidates": RESPUESTA_CANDIDATOS, "find": RESPUESTA_FIND}),
+            ruta
+        )
+        cliente = CartoCiudad(transporte=grabacion)
+        candidatos = cliente.buscar_candidatos("Calle Iglesia 5, Madrid")
+        ubicacion = cliente.geocodificar("Estación de metro Clínico, Málaga")
+        with pytest.raises(APIError):
+            cliente.geocodificacion_inversa(-3.7, 40.4)
+        cliente.cerrar()
+        
+        with open(ruta, encoding="utf-8") as f:
+            entradas = [json.loads(linea) for linea in f]
+        assert [e["codigo"] for e in entradas] == [200, 200, 404]
+        assert entradas[1]["params"]["q"] == "Estación de metro Clínico, Málaga"
+        
+        reproduccion = TransporteReproduccion(ruta)
+        assert len(reproduccion) == 3
+        assert [endpoint for endpoint, _ in reproduccion.consultas()] == ["candidates", "find", "reverseGeocode"]
+        
+        cliente = CartoCiudad(transporte=reproduccion, url_base="http://127.0.0.1:1/otra/base")
+        assert cliente.buscar_candidatos("Calle Iglesia 5, Madrid") == candidatos
+        assert cliente.geocodificar("Estación de metro Clínico, Málaga") == ubicacion
+        
+        # Una petición que no está en el diario recibe un 404
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 1, Madrid")
+        assert excinfo.value.codigo == 404
+    
+    def test_respuestas_repetidas_en_orden(self, tmp_path):
+        """Test de que las repeticiones de una petición se reproducen en orden."""
+        ruta = str(tmp_path / "trafico.ndjson")
+        interior = MagicMock(spec=TransporteBase)
+        interior.enviar.side_effect = [
+            RespuestaTransporte(503, b"{}"),
+            RESPUESTA_OK,
+            ErrorConexion("Connection reset"),
+        ]
+        grabacion = TransporteGrabacion(interior, ruta)
+        for _ in range(2):
+            grabacion.enviar(FIND_URL, {"q": "Calle Mayor 1"})
+        with pytest.raises(ErrorConexion):
+            grabacion.enviar(FIND_URL, {"q": "Calle Mayor 1"})
+        grabacion.cerrar()
+        
+        reproduccion = TransporteReproduccion(ruta)
+        assert reproduccion.enviar(FIND_URL, {"q": "Calle Mayor 1"}).codigo == 503
+        assert reproduccion.enviar(FIND_URL, {"q": "Calle Mayor 1"}).codigo == 200
+        with pytest.raises(ErrorConexion):
+            reproduccion.enviar(FIND_URL, {"q": "Calle Mayor 1"})
+        # La última entrada grabada se repite
+        with pytest.raises(ErrorConexion):
+            reproduccion.enviar(FIND_URL, {"q": "Calle Mayor 1"})
+    
+    def test_cabeceras_insensibles_a_mayusculas(self, tmp_path):
+        """Test de que Retry-After grabado en minúsculas (como en httpx) se respeta al reproducir."""
+        ruta = str(tmp_path / "trafico.ndjson")
+        interior = MagicMock(spec=TransporteBase)
+        interior.enviar.return_value = RespuestaTransporte(429, b"{}", {"retry-after": "7"})
+        grabacion = TransporteGrabacion(interior, ruta)
+        grabacion.enviar(FIND_URL, {"q": "Calle Mayor 1"})
+        grabacion.cerrar()
+        
+        cliente = CartoCiudad(transporte=TransporteReproduccion(ruta))
+        with pytest.raises(APIError) as excinfo:
+            cliente.geocodificar("Calle Mayor 1")
+        assert excinfo.value.codigo == 429
+        assert excinfo.value.retry_after == 7.0
+    
+    def test_contenido_binario(self, tmp_path):
+        """Test de que los cuerpos que no son UTF-8 se graban en base64."""
+        ruta = str(tmp_path / "trafico.ndjson")
+        grabacion = TransporteGrabacion(TransporteMemoria({"find": b"\xff\x00"}), ruta)
+        grabacion.enviar(FIND_URL)
+        grabacion.cerrar()
+        
+        assert TransporteReproduccion(ruta).enviar(FIND_URL).contenido == b"\xff\x00"
+    
+    def test_clave_independiente_de_url_base(self):
+        """Test de que la clave sólo depende del endpoint y los parámetros."""
+        assert clave_peticion(FIND_URL, {"q": "a", "b": None}) == "find?q=a"
+        assert clave_peticion("http://localhost/x/find", {"q": "a"}) == "find?q=a" 
\ No newline at end of file